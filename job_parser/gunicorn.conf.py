@@ -0,0 +1,39 @@
+"""
+Настройки gunicorn.
+
+Режим работы выбирается переменной окружения `SERVER_MODE`:
+
+* `wsgi` (по умолчанию) - приложение `job_parser.wsgi` в синхронных воркерах
+  gunicorn. Каждое асинхронное представление выполняется в отдельном цикле
+  событий, который создается на время запроса;
+* `asgi` - приложение `job_parser.asgi` в воркерах uvicorn. Асинхронные
+  представления выполняются в цикле событий воркера, а запросы к базе
+  данных - в пуле потоков. Синхронные представления, например главная
+  страница, выполняются в пуле потоков целиком.
+
+Цепочка middleware под ASGI асинхронная только без синхронных middleware:
+whitenoise подключен через `job_parser.static_middleware`, а debug-toolbar
+в режиме ASGI не подключается (см. `DEBUG_TOOLBAR` в настройках).
+
+По замерам `bench_http` (sqlite, один воркер, 20 одновременных запросов,
+5000 вакансий) поиск вакансий в режиме ASGI обрабатывает на 7-12% больше
+запросов в секунду, а главная страница - на 5-11% меньше. Поэтому режим
+ASGI включается явно.
+"""
+
+import os
+
+SERVER_MODE = os.getenv("SERVER_MODE", "wsgi").lower()
+
+if SERVER_MODE not in ("asgi", "wsgi"):
+    raise RuntimeError(f"Неизвестный режим сервера: {SERVER_MODE}")
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("GUNICORN_WORKERS", 1))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 30))
+
+if SERVER_MODE == "asgi":
+    wsgi_app = "job_parser.asgi:application"
+    worker_class = "uvicorn.workers.UvicornWorker"
+else:
+    wsgi_app = "job_parser.wsgi:application"
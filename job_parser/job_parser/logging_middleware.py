@@ -1,17 +1,99 @@
+import asyncio
 import time
 import uuid
-from typing import Any
+from typing import Any, Callable, Iterator
 
-from django.http import HttpRequest
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpRequest, HttpResponseBase, StreamingHttpResponse
+from django.utils.decorators import sync_and_async_middleware
 from loguru import logger
 
+from .metrics import count_queries, registry
 
-def logging_middleware(get_response) -> Any:
+
+def get_route(request: HttpRequest) -> str:
+    """Возвращает шаблон маршрута запроса для ключа метрик."""
+    match = getattr(request, "resolver_match", None)
+    if match is not None:
+        return f"/{match.route}"
+    static_url = "/" + (settings.STATIC_URL or "").lstrip("/")
+    if static_url != "/" and request.path.startswith(static_url):
+        return "static"
+    return "unmatched"
+
+
+def count_stream(content: Iterator[bytes], method: str, route: str) -> Iterator[bytes]:
+    """Передает части потокового ответа, подсчитывая их размер."""
+    size = 0
+    try:
+        for chunk in content:
+            size += len(chunk)
+            yield chunk
+    finally:
+        registry.add_bytes(method, route, size)
+
+
+def record(
+    request: HttpRequest,
+    response: HttpResponseBase,
+    start: float,
+    request_id: str,
+    queries: int = 0,
+) -> None:
+    """
+    Регистрирует запрос в метриках маршрута.
+
+    Размер ответа берется из заголовка `Content-Length`. Тело ответа
+    не читается: у потокового ответа размер подсчитывается по мере отправки.
+
+    Args:
+        request (HttpRequest): Объект запроса.
+        response (HttpResponseBase): Объект ответа.
+        start (float): Время начала обработки запроса.
+        request_id (str): Идентификатор запроса.
+        queries (int): Количество SQL-запросов.
+    """
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    route = get_route(request)
+    size = response.get("Content-Length")
+    if size is None and isinstance(response, StreamingHttpResponse):
+        response.streaming_content = count_stream(
+            response.streaming_content, request.method, route
+        )
+    registry.observe(
+        request.method,
+        route,
+        response.status_code,
+        elapsed_ms,
+        int(size) if size is not None else None,
+        queries,
+    )
+    if elapsed_ms >= settings.SLOW_REQUEST_MS:
+        logger.bind(
+            path=request.path,
+            method=request.method,
+            status_code=response.status_code,
+            elapsed=elapsed_ms / 1000,
+        ).warning(
+            "Медленный запрос '{method}' к адресу '{path}'",
+            method=request.method,
+            path=request.path,
+        )
+    response["X-Request-ID"] = request_id
+
+
+@sync_and_async_middleware
+def logging_middleware(get_response: Callable) -> Any:
     """Промежуточное ПО для регистрации информации о запросе и ответе.
 
-    Это промежуточное ПО регистрирует информацию о входящих запросах и исходящих 
-    ответах, включая путь запроса, метод, статус код ответа, размер ответа и время 
-    выполнения запроса.
+    Это промежуточное ПО записывает время ответа, статус и размер ответа
+    в гистограммы по маршрутам (см. `job_parser.metrics`) вместо строки
+    в журнале на каждый запрос. В журнал попадают только запросы дольше
+    `SLOW_REQUEST_MS`. Подсчитывает SQL-запросы и раз
+    в `METRICS_PUBLISH_INTERVAL` сохраняет снимок метрик процесса в кеш
+    для эндпоинта `/metrics`. Поддерживает синхронную и асинхронную обработку,
+    поэтому асинхронные представления не переключаются между потоками.
     Также добавляет идентификатор запроса в заголовок ответа "X-Request-ID".
 
     Args:
@@ -20,34 +102,30 @@ def logging_middleware(get_response) -> Any:
     Returns:
         Функция middleware (Any), которая принимает запрос и возвращает ответ.
     """
+    if asyncio.iscoroutinefunction(get_response):
 
-    def middleware(request: HttpRequest) -> Any:
-        # Создаем идентификатор запроса
-        request_id = str(uuid.uuid4())
+        async def async_middleware(request: HttpRequest) -> Any:
+            request_id = str(uuid.uuid4())
+            with logger.contextualize(
+                request_id=request_id
+            ), count_queries() as queries:
+                start = time.perf_counter()
+                response = await get_response(request)
+                record(request, response, start, request_id, queries[0])
+            if registry.publish_due():
+                await sync_to_async(registry.publish)()
+            return response
 
-        # Добавляем контекст ко всем регистраторам во всех представлениях
-        with logger.contextualize(request_id=request_id):
-            request.start_time = time.time()
+        return async_middleware
 
+    def middleware(request: HttpRequest) -> Any:
+        request_id = str(uuid.uuid4())
+        with logger.contextualize(request_id=request_id), count_queries() as queries:
+            start = time.perf_counter()
             response = get_response(request)
-
-            elapsed = time.time() - request.start_time
-
-            # После получения ответа
-            logger.bind(
-                path=request.path,
-                method=request.method,
-                status_code=response.status_code,
-                response_size=len(response.content),
-                elapsed=elapsed,
-            ).info(
-                "Входящий метод '{method}' запросил адрес '{path}'",
-                method=request.method,
-                path=request.path,
-            )
-
-            response["X-Request-ID"] = request_id
-
-            return response
+            record(request, response, start, request_id, queries[0])
+        if registry.publish_due():
+            registry.publish()
+        return response
 
     return middleware
@@ -0,0 +1,490 @@
+import bisect
+import contextlib
+import copy
+import os
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.backends.signals import connection_created
+
+# Верхние границы интервалов гистограммы задержек в миллисекундах.
+LATENCY_BUCKETS_MS: tuple[float, ...] = (
+    5,
+    10,
+    25,
+    50,
+    100,
+    250,
+    500,
+    1000,
+    2500,
+    5000,
+    10000,
+)
+
+# Верхние границы интервалов гистограммы длительности этапов загрузки в секундах.
+DURATION_BUCKETS_S: tuple[float, ...] = (0.1, 0.5, 1, 5, 10, 30, 60, 300, 900)
+
+# Счетчик SQL-запросов текущего HTTP-запроса. Контекст копируется
+# в `sync_to_async`, поэтому запросы из потоков тоже учитываются.
+query_counter: ContextVar[list[int] | None] = ContextVar("query_counter", default=None)
+
+
+@dataclass
+class Histogram:
+    """
+    Гистограмма с фиксированными интервалами.
+
+    Attributes:
+        buckets (tuple[float, ...]): Верхние границы интервалов.
+        counts (list[int]): Количество значений в каждом интервале, последний
+        элемент - значения больше последней границы.
+        total (float): Сумма значений.
+        count (int): Количество значений.
+    """
+
+    buckets: tuple[float, ...] = LATENCY_BUCKETS_MS
+    counts: list[int] = field(default_factory=list)
+    total: float = 0.0
+    count: int = 0
+
+    def __post_init__(self) -> None:
+        if not self.counts:
+            self.counts = [0] * (len(self.buckets) + 1)
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def merge(self, other: "Histogram") -> None:
+        for index, bucket_count in enumerate(other.counts):
+            self.counts[index] += bucket_count
+        self.total += other.total
+        self.count += other.count
+
+    def quantile(self, q: float) -> float:
+        """
+        Оценивает квантиль по границам интервалов.
+
+        Args:
+            q (float): Квантиль от 0 до 1.
+
+        Returns:
+            float: Верхняя граница интервала, в который попадает квантиль.
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return self.buckets[min(index, len(self.buckets) - 1)]
+        return self.buckets[-1]
+
+
+@dataclass
+class RouteStats:
+    """
+    Статистика запросов к одному маршруту.
+
+    Attributes:
+        latency (Histogram): Гистограмма времени ответа в миллисекундах.
+        statuses (dict[int, int]): Количество ответов по классам статусов (2, 3, 4, 5).
+        response_bytes (int): Суммарный размер ответов в байтах.
+        unknown_size (int): Количество ответов, размер которых неизвестен.
+        queries (int): Количество SQL-запросов.
+    """
+
+    latency: Histogram = field(default_factory=Histogram)
+    statuses: dict[int, int] = field(default_factory=dict)
+    response_bytes: int = 0
+    unknown_size: int = 0
+    queries: int = 0
+
+    def merge(self, other: "RouteStats") -> None:
+        self.latency.merge(other.latency)
+        for status_class, count in other.statuses.items():
+            self.statuses[status_class] = self.statuses.get(status_class, 0) + count
+        self.response_bytes += other.response_bytes
+        self.unknown_size += other.unknown_size
+        self.queries += other.queries
+
+
+def labels_key(labels: dict[str, Any]) -> tuple[tuple[str, str], ...]:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+class MetricsRegistry:
+    """
+    Реестр метрик процесса.
+
+    Метрики HTTP-запросов хранятся по маршрутам. Ключ маршрута - метод
+    и шаблон URL-адреса из `resolver_match.route`, а не путь запроса,
+    поэтому количество ключей ограничено количеством маршрутов приложения.
+    Метрики загрузки вакансий хранятся как именованные счетчики
+    и гистограммы с метками.
+
+    Каждый процесс (воркер gunicorn или huey) периодически сохраняет снимок
+    своих метрик в кеш Django в отдельный слот `metrics:process:<номер>`.
+    Слот занимается атомарным `cache.add` и освобождается по истечении
+    `METRICS_SNAPSHOT_TIMEOUT`, если процесс перестал обновлять снимок.
+    Метод `collect` объединяет снимки всех процессов.
+    """
+
+    slot_key = "metrics:process:{}"
+
+    def __init__(self) -> None:
+        self.routes: dict[tuple[str, str], RouteStats] = {}
+        self.counters: dict[tuple[str, tuple], float] = {}
+        self.histograms: dict[tuple[str, tuple], Histogram] = {}
+        self.lock = threading.Lock()
+        self.pid = os.getpid()
+        self.owner = ""
+        self.slot: int | None = None
+        self.published_at = 0.0
+
+    def stats(self, method: str, route: str) -> RouteStats:
+        key = (method, route)
+        stats = self.routes.get(key)
+        if stats is None:
+            with self.lock:
+                stats = self.routes.setdefault(key, RouteStats())
+        return stats
+
+    def observe(
+        self,
+        method: str,
+        route: str,
+        status_code: int,
+        elapsed_ms: float,
+        size: int | None,
+        queries: int = 0,
+    ) -> None:
+        """
+        Регистрирует запрос.
+
+        Args:
+            method (str): HTTP-метод.
+            route (str): Шаблон маршрута.
+            status_code (int): Статус ответа.
+            elapsed_ms (float): Время ответа в миллисекундах.
+            size (int | None): Размер ответа в байтах, если известен.
+            queries (int): Количество SQL-запросов.
+        """
+        stats = self.stats(method, route)
+        with self.lock:
+            stats.latency.observe(elapsed_ms)
+            status_class = status_code // 100
+            stats.statuses[status_class] = stats.statuses.get(status_class, 0) + 1
+            if size is None:
+                stats.unknown_size += 1
+            else:
+                stats.response_bytes += size
+            stats.queries += queries
+
+    def add_bytes(self, method: str, route: str, size: int) -> None:
+        """Добавляет размер потокового ответа после его отправки."""
+        stats = self.stats(method, route)
+        with self.lock:
+            stats.response_bytes += size
+            stats.unknown_size -= 1
+
+    def inc(self, name: str, value: float = 1, **labels: Any) -> None:
+        """
+        Увеличивает счетчик.
+
+        Args:
+            name (str): Название метрики.
+            value (float): Величина увеличения.
+            **labels: Метки метрики.
+        """
+        key = (name, labels_key(labels))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe_duration(self, name: str, seconds: float, **labels: Any) -> None:
+        """
+        Регистрирует длительность в гистограмме.
+
+        Args:
+            name (str): Название метрики.
+            seconds (float): Длительность в секундах.
+            **labels: Метки метрики.
+        """
+        key = (name, labels_key(labels))
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(DURATION_BUCKETS_S)
+            histogram.observe(seconds)
+
+    def observe_fetch(
+        self, source: str, kind: str, status: int | str, size: int = 0
+    ) -> None:
+        """
+        Регистрирует запрос к сайту поиска работы.
+
+        Args:
+            source (str): Название сайта поиска работы.
+            kind (str): Вид запроса: "page" - страница списка вакансий,
+            "detail" - страница или детали вакансии.
+            status (int | str): Статус ответа или "error" при ошибке соединения.
+            size (int): Размер ответа в байтах.
+        """
+        name = (
+            "ingest_pages_fetched_total"
+            if kind == "page"
+            else "ingest_detail_requests_total"
+        )
+        self.inc(name, source=source)
+        self.inc("ingest_http_responses_total", source=source, status=status)
+        if size:
+            self.inc("ingest_bytes_total", size, source=source)
+
+    @contextlib.contextmanager
+    def timer(self, name: str, **labels: Any) -> Iterator[None]:
+        """Контекстный менеджер, регистрирующий длительность блока."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe_duration(name, time.perf_counter() - start, **labels)
+
+    def reset(self) -> None:
+        with self.lock:
+            self.routes.clear()
+            self.counters.clear()
+            self.histograms.clear()
+
+    def snapshot(self) -> dict[str, dict]:
+        """Возвращает копию метрик процесса."""
+        with self.lock:
+            return copy.deepcopy(
+                {
+                    "routes": self.routes,
+                    "counters": self.counters,
+                    "histograms": self.histograms,
+                }
+            )
+
+    def merge(self, snapshot: dict[str, dict]) -> None:
+        """
+        Добавляет к реестру метрики из снимка другого процесса.
+
+        Args:
+            snapshot (dict[str, dict]): Снимок метрик.
+        """
+        with self.lock:
+            for key, stats in snapshot["routes"].items():
+                self.routes.setdefault(key, RouteStats()).merge(stats)
+            for key, value in snapshot["counters"].items():
+                self.counters[key] = self.counters.get(key, 0) + value
+            for key, histogram in snapshot["histograms"].items():
+                if key in self.histograms:
+                    self.histograms[key].merge(histogram)
+                else:
+                    self.histograms[key] = copy.deepcopy(histogram)
+
+    def check_fork(self) -> None:
+        """Сбрасывает метрики, унаследованные от родительского процесса."""
+        if self.pid != os.getpid():
+            self.reset()
+            self.pid = os.getpid()
+            self.owner = ""
+            self.slot = None
+
+    def claim_slot(self, value: tuple[str, dict]) -> bool:
+        for slot in range(settings.METRICS_MAX_PROCESSES):
+            if cache.add(
+                self.slot_key.format(slot), value, settings.METRICS_SNAPSHOT_TIMEOUT
+            ):
+                self.slot = slot
+                return True
+        return False
+
+    def publish(self) -> None:
+        """
+        Сохраняет снимок метрик процесса в кеш Django.
+
+        Если слот процесса истек и был занят другим процессом,
+        занимается новый слот.
+        """
+        self.check_fork()
+        self.published_at = time.monotonic()
+        if not self.owner:
+            self.owner = f"{os.getpid()}:{uuid.uuid4().hex}"
+        value = (self.owner, self.snapshot())
+        if self.slot is not None:
+            key = self.slot_key.format(self.slot)
+            current = cache.get(key)
+            if current is None or current[0] == self.owner:
+                cache.set(key, value, settings.METRICS_SNAPSHOT_TIMEOUT)
+                return
+        self.claim_slot(value)
+
+    def publish_due(self) -> bool:
+        """Проверяет, прошло ли `METRICS_PUBLISH_INTERVAL` с последнего снимка."""
+        return time.monotonic() - self.published_at >= settings.METRICS_PUBLISH_INTERVAL
+
+    def collect(self) -> "MetricsRegistry":
+        """
+        Объединяет снимки метрик всех процессов.
+
+        Returns:
+            MetricsRegistry: Реестр с суммарными метриками.
+        """
+        self.publish()
+        keys = [
+            self.slot_key.format(slot) for slot in range(settings.METRICS_MAX_PROCESSES)
+        ]
+        total = MetricsRegistry()
+        for owner, snapshot in cache.get_many(keys).values():
+            total.merge(snapshot)
+        return total
+
+
+# Описания метрик для формата Prometheus.
+METRIC_HELP: dict[str, str] = {
+    "http_request_duration_seconds": "Время ответа по маршрутам",
+    "http_responses_total": "Количество ответов по классам статусов",
+    "http_response_bytes_total": "Суммарный размер ответов",
+    "http_db_queries_total": "Количество SQL-запросов при обработке запросов",
+    "ingest_pages_fetched_total": "Загруженные страницы списков вакансий",
+    "ingest_detail_requests_total": "Запросы страниц и деталей вакансий",
+    "ingest_http_responses_total": "Ответы сайтов поиска работы по статусам",
+    "ingest_bytes_total": "Объем загруженных данных",
+    "ingest_rows_total": "Записанные и пропущенные вакансии",
+    "ingest_stage_duration_seconds": "Длительность этапов загрузки вакансий",
+    "ingest_retries_total": "Повторы запросов к сайтам после временных ошибок",
+    "ingest_hedged_requests_total": "Копии запросов, отправленные из-за задержки",
+    "ingest_circuit_open_total": "Размыкания предохранителя хоста",
+    "ingest_fetch_failures_total": "Запросы, не выполненные после всех повторов",
+    "ingest_shards_total": "Сегменты запросов к API по периодам и регионам",
+    "ingest_duplicates_total": "Вакансии, уже сохраненные с этого или другого сайта",
+    "huey_queue_depth": "Количество задач в очереди",
+}
+
+
+def escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(labels: tuple[tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{name}="{escape(value)}"' for name, value in labels)
+    return f"{{{pairs}}}"
+
+
+def format_histogram(
+    name: str, labels: tuple, histogram: Histogram, scale: float = 1
+) -> Iterator[str]:
+    cumulative = 0
+    for bucket, bucket_count in zip(histogram.buckets, histogram.counts):
+        cumulative += bucket_count
+        le = labels + (("le", f"{bucket * scale:g}"),)
+        yield f"{name}_bucket{format_labels(le)} {cumulative}"
+    yield f"{name}_bucket{format_labels(labels + (('le', '+Inf'),))} {histogram.count}"
+    yield f"{name}_sum{format_labels(labels)} {histogram.total * scale:g}"
+    yield f"{name}_count{format_labels(labels)} {histogram.count}"
+
+
+def render(
+    metrics: MetricsRegistry, gauges: dict[tuple[str, tuple], float] | None = None
+) -> str:
+    """
+    Формирует текст метрик в формате Prometheus.
+
+    Args:
+        metrics (MetricsRegistry): Реестр метрик.
+        gauges (dict[tuple[str, tuple], float] | None): Мгновенные значения,
+        вычисленные при запросе метрик, например длина очереди задач.
+
+    Returns:
+        str: Метрики в текстовом формате Prometheus.
+    """
+    families: dict[str, tuple[str, list[str]]] = {}
+
+    def family(name: str, kind: str) -> list[str]:
+        return families.setdefault(name, (kind, []))[1]
+
+    for (method, route), stats in sorted(metrics.routes.items()):
+        labels: tuple[tuple[str, str], ...] = (("method", method), ("route", route))
+        family("http_request_duration_seconds", "histogram").extend(
+            format_histogram(
+                "http_request_duration_seconds", labels, stats.latency, 0.001
+            )
+        )
+        for status_class, count in sorted(stats.statuses.items()):
+            status = format_labels(labels + (("status", f"{status_class}xx"),))
+            family("http_responses_total", "counter").append(
+                f"http_responses_total{status} {count}"
+            )
+        family("http_response_bytes_total", "counter").append(
+            f"http_response_bytes_total{format_labels(labels)} {stats.response_bytes}"
+        )
+        family("http_db_queries_total", "counter").append(
+            f"http_db_queries_total{format_labels(labels)} {stats.queries}"
+        )
+    for (name, labels), value in sorted(metrics.counters.items()):
+        family(name, "counter").append(f"{name}{format_labels(labels)} {value:g}")
+    for (name, labels), histogram in sorted(metrics.histograms.items()):
+        family(name, "histogram").extend(format_histogram(name, labels, histogram))
+    for (name, labels), value in sorted((gauges or {}).items()):
+        family(name, "gauge").append(f"{name}{format_labels(labels)} {value:g}")
+
+    lines: list[str] = []
+    for name, (kind, samples) in families.items():
+        if name in METRIC_HELP:
+            lines.append(f"# HELP {name} {METRIC_HELP[name]}")
+        lines.append(f"# TYPE {name} {kind}")
+        lines.extend(samples)
+    return "\n".join(lines) + "\n"
+
+
+def count_query(
+    execute: Callable[..., Any], sql: str, params: Any, many: bool, context: dict
+) -> Any:
+    """Обертка выполнения SQL-запроса, увеличивающая счетчик `count_queries`."""
+    counter = query_counter.get()
+    if counter is not None:
+        counter[0] += 1
+    return execute(sql, params, many, context)
+
+
+def install_query_counter(connection: BaseDatabaseWrapper, **kwargs: Any) -> None:
+    """Добавляет подсчет SQL-запросов к соединению с базой данных."""
+    if count_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(count_query)
+
+
+@contextlib.contextmanager
+def count_queries() -> Iterator[list[int]]:
+    """
+    Подсчитывает SQL-запросы внутри блока.
+
+    Yields:
+        list[int]: Список из одного элемента с количеством запросов.
+    """
+    install_query_counter(connection)
+    counter = [0]
+    token = query_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        query_counter.reset(token)
+
+
+connection_created.connect(install_query_counter)
+
+registry = MetricsRegistry()
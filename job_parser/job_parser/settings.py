@@ -8,7 +8,6 @@ load_dotenv()
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
-os.environ["DJANGO_ALLOW_ASYNC_UNSAFE"] = "true"
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/4.1/howto/deployment/checklist/
@@ -46,23 +45,46 @@ INSTALLED_APPS = [
     "widget_tweaks",
     "crispy_forms",
     "crispy_bootstrap5",
-    "debug_toolbar",
     "huey.contrib.djhuey",
 ]
 
 MIDDLEWARE = [
+    # Первым, чтобы время ответа включало остальные слои, а заголовок
+    # Content-Length уже был выставлен CommonMiddleware.
+    "job_parser.logging_middleware.logging_middleware",  # loguru
     "django.middleware.security.SecurityMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",  # whitenoise
+    "job_parser.static_middleware.StaticFilesMiddleware",  # whitenoise
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
-    "debug_toolbar.middleware.DebugToolbarMiddleware",  # debug-toolbar
-    "job_parser.logging_middleware.logging_middleware",  # loguru
 ]
 
+# Режим сервера gunicorn (см. gunicorn.conf.py).
+SERVER_MODE = os.getenv("SERVER_MODE", "wsgi").lower()
+
+# debug-toolbar поддерживает только синхронную обработку: под ASGI он
+# перевел бы в синхронный режим всю цепочку middleware, поэтому подключается
+# только в режиме отладки под WSGI.
+DEBUG_TOOLBAR = bool(DEBUG) and SERVER_MODE != "asgi"
+if DEBUG_TOOLBAR:
+    INSTALLED_APPS.append("debug_toolbar")
+    MIDDLEWARE.append("debug_toolbar.middleware.DebugToolbarMiddleware")
+
+# Запросы дольше этого времени в миллисекундах записываются в журнал
+SLOW_REQUEST_MS = int(os.getenv("SLOW_REQUEST_MS", 1000))
+
+# Метрики: каждый процесс сохраняет снимок своих метрик в кеш не чаще, чем раз
+# в METRICS_PUBLISH_INTERVAL секунд, снимок остановленного процесса удаляется
+# через METRICS_SNAPSHOT_TIMEOUT секунд. Если задан METRICS_TOKEN, эндпоинт
+# /metrics требует заголовок "Authorization: Bearer <токен>".
+METRICS_PUBLISH_INTERVAL = float(os.getenv("METRICS_PUBLISH_INTERVAL", 5))
+METRICS_SNAPSHOT_TIMEOUT = int(os.getenv("METRICS_SNAPSHOT_TIMEOUT", 300))
+METRICS_MAX_PROCESSES = int(os.getenv("METRICS_MAX_PROCESSES", 64))
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
 ROOT_URLCONF = "job_parser.urls"
 
 TEMPLATES = [
@@ -192,25 +214,169 @@ SCRAPE_HABR = os.getenv("SCRAPE_HABR", 10)
 SCRAPE_GEEKJOB = os.getenv("SCRAPE_GEEKJOB", 10)
 SCRAPE_CAREERIST = os.getenv("SCRAPE_CAREERIST", 10)
 
-DELETE_OLD_VACANCIES = os.getenv("DELETE_OLD_VACANCIES", 0)
+DELETE_OLD_VACANCIES = os.getenv("DELETE_OLD_VACANCIES", 60)
+
+# Хранение вакансий
+RETENTION_DAYS = int(os.getenv("RETENTION_DAYS", 10))
+RETENTION_BATCH_SIZE = int(os.getenv("RETENTION_BATCH_SIZE", 1000))
+RETENTION_MAX_BATCHES = int(os.getenv("RETENTION_MAX_BATCHES", 50))
+RETENTION_ARCHIVE_DIR = os.getenv("RETENTION_ARCHIVE_DIR")
+
+# Трассировка загрузки вакансий: сводка этапов каждого запуска дописывается
+# строкой JSON в INGEST_TRACE_FILE (пустое значение - не сохранять).
+# INGEST_PROFILE включает профилирование каждого запуска: "sample" - выборочный
+# профилировщик со свернутыми стеками для flamegraph, "cprofile" - файл .prof.
+INGEST_TRACE_FILE = os.getenv(
+    "INGEST_TRACE_FILE", os.path.join(BASE_DIR, "..", "logs", "ingest_traces.jsonl")
+)
+INGEST_PROFILE = os.getenv("INGEST_PROFILE", "")
+INGEST_PROFILE_DIR = os.getenv(
+    "INGEST_PROFILE_DIR", os.path.join(BASE_DIR, "..", "logs", "ingest_profiles")
+)
+
+# Повторы запросов к сайтам поиска работы: количество повторов временных
+# ошибок и границы экспоненциальной задержки в секундах. Предохранитель хоста
+# размыкается после INGEST_BREAKER_THRESHOLD ошибок подряд на
+# INGEST_BREAKER_RESET секунд. INGEST_HEDGE_AFTER - время без ответа,
+# после которого отправляется копия запроса (0 - не отправлять).
+INGEST_RETRIES = int(os.getenv("INGEST_RETRIES", 3))
+INGEST_BACKOFF_BASE = float(os.getenv("INGEST_BACKOFF_BASE", 0.5))
+INGEST_BACKOFF_CAP = float(os.getenv("INGEST_BACKOFF_CAP", 30))
+INGEST_BREAKER_THRESHOLD = int(os.getenv("INGEST_BREAKER_THRESHOLD", 5))
+INGEST_BREAKER_RESET = float(os.getenv("INGEST_BREAKER_RESET", 60))
+INGEST_HEDGE_AFTER = float(os.getenv("INGEST_HEDGE_AFTER", 0))
+
+# Разбиение запросов к API на сегменты по периодам публикации (и регионам
+# INGEST_SHARD_AREAS через запятую для самых коротких периодов), чтобы
+# загружать больше ограничения API на количество результатов.
+# INGEST_SHARD_MIN_WINDOW - минимальная длина периода сегмента в секундах.
+INGEST_SHARDING = os.getenv("INGEST_SHARDING", "True").lower() in ("1", "true", "yes")
+INGEST_SHARD_MIN_WINDOW = int(os.getenv("INGEST_SHARD_MIN_WINDOW", 600))
+INGEST_SHARD_AREAS = [
+    area for area in os.getenv("INGEST_SHARD_AREAS", "").split(",") if area
+]
+INGEST_SHARD_CONCURRENCY = int(os.getenv("INGEST_SHARD_CONCURRENCY", 4))
+
+# Запись вакансий в PostgreSQL командой COPY через промежуточную таблицу
+# (см. parser.bulk) для пакетов от INGEST_COPY_MIN_ROWS вакансий. В остальных
+# случаях и в SQLite вакансии записываются bulk_create.
+INGEST_COPY = os.getenv("INGEST_COPY", "True").lower() in ("1", "true", "yes")
+INGEST_COPY_MIN_ROWS = int(os.getenv("INGEST_COPY_MIN_ROWS", 1000))
+
+# Декодирование ответов API: "schema" - по схемам сайтов на msgspec
+# (если установлен) только с нужными парсерам полями, "json" - модулем json.
+API_DECODER = os.getenv("API_DECODER", "schema")
+
+# Поиск дубликатов вакансий между сайтами по названию, компании и городу
+# и SimHash описания (см. parser.dedup). Вакансии сравниваются с сохраненными
+# за DEDUP_WINDOW_DAYS дней, описания считаются одинаковыми, если SimHash
+# отличается не больше чем в DEDUP_SIMHASH_DISTANCE битах.
+# DEDUP_COLLAPSE_RESULTS скрывает дубликаты в результатах поиска.
+DEDUP_ENABLED = os.getenv("DEDUP_ENABLED", "True").lower() in ("1", "true", "yes")
+DEDUP_WINDOW_DAYS = int(os.getenv("DEDUP_WINDOW_DAYS", 7))
+DEDUP_SIMHASH_DISTANCE = int(os.getenv("DEDUP_SIMHASH_DISTANCE", 3))
+DEDUP_COLLAPSE_RESULTS = os.getenv("DEDUP_COLLAPSE_RESULTS", "True").lower() in (
+    "1",
+    "true",
+    "yes",
+)
 
 settings_dir = os.path.dirname(os.path.abspath(__file__))
 job_parser_dir = os.path.join(settings_dir, "..")
 
-HUEY = {
-    "huey_class": "huey.SqliteHuey",
-    "filename": os.path.join(job_parser_dir, "huey.db"),
-    "immediate": False,
+# Cache
+REDIS_HOST = os.getenv("REDIS_HOST")
+REDIS_PORT = os.getenv("REDIS_PORT", 6379)
+
+# Воркеры huey: thread или greenlet. Для greenlet стандартная библиотека
+# патчится gevent при запуске run_huey в manage.py.
+# Блокировки задач huey не истекают: блокировка воркера, завершенного во время
+# задачи, останавливает периодическую задачу, пока ее не сбросить. HUEY_FLUSH_LOCKS
+# сбрасывает все блокировки при запуске потребителя и допустим только
+# с единственным потребителем: новый потребитель сбросил бы блокировки
+# работающих, и периодическая задача выполнилась бы дважды.
+HUEY_WORKERS = int(os.getenv("HUEY_WORKERS", 4))
+HUEY_WORKER_TYPE = os.getenv("HUEY_WORKER_TYPE", "thread")
+HUEY_FLUSH_LOCKS = os.getenv("HUEY_FLUSH_LOCKS", "").lower() in ("1", "true", "yes")
+HUEY_CONSUMER = {
+    "workers": HUEY_WORKERS,
+    "worker_type": HUEY_WORKER_TYPE,
+    "periodic": True,
+    "flush_locks": HUEY_FLUSH_LOCKS,
 }
 
+if REDIS_HOST:
+    HUEY = {
+        "huey_class": "huey.PriorityRedisHuey",
+        "name": "job_parser",
+        "immediate": False,
+        "connection": {
+            "host": REDIS_HOST,
+            "port": int(REDIS_PORT),
+            "db": int(os.getenv("HUEY_REDIS_DB", 1)),
+        },
+        "consumer": HUEY_CONSUMER,
+    }
+else:
+    HUEY = {
+        "huey_class": "huey.SqliteHuey",
+        "filename": os.path.join(job_parser_dir, "huey.db"),
+        "immediate": False,
+        "consumer": HUEY_CONSUMER,
+    }
+
+if REDIS_HOST:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": f"redis://{REDIS_HOST}:{REDIS_PORT}",
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# Без Redis кеш Django локален для процесса: версии подписок и пользовательских
+# списков, увеличенные в одном процессе, не видны остальным веб-процессам
+# и воркерам huey. Поэтому в локальном кеше версии истекают через
+# LOCAL_CACHE_VERSION_TIMEOUT секунд и данные строятся заново не реже этого
+# интервала. В общем кеше Redis версии не истекают.
+CACHE_VERSION_TIMEOUT = (
+    None if REDIS_HOST else int(os.getenv("LOCAL_CACHE_VERSION_TIMEOUT", 30))
+)
+
+# Кеш пользовательских списков
+PREFERENCE_CACHE_SIZE = int(os.getenv("PREFERENCE_CACHE_SIZE", 1024))
+PREFERENCE_CACHE_TIMEOUT = int(os.getenv("PREFERENCE_CACHE_TIMEOUT", 60 * 60 * 24))
+
+# Индексы вакансий в памяти веб-процесса (см. parser.indexes): версия вакансий
+# в кеше проверяется не чаще раза в VACANCY_INDEX_CHECK_SECONDS секунд,
+# индекс строится заново не реже раза в VACANCY_INDEX_REBUILD_SECONDS секунд.
+VACANCY_INDEX_CHECK_SECONDS = int(os.getenv("VACANCY_INDEX_CHECK_SECONDS", 5))
+VACANCY_INDEX_REBUILD_SECONDS = int(os.getenv("VACANCY_INDEX_REBUILD_SECONDS", 3600))
+# Количество подсказок для полей формы поиска по умолчанию
+AUTOCOMPLETE_LIMIT = int(os.getenv("AUTOCOMPLETE_LIMIT", 10))
+
 # Sending emails
-EMAIL_HOST = os.getenv("EMAIL_HOST")
-EMAIL_PORT = os.getenv("EMAIL_PORT")
-EMAIL_HOST_USER = os.getenv("EMAIL_HOST_USER")
-EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD")
-EMAIL_USE_TLS = os.getenv("EMAIL_USE_TLS")
-SERVER_EMAIL = EMAIL_HOST_USER
-DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
+EMAIL_BACKEND = os.getenv(
+    "EMAIL_BACKEND", "django.core.mail.backends.smtp.EmailBackend"
+)
+EMAIL_HOST = os.getenv("EMAIL_HOST", "localhost")
+EMAIL_PORT = int(os.getenv("EMAIL_PORT", 25))
+EMAIL_HOST_USER = os.getenv("EMAIL_HOST_USER", "")
+EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD", "")
+EMAIL_USE_TLS = os.getenv("EMAIL_USE_TLS", "False").lower() in ("1", "true", "yes")
+EMAIL_USE_SSL = os.getenv("EMAIL_USE_SSL", "False").lower() in ("1", "true", "yes")
+EMAIL_TIMEOUT = int(os.getenv("EMAIL_TIMEOUT", 30))
+# Количество писем, отправляемых через одно SMTP-соединение
+EMAIL_BATCH_SIZE = int(os.getenv("EMAIL_BATCH_SIZE", 100))
+DEFAULT_FROM_EMAIL = os.getenv(
+    "DEFAULT_FROM_EMAIL", EMAIL_HOST_USER or "webmaster@localhost"
+)
+SERVER_EMAIL = DEFAULT_FROM_EMAIL
 
 
 LOGGING_CONFIG = None
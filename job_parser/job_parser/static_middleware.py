@@ -0,0 +1,46 @@
+import asyncio
+from typing import Any, Callable
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpRequest
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+
+class StaticFilesMiddleware(WhiteNoiseMiddleware):
+    """Промежуточное ПО whitenoise для раздачи статических файлов.
+
+    `WhiteNoiseMiddleware` поддерживает только синхронную обработку, поэтому
+    под ASGI Django переводит в синхронный режим всю цепочку middleware
+    и каждое асинхронное представление выполняется в отдельном потоке.
+    Этот класс поддерживает и асинхронную обработку: поиск файла без
+    `WHITENOISE_AUTOREFRESH` - это поиск в словаре, который не блокирует
+    цикл событий, поэтому остальные запросы передаются дальше без потоков.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable, settings: Any = settings) -> None:
+        super().__init__(get_response, settings)
+        if asyncio.iscoroutinefunction(get_response):
+            # Так же, как в `MiddlewareMixin`: Django проверяет асинхронность
+            # экземпляра через asyncio.iscoroutinefunction.
+            self._is_coroutine = asyncio.coroutines._is_coroutine  # type: ignore
+        else:
+            self._is_coroutine = None
+
+    def __call__(self, request: HttpRequest) -> Any:
+        if self._is_coroutine:
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request: HttpRequest) -> Any:
+        """Асинхронная версия `__call__` для асинхронной цепочки middleware."""
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return self.serve(static_file, request)
+        return await self.get_response(request)
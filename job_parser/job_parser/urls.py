@@ -11,9 +11,10 @@ urlpatterns = [
 ]
 
 
-if settings.DEBUG:
+if settings.DEBUG_TOOLBAR:
     urlpatterns = [
         path("__debug__/", include("debug_toolbar.urls")),
     ] + urlpatterns
 
+if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
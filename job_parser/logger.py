@@ -1,36 +1,96 @@
 import os
 import sys
+import threading
+import time
 
 from loguru import logger
 
+# Процесс, в котором логирование уже настроено.
+_configured_pid: int | None = None
+_lock = threading.Lock()
+
+# Минимальный интервал между сообщениями с одним ключом в `log_throttled`.
+THROTTLE_SECONDS = float(os.getenv("LOG_THROTTLE_SECONDS", 1))
+
+# Время последней записи и количество пропущенных сообщений по ключам
+# для `log_throttled`.
+_throttle: dict[str, tuple[float, int]] = {}
+
+
+def env_flag(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.lower() in ("1", "true", "yes")
+
 
 def setup_logging() -> None:
     """Настройка логирования.
 
     Функция настраивает логирование для записи в файл и вывода в консоль.
     Файл лога называется 'parser_views.json' и находится в папке 'logs'.
-    Логирование в файл происходит с уровнем 'ERROR', а в консоль - с уровнем 'TRACE'.
+    Уровни берутся из переменных окружения `LOG_FILE_LEVEL` (по умолчанию
+    'ERROR') и `LOG_LEVEL` (по умолчанию 'INFO').
+
+    Функцию вызывают многие модули при импорте, но настройка выполняется
+    один раз в процессе, остальные вызовы ничего не делают. После fork
+    дочерний процесс настраивает логирование заново. С `LOG_ENQUEUE`
+    (по умолчанию включено) сообщения форматируются и записываются
+    в отдельном потоке, а не в потоке, который их отправил.
+    """
+    global _configured_pid
+    if _configured_pid == os.getpid():
+        return
+    with _lock:
+        if _configured_pid == os.getpid():
+            return
+        log_filename = "parser_views.json"
+        log_path = os.path.join(
+            os.path.dirname(os.path.abspath(__file__)), "..", "logs", log_filename
+        )
+        enqueue = env_flag("LOG_ENQUEUE", True)
+
+        logger.remove()
+        logger.add(
+            log_path,
+            format="ВРЕМЯ {time:MMMM D, YYYY > HH:mm:ss!UTC} | ТИП {level} | СООБЩЕНИЕ {message} | {extra}",
+            level=os.getenv("LOG_FILE_LEVEL", "ERROR"),
+            backtrace=False,
+            diagnose=False,
+            serialize=True,
+            enqueue=enqueue,
+        )
+        logger.add(
+            sys.stderr,
+            colorize=env_flag("LOG_COLORIZE", sys.stderr.isatty()),
+            format="<yellow><level>ВРЕМЯ</level> {time:MMMM D, YYYY > HH:mm:ss!UTC}</yellow>  | <fg #4eff33><level>ТИП</level> {level}</fg #4eff33> | <blue><level>СООБЩЕНИЕ</level> {message}</blue> | <fg #8bfcda>{extra}</fg #8bfcda>",
+            level=os.getenv("LOG_LEVEL", "INFO"),
+            backtrace=False,
+            diagnose=False,
+            enqueue=enqueue,
+        )
+        _configured_pid = os.getpid()
+
+
+def log_throttled(key: str, level: str, message: str, *args, **kwargs) -> None:
+    """Записывает сообщение не чаще одного раза в `LOG_THROTTLE_SECONDS`.
+
+    Предназначена для сообщений о каждом элементе в циклах загрузки:
+    сообщения с одним ключом, отправленные чаще интервала, пропускаются,
+    а к следующему записанному добавляется количество пропущенных.
+    Аргументы форматируются только для записываемых сообщений.
 
+    Args:
+        key (str): Ключ сообщения.
+        level (str): Уровень сообщения.
+        message (str): Шаблон сообщения в формате `str.format`.
     """
-    log_filename = "parser_views.json"
-    log_path = os.path.join(
-        os.path.dirname(os.path.abspath(__file__)), "..", "logs", log_filename
-    )
-
-    logger.remove()
-    logger.add(
-        log_path,
-        format="ВРЕМЯ {time:MMMM D, YYYY > HH:mm:ss!UTC} | ТИП {level} | СООБЩЕНИЕ {message} | {extra}",
-        level="ERROR",
-        backtrace=False,
-        diagnose=False,
-        serialize=True,
-    )
-    logger.add(
-        sys.stderr,
-        colorize=True,
-        format="<yellow><level>ВРЕМЯ</level> {time:MMMM D, YYYY > HH:mm:ss!UTC}</yellow>  | <fg #4eff33><level>ТИП</level> {level}</fg #4eff33> | <blue><level>СООБЩЕНИЕ</level> {message}</blue> | <fg #8bfcda>{extra}</fg #8bfcda>",
-        level="TRACE",
-        backtrace=False,
-        diagnose=False,
-    )
+    now = time.monotonic()
+    last, skipped = _throttle.get(key, (float("-inf"), 0))
+    if now - last < THROTTLE_SECONDS:
+        _throttle[key] = (last, skipped + 1)
+        return
+    _throttle[key] = (now, 0)
+    if skipped:
+        message = f"{message} (пропущено похожих сообщений: {skipped})"
+    logger.opt(depth=1).log(level, message, *args, **kwargs)
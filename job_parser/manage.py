@@ -4,8 +4,23 @@ import os
 import sys
 
 
+def uses_greenlet_workers(argv: list[str]) -> bool:
+    """Check whether the huey consumer is started with greenlet workers."""
+    if "run_huey" not in argv:
+        return False
+    for flag in ("-k", "--worker-type"):
+        if flag in argv[:-1]:
+            return argv[argv.index(flag) + 1] == "greenlet"
+    return os.getenv("HUEY_WORKER_TYPE") == "greenlet"
+
+
 def main():
     """Run administrative tasks."""
+    if uses_greenlet_workers(sys.argv):
+        # gevent must patch the standard library before anything opens sockets.
+        from gevent import monkey
+
+        monkey.patch_all()
     os.environ.setdefault("DJANGO_SETTINGS_MODULE", "job_parser.settings")
     try:
         from django.core.management import execute_from_command_line
@@ -21,6 +21,7 @@ class VacanciesAdmin(admin.ModelAdmin):
         "remote",
         "published_at",
     )
+    readonly_fields = ("description",)
 
 
 @admin.register(UserVacancies)
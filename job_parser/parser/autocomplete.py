@@ -0,0 +1,132 @@
+import heapq
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from parser.indexes import VacancyIndex
+from typing import Iterable
+
+# Поля формы поиска с подсказками.
+FIELDS: tuple[str, ...] = ("title", "city", "company")
+
+# Для префиксов до этой длины лучшие подсказки вычисляются при построении
+# индекса: им соответствует слишком много терминов, чтобы выбирать лучшие
+# при каждом запросе.
+SHORT_PREFIX = 3
+
+# Количество подсказок, которое хранится для коротких префиксов.
+MAX_LIMIT = 20
+
+
+def normalize(value: str | None) -> str:
+    """Приводит термин к виду для сравнения: без регистра и лишних пробелов."""
+    return " ".join((value or "").split()).casefold().replace("ё", "е")
+
+
+def term_keys(key: str) -> Iterable[str]:
+    """Ключи термина: он сам и его окончания с начала каждого слова."""
+    words = key.split(" ")
+    for start in range(len(words)):
+        yield " ".join(words[start:])
+
+
+@dataclass
+class PrefixIndex:
+    """
+    Префиксный индекс терминов одного поля.
+
+    Ключи терминов хранятся в отсортированном массиве, поэтому термины
+    с заданным префиксом занимают в нем непрерывный отрезок, который
+    находится двоичным поиском. Термин входит в индекс и окончаниями
+    с каждого слова: "python разработчик" находится и по "разр". Подсказки
+    упорядочены по популярности - количеству вакансий с термином.
+
+    Attributes:
+        counts (dict[str, int]): Количество вакансий по ключам терминов.
+        labels (dict[str, str]): Написание терминов по ключам.
+    """
+
+    counts: dict[str, int]
+    labels: dict[str, str]
+    keys: list[str] = field(init=False, repr=False)
+    terms: list[str] = field(init=False, repr=False)
+    top: dict[str, list[str]] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        pairs = sorted((key, term) for term in self.counts for key in term_keys(term))
+        self.keys = [key for key, _ in pairs]
+        self.terms = [term for _, term in pairs]
+        self.top = {}
+        for length in range(1, SHORT_PREFIX + 1):
+            groups: dict[str, set[str]] = {}
+            for key, term in pairs:
+                if len(key) >= length:
+                    groups.setdefault(key[:length], set()).add(term)
+            for prefix, terms in groups.items():
+                self.top[prefix] = self.best(terms, MAX_LIMIT)
+
+    def best(self, terms: Iterable[str], limit: int) -> list[str]:
+        return heapq.nlargest(limit, terms, key=lambda term: (self.counts[term], term))
+
+    def search(self, prefix: str, limit: int) -> list[tuple[str, int]]:
+        """
+        Возвращает самые популярные термины с префиксом.
+
+        Args:
+            prefix (str): Нормализованный префикс.
+            limit (int): Количество подсказок.
+
+        Returns:
+            list[tuple[str, int]]: Термины и количество вакансий с ними.
+        """
+        if len(prefix) <= SHORT_PREFIX:
+            terms = self.top.get(prefix, [])[:limit]
+        else:
+            start = bisect_left(self.keys, prefix)
+            end = bisect_left(self.keys, prefix + "\U0010ffff", start)
+            terms = self.best(set(self.terms[start:end]), limit)
+        return [(self.labels[term], self.counts[term]) for term in terms]
+
+
+class AutocompleteIndex(VacancyIndex):
+    """
+    Подсказки для полей формы поиска по названиям, городам и компаниям
+    вакансий (см. `PrefixIndex`).
+
+    Индекс хранится в памяти процесса и обновляется после записи вакансий
+    (см. `VacancyIndex`), поэтому подсказки не обращаются к базе данных.
+    """
+
+    fields = FIELDS
+
+    def apply(
+        self, state: dict[str, PrefixIndex] | None, rows: Iterable[tuple]
+    ) -> dict[str, PrefixIndex]:
+        counts = {name: dict(state[name].counts) if state else {} for name in FIELDS}
+        labels = {name: dict(state[name].labels) if state else {} for name in FIELDS}
+        for _, *values in rows:
+            for name, value in zip(FIELDS, values):
+                key = normalize(value)
+                if not key:
+                    continue
+                counts[name][key] = counts[name].get(key, 0) + 1
+                labels[name].setdefault(key, " ".join(value.split()))
+        return {name: PrefixIndex(counts[name], labels[name]) for name in FIELDS}
+
+    def suggest(self, field: str, query: str, limit: int) -> list[tuple[str, int]]:
+        """
+        Возвращает подсказки для поля формы.
+
+        Args:
+            field (str): Поле: "title", "city" или "company".
+            query (str): Введенный текст.
+            limit (int): Количество подсказок, не больше `MAX_LIMIT`.
+
+        Returns:
+            list[tuple[str, int]]: Подсказки и количество вакансий с ними.
+        """
+        prefix = normalize(query)
+        if not prefix or self.state is None:
+            return []
+        return self.state[field].search(prefix, min(limit, MAX_LIMIT))
+
+
+autocomplete_index = AutocompleteIndex()
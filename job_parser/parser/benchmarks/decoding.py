@@ -0,0 +1,217 @@
+import json
+import random
+import time
+import tracemalloc
+from parser.benchmarks.report import Measurement
+from parser.parsing.decoders import SCHEMAS, JsonDecoder, get_decoder
+from typing import Callable
+
+# Поля, которые API возвращают, но парсеры не читают. Добавляются к каждой
+# вакансии, чтобы объем ответа был близок к реальному (около 3-4 КБ
+# на вакансию HeadHunter).
+NOISE: dict = {
+    "premium": False,
+    "has_test": False,
+    "response_letter_required": False,
+    "type": {"id": "open", "name": "Открытая"},
+    "address": {
+        "city": "Москва",
+        "street": "Ленинградский проспект",
+        "building": "39с79",
+        "lat": 55.79,
+        "lng": 37.53,
+        "metro_stations": [
+            {"station_name": "Динамо", "line_name": "Замоскворецкая", "lat": 55.78}
+        ],
+    },
+    "snippet": {
+        "requirement": "Опыт коммерческой разработки на Python от 2 лет. " * 3,
+        "responsibility": "Разработка и поддержка сервисов, участие в код-ревью. " * 3,
+    },
+    "contacts": None,
+    "working_days": [],
+    "working_time_intervals": [],
+    "professional_roles": [{"id": "96", "name": "Программист, разработчик"}],
+    "accept_incomplete_resumes": False,
+    "department": None,
+    "relations": [],
+    "apply_alternate_url": "https://hh.ru/applicant/vacancy_response?vacancyId=1",
+    "url": "https://api.hh.ru/vacancies/1?host=hh.ru",
+}
+
+
+def hh_vacancy(num: int, rnd: random.Random) -> dict:
+    return {
+        "id": str(num),
+        "name": f"Python разработчик {num}",
+        "alternate_url": f"https://hh.ru/vacancy/{num}",
+        "salary": {
+            "from": rnd.randrange(50_000, 200_000, 5_000),
+            "to": None,
+            "currency": "RUR",
+            "gross": False,
+        },
+        "area": {"id": "1", "name": "Москва", "url": "https://api.hh.ru/areas/1"},
+        "employer": {
+            "id": str(rnd.randrange(1, 10_000)),
+            "name": "Тестовая компания",
+            "url": "https://api.hh.ru/employers/1",
+            "logo_urls": {"90": "https://hh.ru/logo90.png"},
+            "trusted": True,
+        },
+        "employment": {"id": "full", "name": "Полная занятость"},
+        "experience": {"id": "between1And3", "name": "От 1 года до 3 лет"},
+        "published_at": "2023-05-01T10:00:00+0300",
+        "created_at": "2023-05-01T10:00:00+0300",
+        **NOISE,
+    }
+
+
+def sj_vacancy(num: int, rnd: random.Random) -> dict:
+    return {
+        "id": num,
+        "link": f"https://www.superjob.ru/vakansii/{num}.html",
+        "profession": f"Python разработчик {num}",
+        "payment_from": rnd.randrange(50_000, 200_000, 5_000),
+        "payment_to": 0,
+        "currency": "rub",
+        "vacancyRichText": "<p>Разработка и поддержка сервисов.</p>" * 10,
+        "town": {"id": 4, "title": "Москва", "declension": "в Москве"},
+        "firm_name": "Тестовая компания",
+        "place_of_work": {"id": 1, "title": "Офис"},
+        "type_of_work": {"id": 6, "title": "Полный рабочий день"},
+        "experience": {"id": 2, "title": "От 1 года"},
+        "date_published": 1682924400,
+        **NOISE,
+    }
+
+
+def tv_vacancy(num: int, rnd: random.Random) -> dict:
+    return {
+        "vacancy": {
+            "id": str(num),
+            "vac_url": f"https://trudvsem.ru/vacancy/card/{num}",
+            "job-name": f"Python разработчик {num}",
+            "salary_min": rnd.randrange(50_000, 200_000, 5_000),
+            "salary_max": 0,
+            "duty": "<p>Разработка и поддержка сервисов.</p>" * 10,
+            "addresses": {"address": [{"location": "г. Москва, ул. Тверская"}]},
+            "company": {"name": "Тестовая компания", "inn": "7700000000"},
+            "employment": "Полная занятость",
+            "schedule": "Полный рабочий день",
+            "requirement": {"experience": 1, "education": "Высшее"},
+            **NOISE,
+        }
+    }
+
+
+def page_payload(job_board: str, size: int, seed: int = 0) -> bytes:
+    """
+    Формирует страницу списка вакансий в формате API сайта.
+
+    Args:
+        job_board (str): Название сайта поиска работы.
+        size (int): Количество вакансий на странице.
+        seed (int): Начальное значение генератора случайных чисел.
+
+    Returns:
+        bytes: Тело ответа API.
+    """
+    rnd = random.Random(seed)
+    if job_board == "SuperJob":
+        page = {"objects": [sj_vacancy(num, rnd) for num in range(size)], "more": True}
+    elif job_board == "Trudvsem":
+        vacancies = [tv_vacancy(num, rnd) for num in range(size)]
+        page = {
+            "status": "200",
+            "meta": {"total": size},
+            "results": {"vacancies": vacancies},
+        }
+    else:
+        items = [hh_vacancy(num, rnd) for num in range(size)]
+        page = {"items": items, "found": size, "pages": 1, "page": 0, "per_page": size}
+    return json.dumps(page, ensure_ascii=False).encode()
+
+
+def decode_str(content: bytes) -> dict:
+    """Прежнее декодирование: строка из байтов, затем `json.loads`."""
+    return json.loads(content.decode())
+
+
+class DecodingBenchmark:
+    """
+    Замеры декодирования страниц списка вакансий.
+
+    Для каждого сайта сравниваются прежнее декодирование через строку
+    (`str`), `json.loads` от байтов (`bytes`) и декодер сайта (`board`),
+    который с установленным msgspec декодирует по схеме только нужные
+    парсерам поля. Время замеряется без трассировки памяти, пиковая
+    и оставшаяся после декодирования память - отдельным прогоном
+    с `tracemalloc`.
+
+    Attributes:
+        repeat (int): Количество замеряемых прогонов.
+        size (int): Количество вакансий на странице.
+    """
+
+    def __init__(self, repeat: int, size: int = 100) -> None:
+        self.repeat = repeat
+        self.size = size
+
+    @staticmethod
+    def memory(decode: Callable[[bytes], dict], content: bytes) -> tuple[int, int]:
+        """
+        Замеряет память одного декодирования.
+
+        Returns:
+            tuple[int, int]: Пиковая память и память, занятая результатом, в байтах.
+        """
+        tracemalloc.start()
+        data = decode(content)
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del data
+        return peak, retained
+
+    def measure(
+        self, name: str, decode: Callable[[bytes], dict], content: bytes
+    ) -> Measurement:
+        decode(content)
+        measurement = Measurement(name)
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            decode(content)
+            measurement.timings.append(time.perf_counter() - start)
+            measurement.queries.append(0)
+        peak, retained = self.memory(decode, content)
+        measurement.extra["peak_kb"] = round(peak / 1024, 1)
+        measurement.extra["retained_kb"] = round(retained / 1024, 1)
+        return measurement
+
+    def run(self, boards: list[str] | None = None) -> list[Measurement]:
+        """
+        Замеряет декодирование для переданных сайтов.
+
+        Args:
+            boards (list[str] | None): Названия сайтов, по умолчанию все
+            сайты со схемами.
+
+        Returns:
+            list[Measurement]: Результаты замеров, память в `extra`.
+        """
+        measurements = []
+        for board in boards or list(SCHEMAS):
+            content = page_payload(board, self.size)
+            decoder = get_decoder(board)
+            variants: dict[str, Callable[[bytes], dict]] = {
+                "str": decode_str,
+                "bytes": JsonDecoder().decode,
+                "board": decoder.decode,
+            }
+            for variant, decode in variants.items():
+                measurement = self.measure(f"{board}/{variant}", decode, content)
+                if variant == "board":
+                    measurement.extra["decoder"] = type(decoder).__name__
+                measurement.extra["payload_kb"] = round(len(content) / 1024, 1)
+                measurements.append(measurement)
+        return measurements
@@ -0,0 +1,241 @@
+import asyncio
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from parser.benchmarks.report import percentile
+from parser.benchmarks.server import ApiFixtureServer
+from parser.models import Vacancies
+from parser.parsing.config import ParserConfig
+from parser.parsing.db import Database
+from parser.parsing.parsers.base import Vacancy
+from parser.parsing.replay import ReplayWebClient
+
+from django.db import connections
+
+# Префиксы площадок совпадают с префиксами атрибутов `ParserConfig`.
+BOARDS: tuple[str, ...] = ("hh", "zp", "sj", "tv")
+
+
+class TimedDatabase(Database):
+    """
+    Запись вакансий в базу данных с замером времени.
+
+    Attributes:
+        elapsed (float): Суммарное время записи в секундах.
+        written (int): Количество переданных на запись вакансий.
+        created (set[str]): URL-адреса вакансий, которых не было в базе
+        данных до записи.
+    """
+
+    def __init__(self) -> None:
+        self.elapsed = 0.0
+        self.written = 0
+        self.created: set[str] = set()
+
+    async def record(self, vacancy_data: list[Vacancy]) -> None:
+        urls = {vacancy.url for vacancy in vacancy_data if vacancy.url}
+        existing = Vacancies.objects.filter(url__in=urls).values_list("url", flat=True)
+        new = urls.difference([url async for url in existing])
+        start = time.perf_counter()
+        await super().record(vacancy_data)
+        self.elapsed += time.perf_counter() - start
+        self.written += len(vacancy_data)
+        self.created.update(new)
+
+
+class DryRunDatabase(Database):
+    """Заглушка базы данных, используется при записи фикстур."""
+
+    async def record(self, vacancy_data: list[Vacancy]) -> None:
+        return None
+
+
+@dataclass
+class ParseRun:
+    """
+    Результаты одного прогона парсера.
+
+    Attributes:
+        elapsed (float): Время прогона в секундах.
+        items (int): Количество обработанных вакансий.
+        requests (int): Количество запросов к API.
+        db_elapsed (float): Время записи в базу данных в секундах.
+        peak_memory (int): Пиковый объем выделенной памяти в байтах.
+    """
+
+    elapsed: float
+    items: int
+    requests: int
+    db_elapsed: float
+    peak_memory: int = 0
+
+
+@dataclass
+class ParserBenchmarkResult:
+    """
+    Результаты замеров одной площадки.
+
+    Attributes:
+        board (str): Префикс площадки.
+        runs (list[ParseRun]): Прогоны без трассировки памяти.
+        peak_memory (int): Пиковый объем памяти отдельного прогона в байтах.
+        errors (int): Количество искусственных ошибок сервера.
+        misses (int): Количество запросов без записанного ответа.
+    """
+
+    board: str
+    runs: list[ParseRun] = field(default_factory=list)
+    peak_memory: int = 0
+    errors: int = 0
+    misses: int = 0
+
+    def to_dict(self) -> dict:
+        elapsed = percentile([run.elapsed for run in self.runs], 50)
+        items = self.runs[-1].items if self.runs else 0
+        return {
+            "board": self.board,
+            "items": items,
+            "requests": self.runs[-1].requests if self.runs else 0,
+            "p50_s": round(elapsed, 3),
+            "items_per_s": round(items / elapsed, 1) if elapsed else 0.0,
+            "db_write_ms": round(
+                percentile([run.db_elapsed for run in self.runs], 50) * 1000, 1
+            ),
+            "peak_mb": round(self.peak_memory / 2**20, 2),
+            "errors": self.errors,
+            "misses": self.misses,
+        }
+
+
+class ParserBenchmark:
+    """
+    Бенчмарк парсеров API на записанных ответах.
+
+    Запускает `Parser.parse` целиком: запросы идут через `ReplayWebClient` на
+    локальный сервер с фикстурами, вакансии записываются в базу данных. Перед
+    каждым замеряемым прогоном записанные в прогреве вакансии удаляются, чтобы
+    каждый прогон выполнял вставку, а не пропускал дубликаты. Поэтому бенчмарк
+    запускается только на тестовой базе данных, хотя вакансии, которые были
+    в базе до прогона, не удаляются.
+
+    Attributes:
+        server (ApiFixtureServer): Локальный сервер с фикстурами.
+        repeat (int): Количество замеряемых прогонов.
+        delay (bool): Сохранять ли задержки между запросами.
+    """
+
+    def __init__(
+        self, server: ApiFixtureServer, repeat: int = 3, delay: bool = False
+    ) -> None:
+        self.server = server
+        self.repeat = repeat
+        self.delay = delay
+
+    def make_config(self) -> ParserConfig:
+        config = ParserConfig()
+        config.use_client(ReplayWebClient(config, self.server.base_url))
+        for fetcher in config.fetchers:
+            fetcher.delay = self.delay
+        return config
+
+    def parse(self, board: str, trace_memory: bool = False) -> ParseRun:
+        """
+        Выполняет один прогон парсера площадки.
+
+        Args:
+            board (str): Префикс площадки.
+            trace_memory (bool): Замерять ли пиковый объем памяти.
+
+        Returns:
+            ParseRun: Результаты прогона.
+        """
+        config = self.make_config()
+        config.db = database = TimedDatabase()
+        parser = getattr(config, f"{board}_parser")
+        requests = self.server.stats.requests
+
+        if trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        asyncio.run(parser.parse())
+        elapsed = time.perf_counter() - start
+        peak = 0
+        if trace_memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        connections.close_all()
+        self.cleanup(database.created)
+        return ParseRun(
+            elapsed,
+            database.written,
+            self.server.stats.requests - requests,
+            database.elapsed,
+            peak,
+        )
+
+    def cleanup(self, urls: set[str]) -> None:
+        """
+        Удаляет вакансии, созданные во время прогона.
+
+        Вакансии, которые были в базе данных до прогона, не удаляются.
+
+        Args:
+            urls (set[str]): URL-адреса созданных вакансий.
+        """
+        created = sorted(urls)
+        for start in range(0, len(created), 500):
+            Vacancies.objects.filter(url__in=created[start : start + 500]).delete()
+
+    def run(self, boards: list[str]) -> list[ParserBenchmarkResult]:
+        """
+        Запускает замеры для переданных площадок.
+
+        Сначала выполняется прогревочный прогон, затем `repeat` замеряемых
+        прогонов и отдельный прогон с трассировкой памяти, так как `tracemalloc`
+        заметно замедляет выполнение.
+
+        Args:
+            boards (list[str]): Префиксы площадок.
+
+        Returns:
+            list[ParserBenchmarkResult]: Результаты по площадкам.
+        """
+        results = []
+        for board in boards:
+            result = ParserBenchmarkResult(board)
+            self.parse(board)
+            errors, misses = self.server.stats.errors, self.server.stats.misses
+            for _ in range(self.repeat):
+                result.runs.append(self.parse(board))
+            result.errors = self.server.stats.errors - errors
+            result.misses = self.server.stats.misses - misses
+            result.peak_memory = self.parse(board, trace_memory=True).peak_memory
+            results.append(result)
+        return results
+
+
+def format_results(results: list[ParserBenchmarkResult]) -> str:
+    """
+    Форматирует результаты бенчмарка парсеров в текстовую таблицу.
+
+    Args:
+        results (list[ParserBenchmarkResult]): Результаты по площадкам.
+
+    Returns:
+        str: Таблица для вывода в консоль.
+    """
+    header = (
+        f"{'площадка':<9} {'вакансий':>9} {'запросов':>9} {'p50, с':>8} "
+        f"{'вак./с':>9} {'запись БД, мс':>14} {'пик, МБ':>8} {'ошибок':>7} "
+        f"{'промахов':>9}"
+    )
+    lines = [header, "-" * len(header)]
+    for result in results:
+        row = result.to_dict()
+        lines.append(
+            f"{row['board']:<9} {row['items']:>9} {row['requests']:>9} "
+            f"{row['p50_s']:>8.3f} {row['items_per_s']:>9.1f} "
+            f"{row['db_write_ms']:>14.1f} {row['peak_mb']:>8.2f} "
+            f"{row['errors']:>7} {row['misses']:>9}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,237 @@
+import json
+import math
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+from django.db import connection
+from django.db.backends.signals import connection_created
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """
+    Вычисляет перцентиль с линейной интерполяцией между соседними значениями.
+
+    Args:
+        values (list[float]): Измеренные значения.
+        pct (float): Перцентиль от 0 до 100.
+
+    Returns:
+        float: Значение перцентиля или 0, если значений нет.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = math.floor(rank)
+    high = math.ceil(rank)
+    if low == high:
+        return ordered[low]
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+class QueryCounter:
+    """
+    Счетчик SQL-запросов.
+
+    В отличие от `CaptureQueriesContext` не сохраняет текст запросов и не
+    включает отладочный курсор, поэтому почти не влияет на замеры. Учитывает
+    и соединения, открытые во время замера: асинхронные представления работают
+    в отдельном контексте и получают собственное соединение с базой данных.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self._connections: list = []
+
+    def __call__(
+        self, execute: Callable, sql: str, params: Any, many: bool, context: dict
+    ) -> Any:
+        self.count += 1
+        return execute(sql, params, many, context)
+
+    def __enter__(self) -> "QueryCounter":
+        self.count = 0
+        self._install(connection)
+        connection_created.connect(self._on_connection_created, weak=False)
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        connection_created.disconnect(self._on_connection_created)
+        for conn in self._connections:
+            conn.execute_wrappers.remove(self)
+        self._connections.clear()
+
+    def _install(self, conn: Any) -> None:
+        if self not in conn.execute_wrappers:
+            conn.execute_wrappers.append(self)
+            self._connections.append(conn)
+
+    def _on_connection_created(self, sender: Any, connection: Any, **kwargs) -> None:
+        self._install(connection)
+
+
+@dataclass
+class Measurement:
+    """
+    Результаты замеров одного сценария.
+
+    Attributes:
+        name (str): Название сценария в формате `этап/форма запроса`.
+        timings (list[float]): Время выполнения каждого прогона в секундах.
+        queries (list[int]): Количество SQL-запросов в каждом прогоне.
+        extra (dict): Дополнительные метрики сценария.
+    """
+
+    name: str
+    timings: list[float] = field(default_factory=list)
+    queries: list[int] = field(default_factory=list)
+    extra: dict = field(default_factory=dict)
+
+    @property
+    def p50_ms(self) -> float:
+        return percentile(self.timings, 50) * 1000
+
+    @property
+    def p95_ms(self) -> float:
+        return percentile(self.timings, 95) * 1000
+
+    @property
+    def max_queries(self) -> int:
+        return max(self.queries, default=0)
+
+    def to_dict(self) -> dict:
+        return {
+            "p50_ms": round(self.p50_ms, 3),
+            "p95_ms": round(self.p95_ms, 3),
+            "queries": self.max_queries,
+            **self.extra,
+        }
+
+
+def measure(
+    name: str, func: Callable[[], Any], repeat: int, warmup: int = 1
+) -> Measurement:
+    """
+    Многократно выполняет функцию, замеряя время и количество SQL-запросов.
+
+    Args:
+        name (str): Название сценария.
+        func (Callable[[], Any]): Замеряемая функция без аргументов.
+        repeat (int): Количество замеряемых прогонов.
+        warmup (int): Количество прогревочных прогонов, не попадающих в результат.
+
+    Returns:
+        Measurement: Результаты замеров.
+    """
+    for _ in range(warmup):
+        func()
+
+    measurement = Measurement(name)
+    for _ in range(repeat):
+        with QueryCounter() as counter:
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+        measurement.timings.append(elapsed)
+        measurement.queries.append(counter.count)
+    return measurement
+
+
+class Baseline:
+    """
+    Сохраненные эталонные результаты бенчмарка.
+
+    Файл хранится в формате JSON: в ключе `meta` описаны условия замеров
+    (объем данных, число прогонов), в ключе `results` - метрики сценариев.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.meta: dict = {}
+        self.results: dict[str, dict] = {}
+        if path.exists():
+            data = json.loads(path.read_text(encoding="utf-8"))
+            self.meta = data.get("meta", {})
+            self.results = data.get("results", {})
+
+    def save(self, measurements: list[Measurement], meta: dict) -> None:
+        """
+        Сохраняет результаты как новый эталон.
+
+        Args:
+            measurements (list[Measurement]): Результаты замеров.
+            meta (dict): Условия замеров.
+        """
+        self.meta = meta
+        self.results = {item.name: item.to_dict() for item in measurements}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(
+            json.dumps(
+                {"meta": self.meta, "results": self.results},
+                ensure_ascii=False,
+                indent=2,
+            )
+            + "\n",
+            encoding="utf-8",
+        )
+
+    def compare(self, measurements: list[Measurement], tolerance: float) -> list[dict]:
+        """
+        Сравнивает результаты с эталоном.
+
+        Регрессией считается рост p95 больше чем на `tolerance` или рост
+        количества SQL-запросов.
+
+        Args:
+            measurements (list[Measurement]): Результаты замеров.
+            tolerance (float): Допустимый относительный рост времени.
+
+        Returns:
+            list[dict]: Строки отчета со значениями, эталоном и признаком регрессии.
+        """
+        rows = []
+        for item in measurements:
+            current = item.to_dict()
+            base = self.results.get(item.name)
+            regression = False
+            if base:
+                slower = current["p95_ms"] > base["p95_ms"] * (1 + tolerance)
+                more_queries = current["queries"] > base["queries"]
+                regression = slower or more_queries
+            rows.append(
+                {
+                    "name": item.name,
+                    **current,
+                    "baseline": base,
+                    "regression": regression,
+                }
+            )
+        return rows
+
+
+def format_report(rows: list[dict]) -> str:
+    """
+    Форматирует строки отчета в текстовую таблицу.
+
+    Args:
+        rows (list[dict]): Строки отчета, полученные из `Baseline.compare`.
+
+    Returns:
+        str: Таблица для вывода в консоль.
+    """
+    header = (
+        f"{'сценарий':<36} {'p50, мс':>10} {'p95, мс':>10} {'запросы':>8} "
+        f"{'эталон p95':>11} {'эталон запр.':>13}"
+    )
+    lines = [header, "-" * len(header)]
+    for row in rows:
+        base = row["baseline"] or {}
+        mark = "  РЕГРЕССИЯ" if row["regression"] else ""
+        lines.append(
+            f"{row['name']:<36} {row['p50_ms']:>10.2f} {row['p95_ms']:>10.2f} "
+            f"{row['queries']:>8} {base.get('p95_ms', '-'):>11} "
+            f"{base.get('queries', '-'):>13}{mark}"
+        )
+    return "\n".join(lines)
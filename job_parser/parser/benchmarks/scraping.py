@@ -0,0 +1,330 @@
+import asyncio
+import datetime
+import json
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from parser.benchmarks.server import StubServer
+from parser.parsing.replay import fixture_key
+from parser.scraping.configuration import Config
+from pathlib import Path
+from typing import Iterator, Protocol
+from urllib.parse import parse_qsl, urlsplit
+
+from aiohttp import web
+
+# Префиксы скраперов совпадают с префиксами атрибутов `Config`.
+SCRAPERS: tuple[str, ...] = ("habr", "geekjob", "careerist")
+
+CORPUS_ROOT = Path(__file__).resolve().parent / "corpus"
+
+
+def url_key(url: str) -> str:
+    """Формирует ключ страницы корпуса по ее URL-адресу."""
+    parts = urlsplit(url)
+    return fixture_key(
+        parts.netloc, parts.path, parse_qsl(parts.query, keep_blank_values=True)
+    )
+
+
+class Corpus:
+    """
+    Версионированный корпус сохраненных HTML-страниц.
+
+    Каждая версия - отдельный каталог `corpus/vN`, внутри которого для каждой
+    площадки лежат HTML-файлы и `manifest.json` с их URL-адресами. Сохраненные
+    версии не изменяются, новая выборка страниц сохраняется в следующую версию,
+    чтобы результаты замеров оставались сравнимыми.
+
+    Attributes:
+        directory (Path): Каталог версии корпуса.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = Path(directory)
+        self.manifests: dict[str, dict] = {}
+        for manifest_path in sorted(self.directory.glob("*/manifest.json")):
+            manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+            self.manifests[manifest["board"]] = manifest
+        self.index = {
+            url_key(page["url"]): self.directory / board / page["file"]
+            for board, manifest in self.manifests.items()
+            for page in manifest["pages"]
+        }
+
+    @classmethod
+    def latest(cls, root: Path = CORPUS_ROOT) -> "Corpus":
+        """Возвращает последнюю версию корпуса."""
+        versions = sorted(
+            (path for path in root.glob("v*") if path.is_dir()),
+            key=lambda path: int(path.name[1:]),
+        )
+        return cls(versions[-1] if versions else root / "v1")
+
+    @classmethod
+    def next_version(cls, root: Path = CORPUS_ROOT) -> "Corpus":
+        """Возвращает пустую следующую версию корпуса."""
+        latest = cls.latest(root)
+        if not latest.manifests:
+            return latest
+        return cls(root / f"v{int(latest.directory.name[1:]) + 1}")
+
+    @property
+    def version(self) -> str:
+        return self.directory.name
+
+    def add(self, board: str, kind: str, url: str, html: str) -> None:
+        """
+        Добавляет страницу в корпус.
+
+        Args:
+            board (str): Префикс площадки.
+            kind (str): Тип страницы: `listing` или `vacancy`.
+            url (str): URL-адрес страницы.
+            html (str): HTML-код страницы.
+        """
+        manifest = self.manifests.setdefault(
+            board,
+            {
+                "board": board,
+                "version": self.version,
+                "saved_at": datetime.datetime.now().isoformat(timespec="seconds"),
+                "pages": [],
+            },
+        )
+        number = sum(1 for page in manifest["pages"] if page["kind"] == kind) + 1
+        file_name = f"{kind}-{number}.html"
+        path = self.directory / board / file_name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(html, encoding="utf-8")
+        manifest["pages"].append({"kind": kind, "url": url, "file": file_name})
+        self.index[url_key(url)] = path
+
+    def save(self) -> None:
+        """Сохраняет манифесты площадок."""
+        for board, manifest in self.manifests.items():
+            path = self.directory / board / "manifest.json"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(
+                json.dumps(manifest, ensure_ascii=False, indent=2) + "\n",
+                encoding="utf-8",
+            )
+
+    def pages(self, board: str, kind: str) -> Iterator[tuple[str, str]]:
+        """
+        Возвращает страницы площадки указанного типа.
+
+        Args:
+            board (str): Префикс площадки.
+            kind (str): Тип страницы: `listing` или `vacancy`.
+
+        Yields:
+            tuple[str, str]: HTML-код и URL-адрес страницы.
+        """
+        manifest = self.manifests.get(board, {"pages": []})
+        for page in manifest["pages"]:
+            if page["kind"] == kind:
+                path = self.directory / board / page["file"]
+                yield path.read_text(encoding="utf-8"), page["url"]
+
+
+class PageServer(Protocol):
+    """Локальный сервер, на который `ScraperBenchmark` направляет запросы."""
+
+    def rewrite(self, url: str) -> str:
+        ...
+
+
+@dataclass
+class CorpusServer(StubServer):
+    """
+    Сервер, отдающий страницы корпуса вместо сайтов площадок.
+
+    Как и для API, хост сайта передается первым сегментом пути.
+
+    Attributes:
+        corpus (Corpus): Корпус страниц.
+    """
+
+    corpus: Corpus = field(kw_only=True)
+
+    def resolve(self, request: web.Request) -> web.Response | None:
+        host, _, path = request.path.lstrip("/").partition("/")
+        key = fixture_key(host, f"/{path}", list(request.query.items()))
+        page = self.corpus.index.get(key)
+        if page is None:
+            return None
+        return web.Response(
+            text=page.read_text(encoding="utf-8"), content_type="text/html"
+        )
+
+    def rewrite(self, url: str) -> str:
+        """Заменяет адрес сайта на адрес локального сервера."""
+        parts = urlsplit(url)
+        query = f"?{parts.query}" if parts.query else ""
+        return f"{self.base_url}/{parts.netloc}{parts.path}{query}"
+
+
+@dataclass
+class ScraperBenchmarkResult:
+    """
+    Результаты замеров одного скрапера.
+
+    Attributes:
+        board (str): Префикс площадки.
+        listing_pages (int): Количество страниц пагинации.
+        links (int): Количество найденных ссылок на вакансии.
+        links_elapsed (float): Время `get_vacancy_links` в секундах.
+        vacancy_pages (int): Количество страниц вакансий.
+        parse_elapsed (float): Время построения деревьев страниц в секундах.
+        extract_elapsed (float): Время извлечения полей в секундах.
+        parse_peak (int): Пиковый объем памяти, выделенной при построении дерева
+        одной страницы, в байтах.
+        extract_peak (int): Пиковый объем памяти, выделенной при извлечении полей
+        одной страницы, в байтах.
+    """
+
+    board: str
+    listing_pages: int = 0
+    links: int = 0
+    links_elapsed: float = 0.0
+    vacancy_pages: int = 0
+    parse_elapsed: float = 0.0
+    extract_elapsed: float = 0.0
+    parse_peak: int = 0
+    extract_peak: int = 0
+
+    def to_dict(self) -> dict:
+        total = self.parse_elapsed + self.extract_elapsed
+        return {
+            "board": self.board,
+            "listing_pages": self.listing_pages,
+            "links": self.links,
+            "listing_per_s": round(self.listing_pages / self.links_elapsed, 1)
+            if self.links_elapsed
+            else 0.0,
+            "vacancy_pages": self.vacancy_pages,
+            "pages_per_s": round(self.vacancy_pages / total, 1) if total else 0.0,
+            "parse_share": round(self.parse_elapsed / total, 2) if total else 0.0,
+            "parse_ms": round(self.parse_elapsed * 1000, 1),
+            "extract_ms": round(self.extract_elapsed * 1000, 1),
+            "parse_peak_kb": round(self.parse_peak / 1024, 1),
+            "extract_peak_kb": round(self.extract_peak / 1024, 1),
+        }
+
+
+class ScraperBenchmark:
+    """
+    Бенчмарк скраперов на корпусе сохраненных страниц.
+
+    Для каждого скрапера замеряется `get_vacancy_links` через локальный сервер
+    и, отдельно, построение дерева страницы (`parse_page`) и извлечение полей
+    (`extract`) для каждой сохраненной страницы вакансии. Распределение памяти
+    замеряется отдельным прогоном, так как `tracemalloc` замедляет выполнение.
+
+    Attributes:
+        corpus (Corpus): Корпус страниц.
+        server (PageServer): Локальный сервер с корпусом.
+        repeat (int): Количество прогонов извлечения.
+    """
+
+    def __init__(self, corpus: Corpus, server: PageServer, repeat: int = 3) -> None:
+        self.corpus = corpus
+        self.server = server
+        self.repeat = repeat
+        self.config = Config()
+
+    def bench_links(self, board: str, result: ScraperBenchmarkResult) -> None:
+        scraper = getattr(self.config, f"{board}_scraper")
+        fetcher = scraper.fetcher
+        fetcher.url = self.server.rewrite(fetcher.url)
+        fetcher.pages = sum(1 for _ in self.corpus.pages(board, "listing"))
+        domain = getattr(self.config, f"{board}_domain")
+
+        start = time.perf_counter()
+        links = asyncio.run(fetcher.get_vacancy_links(domain, scraper.selector))
+        result.links_elapsed = time.perf_counter() - start
+        result.listing_pages = fetcher.pages
+        result.links = len(links)
+
+    def bench_extract(self, board: str, result: ScraperBenchmarkResult) -> None:
+        scraper = getattr(self.config, f"{board}_scraper")
+        pages = list(self.corpus.pages(board, "vacancy"))
+        result.vacancy_pages = len(pages) * self.repeat
+
+        async def run() -> None:
+            for _ in range(self.repeat):
+                for html, url in pages:
+                    start = time.perf_counter()
+                    soup = scraper.parse_page(html)
+                    parsed = time.perf_counter()
+                    await scraper.extract(soup, url)
+                    result.parse_elapsed += parsed - start
+                    result.extract_elapsed += time.perf_counter() - parsed
+
+        if pages:
+            asyncio.run(run())
+
+    def bench_memory(self, board: str, result: ScraperBenchmarkResult) -> None:
+        scraper = getattr(self.config, f"{board}_scraper")
+
+        async def run() -> None:
+            for html, url in self.corpus.pages(board, "vacancy"):
+                tracemalloc.start()
+                soup = scraper.parse_page(html)
+                current, peak = tracemalloc.get_traced_memory()
+                result.parse_peak = max(result.parse_peak, peak)
+                tracemalloc.reset_peak()
+                await scraper.extract(soup, url)
+                result.extract_peak = max(
+                    result.extract_peak, tracemalloc.get_traced_memory()[1] - current
+                )
+                tracemalloc.stop()
+
+        asyncio.run(run())
+
+    def run(self, boards: list[str]) -> list[ScraperBenchmarkResult]:
+        """
+        Запускает замеры для переданных скраперов.
+
+        Args:
+            boards (list[str]): Префиксы площадок.
+
+        Returns:
+            list[ScraperBenchmarkResult]: Результаты по скраперам.
+        """
+        results = []
+        for board in boards:
+            result = ScraperBenchmarkResult(board)
+            self.bench_links(board, result)
+            self.bench_extract(board, result)
+            self.bench_memory(board, result)
+            results.append(result)
+        return results
+
+
+def format_results(results: list[ScraperBenchmarkResult]) -> str:
+    """
+    Форматирует результаты бенчмарка скраперов в текстовую таблицу.
+
+    Args:
+        results (list[ScraperBenchmarkResult]): Результаты по скраперам.
+
+    Returns:
+        str: Таблица для вывода в консоль.
+    """
+    header = (
+        f"{'скрапер':<10} {'списки/с':>9} {'ссылок':>7} {'стр./с':>8} "
+        f"{'парсинг, мс':>12} {'извлеч., мс':>12} {'доля парс.':>11} "
+        f"{'пик парс., КБ':>14} {'пик извл., КБ':>14}"
+    )
+    lines = [header, "-" * len(header)]
+    for result in results:
+        row = result.to_dict()
+        lines.append(
+            f"{row['board']:<10} {row['listing_per_s']:>9.1f} {row['links']:>7} "
+            f"{row['pages_per_s']:>8.1f} {row['parse_ms']:>12.1f} "
+            f"{row['extract_ms']:>12.1f} {row['parse_share']:>11.2f} "
+            f"{row['parse_peak_kb']:>14.1f} {row['extract_peak_kb']:>14.1f}"
+        )
+    return "\n".join(lines)
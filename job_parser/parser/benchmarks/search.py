@@ -0,0 +1,166 @@
+import asyncio
+import datetime
+from parser.benchmarks.report import Measurement, measure
+from parser.forms import SearchingForm
+from parser.mixins import VacanciesMixin
+from parser.views.vacancies import VacancyListView
+from typing import Coroutine
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.db import connections
+from django.db.models import QuerySet
+from django.test import RequestFactory
+
+
+def query_shapes(today: datetime.date | None = None) -> dict[str, dict]:
+    """
+    Возвращает фиксированный набор форм поисковых запросов.
+
+    Формы покрывают типичные сценарии: частый и редкий заголовок, поиск только
+    в заголовках, фильтры по городу, зарплате, опыту, площадке и удаленке, а также
+    запрос со всеми фильтрами сразу. Даты указываются относительно `today`, чтобы
+    результаты не зависели от дня запуска.
+
+    Args:
+        today (datetime.date | None): Текущая дата.
+
+    Returns:
+        dict[str, dict]: Параметры GET-запроса по названию формы.
+    """
+    today = today or datetime.date.today()
+    week_ago = (today - datetime.timedelta(days=7)).isoformat()
+    return {
+        "title": {"title": "разработчик"},
+        "title_week": {"title": "разработчик", "date_from": week_ago},
+        "title_only": {"title": "python", "title_search": "on", "date_from": week_ago},
+        "rare_title": {"title": "терапевт", "date_from": week_ago},
+        "city": {"title": "разработчик", "city": "Москва", "date_from": week_ago},
+        "salary": {
+            "title": "разработчик",
+            "salary_from": 100000,
+            "salary_to": 200000,
+            "date_from": week_ago,
+        },
+        "experience_board": {
+            "title": "инженер",
+            "experience": ["От 1 года до 3 лет", "От 3 до 6 лет"],
+            "job_board": ["HeadHunter", "SuperJob"],
+            "date_from": week_ago,
+        },
+        "remote_company": {
+            "title": "разработчик",
+            "remote": "on",
+            "company": "Альфа",
+            "date_from": week_ago,
+        },
+        "all_filters": {
+            "title": "python",
+            "city": "Москва",
+            "company": "ООО",
+            "salary_from": 50000,
+            "salary_to": 250000,
+            "experience": ["От 1 года до 3 лет"],
+            "job_board": ["HeadHunter"],
+            "remote": "on",
+            "title_search": "on",
+            "date_from": week_ago,
+        },
+    }
+
+
+class SearchBenchmark:
+    """
+    Бенчмарк поиска вакансий.
+
+    Замеряет три уровня: выборку `VacancyFetcher.fetch` с подсчетом и первой
+    страницей результатов, фильтрацию `check_vacancies` для пользователя и полный
+    рендер `VacancyListView`.
+
+    Attributes:
+        user (User): Пользователь, от имени которого выполняется поиск.
+        repeat (int): Количество замеряемых прогонов.
+        warmup (int): Количество прогревочных прогонов.
+    """
+
+    stages = ("fetch", "check", "render")
+
+    def __init__(self, user: User, repeat: int = 20, warmup: int = 2) -> None:
+        self.user = user
+        self.repeat = repeat
+        self.warmup = warmup
+        self.factory = RequestFactory()
+        self.mixin = VacanciesMixin()
+        self.view = VacancyListView.as_view()
+        self.page_size = VacancyListView.paginate_by
+
+    def request(self, params: dict):
+        request = self.factory.get("/vacancies/", params)
+        request.user = self.user
+        request.session = {}
+        request._messages = []
+        return request
+
+    def execute(self, coro: Coroutine) -> None:
+        """
+        Выполняет этап в отдельном цикле событий и закрывает его соединения.
+
+        Запросы к базе данных этапы выполняют через `sync_to_async` в отдельном
+        потоке, который получает собственное соединение, поэтому оно закрывается
+        в том же потоке в конце этапа, как это происходит по окончании запроса.
+        """
+
+        async def wrapper() -> None:
+            try:
+                await coro
+            finally:
+                await sync_to_async(connections.close_all)()
+
+        asyncio.run(wrapper())
+
+    async def fetch(self, params: dict) -> None:
+        """Выполняет выборку вакансий, подсчет и получение первой страницы."""
+        form = SearchingForm(params)
+        vacancies = await self.mixin.get_vacancies(form)
+        if isinstance(vacancies, QuerySet):
+            await sync_to_async(self.first_page)(vacancies)
+
+    def first_page(self, vacancies: QuerySet) -> list:
+        """Подсчитывает вакансии и возвращает первую страницу."""
+        vacancies.count()
+        return list(vacancies[: self.page_size])
+
+    async def check(self, params: dict) -> None:
+        """Выполняет выборку и фильтрацию по спискам пользователя."""
+        form = SearchingForm(params)
+        vacancies = await self.mixin.get_vacancies(form)
+        await sync_to_async(self.mixin.check_vacancies)(vacancies, self.request(params))
+
+    async def render(self, params: dict) -> None:
+        """Выполняет полный рендер страницы со списком вакансий."""
+        response = await self.view(self.request(params))
+        await sync_to_async(response.render)()
+
+    def run(self, shapes: dict[str, dict]) -> list[Measurement]:
+        """
+        Запускает все этапы бенчмарка для переданных форм запросов.
+
+        Args:
+            shapes (dict[str, dict]): Параметры GET-запроса по названию формы.
+
+        Returns:
+            list[Measurement]: Результаты замеров.
+        """
+        results = []
+        for stage in self.stages:
+            func = getattr(self, stage)
+            for name, params in shapes.items():
+                results.append(
+                    measure(
+                        f"{stage}/{name}",
+                        lambda: self.execute(func(params)),
+                        self.repeat,
+                        self.warmup,
+                    )
+                )
+        return results
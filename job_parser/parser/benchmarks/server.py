@@ -0,0 +1,163 @@
+import abc
+import asyncio
+import random
+import threading
+from dataclasses import dataclass, field
+from parser.parsing.replay import FixtureStore
+from typing import TypeVar
+
+from aiohttp import web
+
+ServerT = TypeVar("ServerT", bound="StubServer")
+
+
+@dataclass
+class ServerStats:
+    """
+    Счетчики запросов к локальному серверу.
+
+    Attributes:
+        requests (int): Общее количество запросов.
+        errors (int): Количество искусственных ошибок.
+        misses (int): Количество запросов, для которых нет записанного ответа.
+    """
+
+    requests: int = 0
+    errors: int = 0
+    misses: int = 0
+
+
+@dataclass
+class StubServer(abc.ABC):
+    """
+    Локальный HTTP-сервер, заменяющий внешние сайты при замерах.
+
+    Сервер запускается в отдельном потоке со своим циклом событий, чтобы его
+    работа не влияла на замеряемый код. Задержка и доля ошибок задаются для
+    имитации реальной сети.
+
+    Attributes:
+        latency (float): Средняя задержка ответа в секундах.
+        jitter (float): Максимальное отклонение задержки в секундах.
+        error_rate (float): Доля ответов с кодом 503 от 0 до 1.
+        seed (int | None): Начальное значение генератора случайных чисел.
+        host (str): Адрес, на котором запускается сервер.
+        port (int): Порт сервера, 0 - выбрать свободный.
+    """
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    seed: int | None = None
+    host: str = "127.0.0.1"
+    port: int = 0
+    stats: ServerStats = field(default_factory=ServerStats, init=False)
+
+    def __post_init__(self) -> None:
+        self.rnd = random.Random(self.seed)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._runner: web.AppRunner | None = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @abc.abstractmethod
+    def resolve(self, request: web.Request) -> web.Response | None:
+        """
+        Возвращает ответ на запрос или None, если ответа нет.
+
+        Args:
+            request (web.Request): Запрос к серверу.
+
+        Returns:
+            web.Response | None: Ответ сервера.
+        """
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.stats.requests += 1
+        delay = self.latency + self.rnd.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self.rnd.random() < self.error_rate:
+            self.stats.errors += 1
+            return web.json_response(
+                {"errors": [{"type": "service_unavailable"}]}, status=503
+            )
+        response = self.resolve(request)
+        if response is None:
+            self.stats.misses += 1
+            return web.json_response({}, status=404)
+        return response
+
+    async def _start(self) -> None:
+        app = web.Application()
+        app.router.add_route("GET", "/{tail:.*}", self.handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+
+    def start(self) -> str:
+        """
+        Запускает сервер в отдельном потоке.
+
+        Returns:
+            str: Адрес сервера.
+        """
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._start(), self._loop).result(timeout=10)
+        return self.base_url
+
+    def stop(self) -> None:
+        """Останавливает сервер и его поток."""
+        if self._loop is None:
+            return
+        if self._runner is not None:
+            asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result(
+                timeout=10
+            )
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+            self._thread = None
+        self._loop.close()
+        self._loop = None
+
+    def __enter__(self: ServerT) -> ServerT:
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+@dataclass
+class ApiFixtureServer(StubServer):
+    """
+    Сервер, отдающий записанные ответы API.
+
+    Первый сегмент пути запроса - хост API, остальное - путь на исходном сервере,
+    как их формирует `ReplayWebClient`.
+
+    Attributes:
+        store (FixtureStore): Хранилище фикстур.
+    """
+
+    store: FixtureStore = field(kw_only=True)
+
+    def resolve(self, request: web.Request) -> web.Response | None:
+        host, _, path = request.path.lstrip("/").partition("/")
+        fixture = self.store.load(host, f"/{path}", list(request.query.items()))
+        if fixture is None:
+            return None
+        return web.Response(
+            text=fixture["body"],
+            status=fixture["status"],
+            content_type=fixture["content_type"].split(";")[0],
+            charset="utf-8",
+        )
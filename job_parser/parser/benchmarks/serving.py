@@ -0,0 +1,165 @@
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+from parser.benchmarks.report import Measurement
+from pathlib import Path
+
+import httpx
+from django.conf import settings
+
+# Режимы сервера, см. `gunicorn.conf.py`.
+MODES: tuple[str, ...] = ("wsgi", "asgi")
+
+# Маршруты по умолчанию: поиск вакансий с фильтрами и главная страница.
+ROUTES: tuple[str, ...] = ("/vacancies/?job=python&city=москва", "/")
+
+
+def free_port() -> int:
+    """Возвращает свободный локальный порт."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class ServingBenchmark:
+    """
+    Нагрузочное сравнение режимов сервера.
+
+    Для каждого режима запускается gunicorn с настройками проекта
+    и воркерами `workers`, после чего каждый маршрут запрашивается `requests`
+    раз с `concurrency` одновременными соединениями. Сервер использует базу
+    данных из настроек, поэтому перед замером ее стоит заполнить командой
+    `generate_vacancies`.
+
+    Attributes:
+        workers (int): Количество воркеров gunicorn.
+        concurrency (int): Количество одновременных запросов.
+        requests (int): Количество запросов к маршруту.
+        base_dir (Path): Каталог проекта, из которого запускается сервер.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        concurrency: int,
+        requests: int,
+        base_dir: Path | None = None,
+    ) -> None:
+        self.workers = workers
+        self.concurrency = concurrency
+        self.requests = requests
+        self.base_dir = base_dir or Path(settings.BASE_DIR)
+
+    def start(self, mode: str, port: int) -> subprocess.Popen:
+        """
+        Запускает gunicorn в заданном режиме и ждет, пока он начнет отвечать.
+
+        Args:
+            mode (str): Режим сервера.
+            port (int): Порт.
+
+        Returns:
+            subprocess.Popen: Процесс сервера.
+        """
+        env = {
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": settings.SETTINGS_MODULE,
+            "SERVER_MODE": mode,
+            "GUNICORN_BIND": f"127.0.0.1:{port}",
+            "GUNICORN_WORKERS": str(self.workers),
+        }
+        process = subprocess.Popen(
+            [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py"],
+            cwd=self.base_dir,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                _, stderr = process.communicate()
+                raise RuntimeError(f"Сервер {mode} завершился с ошибкой:\n{stderr}")
+            try:
+                httpx.get(f"http://127.0.0.1:{port}/", timeout=1)
+                return process
+            except httpx.HTTPError:
+                time.sleep(0.2)
+        self.stop(process)
+        raise RuntimeError(f"Сервер {mode} не запустился")
+
+    def stop(self, process: subprocess.Popen) -> None:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+    async def load(self, url: str) -> tuple[list[float], int, float]:
+        """
+        Запрашивает адрес `requests` раз с `concurrency` одновременными запросами.
+
+        Args:
+            url (str): Адрес.
+
+        Returns:
+            tuple[list[float], int, float]: Время ответов в секундах, количество
+            ошибок и общее время в секундах.
+        """
+        timings: list[float] = []
+        errors = 0
+        remaining = iter(range(self.requests))
+        limits = httpx.Limits(max_connections=self.concurrency)
+
+        async def worker(client: httpx.AsyncClient) -> None:
+            nonlocal errors
+            for _ in remaining:
+                start = time.perf_counter()
+                try:
+                    response = await client.get(url)
+                    if response.status_code >= 400:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                timings.append(time.perf_counter() - start)
+
+        async with httpx.AsyncClient(limits=limits, timeout=60) as client:
+            start = time.perf_counter()
+            await asyncio.gather(*(worker(client) for _ in range(self.concurrency)))
+            elapsed = time.perf_counter() - start
+        return timings, errors, elapsed
+
+    def run(self, modes: list[str], routes: list[str]) -> list[Measurement]:
+        """
+        Замеряет маршруты в каждом режиме сервера.
+
+        Args:
+            modes (list[str]): Режимы сервера.
+            routes (list[str]): Маршруты.
+
+        Returns:
+            list[Measurement]: Результаты замеров по сценариям `режим/маршрут`,
+            запросы в секунду и количество ошибок в `extra`.
+        """
+        measurements = []
+        for mode in modes:
+            port = free_port()
+            process = self.start(mode, port)
+            try:
+                for route in routes:
+                    url = f"http://127.0.0.1:{port}{route}"
+                    asyncio.run(self.load(url))  # прогрев
+                    timings, errors, elapsed = asyncio.run(self.load(url))
+                    measurement = Measurement(f"{mode}{route}", timings=timings)
+                    measurement.queries = [0]
+                    measurement.extra["rps"] = round(len(timings) / elapsed, 1)
+                    measurement.extra["errors"] = errors
+                    measurements.append(measurement)
+            finally:
+                self.stop(process)
+        return measurements
@@ -0,0 +1,114 @@
+import asyncio
+import threading
+from dataclasses import dataclass, field
+from email import message_from_bytes
+from email.message import Message
+
+
+@dataclass
+class SmtpStats:
+    """
+    Счетчики локального SMTP-сервера.
+
+    Attributes:
+        connections (int): Количество SMTP-соединений.
+        messages (int): Количество принятых писем.
+    """
+
+    connections: int = 0
+    messages: int = 0
+
+
+@dataclass
+class SmtpStubServer:
+    """
+    Локальный SMTP-сервер, заменяющий почтовый сервер при тестах и замерах.
+
+    Сервер поддерживает минимальный набор команд без шифрования и авторизации,
+    принимает все письма и сохраняет их в памяти. Запускается в отдельном
+    потоке со своим циклом событий, как и `StubServer`.
+
+    Attributes:
+        host (str): Адрес, на котором запускается сервер.
+        port (int): Порт сервера, 0 - выбрать свободный.
+        messages (list[Message]): Принятые письма.
+    """
+
+    host: str = "127.0.0.1"
+    port: int = 0
+    stats: SmtpStats = field(default_factory=SmtpStats, init=False)
+    messages: list[Message] = field(default_factory=list, init=False)
+
+    def __post_init__(self) -> None:
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._server: asyncio.AbstractServer | None = None
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.stats.connections += 1
+
+        async def reply(line: str) -> None:
+            writer.write(f"{line}\r\n".encode())
+            await writer.drain()
+
+        await reply("220 smtp-stub ESMTP")
+        try:
+            while line := await reader.readline():
+                command = line.decode(errors="replace").strip().upper()
+                if command.startswith("EHLO"):
+                    await reply("250-smtp-stub")
+                    await reply("250 8BITMIME")
+                elif command.startswith("DATA"):
+                    await reply("354 End data with <CR><LF>.<CR><LF>")
+                    data = await reader.readuntil(b"\r\n.\r\n")
+                    self.messages.append(message_from_bytes(data[:-5]))
+                    self.stats.messages += 1
+                    await reply("250 OK")
+                elif command.startswith("QUIT"):
+                    await reply("221 Bye")
+                    break
+                else:
+                    await reply("250 OK")
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _start(self) -> None:
+        self._server = await asyncio.start_server(self.handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    def start(self) -> int:
+        """
+        Запускает сервер в отдельном потоке.
+
+        Returns:
+            int: Порт сервера.
+        """
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._start(), self._loop).result(timeout=10)
+        return self.port
+
+    def stop(self) -> None:
+        """Останавливает сервер и его поток."""
+        if self._loop is None:
+            return
+        if self._server is not None:
+            self._server.close()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+            self._thread = None
+        self._loop.close()
+        self._loop = None
+
+    def __enter__(self) -> "SmtpStubServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
@@ -0,0 +1,92 @@
+import json
+import os
+import subprocess
+import sys
+from parser.benchmarks.report import Measurement
+from pathlib import Path
+
+from django.conf import settings
+
+# Сценарии замера: название и код, выполняемый после `django.setup()`.
+SCENARIOS: dict[str, str] = {
+    "import/tasks": "import parser.tasks",
+    "config/parsing": "from parser.parsing.main import JobParser\nJobParser().config",
+    "config/scraping": (
+        "from parser.scraping.main import StartScrapers\nStartScrapers().config"
+    ),
+}
+
+# Код дочернего процесса: замеряет время настройки Django и выполнения
+# сценария и выводит его вместе с пиковым потреблением памяти в JSON.
+PROBE = """
+import json, resource, sys, time
+start = time.perf_counter()
+import django
+django.setup()
+exec(sys.argv[1])
+elapsed = time.perf_counter() - start
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({"seconds": elapsed, "rss_kb": rss_kb}))
+"""
+
+
+class StartupBenchmark:
+    """
+    Замеры времени запуска и памяти воркера.
+
+    Каждый прогон выполняется в новом процессе интерпретатора, чтобы
+    учитывать импорт модулей с нуля, как при запуске воркера huey.
+
+    Attributes:
+        repeat (int): Количество прогонов каждого сценария.
+        base_dir (Path): Каталог проекта, из которого запускается процесс.
+    """
+
+    def __init__(self, repeat: int, base_dir: Path | None = None) -> None:
+        self.repeat = repeat
+        self.base_dir = base_dir or Path(settings.BASE_DIR)
+
+    def probe(self, code: str) -> dict:
+        """
+        Выполняет сценарий в новом процессе.
+
+        Args:
+            code (str): Код сценария.
+
+        Returns:
+            dict: Время в секундах и пиковая память процесса в килобайтах.
+        """
+        env = {**os.environ, "DJANGO_SETTINGS_MODULE": settings.SETTINGS_MODULE}
+        result = subprocess.run(
+            [sys.executable, "-c", PROBE, code],
+            cwd=self.base_dir,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode:
+            raise RuntimeError(f"Сценарий завершился с ошибкой:\n{result.stderr}")
+        return json.loads(result.stdout.strip().splitlines()[-1])
+
+    def run(self, scenarios: dict[str, str]) -> list[Measurement]:
+        """
+        Замеряет сценарии.
+
+        Args:
+            scenarios (dict[str, str]): Сценарии по названиям.
+
+        Returns:
+            list[Measurement]: Результаты замеров, пиковая память в `extra`.
+        """
+        measurements = []
+        for name, code in scenarios.items():
+            measurement = Measurement(name)
+            rss_kb = 0
+            for _ in range(self.repeat):
+                sample = self.probe(code)
+                measurement.timings.append(sample["seconds"])
+                measurement.queries.append(0)
+                rss_kb = max(rss_kb, sample["rss_kb"])
+            measurement.extra["rss_mb"] = round(rss_kb / 1024, 1)
+            measurements.append(measurement)
+        return measurements
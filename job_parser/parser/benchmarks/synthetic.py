@@ -0,0 +1,250 @@
+import datetime
+import random
+from dataclasses import dataclass, field
+from itertools import accumulate
+from typing import Iterator
+
+from django.utils import timezone
+
+# Доли площадок примерно соответствуют тому, что собирают парсеры за сутки:
+# основную массу дают HeadHunter и Trudvsem, скраперы - единицы процентов.
+JOB_BOARDS: dict[str, float] = {
+    "HeadHunter": 0.38,
+    "Trudvsem": 0.27,
+    "Zarplata": 0.14,
+    "SuperJob": 0.11,
+    "Habr": 0.05,
+    "Geekjob": 0.03,
+    "Careerist": 0.02,
+}
+
+# Города отсортированы по убыванию популярности, вес задается законом Ципфа.
+CITIES: list[str] = [
+    "Москва",
+    "Санкт-Петербург",
+    "Новосибирск",
+    "Екатеринбург",
+    "Казань",
+    "Нижний Новгород",
+    "Челябинск",
+    "Самара",
+    "Омск",
+    "Ростов-на-Дону",
+    "Уфа",
+    "Красноярск",
+    "Воронеж",
+    "Пермь",
+    "Волгоград",
+    "Краснодар",
+    "Саратов",
+    "Тюмень",
+    "Тольятти",
+    "Ижевск",
+    "Барнаул",
+    "Иркутск",
+    "Хабаровск",
+    "Ярославль",
+    "Владивосток",
+    "Томск",
+    "Оренбург",
+    "Кемерово",
+    "Рязань",
+    "Калининград",
+]
+
+TITLES: list[str] = [
+    "Python разработчик",
+    "Backend разработчик",
+    "Frontend разработчик",
+    "Java разработчик",
+    "Go разработчик",
+    "DevOps инженер",
+    "Аналитик данных",
+    "Системный администратор",
+    "Тестировщик",
+    "Менеджер по продажам",
+    "Бухгалтер",
+    "Водитель",
+    "Кладовщик",
+    "Продавец-консультант",
+    "Оператор call-центра",
+    "Инженер-конструктор",
+    "Врач-терапевт",
+    "Учитель математики",
+    "Повар",
+    "Курьер",
+]
+
+LEVELS: list[str] = ["", "Junior ", "Middle ", "Senior ", "Ведущий ", "Главный "]
+
+EXPERIENCE: dict[str, float] = {
+    "Нет опыта": 0.22,
+    "От 1 года до 3 лет": 0.45,
+    "От 3 до 6 лет": 0.26,
+    "От 6 лет": 0.07,
+}
+
+SCHEDULES: dict[str, float] = {
+    "Полный день": 0.68,
+    "Сменный график": 0.14,
+    "Гибкий график": 0.08,
+    "Удаленная работа": 0.10,
+}
+
+COMPANY_PREFIXES: list[str] = ["ООО", "АО", "ПАО", "ИП", "ГБУ"]
+COMPANY_WORDS: list[str] = [
+    "Альфа",
+    "Вектор",
+    "Север",
+    "Технологии",
+    "Ресурс",
+    "Системы",
+    "Трейд",
+    "Логистик",
+    "Софт",
+    "Строй",
+    "Медиа",
+    "Консалт",
+]
+
+DESCRIPTION_SENTENCES: list[str] = [
+    "Ищем в команду специалиста, готового развиваться вместе с компанией.",
+    "Работа в стабильной компании с белой заработной платой.",
+    "Требуется опыт работы с Python, Django и PostgreSQL.",
+    "Знание Docker и CI/CD будет преимуществом.",
+    "Оформление по ТК РФ, ДМС после испытательного срока.",
+    "Обязанности: приемка и отгрузка товара, работа с документами.",
+    "Уверенное владение ПК, внимательность, ответственность.",
+    "Предоставляем обучение и наставника на первое время.",
+    "Гибкое начало рабочего дня, возможна частичная удаленка.",
+    "Участие в разработке высоконагруженных сервисов.",
+]
+
+
+def _weighted(values: dict[str, float]) -> tuple[list[str], list[float]]:
+    """Разворачивает словарь весов в значения и накопленные веса для `choices`."""
+    return list(values), list(accumulate(values.values()))
+
+
+@dataclass
+class SyntheticDataset:
+    """
+    Генератор синтетических вакансий с реалистичными распределениями.
+
+    Распределения подобраны так, чтобы форма данных была близка к боевой:
+    площадки и опыт выбираются по весам, города - по закону Ципфа,
+    зарплата - по логнормальному распределению, дата публикации - в пределах
+    срока хранения вакансий с перекосом в сторону свежих.
+
+    Attributes:
+        seed (int): Начальное значение генератора случайных чисел.
+        days (int): Глубина дат публикации в днях.
+        companies_count (int): Количество различных компаний.
+    """
+
+    seed: int = 42
+    days: int = 10
+    companies_count: int = 20000
+    rnd: random.Random = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.rnd = random.Random(self.seed)
+        self.boards, self.board_weights = _weighted(JOB_BOARDS)
+        self.experience, self.experience_weights = _weighted(EXPERIENCE)
+        self.schedules, self.schedule_weights = _weighted(SCHEDULES)
+        self.city_weights = list(
+            accumulate(1 / rank for rank in range(1, len(CITIES) + 1))
+        )
+        self.companies = [
+            f"{self.rnd.choice(COMPANY_PREFIXES)} "
+            f"{self.rnd.choice(COMPANY_WORDS)}-{self.rnd.choice(COMPANY_WORDS)} {num}"
+            for num in range(self.companies_count)
+        ]
+        self.company_weights = list(
+            accumulate(1 / rank for rank in range(1, self.companies_count + 1))
+        )
+        self.now = timezone.now()
+
+    def company(self) -> str:
+        """Возвращает название компании, крупные компании встречаются чаще."""
+        return self.rnd.choices(self.companies, cum_weights=self.company_weights)[0]
+
+    def salary(self) -> tuple[int | None, int | None]:
+        """Возвращает вилку зарплаты, примерно треть вакансий без зарплаты."""
+        if self.rnd.random() < 0.3:
+            return None, None
+        base = int(self.rnd.lognormvariate(11.0, 0.45)) // 1000 * 1000
+        salary_from = base if self.rnd.random() < 0.85 else None
+        salary_to: int | None = int(base * self.rnd.uniform(1.1, 1.6)) // 1000 * 1000
+        if self.rnd.random() < 0.3:
+            salary_to = None
+        return salary_from, salary_to
+
+    def published_at(self) -> datetime.datetime:
+        """Возвращает дату публикации, свежие вакансии встречаются чаще."""
+        days_ago = min(self.rnd.expovariate(0.35), self.days - 0.01)
+        return self.now - datetime.timedelta(days=days_ago)
+
+    def vacancy(self, num: int) -> dict:
+        """
+        Формирует данные одной вакансии.
+
+        Args:
+            num (int): Порядковый номер вакансии, используется для уникального URL.
+
+        Returns:
+            dict: Поля модели `Vacancies`.
+        """
+        rnd = self.rnd
+        job_board = rnd.choices(self.boards, cum_weights=self.board_weights)[0]
+        schedule = rnd.choices(self.schedules, cum_weights=self.schedule_weights)[0]
+        experience = rnd.choices(self.experience, cum_weights=self.experience_weights)
+        salary_from, salary_to = self.salary()
+        description = " ".join(rnd.sample(DESCRIPTION_SENTENCES, rnd.randint(3, 8)))
+        return {
+            "job_board": job_board,
+            "url": f"https://synthetic.local/{job_board.lower()}/vacancy/{num}",
+            "title": f"{rnd.choice(LEVELS)}{rnd.choice(TITLES)}",
+            "salary_from": salary_from,
+            "salary_to": salary_to,
+            "salary_currency": "RUR" if salary_from or salary_to else None,
+            "description": f"<p>{description}</p>",
+            "city": rnd.choices(CITIES, cum_weights=self.city_weights)[0],
+            "company": self.company(),
+            "employment": "Полная занятость",
+            "schedule": schedule,
+            "experience": experience[0],
+            "remote": schedule == "Удаленная работа",
+            "published_at": self.published_at(),
+        }
+
+    def vacancies(self, count: int, start: int = 0) -> Iterator[dict]:
+        """
+        Генерирует данные вакансий.
+
+        Args:
+            count (int): Количество вакансий.
+            start (int): Номер первой вакансии.
+
+        Yields:
+            dict: Поля модели `Vacancies`.
+        """
+        for num in range(start, start + count):
+            yield self.vacancy(num)
+
+    def blacklist_size(self, limit: int) -> int:
+        """
+        Возвращает размер черного списка пользователя.
+
+        Большинство пользователей скрывает единицы вакансий, но у небольшой
+        доли активных пользователей списки исчисляются тысячами.
+
+        Args:
+            limit (int): Максимальный размер списка.
+
+        Returns:
+            int: Размер черного списка.
+        """
+        if self.rnd.random() < 0.02:
+            return self.rnd.randint(limit // 2, limit)
+        return min(int(self.rnd.paretovariate(1.2)) * 3, limit)
@@ -0,0 +1,95 @@
+import time
+from parser.benchmarks.report import Measurement
+from parser.benchmarks.synthetic import SyntheticDataset
+from parser.bulk import copy_insert
+from parser.models import Vacancies
+from typing import Callable
+
+from django.db import connection
+
+# Префикс URL-адресов вакансий бенчмарка, по нему они удаляются после замера.
+BENCH_URL = "https://bench.local/ingest/"
+
+
+def orm_write(rows: list[Vacancies]) -> None:
+    Vacancies.objects.bulk_create(rows, ignore_conflicts=True)
+
+
+def copy_write(rows: list[Vacancies]) -> None:
+    copy_insert(rows, connection)
+
+
+class WriteBenchmark:
+    """
+    Замеры скорости записи пакета вакансий в базу данных.
+
+    Сравнивается запись `bulk_create(ignore_conflicts=True)` и, в PostgreSQL,
+    командой COPY через промежуточную таблицу (см. `parser.bulk`). Каждый
+    способ замеряется на новых вакансиях (`new`) и на повторной записи тех же
+    вакансий (`existing`), которые при загрузке пропускаются. Описания
+    не записываются: они сохраняются отдельно от способа записи вакансий.
+
+    Attributes:
+        rows (int): Количество вакансий в пакете.
+        repeat (int): Количество замеряемых прогонов.
+        seed (int): Начальное значение генератора синтетических вакансий.
+    """
+
+    def __init__(self, rows: int, repeat: int, seed: int = 42) -> None:
+        self.rows = rows
+        self.repeat = repeat
+        self.dataset = SyntheticDataset(seed=seed)
+
+    @property
+    def methods(self) -> dict[str, Callable[[list[Vacancies]], None]]:
+        """Способы записи, доступные в текущей базе данных."""
+        methods: dict[str, Callable[[list[Vacancies]], None]] = {"orm": orm_write}
+        if connection.vendor == "postgresql":
+            methods["copy"] = copy_write
+        return methods
+
+    def make_rows(self) -> list[Vacancies]:
+        rows = []
+        for num, data in enumerate(self.dataset.vacancies(self.rows)):
+            data.pop("description")
+            rows.append(Vacancies(**{**data, "url": f"{BENCH_URL}{num}"}))
+        return rows
+
+    def cleanup(self) -> None:
+        """Удаляет вакансии бенчмарка."""
+        Vacancies.objects.filter(url__startswith=BENCH_URL).delete()
+
+    def timed(self, write: Callable, rows: list[Vacancies]) -> float:
+        start = time.perf_counter()
+        write(rows)
+        return time.perf_counter() - start
+
+    def run(self) -> list[Measurement]:
+        """
+        Замеряет способы записи.
+
+        Returns:
+            list[Measurement]: Результаты по сценариям `способ/new`
+            и `способ/existing`, вакансии в секунду в `extra`.
+        """
+        measurements = []
+        self.cleanup()
+        for name, write in self.methods.items():
+            new = Measurement(f"{name}/new")
+            existing = Measurement(f"{name}/existing")
+            for _ in range(self.repeat):
+                rows = self.make_rows()
+                new.timings.append(self.timed(write, rows))
+                existing.timings.append(self.timed(write, self.make_rows()))
+                written = Vacancies.objects.filter(url__startswith=BENCH_URL).count()
+                if written != len(rows):
+                    raise RuntimeError(f"Способ {name} записал не все вакансии")
+                self.cleanup()
+            for measurement in (new, existing):
+                measurement.queries = [0]
+                elapsed = measurement.p50_ms / 1000
+                measurement.extra["rows_per_s"] = (
+                    round(self.rows / elapsed, 1) if elapsed else 0.0
+                )
+                measurements.append(measurement)
+        return measurements
@@ -0,0 +1,99 @@
+import io
+from typing import Any
+
+from django.db import transaction
+from django.db.models import Field, Model
+
+
+def copy_value(value: Any) -> str:
+    """
+    Преобразует значение в текстовый формат команды COPY.
+
+    Args:
+        value (Any): Значение, подготовленное полем модели для базы данных.
+
+    Returns:
+        str: Значение с экранированными разделителями или `\\N` для NULL.
+    """
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def copy_buffer(rows: list[Model], fields: list[Field], connection: Any) -> io.StringIO:
+    """
+    Формирует данные команды COPY: строка на объект, столбцы через табуляцию.
+
+    Args:
+        rows (list[Model]): Объекты модели.
+        fields (list[Field]): Поля, которые записываются.
+        connection (Any): Соединение с базой данных.
+
+    Returns:
+        io.StringIO: Данные для `COPY ... FROM STDIN`.
+    """
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write(
+            "\t".join(
+                copy_value(
+                    field.get_db_prep_save(getattr(row, field.attname), connection)
+                )
+                for field in fields
+            )
+        )
+        buffer.write("\n")
+    buffer.seek(0)
+    return buffer
+
+
+def copy_insert(rows: list[Model], connection: Any) -> int:
+    """
+    Вставляет объекты модели в PostgreSQL через промежуточную таблицу.
+
+    Строки передаются командой COPY во временную таблицу, которая, как
+    и нежурналируемая, не пишется в WAL и видна только текущему соединению,
+    поэтому одновременные загрузки не мешают друг другу. Затем строки
+    переносятся в таблицу модели одним `INSERT ... ON CONFLICT DO NOTHING`:
+    как и `bulk_create(ignore_conflicts=True)`, уже сохраненные строки
+    пропускаются. Временная таблица удаляется сразу после переноса строк.
+
+    Args:
+        rows (list[Model]): Объекты одной модели.
+        connection (Any): Соединение с PostgreSQL.
+
+    Returns:
+        int: Количество вставленных строк.
+    """
+    if not rows:
+        return 0
+    opts = rows[0]._meta
+    fields = [field for field in opts.concrete_fields if not field.primary_key]
+    quote = connection.ops.quote_name
+    table = quote(opts.db_table)
+    staging = quote(f"{opts.db_table}_staging")
+    columns = ", ".join(quote(field.column) for field in fields)
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE TEMPORARY TABLE {staging} AS "
+            f"SELECT {columns} FROM {table} WITH NO DATA"
+        )
+        cursor.copy_expert(
+            f"COPY {staging} ({columns}) FROM STDIN",
+            copy_buffer(rows, fields, connection),
+        )
+        cursor.execute(
+            f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {staging} "
+            "ON CONFLICT DO NOTHING"
+        )
+        inserted = cursor.rowcount
+        cursor.execute(f"DROP TABLE {staging}")
+    return inserted
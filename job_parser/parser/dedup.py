@@ -0,0 +1,191 @@
+import datetime
+import hashlib
+import re
+from parser.descriptions import plain_text
+from parser.models import Vacancies
+from typing import Any, Iterable
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.utils import timezone
+from job_parser.metrics import registry
+
+WORD_RE = re.compile(r"\w+")
+
+# Количество слов в шингле описания.
+SHINGLE_SIZE = 3
+
+# Минимальное количество слов описания для SimHash: по заглушкам вроде
+# "Нет описания" вакансии сравнивать нельзя.
+MIN_WORDS = 8
+
+MASK = (1 << 64) - 1
+
+
+def normalize(value: str | None) -> str:
+    """Приводит поле вакансии к виду для сравнения: слова без регистра и знаков."""
+    return " ".join(WORD_RE.findall((value or "").casefold().replace("ё", "е")))
+
+
+def hash64(value: str) -> int:
+    return int.from_bytes(
+        hashlib.blake2b(value.encode(), digest_size=8).digest(), "big"
+    )
+
+
+def fingerprint(title: str | None, company: str | None, city: str | None) -> str | None:
+    """
+    Вычисляет отпечаток вакансии по названию, компании и городу.
+
+    Args:
+        title (str | None): Название вакансии.
+        company (str | None): Компания.
+        city (str | None): Город.
+
+    Returns:
+        str | None: Отпечаток или None, если не указаны название или компания.
+    """
+    if not normalize(title) or not normalize(company):
+        return None
+    key = "\n".join(normalize(value) for value in (title, company, city))
+    return f"{hash64(key):016x}"
+
+
+def simhash(description: str | None) -> int | None:
+    """
+    Вычисляет SimHash описания вакансии по шинглам из `SHINGLE_SIZE` слов.
+
+    У похожих описаний SimHash отличается в небольшом количестве битов,
+    поэтому описание, которое сайт-клон переформатировал или дополнил,
+    распознается как дубликат.
+
+    Args:
+        description (str | None): Описание вакансии в HTML.
+
+    Returns:
+        int | None: SimHash со знаком, как хранится в базе данных, или None,
+        если описание слишком короткое.
+    """
+    words = WORD_RE.findall(plain_text(description).replace("ё", "е"))
+    if len(words) < MIN_WORDS:
+        return None
+    weights = [0] * 64
+    for start in range(len(words) - SHINGLE_SIZE + 1):
+        value = hash64(" ".join(words[start : start + SHINGLE_SIZE]))
+        for bit in range(64):
+            weights[bit] += 1 if value >> bit & 1 else -1
+    value = sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def distance(first: int, second: int) -> int:
+    """Количество различающихся битов двух SimHash."""
+    return ((first ^ second) & MASK).bit_count()
+
+
+class Deduplicator:
+    """
+    Поиск вакансий, уже сохраненных с другого сайта.
+
+    Zarplata отдает вакансии HeadHunter, Habr и Geekjob публикуют одни и те же
+    вакансии. Для каждой вакансии вычисляется отпечаток по названию, компании
+    и городу, а при наличии описания - его SimHash. Индексом служит столбец
+    отпечатков сохраненных вакансий: вакансии пакета сравниваются с вакансиями
+    других сайтов за последние `DEDUP_WINDOW_DAYS` дней одним запросом.
+    Вакансия считается дубликатом, если отпечатки совпадают, а SimHash
+    описаний отличаются не больше чем в `DEDUP_SIMHASH_DISTANCE` битах.
+    Одного отпечатка недостаточно: разные вакансии одной компании в одном
+    городе часто называются одинаково.
+
+    Дубликат сохраняется ссылкой на найденную вакансию
+    (`Vacancies.duplicate_of`) без описания, а в результатах поиска
+    скрывается, если включена настройка `DEDUP_COLLAPSE_RESULTS`. Если
+    описание есть уже в списке вакансий, дубликат не загружает детали,
+    иначе он проверяется повторно после их загрузки.
+    """
+
+    def sign(self, vacancy: Any) -> None:
+        """Вычисляет отпечаток и SimHash вакансии."""
+        vacancy.fingerprint = fingerprint(vacancy.title, vacancy.company, vacancy.city)
+        vacancy.simhash = simhash(vacancy.description)
+
+    def candidates(self, fingerprints: Iterable[str]) -> dict[str, list[tuple]]:
+        """
+        Загружает недавно сохраненные вакансии с заданными отпечатками.
+
+        Args:
+            fingerprints (Iterable[str]): Отпечатки.
+
+        Returns:
+            dict[str, list[tuple]]: Идентификаторы, URL-адреса, сайты и SimHash
+            вакансий по отпечаткам.
+        """
+        since = timezone.now() - datetime.timedelta(days=settings.DEDUP_WINDOW_DAYS)
+        rows = (
+            Vacancies.objects.filter(
+                fingerprint__in=list(fingerprints),
+                duplicate_of__isnull=True,
+                published_at__gte=since,
+            )
+            .order_by("pk")
+            .values_list("fingerprint", "pk", "url", "job_board", "simhash")
+        )
+        candidates: dict[str, list[tuple]] = {}
+        for key, *row in rows:
+            candidates.setdefault(key, []).append(tuple(row))
+        return candidates
+
+    def detect(self, vacancies: list[Any]) -> set[str]:
+        """
+        Отмечает дубликаты вакансий пакета одного сайта.
+
+        У дубликатов заполняется `duplicate_of_id`. Вакансии без описания
+        дубликатами не отмечаются: их нужно проверить повторно после загрузки
+        деталей. Вакансии, уже сохраненные с того же сайта по тому же
+        URL-адресу, не требуют загрузки деталей: при записи они пропускаются.
+        Отпечатки вычисляются и при выключенном поиске дубликатов, чтобы
+        сохраненные вакансии участвовали в сравнении после его включения.
+
+        Args:
+            vacancies (list[Any]): Вакансии пакета с атрибутами `Vacancy`.
+
+        Returns:
+            set[str]: URL-адреса вакансий, которые уже сохранены.
+        """
+        for vacancy in vacancies:
+            self.sign(vacancy)
+        if not settings.DEDUP_ENABLED or not vacancies:
+            return set()
+        candidates = self.candidates(
+            {vacancy.fingerprint for vacancy in vacancies if vacancy.fingerprint}
+        )
+        known: set[str] = set()
+        duplicates = 0
+        for vacancy in vacancies:
+            rows = candidates.get(vacancy.fingerprint, [])
+            if any(url == vacancy.url for _, url, _, _ in rows):
+                known.add(vacancy.url)
+                continue
+            if vacancy.simhash is None:
+                continue
+            for pk, url, job_board, stored_simhash in rows:
+                if job_board == vacancy.job_board or stored_simhash is None:
+                    continue
+                if (
+                    distance(vacancy.simhash, stored_simhash)
+                    <= settings.DEDUP_SIMHASH_DISTANCE
+                ):
+                    vacancy.duplicate_of_id = pk
+                    duplicates += 1
+                    break
+        source = vacancies[0].job_board
+        registry.inc("ingest_duplicates_total", duplicates, source=source, kind="board")
+        registry.inc("ingest_duplicates_total", len(known), source=source, kind="url")
+        return known
+
+    async def adetect(self, vacancies: list[Any]) -> set[str]:
+        """Асинхронный вариант `detect`."""
+        return await sync_to_async(self.detect)(vacancies)
+
+
+deduplicator = Deduplicator()
@@ -0,0 +1,135 @@
+import html
+import re
+import zlib
+from collections import Counter
+from functools import lru_cache
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - зависит от окружения
+    zstandard = None
+
+# Кодек, которым сжимаются новые описания. Без пакета zstandard описания
+# сжимаются zlib из стандартной библиотеки, который тоже поддерживает словари.
+CODEC = "zstd" if zstandard is not None else "zlib"
+
+LEVELS = {"zstd": 9, "zlib": 9}
+
+# Размер словаря по умолчанию: zlib использует только последние 32 КБ словаря.
+DICTIONARY_SIZES = {"zstd": 112 * 1024, "zlib": 32 * 1024}
+
+TAG_RE = re.compile(r"<[^>]+>")
+
+# Фрагмент разметки: тег вместе со следующим за ним текстом.
+FRAGMENT_RE = re.compile(r"<[^>]+>[^<]*|[^<]+")
+
+
+def plain_text(description: str | None) -> str:
+    """
+    Приводит описание к тексту для поиска: без тегов, лишних пробелов
+    и регистра.
+
+    Args:
+        description (str | None): Описание вакансии в HTML.
+
+    Returns:
+        str: Текст описания.
+    """
+    if not description:
+        return ""
+    text = html.unescape(TAG_RE.sub(" ", description))
+    return " ".join(text.split()).casefold()
+
+
+@lru_cache(maxsize=16)
+def zstd_dictionary(dictionary: bytes) -> "zstandard.ZstdCompressionDict":
+    """Возвращает подготовленный словарь zstd, общий для всех вызовов."""
+    return zstandard.ZstdCompressionDict(dictionary)
+
+
+def compress(text: str, codec: str = CODEC, dictionary: bytes | None = None) -> bytes:
+    """
+    Сжимает описание вакансии.
+
+    Args:
+        text (str): Описание.
+        codec (str): "zstd" или "zlib".
+        dictionary (bytes | None): Словарь, обученный на описаниях сайта.
+
+    Returns:
+        bytes: Сжатое описание.
+    """
+    data = text.encode()
+    if codec == "zstd":
+        options = {"dict_data": zstd_dictionary(dictionary)} if dictionary else {}
+        return zstandard.ZstdCompressor(level=LEVELS[codec], **options).compress(data)
+    options = {"zdict": dictionary} if dictionary else {}
+    compressor = zlib.compressobj(LEVELS[codec], **options)
+    return compressor.compress(data) + compressor.flush()
+
+
+def decompress(data: bytes, codec: str, dictionary: bytes | None = None) -> str:
+    """
+    Распаковывает описание вакансии.
+
+    Args:
+        data (bytes): Сжатое описание.
+        codec (str): Кодек, которым описание было сжато.
+        dictionary (bytes | None): Словарь, с которым описание было сжато.
+
+    Returns:
+        str: Описание.
+    """
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("Для распаковки описания нужен пакет zstandard")
+        options = {"dict_data": zstd_dictionary(dictionary)} if dictionary else {}
+        return zstandard.ZstdDecompressor(**options).decompress(bytes(data)).decode()
+    options = {"zdict": dictionary} if dictionary else {}
+    decompressor = zlib.decompressobj(**options)
+    return (decompressor.decompress(bytes(data)) + decompressor.flush()).decode()
+
+
+def train_dictionary(
+    samples: list[str], codec: str = CODEC, size: int | None = None
+) -> bytes:
+    """
+    Обучает словарь сжатия на описаниях одного сайта.
+
+    Описания одного сайта повторяют разметку и типовые фразы, которые
+    по отдельности не сжимаются: словарь позволяет ссылаться на них
+    из каждого описания. Для zstd словарь обучается библиотекой, для zlib
+    составляется из фрагментов разметки, которые встречаются в нескольких
+    описаниях; самые частые фрагменты помещаются в конец словаря, где ссылки
+    на них короче.
+
+    Args:
+        samples (list[str]): Описания.
+        codec (str): "zstd" или "zlib".
+        size (int | None): Размер словаря в байтах.
+
+    Returns:
+        bytes: Словарь.
+    """
+    size = size or DICTIONARY_SIZES[codec]
+    if codec == "zstd":
+        return zstandard.train_dictionary(
+            size, [sample.encode() for sample in samples]
+        ).as_bytes()
+    size = min(size, DICTIONARY_SIZES["zlib"])
+    counts: Counter[str] = Counter()
+    for sample in samples:
+        counts.update(
+            {fragment.strip() for fragment in FRAGMENT_RE.findall(sample)} - {""}
+        )
+    fragments = [
+        fragment.encode() for fragment, count in counts.most_common() if count > 1
+    ]
+    selected: list[bytes] = []
+    used = 0
+    for fragment in fragments:
+        if used + len(fragment) > size:
+            continue
+        selected.append(fragment)
+        used += len(fragment)
+    return b"".join(reversed(selected))
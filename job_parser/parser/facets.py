@@ -0,0 +1,308 @@
+import datetime
+from dataclasses import dataclass
+from parser.indexes import VacancyIndex
+from parser.mixins import RequestParams
+from typing import Any, Iterable
+
+from django.utils import timezone
+
+# Фасеты поиска: площадка, опыт работы, удаленная работа и день публикации.
+FACETS: tuple[str, ...] = ("job_board", "experience", "remote", "published")
+
+# Фасеты с флажками в форме поиска.
+FORM_FACETS: tuple[str, ...] = ("job_board", "experience", "remote")
+
+# Значение флажков формы поиска, которое не ограничивает выбор.
+ANY_VALUE = "Не имеет значения"
+
+
+def date_bucket(
+    value: datetime.datetime | None, tz: datetime.tzinfo | None = None
+) -> datetime.date | None:
+    """
+    Возвращает день публикации вакансии.
+
+    Args:
+        value (datetime.datetime | None): Дата публикации.
+        tz (datetime.tzinfo | None): Часовой пояс, по умолчанию текущий.
+
+    Returns:
+        datetime.date | None: День публикации.
+    """
+    if value is None:
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(tz or timezone.get_current_timezone())
+    return value.date()
+
+
+def search_date(value: datetime.date | str | None) -> datetime.date | None:
+    """
+    Возвращает день из даты параметров поиска.
+
+    Args:
+        value (datetime.date | str | None): Дата или дата со временем
+        из `RequestParams`, строка в формате ISO.
+
+    Returns:
+        datetime.date | None: День.
+    """
+    if not value:
+        return None
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    return datetime.date.fromisoformat(value[:10])
+
+
+def bit_ids(bits: int, base: int = 0) -> list[int]:
+    """
+    Возвращает идентификаторы вакансий битовой карты.
+
+    Args:
+        bits (int): Битовая карта.
+        base (int): Идентификатор вакансии нулевого бита.
+
+    Returns:
+        list[int]: Идентификаторы по возрастанию.
+    """
+    digits = bin(bits)[:1:-1]
+    ids = []
+    position = digits.find("1")
+    while position != -1:
+        ids.append(position + base)
+        position = digits.find("1", position + 1)
+    return ids
+
+
+def make_bitmap(ids: Iterable[int], base: int = 0) -> int:
+    """
+    Строит битовую карту идентификаторов вакансий.
+
+    Биты устанавливаются в массиве байтов, который один раз переводится
+    в число: установка битов в самом числе создавала бы новое число
+    на каждую вакансию.
+
+    Args:
+        ids (Iterable[int]): Идентификаторы вакансий, не меньше `base`.
+        base (int): Идентификатор вакансии нулевого бита.
+
+    Returns:
+        int: Битовая карта.
+    """
+    ids = list(ids)
+    if not ids:
+        return 0
+    buffer = bytearray((max(ids) - base) // 8 + 1)
+    for pk in ids:
+        bit = pk - base
+        buffer[bit >> 3] |= 1 << (bit & 7)
+    return int.from_bytes(buffer, "little")
+
+
+@dataclass(frozen=True)
+class FacetCounts:
+    """
+    Количество вакансий по значениям фасетов.
+
+    Количество по значениям фасета учитывает выбор в остальных фасетах,
+    но не в нем самом. Название, город, компания и зарплата из поиска
+    в количестве не учитываются: это количество вакансий с отмеченными
+    значениями фасетов, а не найденных поиском.
+
+    Attributes:
+        values (dict[str, dict[Any, int]]): Количество по фасетам и значениям.
+        totals (dict[str, int]): Количество вакансий без выбора в фасете.
+    """
+
+    values: dict[str, dict[Any, int]]
+    totals: dict[str, int]
+
+
+@dataclass(frozen=True)
+class FacetBitmaps:
+    """
+    Битовые карты значений фасетов.
+
+    Каждому значению фасета соответствует целое число, в котором установлен
+    бит каждой вакансии с этим значением: номер бита - идентификатор вакансии
+    за вычетом `base`. Отбор по нескольким значениям - объединение карт,
+    по нескольким фасетам - пересечение, количество вакансий - число
+    установленных битов.
+
+    Размер карты определяется разницей между идентификаторами самой новой
+    и самой старой вакансии индекса, а не самим идентификатором, поэтому
+    не растет, пока устаревшие вакансии удаляются (см. `parser.retention`):
+    после удаления индекс строится заново от старейшей оставшейся вакансии.
+
+    Attributes:
+        bitmaps (dict[str, dict[Any, int]]): Карты по фасетам и значениям.
+        everything (int): Карта всех вакансий индекса.
+        base (int): Идентификатор вакансии нулевого бита.
+    """
+
+    bitmaps: dict[str, dict[Any, int]]
+    everything: int
+    base: int = 0
+
+    def union(self, facet: str, values: Iterable) -> int:
+        bits = 0
+        for value in values:
+            bits |= self.bitmaps[facet].get(value, 0)
+        return bits
+
+    def match(self, selected: dict[str, Iterable | None]) -> int:
+        """
+        Возвращает карту вакансий, подходящих под выбор.
+
+        Args:
+            selected (dict[str, Iterable | None]): Выбранные значения по фасетам,
+            None - фасет не ограничивает выбор.
+
+        Returns:
+            int: Битовая карта вакансий.
+        """
+        bits = self.everything
+        for facet, values in selected.items():
+            if values is not None:
+                bits &= self.union(facet, values)
+        return bits
+
+    def counts(
+        self, selected: dict[str, Iterable | None], facets: Iterable[str] = FACETS
+    ) -> FacetCounts:
+        """
+        Считает вакансии по значениям фасетов с учетом выбора (см. `FacetCounts`).
+
+        Args:
+            selected (dict[str, Iterable | None]): Выбранные значения по фасетам.
+            facets (Iterable[str]): Фасеты, по значениям которых нужно количество.
+
+        Returns:
+            FacetCounts: Количество вакансий.
+        """
+        values, totals = {}, {}
+        for facet in facets:
+            others = self.match(
+                {name: value for name, value in selected.items() if name != facet}
+            )
+            totals[facet] = others.bit_count()
+            values[facet] = {
+                value: (bits & others).bit_count()
+                for value, bits in self.bitmaps[facet].items()
+            }
+        return FacetCounts(values, totals)
+
+
+class FacetIndex(VacancyIndex):
+    """
+    Битовый индекс вакансий по площадке, опыту работы, удаленной работе
+    и дню публикации (см. `FacetBitmaps`).
+
+    Индекс хранится в памяти процесса и обновляется после записи вакансий
+    (см. `VacancyIndex`). По параметрам поиска он возвращает количество
+    вакансий по значениям фасетов, которое форма поиска показывает рядом
+    с флажками.
+    """
+
+    fields = ("job_board", "experience", "remote", "published_at")
+
+    def apply(self, state: FacetBitmaps | None, rows: Iterable[tuple]) -> FacetBitmaps:
+        ids: dict[str, dict[Any, list[int]]] = {facet: {} for facet in FACETS}
+        pks = []
+        tz = timezone.get_current_timezone()
+        for pk, job_board, experience, remote, published_at in rows:
+            pks.append(pk)
+            published = date_bucket(published_at, tz)
+            values = (job_board, experience, bool(remote), published)
+            for facet, value in zip(FACETS, values):
+                ids[facet].setdefault(value, []).append(pk)
+        if state is not None:
+            base = state.base
+        else:
+            base = min(pks, default=0)
+        bitmaps = {
+            facet: dict(state.bitmaps[facet]) if state else {} for facet in FACETS
+        }
+        for facet, groups in ids.items():
+            for value, group in groups.items():
+                bits = make_bitmap(group, base)
+                bitmaps[facet][value] = bitmaps[facet].get(value, 0) | bits
+        everything = (state.everything if state else 0) | make_bitmap(pks, base)
+        return FacetBitmaps(bitmaps, everything, base)
+
+    def selections(
+        self, state: FacetBitmaps, params: RequestParams
+    ) -> dict[str, Iterable | None]:
+        """
+        Переводит параметры поиска в выбор значений фасетов.
+
+        Отбор повторяет условия `VacancyFetcher`: "Не имеет значения" первым
+        в списке снимает ограничение, флажок удаленной работы отбирает только
+        удаленные вакансии, период публикации - дни между датами поиска.
+
+        Args:
+            state (FacetBitmaps): Состояние индекса.
+            params (RequestParams): Параметры поиска.
+
+        Returns:
+            dict[str, Iterable | None]: Выбранные значения по фасетам.
+        """
+        selected: dict[str, Iterable | None] = {}
+        for facet in ("job_board", "experience"):
+            values = getattr(params, facet)
+            selected[facet] = values if values and values[0] != ANY_VALUE else None
+        selected["remote"] = (True,) if params.remote else None
+        if params.date_from or params.date_to:
+            date_from = search_date(params.date_from)
+            date_to = search_date(params.date_to)
+            selected["published"] = [
+                day
+                for day in state.bitmaps["published"]
+                if day is not None
+                and (date_from is None or day >= date_from)
+                and (date_to is None or day <= date_to)
+            ]
+        return selected
+
+    def ids(self, params: RequestParams) -> list[int] | None:
+        """
+        Возвращает идентификаторы вакансий, подходящих под фасеты поиска.
+
+        Название, город, компания и зарплата не учитываются (см. `FacetCounts`),
+        поэтому поиск вакансий отбирает их запросом к базе данных.
+
+        Args:
+            params (RequestParams): Параметры поиска.
+
+        Returns:
+            list[int] | None: Идентификаторы по возрастанию или None, если
+            индекс не построен.
+        """
+        state = self.state
+        if state is None:
+            return None
+        return bit_ids(state.match(self.selections(state, params)), state.base)
+
+    def counts(
+        self, params: RequestParams, facets: Iterable[str] = FACETS
+    ) -> FacetCounts | None:
+        """
+        Считает вакансии по значениям фасетов с учетом параметров поиска.
+
+        Args:
+            params (RequestParams): Параметры поиска.
+            facets (Iterable[str]): Фасеты, по значениям которых нужно количество.
+
+        Returns:
+            FacetCounts | None: Количество вакансий или None, если индекс
+            не построен.
+        """
+        state = self.state
+        if state is None:
+            return None
+        return state.counts(self.selections(state, params), facets)
+
+
+facet_index = FacetIndex()
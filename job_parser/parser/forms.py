@@ -1,6 +1,19 @@
+from typing import TYPE_CHECKING
+
 from django import forms
 from django.core.validators import MaxValueValidator, MinValueValidator
 
+if TYPE_CHECKING:
+    from parser.facets import FacetCounts
+
+
+# Подсказка к количеству вакансий у флажков формы поиска.
+FACET_COUNTS_HELP = (
+    "В скобках - количество вакансий с отмеченными площадками, опытом работы, "
+    "удаленной работой и периодом, без учета запроса, города, компании "
+    "и зарплаты."
+)
+
 
 class SearchingForm(forms.Form):
     """
@@ -51,13 +64,25 @@ class SearchingForm(forms.Form):
         label="Что ищем ?",
         required=True,
         max_length=250,
-        widget=forms.TextInput(attrs={"placeholder": "Поиск"}),
+        widget=forms.TextInput(
+            attrs={
+                "placeholder": "Поиск",
+                "autocomplete": "off",
+                "data-autocomplete": "title",
+            }
+        ),
     )
     city = forms.CharField(
         label="Город",
         required=False,
         max_length=250,
-        widget=forms.TextInput(attrs={"placeholder": "Город"}),
+        widget=forms.TextInput(
+            attrs={
+                "placeholder": "Город",
+                "autocomplete": "off",
+                "data-autocomplete": "city",
+            }
+        ),
     )
     date_from = forms.DateField(
         label="Дата от",
@@ -73,7 +98,13 @@ class SearchingForm(forms.Form):
         label="Компания",
         required=False,
         max_length=250,
-        widget=forms.TextInput(attrs={"placeholder": "Поиск по компании"}),
+        widget=forms.TextInput(
+            attrs={
+                "placeholder": "Поиск по компании",
+                "autocomplete": "off",
+                "data-autocomplete": "company",
+            }
+        ),
     )
     salary_from = forms.IntegerField(
         label="Зарплата от:",
@@ -113,6 +144,34 @@ class SearchingForm(forms.Form):
         label="Удаленная работа", required=False, widget=forms.CheckboxInput
     )
 
+    def set_facet_counts(self, counts: "FacetCounts") -> None:
+        """
+        Добавляет к подписям флажков количество вакансий.
+
+        Рядом со значениями опыта работы и площадок показывается количество
+        вакансий с этим значением и отмеченными значениями остальных флажков
+        и периода, рядом с "Не имеет значения" - без отбора по полю
+        (см. `parser.facets.FacetCounts`). Остальные поля поиска в количестве
+        не учитываются, о чем сообщает подсказка под площадками.
+
+        Args:
+            counts (FacetCounts): Количество вакансий по значениям фасетов.
+        """
+        for name in ("experience", "job_board"):
+            field = self.fields[name]
+            field.choices = [
+                (
+                    value,
+                    f"{label} ({counts.totals[name]})"
+                    if value == "Не имеет значения"
+                    else f"{label} ({counts.values[name].get(value, 0)})",
+                )
+                for value, label in field.choices
+            ]
+        remote = self.fields["remote"]
+        remote.label = f"{remote.label} ({counts.values['remote'].get(True, 0)})"
+        self.fields["job_board"].help_text = FACET_COUNTS_HELP
+
     def clean(self) -> dict:
         """
         Очищает и проверяет данные формы.
@@ -0,0 +1,184 @@
+import abc
+import threading
+import time
+from parser.models import Vacancies
+from typing import Any, Iterable
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import QuerySet
+from logger import logger, setup_logging
+
+# Логирование
+setup_logging()
+
+# Версия вакансий увеличивается после каждой записи вакансий, поколение -
+# после удаления устаревших вакансий.
+VERSION_KEY = "vacancy-index:version"
+GENERATION_KEY = "vacancy-index:generation"
+
+
+def bump(key: str) -> None:
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns(), None)
+
+
+def publish(deleted: bool = False) -> None:
+    """
+    Сообщает индексам в памяти процессов, что вакансии изменились.
+
+    Индексы веб-процессов сравнивают версию и поколение из кеша Django
+    со своими и обновляются: после записи добавляют новые вакансии,
+    после удаления строятся заново.
+
+    Args:
+        deleted (bool): Были ли вакансии удалены.
+    """
+    bump(GENERATION_KEY if deleted else VERSION_KEY)
+
+
+async def apublish(deleted: bool = False) -> None:
+    """Асинхронный вариант `publish`."""
+    await sync_to_async(publish)(deleted)
+
+
+def get_counters() -> tuple[Any, Any]:
+    """Возвращает текущие версию и поколение вакансий."""
+    values = cache.get_many([VERSION_KEY, GENERATION_KEY])
+    return values.get(VERSION_KEY), values.get(GENERATION_KEY)
+
+
+class VacancyIndex(abc.ABC):
+    """
+    Базовый класс индексов вакансий в памяти процесса.
+
+    Индекс хранит неизменяемое состояние, которое запросы читают без
+    обращения к базе данных. Обновление строит новое состояние и подменяет
+    им текущее: после записи вакансий (см. `publish`) к состоянию добавляются
+    вакансии с идентификаторами больше последнего загруженного, после удаления
+    вакансий и не реже чем раз в `VACANCY_INDEX_REBUILD_SECONDS` индекс
+    строится заново. Дубликаты вакансий других сайтов в индекс не входят.
+
+    Наследники задают загружаемые поля `fields` и метод `apply`.
+
+    Attributes:
+        fields (tuple[str, ...]): Поля вакансий, которые загружает индекс.
+        state (Any): Текущее состояние индекса или None, если индекс не построен.
+    """
+
+    fields: tuple[str, ...] = ()
+
+    def __init__(self) -> None:
+        self.refreshing = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Сбрасывает индекс: он будет построен заново при следующем запросе."""
+        self.state: Any = None
+        self.version: Any = None
+        self.generation: Any = None
+        self.last_pk = 0
+        self.built_at = 0.0
+        self.checked_at = 0.0
+
+    @abc.abstractmethod
+    def apply(self, state: Any, rows: Iterable[tuple]) -> Any:
+        """
+        Строит новое состояние индекса.
+
+        Args:
+            state (Any): Текущее состояние или None при построении заново.
+            rows (Iterable[tuple]): Идентификаторы и поля `fields` вакансий.
+
+        Returns:
+            Any: Новое состояние.
+        """
+
+    def queryset(self) -> QuerySet:
+        return Vacancies.objects.filter(duplicate_of__isnull=True)
+
+    def refresh(self) -> None:
+        """
+        Обновляет индекс, если вакансии изменились.
+
+        Новые вакансии загружаются по возрастанию идентификатора, поэтому
+        вакансия, записанная транзакцией, которая завершилась позже следующей,
+        попадает в индекс при очередном построении заново.
+        """
+        with self.refreshing:
+            version, generation = get_counters()
+            rebuild = (
+                self.state is None
+                or generation != self.generation
+                or time.monotonic() - self.built_at
+                > settings.VACANCY_INDEX_REBUILD_SECONDS
+            )
+            if not rebuild and version == self.version:
+                return
+            since = 0 if rebuild else self.last_pk
+            rows = list(
+                self.queryset()
+                .filter(pk__gt=since)
+                .order_by("pk")
+                .values_list("pk", *self.fields)
+            )
+            self.state = self.apply(None if rebuild else self.state, rows)
+            if rows:
+                self.last_pk = rows[-1][0]
+            elif rebuild:
+                self.last_pk = 0
+            if rebuild:
+                self.built_at = time.monotonic()
+            self.version, self.generation = version, generation
+            self.checked_at = time.monotonic()
+
+    def background_refresh(self) -> None:
+        try:
+            self.refresh()
+        except Exception as exc:
+            logger.exception(exc)
+        finally:
+            connection.close()
+
+    def check_due(self) -> bool:
+        """Пора ли сверить индекс с версией и поколением вакансий в кеше."""
+        now = time.monotonic()
+        if now - self.checked_at < settings.VACANCY_INDEX_CHECK_SECONDS:
+            return False
+        self.checked_at = now
+        return True
+
+    def schedule_refresh(self, counters: tuple[Any, Any]) -> None:
+        """Запускает обновление в фоновом потоке, если вакансии изменились."""
+        expired = (
+            time.monotonic() - self.built_at > settings.VACANCY_INDEX_REBUILD_SECONDS
+        )
+        if (counters != (self.version, self.generation) or expired) and not (
+            self.refreshing.locked()
+        ):
+            threading.Thread(target=self.background_refresh, daemon=True).start()
+
+    def prepare(self) -> None:
+        """
+        Готовит индекс к запросу.
+
+        Индекс строится при первом запросе процесса. Дальше не чаще чем раз
+        в `VACANCY_INDEX_CHECK_SECONDS` проверяются версия и поколение вакансий
+        в кеше, и если они изменились, индекс обновляется в фоновом потоке,
+        а запросы обслуживаются текущим состоянием.
+        """
+        if self.state is None:
+            self.refresh()
+        elif self.check_due():
+            self.schedule_refresh(get_counters())
+
+    async def aprepare(self) -> None:
+        """Асинхронный вариант `prepare`."""
+        if self.state is None:
+            await sync_to_async(self.refresh)()
+        elif self.check_due():
+            self.schedule_refresh(await sync_to_async(get_counters)())
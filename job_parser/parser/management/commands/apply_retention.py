@@ -0,0 +1,44 @@
+from parser.retention import RetentionPolicy
+
+from django.core.management.base import BaseCommand, CommandParser
+
+
+class Command(BaseCommand):
+    """
+    Команда для удаления устаревших вакансий.
+
+    Удаляет вакансии пакетами так же, как периодическая задача
+    `delete_old_vacancies`, но позволяет задать параметры вручную,
+    например чтобы удалить накопившийся остаток за один запуск.
+    """
+
+    help = "Удаляет вакансии старше срока хранения пакетами"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--days", type=int, help="Срок хранения в днях")
+        parser.add_argument("--batch-size", type=int)
+        parser.add_argument("--max-batches", type=int)
+        parser.add_argument("--archive-dir", help="Каталог архива вакансий")
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Только подсчитать устаревшие вакансии",
+        )
+
+    def handle(self, *args, **options) -> None:
+        policy = RetentionPolicy(
+            days=options["days"],
+            batch_size=options["batch_size"],
+            max_batches=options["max_batches"],
+            archive_dir=options["archive_dir"],
+        )
+        result = policy.run(dry_run=options["dry_run"])
+        if options["dry_run"]:
+            self.stdout.write(f"Устаревших вакансий: {result.deleted}")
+            return
+        self.stdout.write(
+            f"Удалено вакансий: {result.deleted}, пакетов: {result.batches}, "
+            f"в архиве: {result.archived}, за {result.elapsed:.2f} с"
+        )
+        if not result.exhausted:
+            self.stdout.write("Остались устаревшие вакансии, запустите команду снова")
@@ -0,0 +1,90 @@
+import asyncio
+import datetime
+from parser.parsing.config import ParserConfig
+from parser.tracing import trace
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+# Префиксы парсеров в конфигурации по названию сайта.
+BOARDS = {
+    "headhunter": "hh",
+    "zarplata": "zp",
+    "superjob": "sj",
+    "trudvsem": "tv",
+}
+
+
+def day_windows(
+    since: datetime.date, until: datetime.date, step: int
+) -> list[tuple[datetime.datetime, datetime.datetime]]:
+    """
+    Делит период на интервалы по `step` дней в локальном часовом поясе.
+
+    Args:
+        since (datetime.date): Первый день периода.
+        until (datetime.date): Последний день периода включительно.
+        step (int): Длина интервала в днях.
+
+    Returns:
+        list[tuple[datetime.datetime, datetime.datetime]]: Начало и конец интервалов.
+    """
+    tzinfo = datetime.datetime.now().astimezone().tzinfo
+    windows = []
+    day = since
+    while day <= until:
+        end = min(day + datetime.timedelta(days=step), until + datetime.timedelta(1))
+        windows.append(
+            (
+                datetime.datetime.combine(day, datetime.time.min, tzinfo=tzinfo),
+                datetime.datetime.combine(end, datetime.time.min, tzinfo=tzinfo),
+            )
+        )
+        day = end
+    return windows
+
+
+class Command(BaseCommand):
+    """
+    Команда для загрузки вакансий за прошлые дни.
+
+    Период загружается интервалами по `--step-days` дней: каждый интервал
+    разбивается на сегменты (см. `parser.parsing.planner`), загружается
+    и записывается в базу данных до перехода к следующему, поэтому объем
+    памяти не зависит от длины периода. Вакансии, уже сохраненные ранее,
+    пропускаются при записи.
+    """
+
+    help = "Загружает вакансии с сайта за указанный период"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("board", choices=sorted(BOARDS))
+        parser.add_argument(
+            "--since",
+            type=datetime.date.fromisoformat,
+            required=True,
+            help="Первый день периода, ГГГГ-ММ-ДД",
+        )
+        parser.add_argument(
+            "--until",
+            type=datetime.date.fromisoformat,
+            default=datetime.date.today(),
+            help="Последний день периода, ГГГГ-ММ-ДД, по умолчанию сегодня",
+        )
+        parser.add_argument("--step-days", type=int, default=1)
+
+    def handle(self, *args, **options) -> None:
+        if options["since"] > options["until"]:
+            raise CommandError("Начало периода позже его конца")
+        board = options["board"]
+        config = ParserConfig()
+        parser = getattr(config, f"{BOARDS[board]}_parser")
+        windows = day_windows(options["since"], options["until"], options["step_days"])
+        with trace(f"backfill_{board}") as root:
+            for start, end in windows:
+                self.stdout.write(
+                    f"{board}: {start:%Y-%m-%d %H:%M} - {end:%Y-%m-%d %H:%M}"
+                )
+                asyncio.run(parser.parse(start, end))
+        self.stdout.write(
+            f"Загружено интервалов: {len(windows)} за {root.duration:.2f} с"
+        )
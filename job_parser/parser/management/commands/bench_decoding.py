@@ -0,0 +1,86 @@
+import platform
+import sys
+from parser.benchmarks.decoding import DecodingBenchmark
+from parser.benchmarks.report import Baseline, format_report
+from parser.parsing.decoders import SCHEMAS
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+BASELINE_PATH = (
+    Path(__file__).resolve().parents[2] / "benchmarks/baselines/decoding.json"
+)
+
+
+class Command(BaseCommand):
+    """
+    Команда для замеров декодирования ответов API.
+
+    Сравнивает по времени и памяти прежнее декодирование через строку,
+    `json.loads` от байтов и декодеры сайтов на синтетических страницах
+    списка вакансий.
+    """
+
+    help = "Замеряет время и память декодирования ответов API"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "boards",
+            nargs="*",
+            help=f"Сайты для замеров: {', '.join(SCHEMAS)}, по умолчанию все",
+        )
+        parser.add_argument("--repeat", type=int, default=50)
+        parser.add_argument(
+            "--size", type=int, default=100, help="Количество вакансий на странице"
+        )
+        parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+        parser.add_argument(
+            "--save-baseline",
+            action="store_true",
+            help="Сохранить результаты как новый эталон",
+        )
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=0.2,
+            help="Допустимый относительный рост p95",
+        )
+        parser.add_argument(
+            "--fail-on-regression",
+            action="store_true",
+            help="Завершиться с ошибкой при обнаружении регрессии",
+        )
+
+    def handle(self, *args, **options) -> None:
+        unknown = set(options["boards"]) - set(SCHEMAS)
+        if unknown:
+            raise CommandError(f"Неизвестные сайты: {', '.join(sorted(unknown))}")
+        benchmark = DecodingBenchmark(options["repeat"], options["size"])
+        measurements = benchmark.run(options["boards"])
+
+        baseline = Baseline(options["baseline"])
+        rows = baseline.compare(measurements, options["tolerance"])
+        self.stdout.write(format_report(rows))
+        for item in measurements:
+            extra = item.extra
+            decoder = f", декодер {extra['decoder']}" if "decoder" in extra else ""
+            self.stdout.write(
+                f"{item.name}: ответ {extra['payload_kb']} КБ, пиковая память "
+                f"{extra['peak_kb']} КБ, результат {extra['retained_kb']} КБ{decoder}"
+            )
+
+        if options["save_baseline"]:
+            baseline.save(
+                measurements,
+                {
+                    "repeat": options["repeat"],
+                    "size": options["size"],
+                    "python": sys.version.split()[0],
+                    "platform": platform.platform(),
+                },
+            )
+            self.stdout.write(self.style.SUCCESS(f"Эталон сохранен: {baseline.path}"))
+
+        regressions = [row["name"] for row in rows if row["regression"]]
+        if regressions and options["fail_on_regression"]:
+            raise CommandError(f"Обнаружены регрессии: {', '.join(regressions)}")
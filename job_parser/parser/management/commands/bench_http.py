@@ -0,0 +1,88 @@
+import platform
+import sys
+from parser.benchmarks.report import Baseline, format_report
+from parser.benchmarks.serving import MODES, ROUTES, ServingBenchmark
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+BASELINE_PATH = (
+    Path(__file__).resolve().parents[2] / "benchmarks/baselines/serving.json"
+)
+
+
+class Command(BaseCommand):
+    """
+    Команда для нагрузочного сравнения режимов сервера WSGI и ASGI.
+
+    Запускает gunicorn в каждом режиме (см. `gunicorn.conf.py`) и замеряет
+    время ответа и пропускную способность маршрутов при одновременных
+    запросах.
+    """
+
+    help = "Сравнивает время ответа gunicorn в режимах WSGI и ASGI"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--mode", action="append", choices=MODES, help="По умолчанию все режимы"
+        )
+        parser.add_argument(
+            "--route", action="append", help="Маршрут, по умолчанию поиск и главная"
+        )
+        parser.add_argument("--workers", type=int, default=1)
+        parser.add_argument("--concurrency", type=int, default=20)
+        parser.add_argument("--requests", type=int, default=500)
+        parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+        parser.add_argument(
+            "--save-baseline",
+            action="store_true",
+            help="Сохранить результаты как новый эталон",
+        )
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=0.2,
+            help="Допустимый относительный рост p95",
+        )
+        parser.add_argument(
+            "--fail-on-regression",
+            action="store_true",
+            help="Завершиться с ошибкой при обнаружении регрессии",
+        )
+
+    def handle(self, *args, **options) -> None:
+        benchmark = ServingBenchmark(
+            options["workers"], options["concurrency"], options["requests"]
+        )
+        try:
+            measurements = benchmark.run(
+                options["mode"] or list(MODES), options["route"] or list(ROUTES)
+            )
+        except RuntimeError as exc:
+            raise CommandError(str(exc)) from exc
+
+        baseline = Baseline(options["baseline"])
+        rows = baseline.compare(measurements, options["tolerance"])
+        self.stdout.write(format_report(rows))
+        for item in measurements:
+            self.stdout.write(
+                f"{item.name}: {item.extra['rps']} запросов в секунду, "
+                f"ошибок: {item.extra['errors']}"
+            )
+
+        if options["save_baseline"]:
+            baseline.save(
+                measurements,
+                {
+                    "workers": options["workers"],
+                    "concurrency": options["concurrency"],
+                    "requests": options["requests"],
+                    "python": sys.version.split()[0],
+                    "platform": platform.platform(),
+                },
+            )
+            self.stdout.write(self.style.SUCCESS(f"Эталон сохранен: {baseline.path}"))
+
+        regressions = [row["name"] for row in rows if row["regression"]]
+        if regressions and options["fail_on_regression"]:
+            raise CommandError(f"Обнаружены регрессии: {', '.join(regressions)}")
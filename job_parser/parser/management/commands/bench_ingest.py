@@ -0,0 +1,77 @@
+import platform
+import sys
+from parser.benchmarks.report import Baseline, format_report
+from parser.benchmarks.writes import WriteBenchmark
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection
+
+BASELINE_PATH = Path(__file__).resolve().parents[2] / "benchmarks/baselines/ingest.json"
+
+
+class Command(BaseCommand):
+    """
+    Команда для замеров скорости записи вакансий в базу данных.
+
+    Сравнивает запись пакета синтетических вакансий `bulk_create` и командой
+    COPY через промежуточную таблицу. Запись командой COPY замеряется только
+    в PostgreSQL. Записанные вакансии удаляются после каждого прогона.
+    """
+
+    help = "Сравнивает скорость записи вакансий bulk_create и командой COPY"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--rows", type=int, default=10000)
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+        parser.add_argument(
+            "--save-baseline",
+            action="store_true",
+            help="Сохранить результаты как новый эталон",
+        )
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=0.2,
+            help="Допустимый относительный рост p95",
+        )
+        parser.add_argument(
+            "--fail-on-regression",
+            action="store_true",
+            help="Завершиться с ошибкой при обнаружении регрессии",
+        )
+
+    def handle(self, *args, **options) -> None:
+        if connection.vendor != "postgresql":
+            self.stdout.write(
+                f"База данных {connection.vendor}: запись командой COPY не замеряется"
+            )
+        benchmark = WriteBenchmark(options["rows"], options["repeat"], options["seed"])
+        measurements = benchmark.run()
+
+        baseline = Baseline(options["baseline"])
+        rows = baseline.compare(measurements, options["tolerance"])
+        self.stdout.write(format_report(rows))
+        for item in measurements:
+            self.stdout.write(
+                f"{item.name}: {item.extra['rows_per_s']} вакансий в секунду"
+            )
+
+        if options["save_baseline"]:
+            baseline.save(
+                measurements,
+                {
+                    "rows": options["rows"],
+                    "repeat": options["repeat"],
+                    "database": connection.vendor,
+                    "python": sys.version.split()[0],
+                    "platform": platform.platform(),
+                },
+            )
+            self.stdout.write(self.style.SUCCESS(f"Эталон сохранен: {baseline.path}"))
+
+        regressions = [row["name"] for row in rows if row["regression"]]
+        if regressions and options["fail_on_regression"]:
+            raise CommandError(f"Обнаружены регрессии: {', '.join(regressions)}")
@@ -0,0 +1,78 @@
+from parser.benchmarks.ingest import BOARDS, ParserBenchmark, format_results
+from parser.benchmarks.server import ApiFixtureServer
+from parser.management.commands.record_fixtures import FIXTURES_PATH
+from parser.parsing.replay import FixtureStore
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+
+class Command(BaseCommand):
+    """
+    Команда для замеров пропускной способности парсеров API.
+
+    Запускает парсеры на локальном сервере, отдающем записанные командой
+    `record_fixtures` ответы, и выводит количество вакансий в секунду, запросов,
+    время записи в базу данных и пиковый объем памяти. Записанные вакансии
+    удаляются после каждого прогона, поэтому команда запускается только на
+    тестовой базе данных.
+    """
+
+    help = "Замеряет пропускную способность парсеров API на записанных ответах"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--board",
+            action="append",
+            choices=BOARDS,
+            help="Площадка для замера, по умолчанию - все",
+        )
+        parser.add_argument("--fixtures", type=Path, default=FIXTURES_PATH)
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument(
+            "--latency",
+            type=float,
+            default=0.05,
+            help="Средняя задержка ответа сервера в секундах",
+        )
+        parser.add_argument(
+            "--jitter",
+            type=float,
+            default=0.02,
+            help="Максимальное отклонение задержки в секундах",
+        )
+        parser.add_argument(
+            "--error-rate",
+            type=float,
+            default=0.0,
+            help="Доля ответов сервера с ошибкой от 0 до 1",
+        )
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument(
+            "--with-delay",
+            action="store_true",
+            help="Сохранить задержки между запросами к API",
+        )
+
+    def handle(self, *args, **options) -> None:
+        store = FixtureStore(options["fixtures"])
+        if next(iter(store), None) is None:
+            raise CommandError(
+                f"Фикстуры не найдены в {store.directory}, "
+                "сначала выполните record_fixtures"
+            )
+
+        server = ApiFixtureServer(
+            latency=options["latency"],
+            jitter=options["jitter"],
+            error_rate=options["error_rate"],
+            seed=options["seed"],
+            store=store,
+        )
+        with server:
+            benchmark = ParserBenchmark(
+                server, options["repeat"], delay=options["with_delay"]
+            )
+            results = benchmark.run(options["board"] or list(BOARDS))
+
+        self.stdout.write(format_results(results))
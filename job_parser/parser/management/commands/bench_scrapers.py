@@ -0,0 +1,65 @@
+from parser.benchmarks.scraping import (
+    CORPUS_ROOT,
+    SCRAPERS,
+    Corpus,
+    CorpusServer,
+    ScraperBenchmark,
+    format_results,
+)
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+
+class Command(BaseCommand):
+    """
+    Команда для замеров производительности скраперов.
+
+    Замеряет получение ссылок на вакансии через локальный сервер с корпусом
+    страниц и извлечение полей из сохраненных страниц вакансий: страниц
+    в секунду, долю времени на построение дерева и пиковый объем памяти.
+    """
+
+    help = "Замеряет производительность скраперов на корпусе HTML-страниц"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--board",
+            action="append",
+            choices=SCRAPERS,
+            help="Площадка для замера, по умолчанию - все из корпуса",
+        )
+        parser.add_argument(
+            "--corpus",
+            type=Path,
+            help="Каталог версии корпуса, по умолчанию - последняя версия",
+        )
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument(
+            "--latency",
+            type=float,
+            default=0.0,
+            help="Задержка ответа сервера в секундах",
+        )
+
+    def handle(self, *args, **options) -> None:
+        corpus = (
+            Corpus(options["corpus"])
+            if options["corpus"]
+            else Corpus.latest(CORPUS_ROOT)
+        )
+        if not corpus.manifests:
+            raise CommandError(
+                f"Корпус не найден в {corpus.directory}, "
+                "сначала выполните save_html_corpus"
+            )
+        boards = options["board"] or [
+            board for board in SCRAPERS if board in corpus.manifests
+        ]
+
+        with CorpusServer(latency=options["latency"], corpus=corpus) as server:
+            benchmark = ScraperBenchmark(corpus, server, options["repeat"])
+            results = benchmark.run(boards)
+
+        self.stdout.write(f"Версия корпуса: {corpus.version}")
+        self.stdout.write(format_results(results))
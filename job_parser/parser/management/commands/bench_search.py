@@ -0,0 +1,123 @@
+from parser.benchmarks.report import Baseline, format_report
+from parser.benchmarks.search import SearchBenchmark, query_shapes
+from parser.management.commands.generate_vacancies import (
+    SYNTHETIC_URL_PREFIX,
+    SYNTHETIC_USER_PREFIX,
+)
+from parser.models import Vacancies
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db.models import Count
+
+BASELINE_PATH = Path(__file__).resolve().parents[2] / "benchmarks/baselines/search.json"
+
+
+class Command(BaseCommand):
+    """
+    Команда для замеров производительности поиска вакансий.
+
+    Выполняет фиксированный набор поисковых запросов на данных, созданных командой
+    `generate_vacancies`, и сравнивает p50/p95 и количество SQL-запросов
+    с сохраненным эталоном.
+    """
+
+    help = "Замеряет производительность поиска вакансий"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--warmup", type=int, default=2)
+        parser.add_argument(
+            "--shape",
+            action="append",
+            help="Форма запроса для замера, по умолчанию - все",
+        )
+        parser.add_argument(
+            "--username",
+            help="Пользователь для поиска, по умолчанию - с самым большим списком",
+        )
+        parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+        parser.add_argument(
+            "--save-baseline",
+            action="store_true",
+            help="Сохранить результаты как новый эталон",
+        )
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=0.2,
+            help="Допустимый относительный рост p95",
+        )
+        parser.add_argument(
+            "--fail-on-regression",
+            action="store_true",
+            help="Завершиться с ошибкой при обнаружении регрессии",
+        )
+
+    def handle(self, *args, **options) -> None:
+        user = self.get_user(options["username"])
+        shapes = query_shapes()
+        if options["shape"]:
+            unknown = set(options["shape"]).difference(shapes)
+            if unknown:
+                raise CommandError(f"Неизвестные формы запроса: {', '.join(unknown)}")
+            shapes = {name: shapes[name] for name in options["shape"]}
+
+        benchmark = SearchBenchmark(user, options["repeat"], options["warmup"])
+        measurements = benchmark.run(shapes)
+
+        baseline = Baseline(options["baseline"])
+        rows = baseline.compare(measurements, options["tolerance"])
+        self.stdout.write(format_report(rows))
+
+        if options["save_baseline"]:
+            baseline.save(measurements, self.get_meta(user, options))
+            self.stdout.write(self.style.SUCCESS(f"Эталон сохранен: {baseline.path}"))
+
+        regressions = [row["name"] for row in rows if row["regression"]]
+        if regressions and options["fail_on_regression"]:
+            raise CommandError(f"Обнаружены регрессии: {', '.join(regressions)}")
+
+    def get_user(self, username: str | None) -> User:
+        """
+        Возвращает пользователя, от имени которого выполняется поиск.
+
+        Args:
+            username (str | None): Имя пользователя.
+
+        Returns:
+            User: Пользователь с самым большим списком, если имя не указано.
+        """
+        users = User.objects.filter(username__startswith=SYNTHETIC_USER_PREFIX)
+        if username:
+            users = User.objects.filter(username=username)
+        user = users.annotate(lists=Count("uservacancies")).order_by("-lists").first()
+        if user is None:
+            raise CommandError(
+                "Пользователь не найден, сначала выполните generate_vacancies"
+            )
+        return user
+
+    def get_meta(self, user: User, options: dict) -> dict:
+        """
+        Возвращает описание условий замеров для сохранения вместе с эталоном.
+
+        Args:
+            user (User): Пользователь, от имени которого выполнялся поиск.
+            options (dict): Параметры команды.
+
+        Returns:
+            dict: Условия замеров.
+        """
+        return {
+            "vacancies": Vacancies.objects.filter(
+                url__startswith=SYNTHETIC_URL_PREFIX
+            ).count(),
+            "users": User.objects.filter(
+                username__startswith=SYNTHETIC_USER_PREFIX
+            ).count(),
+            "user_lists": user.uservacancies_set.count(),
+            "repeat": options["repeat"],
+            "warmup": options["warmup"],
+        }
@@ -0,0 +1,67 @@
+import platform
+import sys
+from parser.benchmarks.report import Baseline, format_report
+from parser.benchmarks.startup import SCENARIOS, StartupBenchmark
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+BASELINE_PATH = (
+    Path(__file__).resolve().parents[2] / "benchmarks/baselines/startup.json"
+)
+
+
+class Command(BaseCommand):
+    """
+    Команда для замеров времени запуска и памяти воркера.
+
+    Каждый сценарий выполняется в новом процессе: импорт модуля задач,
+    как при запуске воркера huey, и создание конфигурации парсеров
+    и скраперов перед первым запуском загрузки.
+    """
+
+    help = "Замеряет время импорта модулей задач и создания конфигурации"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+        parser.add_argument(
+            "--save-baseline",
+            action="store_true",
+            help="Сохранить результаты как новый эталон",
+        )
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=0.2,
+            help="Допустимый относительный рост p95",
+        )
+        parser.add_argument(
+            "--fail-on-regression",
+            action="store_true",
+            help="Завершиться с ошибкой при обнаружении регрессии",
+        )
+
+    def handle(self, *args, **options) -> None:
+        measurements = StartupBenchmark(options["repeat"]).run(SCENARIOS)
+
+        baseline = Baseline(options["baseline"])
+        rows = baseline.compare(measurements, options["tolerance"])
+        self.stdout.write(format_report(rows))
+        for item in measurements:
+            self.stdout.write(f"{item.name}: пиковая память {item.extra['rss_mb']} МБ")
+
+        if options["save_baseline"]:
+            baseline.save(
+                measurements,
+                {
+                    "repeat": options["repeat"],
+                    "python": sys.version.split()[0],
+                    "platform": platform.platform(),
+                },
+            )
+            self.stdout.write(self.style.SUCCESS(f"Эталон сохранен: {baseline.path}"))
+
+        regressions = [row["name"] for row in rows if row["regression"]]
+        if regressions and options["fail_on_regression"]:
+            raise CommandError(f"Обнаружены регрессии: {', '.join(regressions)}")
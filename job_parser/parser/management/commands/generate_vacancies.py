@@ -0,0 +1,184 @@
+import time
+from itertools import islice
+from parser.benchmarks.synthetic import SyntheticDataset
+from parser.models import UserVacancies, Vacancies, VacancyDescription
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import transaction
+
+SYNTHETIC_URL_PREFIX = "https://synthetic.local/"
+SYNTHETIC_USER_PREFIX = "bench_user_"
+
+
+class Command(BaseCommand):
+    """
+    Команда для генерации синтетического набора данных.
+
+    Создает вакансии и пользователей с черными списками, избранным и скрытыми
+    компаниями в объеме, сопоставимом с боевым. Используется вместе с командой
+    `bench_search` для замеров производительности поиска.
+
+    Количество вакансий и пользователей - итоговый объем синтетических данных:
+    повторный запуск досоздает недостающие записи, а не добавляет новые.
+    """
+
+    help = "Генерирует синтетические вакансии и пользовательские списки"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--vacancies", type=int, default=1_000_000)
+        parser.add_argument("--users", type=int, default=10_000)
+        parser.add_argument(
+            "--max-blacklist",
+            type=int,
+            default=5000,
+            help="Максимальный размер черного списка одного пользователя",
+        )
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument(
+            "--clear",
+            action="store_true",
+            help="Удалить ранее сгенерированные данные перед генерацией",
+        )
+
+    def handle(self, *args, **options) -> None:
+        dataset = SyntheticDataset(seed=options["seed"])
+        batch_size = options["batch_size"]
+
+        if options["clear"]:
+            self.clear()
+
+        start = time.perf_counter()
+        self.create_vacancies(dataset, options["vacancies"], batch_size)
+        self.create_users(options["users"], batch_size)
+        self.create_user_vacancies(dataset, options["max_blacklist"], batch_size)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Синтетические данные созданы за {time.perf_counter() - start:.1f} с"
+            )
+        )
+
+    def clear(self) -> None:
+        """Удаляет ранее сгенерированные вакансии и пользователей."""
+        UserVacancies.objects.filter(
+            user__username__startswith=SYNTHETIC_USER_PREFIX
+        ).delete()
+        User.objects.filter(username__startswith=SYNTHETIC_USER_PREFIX).delete()
+        Vacancies.objects.filter(url__startswith=SYNTHETIC_URL_PREFIX).delete()
+        self.stdout.write("Ранее сгенерированные данные удалены")
+
+    def create_vacancies(
+        self, dataset: SyntheticDataset, count: int, batch_size: int
+    ) -> None:
+        """
+        Досоздает вакансии до `count` штук пачками по `batch_size` штук.
+
+        Args:
+            dataset (SyntheticDataset): Генератор данных.
+            count (int): Итоговое количество вакансий.
+            batch_size (int): Размер пачки.
+        """
+        start = Vacancies.objects.filter(url__startswith=SYNTHETIC_URL_PREFIX).count()
+        rows = dataset.vacancies(max(count - start, 0), start=start)
+        created = 0
+        while batch := list(islice(rows, batch_size)):
+            Vacancies.objects.bulk_create(
+                [Vacancies(**row) for row in batch], ignore_conflicts=True
+            )
+            VacancyDescription.objects.store(
+                {row["url"]: row["description"] for row in batch}
+            )
+            created += len(batch)
+            if created % (batch_size * 20) == 0:
+                self.stdout.write(f"Вакансий создано: {created}")
+        self.stdout.write(f"Вакансий создано: {created}")
+
+    def create_users(self, count: int, batch_size: int) -> None:
+        """
+        Досоздает пользователей без пароля до `count` штук.
+
+        Args:
+            count (int): Итоговое количество пользователей.
+            batch_size (int): Размер пачки.
+        """
+        existing = User.objects.filter(
+            username__startswith=SYNTHETIC_USER_PREFIX
+        ).count()
+        users = [
+            User(username=f"{SYNTHETIC_USER_PREFIX}{num}", password=make_password(None))
+            for num in range(existing, count)
+        ]
+        User.objects.bulk_create(users, batch_size=batch_size)
+        self.stdout.write(f"Пользователей создано: {len(users)}")
+
+    def create_user_vacancies(
+        self, dataset: SyntheticDataset, max_blacklist: int, batch_size: int
+    ) -> None:
+        """
+        Создает черные списки, избранное и скрытые компании пользователей.
+
+        Args:
+            dataset (SyntheticDataset): Генератор данных.
+            max_blacklist (int): Максимальный размер черного списка.
+            batch_size (int): Размер пачки.
+        """
+        vacancy_ids = list(
+            Vacancies.objects.filter(url__startswith=SYNTHETIC_URL_PREFIX).values_list(
+                "id", flat=True
+            )
+        )
+        if not vacancy_ids:
+            return
+        user_ids = list(
+            User.objects.filter(
+                username__startswith=SYNTHETIC_USER_PREFIX,
+                uservacancies__isnull=True,
+            ).values_list("id", flat=True)
+        )
+
+        rnd = dataset.rnd
+        buffer: list[UserVacancies] = []
+        created = 0
+        for user_id in user_ids:
+            blacklist = rnd.sample(
+                vacancy_ids,
+                min(dataset.blacklist_size(max_blacklist), len(vacancy_ids)),
+            )
+            favourites = rnd.sample(
+                vacancy_ids, min(rnd.randint(0, 20), len(vacancy_ids))
+            )
+            buffer.extend(
+                UserVacancies(user_id=user_id, vacancy_id=pk, is_blacklist=True)
+                for pk in blacklist
+            )
+            buffer.extend(
+                UserVacancies(user_id=user_id, vacancy_id=pk, is_favourite=True)
+                for pk in set(favourites).difference(blacklist)
+            )
+            hidden_companies = {dataset.company() for _ in range(rnd.randint(0, 3))}
+            buffer.extend(
+                UserVacancies(user_id=user_id, hidden_company=company)
+                for company in hidden_companies
+            )
+            if len(buffer) >= batch_size:
+                created += self.flush(buffer)
+        created += self.flush(buffer)
+        self.stdout.write(f"Пользовательских записей создано: {created}")
+
+    def flush(self, buffer: list[UserVacancies]) -> int:
+        """
+        Записывает накопленные пользовательские записи в базу данных.
+
+        Args:
+            buffer (list[UserVacancies]): Накопленные записи, очищается после записи.
+
+        Returns:
+            int: Количество записанных строк.
+        """
+        count = len(buffer)
+        with transaction.atomic():
+            UserVacancies.objects.bulk_create(buffer)
+        buffer.clear()
+        return count
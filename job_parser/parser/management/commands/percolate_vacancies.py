@@ -0,0 +1,40 @@
+import datetime
+from parser.models import Vacancies
+from parser.percolator import percolator
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    """
+    Команда для сопоставления сохраненных вакансий с подписками.
+
+    Новые вакансии сопоставляются с подписками при записи в базу данных.
+    Команда нужна для вакансий, записанных до появления или изменения
+    подписки, например после массового импорта профилей.
+    """
+
+    help = "Сопоставляет вакансии за последние дни с подписками на рассылку"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--days", type=int, default=1)
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options) -> None:
+        since = timezone.now() - datetime.timedelta(days=options["days"])
+        urls = (
+            Vacancies.objects.filter(published_at__gte=since)
+            .order_by("pk")
+            .values_list("url", flat=True)
+        )
+        batch: list[str] = []
+        matched = 0
+        for url in urls.iterator(chunk_size=options["batch_size"]):
+            batch.append(url)
+            if len(batch) >= options["batch_size"]:
+                matched += percolator.percolate(batch)
+                batch = []
+        if batch:
+            matched += percolator.percolate(batch)
+        self.stdout.write(f"Найдено совпадений: {matched}")
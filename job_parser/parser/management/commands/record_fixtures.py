@@ -0,0 +1,51 @@
+import asyncio
+from parser.benchmarks.ingest import BOARDS, DryRunDatabase
+from parser.parsing.config import ParserConfig
+from parser.parsing.replay import FixtureStore, RecordingWebClient
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandParser
+
+FIXTURES_PATH = Path(__file__).resolve().parents[2] / "benchmarks/fixtures/api"
+
+
+class Command(BaseCommand):
+    """
+    Команда для записи ответов API площадок в фикстуры.
+
+    Запускает парсеры на реальных API, сохраняя ответы списков и деталей вакансий.
+    Вакансии в базу данных не записываются.
+    """
+
+    help = "Записывает ответы API площадок для воспроизведения в бенчмарках"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--board",
+            action="append",
+            choices=BOARDS,
+            help="Площадка для записи, по умолчанию - все",
+        )
+        parser.add_argument(
+            "--pages",
+            type=int,
+            default=2,
+            help="Количество страниц списка вакансий",
+        )
+        parser.add_argument("--output", type=Path, default=FIXTURES_PATH)
+
+    def handle(self, *args, **options) -> None:
+        store = FixtureStore(options["output"])
+        config = ParserConfig()
+        config.db = DryRunDatabase()
+        config.use_client(RecordingWebClient(config, store))
+        for fetcher in config.fetchers:
+            fetcher.pages = options["pages"]
+
+        for board in options["board"] or BOARDS:
+            asyncio.run(getattr(config, f"{board}_parser").parse())
+            self.stdout.write(f"Ответы {board} записаны")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Записано фикстур: {sum(1 for _ in store)}")
+        )
@@ -0,0 +1,43 @@
+import asyncio
+from parser.parsing.main import JobParser
+from parser.scraping.main import StartScrapers
+from parser.tracing import PROFILERS, trace
+
+from django.core.management.base import BaseCommand, CommandParser
+
+# Методы запуска загрузки по названию сайта.
+SOURCES = {
+    "headhunter": (JobParser, "parse_headhunter"),
+    "zarplata": (JobParser, "parse_zarplata"),
+    "superjob": (JobParser, "parse_superjob"),
+    "trudvsem": (JobParser, "parse_trudvsem"),
+    "habr": (StartScrapers, "scrape_habr"),
+    "geekjob": (StartScrapers, "scrape_geekjob"),
+    "careerist": (StartScrapers, "scrape_careerist"),
+}
+
+
+class Command(BaseCommand):
+    """
+    Команда для однократного запуска загрузки вакансий с одного сайта.
+
+    Запуск трассируется так же, как периодические задачи, а параметр
+    `--profile` включает профилирование только этого запуска.
+    """
+
+    help = "Запускает загрузку вакансий с указанного сайта"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("source", choices=sorted(SOURCES))
+        parser.add_argument(
+            "--profile",
+            choices=PROFILERS,
+            help="Профилировщик: sample - свернутые стеки, cprofile - файл .prof. "
+            "По умолчанию используется настройка INGEST_PROFILE",
+        )
+
+    def handle(self, *args, **options) -> None:
+        runner, method = SOURCES[options["source"]]
+        with trace(f"ingest_{options['source']}", options["profile"]) as root:
+            asyncio.run(getattr(runner(), method)())
+        self.stdout.write(f"Загрузка завершена за {root.duration:.2f} с")
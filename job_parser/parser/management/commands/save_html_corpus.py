@@ -0,0 +1,77 @@
+import asyncio
+from parser.benchmarks.scraping import CORPUS_ROOT, SCRAPERS, Corpus
+from parser.scraping.configuration import Config
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandParser
+
+
+class Command(BaseCommand):
+    """
+    Команда для сохранения корпуса HTML-страниц площадок.
+
+    Скачивает страницы пагинации и часть страниц вакансий с реальных сайтов
+    и сохраняет их в новую версию корпуса для команды `bench_scrapers`.
+    """
+
+    help = "Сохраняет страницы площадок в новую версию корпуса"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--board",
+            action="append",
+            choices=SCRAPERS,
+            help="Площадка для сохранения, по умолчанию - все",
+        )
+        parser.add_argument(
+            "--pages",
+            type=int,
+            default=2,
+            help="Количество страниц пагинации",
+        )
+        parser.add_argument(
+            "--vacancies",
+            type=int,
+            default=30,
+            help="Количество страниц вакансий",
+        )
+        parser.add_argument("--root", type=Path, default=CORPUS_ROOT)
+
+    def handle(self, *args, **options) -> None:
+        corpus = Corpus.next_version(options["root"])
+        config = Config()
+        for board in options["board"] or SCRAPERS:
+            asyncio.run(self.save_board(corpus, config, board, options))
+            self.stdout.write(f"Страницы {board} сохранены")
+        corpus.save()
+        self.stdout.write(self.style.SUCCESS(f"Корпус сохранен: {corpus.directory}"))
+
+    async def save_board(
+        self, corpus: Corpus, config: Config, board: str, options: dict
+    ) -> None:
+        """
+        Сохраняет страницы одной площадки.
+
+        Args:
+            corpus (Corpus): Корпус страниц.
+            config (Config): Конфигурация скраперов.
+            board (str): Префикс площадки.
+            options (dict): Параметры команды.
+        """
+        scraper = getattr(config, f"{board}_scraper")
+        fetcher = scraper.fetcher
+        domain = getattr(config, f"{board}_domain")
+
+        links: list[str] = []
+        for page_num in range(1, options["pages"] + 1):
+            url = f"{fetcher.url}{page_num}"
+            page = await fetcher.fetch(url, kind="page")
+            if page is None:
+                continue
+            corpus.add(board, "listing", url, page[0])
+            links.extend(fetcher.extract_links(page[0], domain, scraper.selector))
+
+        for html, url in await fetcher.fetch_vacancy_pages(
+            links[: options["vacancies"]]
+        ):
+            corpus.add(board, "vacancy", url, html)
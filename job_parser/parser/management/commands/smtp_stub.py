@@ -0,0 +1,40 @@
+import time
+from parser.benchmarks.smtp import SmtpStubServer
+
+from django.core.management.base import BaseCommand, CommandParser
+
+
+class Command(BaseCommand):
+    """
+    Команда для запуска локального SMTP-сервера.
+
+    Сервер принимает все письма и выводит их получателей и темы, поэтому
+    рассылку можно проверить без настоящего почтового сервера, указав
+    `EMAIL_HOST=127.0.0.1`, `EMAIL_PORT` сервера и `EMAIL_USE_TLS=False`.
+    """
+
+    help = "Запускает локальный SMTP-сервер для проверки рассылки"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=1025)
+
+    def handle(self, *args, **options) -> None:
+        server = SmtpStubServer(host=options["host"], port=options["port"])
+        server.start()
+        self.stdout.write(f"SMTP-сервер запущен на {server.host}:{server.port}")
+        shown = 0
+        try:
+            while True:
+                time.sleep(1)
+                for message in server.messages[shown:]:
+                    self.stdout.write(f"{message['To']}: {message['Subject']}")
+                shown = len(server.messages)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.stop()
+            self.stdout.write(
+                f"Соединений: {server.stats.connections}, "
+                f"писем: {server.stats.messages}"
+            )
@@ -0,0 +1,114 @@
+from parser.descriptions import CODEC, compress, train_dictionary
+from parser.models import DescriptionDictionary, Vacancies, VacancyDescription
+
+from django.core.management.base import BaseCommand, CommandParser
+
+
+class Command(BaseCommand):
+    """
+    Команда для обучения словарей сжатия описаний вакансий.
+
+    Для каждого сайта словарь обучается на последних сохраненных описаниях
+    и используется при сжатии новых описаний сайта (см. `VacancyDescription`).
+    Уже сохраненные описания остаются сжатыми прежним словарем, пока их
+    не пересжать параметром `--recompress`.
+    """
+
+    help = "Обучает словари сжатия описаний вакансий по сайтам"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--board", action="append", help="Сайт, по умолчанию все сайты"
+        )
+        parser.add_argument("--samples", type=int, default=2000)
+        parser.add_argument("--min-samples", type=int, default=100)
+        parser.add_argument("--size", type=int, help="Размер словаря в байтах")
+        parser.add_argument(
+            "--recompress",
+            action="store_true",
+            help="Пересжать сохраненные описания новым словарем",
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options) -> None:
+        boards = options["board"] or list(
+            Vacancies.objects.order_by("job_board")
+            .values_list("job_board", flat=True)
+            .distinct()
+        )
+        for board in boards:
+            dictionary = self.train(board, options)
+            if dictionary is not None and options["recompress"]:
+                recompressed = self.recompress(board, options["batch_size"])
+                self.stdout.write(f"{board}: пересжато описаний: {recompressed}")
+
+    def train(self, board: str, options: dict) -> DescriptionDictionary | None:
+        """
+        Обучает словарь сайта и сравнивает размер описаний с ним и без него.
+
+        Args:
+            board (str): Название сайта.
+            options (dict): Параметры команды.
+
+        Returns:
+            DescriptionDictionary | None: Словарь или None, если описаний мало.
+        """
+        rows = VacancyDescription.objects.filter(vacancy__job_board=board).order_by(
+            "-vacancy__published_at"
+        )[: options["samples"]]
+        samples = [row.text for row in rows]
+        if len(samples) < options["min_samples"]:
+            self.stdout.write(f"{board}: мало описаний для обучения: {len(samples)}")
+            return None
+        try:
+            data = train_dictionary(samples, CODEC, options["size"])
+        except Exception as exc:
+            self.stderr.write(f"{board}: словарь не обучен: {exc}")
+            return None
+        if not data:
+            self.stdout.write(f"{board}: в описаниях нет общих фрагментов")
+            return None
+        dictionary = DescriptionDictionary.objects.create(
+            job_board=board, codec=CODEC, data=data, samples=len(samples)
+        )
+        DescriptionDictionary.clear_cache()
+        plain = sum(len(compress(sample, CODEC)) for sample in samples)
+        trained = sum(len(compress(sample, CODEC, data)) for sample in samples)
+        self.stdout.write(
+            f"{board}: словарь {CODEC} {len(data)} байт, описания без словаря "
+            f"{plain} байт, со словарем {trained} байт"
+        )
+        return dictionary
+
+    def recompress(self, board: str, batch_size: int) -> int:
+        """
+        Пересжимает описания сайта последним словарем.
+
+        Args:
+            board (str): Название сайта.
+            batch_size (int): Размер пакета обновления.
+
+        Returns:
+            int: Количество пересжатых описаний.
+        """
+        dictionary_id = DescriptionDictionary.active(board)
+        pks = list(
+            VacancyDescription.objects.filter(vacancy__job_board=board)
+            .exclude(dictionary_id=dictionary_id)
+            .values_list("pk", flat=True)
+        )
+        for start in range(0, len(pks), batch_size):
+            batch = list(
+                VacancyDescription.objects.filter(
+                    pk__in=pks[start : start + batch_size]
+                )
+            )
+            for row in batch:
+                packed = VacancyDescription.pack(row.text, board)
+                row.codec = packed["codec"]
+                row.dictionary_id = packed["dictionary_id"]
+                row.data = packed["data"]
+            VacancyDescription.objects.bulk_update(
+                batch, ["codec", "dictionary", "data"]
+            )
+        return len(pks)
@@ -0,0 +1,184 @@
+# Generated by Django 4.1.5 on 2026-10-19 07:33
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Vacancies",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "job_board",
+                    models.CharField(max_length=100, verbose_name="Площадка"),
+                ),
+                ("url", models.URLField(unique=True)),
+                (
+                    "title",
+                    models.CharField(
+                        db_index=True,
+                        max_length=255,
+                        null=True,
+                        verbose_name="Вакансия",
+                    ),
+                ),
+                (
+                    "salary_from",
+                    models.IntegerField(
+                        blank=True, null=True, verbose_name="Зарплата от"
+                    ),
+                ),
+                (
+                    "salary_to",
+                    models.IntegerField(
+                        blank=True, null=True, verbose_name="Зарплата до"
+                    ),
+                ),
+                (
+                    "salary_currency",
+                    models.CharField(
+                        blank=True, max_length=30, null=True, verbose_name="Валюта"
+                    ),
+                ),
+                (
+                    "description",
+                    models.TextField(
+                        blank=True,
+                        max_length=10000,
+                        null=True,
+                        verbose_name="Описание вакансии",
+                    ),
+                ),
+                (
+                    "city",
+                    models.TextField(
+                        blank=True, max_length=500, null=True, verbose_name="Город"
+                    ),
+                ),
+                (
+                    "company",
+                    models.CharField(
+                        blank=True, max_length=500, null=True, verbose_name="Компания"
+                    ),
+                ),
+                (
+                    "employment",
+                    models.CharField(
+                        blank=True,
+                        max_length=255,
+                        null=True,
+                        verbose_name="Тип занятости",
+                    ),
+                ),
+                (
+                    "schedule",
+                    models.CharField(
+                        blank=True,
+                        max_length=255,
+                        null=True,
+                        verbose_name="График работы",
+                    ),
+                ),
+                (
+                    "experience",
+                    models.CharField(
+                        blank=True,
+                        max_length=100,
+                        null=True,
+                        verbose_name="Опыт работы",
+                    ),
+                ),
+                (
+                    "remote",
+                    models.BooleanField(
+                        blank=True,
+                        default=False,
+                        null=True,
+                        verbose_name="Удаленная компания",
+                    ),
+                ),
+                (
+                    "published_at",
+                    models.DateTimeField(
+                        blank=True,
+                        db_index=True,
+                        null=True,
+                        verbose_name="Дата публикации",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Вакансия",
+                "verbose_name_plural": "Вакансии",
+                "ordering": ["-published_at"],
+            },
+        ),
+        migrations.CreateModel(
+            name="UserVacancies",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "hidden_company",
+                    models.CharField(
+                        max_length=255, null=True, verbose_name="Компания скрыта"
+                    ),
+                ),
+                (
+                    "is_favourite",
+                    models.BooleanField(default=False, verbose_name="В избранном"),
+                ),
+                (
+                    "is_blacklist",
+                    models.BooleanField(default=False, verbose_name="В черном списке"),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Пользователь",
+                    ),
+                ),
+                (
+                    "vacancy",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="parser.vacancies",
+                        verbose_name="Вакансия",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Вакансия пользователя",
+                "verbose_name_plural": "Вакансии пользователя",
+            },
+        ),
+    ]
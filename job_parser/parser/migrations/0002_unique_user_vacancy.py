@@ -0,0 +1,51 @@
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def normalize_user_vacancies(apps, schema_editor):
+    """
+    Приводит пользовательские списки к виду, допускающему уникальное ограничение.
+
+    Дубликаты пары пользователь - вакансия объединяются в одну строку.
+    Вакансия не может одновременно находиться в избранном и черном списке,
+    при конфликте приоритет у черного списка. Строки без признаков удаляются.
+    """
+    UserVacancies = apps.get_model("parser", "UserVacancies")
+    duplicates = (
+        UserVacancies.objects.filter(vacancy__isnull=False)
+        .values("user", "vacancy")
+        .annotate(rows=Count("id"), keep=Min("id"))
+        .filter(rows__gt=1)
+    )
+    for duplicate in duplicates.iterator():
+        rows = UserVacancies.objects.filter(
+            user=duplicate["user"], vacancy=duplicate["vacancy"]
+        )
+        is_blacklist = rows.filter(is_blacklist=True).exists()
+        is_favourite = rows.filter(is_favourite=True).exists()
+        rows.exclude(id=duplicate["keep"]).delete()
+        rows.update(is_blacklist=is_blacklist, is_favourite=is_favourite)
+
+    UserVacancies.objects.filter(is_blacklist=True, is_favourite=True).update(
+        is_favourite=False
+    )
+    UserVacancies.objects.filter(
+        is_blacklist=False, is_favourite=False, hidden_company__isnull=True
+    ).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("parser", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_user_vacancies, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="uservacancies",
+            constraint=models.UniqueConstraint(
+                fields=("user", "vacancy"), name="unique_user_vacancy"
+            ),
+        ),
+    ]
@@ -0,0 +1,44 @@
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def deduplicate_hidden_companies(apps, schema_editor):
+    """
+    Удаляет повторно скрытые компании перед добавлением уникального ограничения.
+
+    Из дубликатов пары пользователь - компания остается строка с наименьшим
+    идентификатором. У остальных строк, относящихся к вакансии или спискам,
+    сбрасывается скрытая компания, пустые строки удаляются.
+    """
+    UserVacancies = apps.get_model("parser", "UserVacancies")
+    duplicates = (
+        UserVacancies.objects.filter(hidden_company__isnull=False)
+        .values("user", "hidden_company")
+        .annotate(rows=Count("id"), keep=Min("id"))
+        .filter(rows__gt=1)
+    )
+    for duplicate in duplicates.iterator():
+        rows = UserVacancies.objects.filter(
+            user=duplicate["user"], hidden_company=duplicate["hidden_company"]
+        ).exclude(id=duplicate["keep"])
+        rows.filter(
+            vacancy__isnull=True, is_favourite=False, is_blacklist=False
+        ).delete()
+        rows.update(hidden_company=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("parser", "0002_unique_user_vacancy"),
+    ]
+
+    operations = [
+        migrations.RunPython(deduplicate_hidden_companies, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="uservacancies",
+            constraint=models.UniqueConstraint(
+                fields=("user", "hidden_company"), name="unique_user_hidden_company"
+            ),
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 4.1.5 on 2026-10-19 07:57
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("profiles", "0001_initial"),
+        ("parser", "0003_unique_user_hidden_company"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SubscriptionMatch",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True,
+                        db_index=True,
+                        verbose_name="Дата сопоставления",
+                    ),
+                ),
+                (
+                    "profile",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="profiles.profile",
+                        verbose_name="Профиль",
+                    ),
+                ),
+                (
+                    "vacancy",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="parser.vacancies",
+                        verbose_name="Вакансия",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Совпадение подписки",
+                "verbose_name_plural": "Совпадения подписок",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="subscriptionmatch",
+            constraint=models.UniqueConstraint(
+                fields=("profile", "vacancy"), name="unique_profile_vacancy"
+            ),
+        ),
+    ]
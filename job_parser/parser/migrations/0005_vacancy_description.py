@@ -0,0 +1,176 @@
+import html
+import re
+import zlib
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+BATCH_SIZE = 1000
+
+# Миграция не зависит от `parser.descriptions`: описания переносятся
+# кодеком zlib из стандартной библиотеки без словаря, а при откате
+# распаковываются любым кодеком, которым их могло сжать приложение.
+CODEC = "zlib"
+LEVEL = 9
+TAG_RE = re.compile(r"<[^>]+>")
+
+
+def plain_text(description):
+    """Приводит описание к тексту для поиска."""
+    text = html.unescape(TAG_RE.sub(" ", description))
+    return " ".join(text.split()).casefold()
+
+
+def decompress(data, codec, dictionary):
+    """Распаковывает описание, сжатое zlib или zstd."""
+    if codec == "zstd":
+        import zstandard
+
+        options = (
+            {"dict_data": zstandard.ZstdCompressionDict(dictionary)}
+            if dictionary
+            else {}
+        )
+        return zstandard.ZstdDecompressor(**options).decompress(bytes(data)).decode()
+    options = {"zdict": dictionary} if dictionary else {}
+    decompressor = zlib.decompressobj(**options)
+    return (decompressor.decompress(bytes(data)) + decompressor.flush()).decode()
+
+
+def copy_descriptions(apps, schema_editor):
+    """Переносит описания вакансий в отдельную таблицу в сжатом виде."""
+    Vacancies = apps.get_model("parser", "Vacancies")
+    VacancyDescription = apps.get_model("parser", "VacancyDescription")
+    rows = (
+        Vacancies.objects.exclude(description__isnull=True)
+        .exclude(description="")
+        .values_list("pk", "description")
+    )
+    batch = []
+    for pk, description in rows.iterator(chunk_size=BATCH_SIZE):
+        batch.append(
+            VacancyDescription(
+                vacancy_id=pk,
+                codec=CODEC,
+                data=zlib.compress(description.encode(), LEVEL),
+                size=len(description.encode()),
+                search_text=plain_text(description),
+            )
+        )
+        if len(batch) >= BATCH_SIZE:
+            VacancyDescription.objects.bulk_create(batch)
+            batch = []
+    VacancyDescription.objects.bulk_create(batch)
+
+
+def restore_descriptions(apps, schema_editor):
+    """Возвращает распакованные описания в таблицу вакансий."""
+    Vacancies = apps.get_model("parser", "Vacancies")
+    VacancyDescription = apps.get_model("parser", "VacancyDescription")
+    rows = VacancyDescription.objects.select_related("dictionary")
+    batch = []
+    for row in rows.iterator(chunk_size=BATCH_SIZE):
+        dictionary = bytes(row.dictionary.data) if row.dictionary else None
+        batch.append(
+            Vacancies(
+                pk=row.vacancy_id,
+                description=decompress(row.data, row.codec, dictionary),
+            )
+        )
+        if len(batch) >= BATCH_SIZE:
+            Vacancies.objects.bulk_update(batch, ["description"])
+            batch = []
+    Vacancies.objects.bulk_update(batch, ["description"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("parser", "0004_subscription_match"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DescriptionDictionary",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "job_board",
+                    models.CharField(
+                        db_index=True, max_length=100, verbose_name="Площадка"
+                    ),
+                ),
+                ("codec", models.CharField(max_length=10, verbose_name="Кодек")),
+                ("data", models.BinaryField(verbose_name="Словарь")),
+                (
+                    "samples",
+                    models.IntegerField(default=0, verbose_name="Описаний в обучении"),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Дата обучения"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Словарь сжатия описаний",
+                "verbose_name_plural": "Словари сжатия описаний",
+            },
+        ),
+        migrations.CreateModel(
+            name="VacancyDescription",
+            fields=[
+                (
+                    "vacancy",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="description_data",
+                        serialize=False,
+                        to="parser.vacancies",
+                        verbose_name="Вакансия",
+                    ),
+                ),
+                ("codec", models.CharField(max_length=10, verbose_name="Кодек")),
+                ("data", models.BinaryField(verbose_name="Сжатое описание")),
+                (
+                    "size",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Размер описания"
+                    ),
+                ),
+                (
+                    "search_text",
+                    models.TextField(blank=True, verbose_name="Текст для поиска"),
+                ),
+                (
+                    "dictionary",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.PROTECT,
+                        to="parser.descriptiondictionary",
+                        verbose_name="Словарь",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Описание вакансии",
+                "verbose_name_plural": "Описания вакансий",
+            },
+        ),
+        migrations.RunPython(copy_descriptions, restore_descriptions),
+        migrations.RemoveField(
+            model_name="vacancies",
+            name="description",
+        ),
+    ]
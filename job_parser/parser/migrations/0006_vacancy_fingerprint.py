@@ -0,0 +1,44 @@
+# Generated by Django 4.1.5 on 2026-10-19 08:29
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("parser", "0005_vacancy_description"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="vacancies",
+            name="duplicate_of",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="duplicates",
+                to="parser.vacancies",
+                verbose_name="Дубликат вакансии",
+            ),
+        ),
+        migrations.AddField(
+            model_name="vacancies",
+            name="fingerprint",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                max_length=16,
+                null=True,
+                verbose_name="Отпечаток",
+            ),
+        ),
+        migrations.AddField(
+            model_name="vacancies",
+            name="simhash",
+            field=models.BigIntegerField(
+                blank=True, null=True, verbose_name="SimHash описания"
+            ),
+        ),
+    ]
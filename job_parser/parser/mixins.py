@@ -1,10 +1,16 @@
 from dataclasses import dataclass
+from parser.descriptions import plain_text
 from parser.forms import SearchingForm
 from parser.models import UserVacancies, Vacancies
+from parser.preferences import PreferenceSnapshot, preference_cache
 from parser.utils import Utils
 from typing import Any, Awaitable
 
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user
 from django.contrib.auth.mixins import AccessMixin
+from django.db import transaction
 from django.db.models import Q, QuerySet
 from django.http import HttpRequest, HttpResponse
 from logger import setup_logging
@@ -15,6 +21,31 @@ setup_logging()
 
 utils = Utils()
 
+# Виды действий пакетного изменения списков пользователя.
+BATCH_ACTIONS: tuple[str, ...] = ("favourite", "blacklist", "hide")
+
+# Количество строк в одном запросе пакетной вставки.
+BATCH_SIZE = 500
+
+
+async def aget_user(request: HttpRequest) -> Any:
+    """
+    Загружает пользователя запроса в асинхронном представлении.
+
+    `request.user` - ленивый объект, который при первом обращении читает сессию
+    и пользователя из базы данных. В асинхронном коде это обращение
+    выполняется в отдельном потоке, после чего `request.user` заменяется
+    загруженным пользователем и дальше используется без запросов.
+
+    Args:
+        request (HttpRequest): Объект запроса.
+
+    Returns:
+        Any: Пользователь или анонимный пользователь.
+    """
+    request.user = await sync_to_async(get_user)(request)
+    return request.user
+
 
 @dataclass
 class RequestParams:
@@ -83,7 +114,7 @@ class FormDataParser:
                 "title",
                 "date_from",
                 "date_to",
-                'company',
+                "company",
                 "salary_from",
                 "salary_to",
                 "title_search",
@@ -375,13 +406,18 @@ class VacancyFetcher:
             q_objects = await self.filter_by_experience(q_objects, params)
             q_objects = await self.filter_by_job_board(q_objects, params)
             q_objects = await self.filter_by_remote(q_objects, params)
-            vacancies = Vacancies.objects.filter(q_objects)
+            q_objects = await self.filter_duplicates(q_objects)
+            vacancies = Vacancies.objects.filter(q_objects).select_related(
+                "description_data"
+            )
         return vacancies
 
     async def filter_by_title(self, q_objects: Q, params: RequestParams) -> Q:
         """Метод фильтрации по названию.
 
         Этот метод добавляет условия фильтрации по названию вакансии к объекту Q.
+        Если поиск не ограничен названием, условие проверяет также текст описания,
+        сохраненный для поиска без сжатия (см. `VacancyDescription.search_text`).
 
         Args:
             q_objects (Q): Объект Q, содержащий текущие условия фильтрации.
@@ -395,7 +431,7 @@ class VacancyFetcher:
                 q_objects &= Q(title__icontains=params.title)
             else:
                 q_objects &= Q(title__icontains=params.title) | Q(
-                    description__icontains=params.title
+                    description_data__search_text__contains=plain_text(params.title)
                 )
         return q_objects
 
@@ -433,7 +469,7 @@ class VacancyFetcher:
         if params.date_to:
             q_objects &= Q(published_at__lte=params.date_to)
         return q_objects
-    
+
     async def filter_by_company(self, q_objects: Q, params: RequestParams) -> Q:
         """Метод фильтрации по компании.
 
@@ -521,6 +557,23 @@ class VacancyFetcher:
             q_objects &= Q(remote=True)
         return q_objects
 
+    async def filter_duplicates(self, q_objects: Q) -> Q:
+        """Метод скрытия дубликатов.
+
+        Если включена настройка `DEDUP_COLLAPSE_RESULTS`, этот метод добавляет
+        к объекту Q условие, скрывающее вакансии, уже найденные на другом сайте
+        (см. `parser.dedup`).
+
+        Args:
+            q_objects (Q): Объект Q, содержащий текущие условия фильтрации.
+
+        Returns:
+            Q: Обновленный объект Q с добавленными условиями фильтрации.
+        """
+        if settings.DEDUP_COLLAPSE_RESULTS:
+            q_objects &= Q(duplicate_of__isnull=True)
+        return q_objects
+
 
 class AsyncLoginRequiredMixin(AccessMixin):
     """
@@ -539,6 +592,7 @@ class AsyncLoginRequiredMixin(AccessMixin):
         """Асинхронный метод dispatch для обработки запросов.
 
         В этом методе выполняется проверка аутентификации пользователя.
+        Пользователь загружается функцией `aget_user`.
         Если пользователь не аутентифицирован, вызывается метод handle_no_permission,
         который возвращает объект HttpResponseRedirect для перенаправления пользователя
         на страницу входа.
@@ -549,11 +603,196 @@ class AsyncLoginRequiredMixin(AccessMixin):
         Returns:
             Awaitable[HttpResponse]: Объект ответа.
         """
-        if not request.user.is_authenticated:
+        user = await aget_user(request)
+        if not user.is_authenticated:
             return self.handle_no_permission()
         return await super().dispatch(request, *args, **kwargs)
 
 
+class UserVacanciesMixin:
+    """
+    Миксин для изменения пользовательских списков вакансий.
+
+    Каждое действие выполняется одним SQL-запросом: добавление - вставкой
+    с обновлением при конфликте по паре пользователь - вакансия, удаление -
+    удалением строки по условию. Вакансия находится либо в избранном, либо
+    в черном списке, поэтому строка с признаком всегда относится к одному списку.
+    После изменения увеличивается версия списков в `preference_cache`.
+    """
+
+    async def upsert_user_vacancy(
+        self, request: HttpRequest, pk: int | str, **flags: bool
+    ) -> None:
+        """
+        Асинхронный метод для добавления вакансии в список пользователя.
+
+        Если строка для пары пользователь - вакансия уже существует, в ней
+        обновляются только переданные признаки.
+
+        Args:
+            request (HttpRequest): Объект запроса.
+            pk (int | str): Идентификатор вакансии.
+            **flags (bool): Значения признаков `is_favourite` и `is_blacklist`.
+
+        Raises:
+            IntegrityError: Если вакансия не существует.
+            ValueError: Если идентификатор вакансии невалиден.
+        """
+        await UserVacancies.objects.abulk_create(
+            [UserVacancies(user_id=request.user.pk, vacancy_id=int(pk), **flags)],
+            update_conflicts=True,
+            unique_fields=["user", "vacancy"],
+            update_fields=list(flags),
+        )
+        await preference_cache.ainvalidate(request.user.pk)
+
+    async def delete_user_vacancy(
+        self, request: HttpRequest, pk: int | str, **flags: bool
+    ) -> int:
+        """
+        Асинхронный метод для удаления вакансии из списка пользователя.
+
+        Args:
+            request (HttpRequest): Объект запроса.
+            pk (int | str): Идентификатор вакансии.
+            **flags (bool): Признак списка, из которого удаляется вакансия.
+
+        Returns:
+            int: Количество удаленных строк.
+
+        Raises:
+            ValueError: Если идентификатор вакансии невалиден.
+        """
+        deleted, _ = await UserVacancies.objects.filter(
+            user_id=request.user.pk, vacancy_id=int(pk), **flags
+        ).adelete()
+        await preference_cache.ainvalidate(request.user.pk)
+        return deleted
+
+    async def clear_user_list(self, request: HttpRequest, field: str) -> dict:
+        """
+        Асинхронный метод для очистки списка пользователя.
+
+        Строки, которые после очистки не относились бы ни к одному списку,
+        удаляются одним запросом, в остальных признак списка сбрасывается
+        вторым запросом. Оба запроса выполняются в одной транзакции, поэтому
+        количество обращений к базе данных не зависит от размера списка.
+
+        Args:
+            request (HttpRequest): Объект запроса.
+            field (str): Признак списка: `is_favourite`, `is_blacklist`
+            или `hidden_company`.
+
+        Returns:
+            dict: Количество обновленных и удаленных строк.
+        """
+        return await sync_to_async(self._clear_user_list)(request.user.pk, field)
+
+    @staticmethod
+    def _clear_user_list(user_id: int, field: str) -> dict:
+        in_list = {
+            "is_favourite": Q(is_favourite=True),
+            "is_blacklist": Q(is_blacklist=True),
+            "hidden_company": Q(hidden_company__isnull=False),
+        }
+        cleared = {"is_favourite": False, "is_blacklist": False, "hidden_company": None}
+        in_other_lists = Q()
+        for other in in_list.keys() - {field}:
+            in_other_lists |= in_list[other]
+
+        rows = UserVacancies.objects.filter(in_list[field], user_id=user_id)
+        with transaction.atomic():
+            deleted, _ = rows.exclude(in_other_lists).delete()
+            updated = rows.update(**{field: cleared[field]})
+        preference_cache.invalidate(user_id)
+        return {"updated": updated, "deleted": deleted}
+
+    async def apply_batch(self, request: HttpRequest, operations: dict) -> dict:
+        """
+        Асинхронный метод для пакетного изменения списков пользователя.
+
+        Вакансии из `favourite` и `blacklist` добавляются в соответствующий
+        список вставкой с обновлением при конфликте, компании из `hide`
+        скрываются вставкой с пропуском существующих строк. Все изменения
+        выполняются в одной транзакции пакетами по `BATCH_SIZE` строк.
+
+        Args:
+            request (HttpRequest): Объект запроса.
+            operations (dict): Списки идентификаторов вакансий и названий
+            компаний по видам действий.
+
+        Returns:
+            dict: Статус каждого элемента по видам действий: `ok`, `invalid`,
+            `not_found` или `conflict`, если вакансия передана и в избранное,
+            и в черный список.
+        """
+        return await sync_to_async(self._apply_batch)(request.user.pk, operations)
+
+    @staticmethod
+    def _apply_batch(user_id: int, operations: dict) -> dict:
+        statuses: dict[str, dict[str, str]] = {action: {} for action in BATCH_ACTIONS}
+        actions_by_pk: dict[int, set[str]] = {}
+        for action in ("favourite", "blacklist"):
+            for item in operations.get(action) or []:
+                try:
+                    pk = int(item)
+                except (TypeError, ValueError):
+                    statuses[action][str(item)] = "invalid"
+                    continue
+                actions_by_pk.setdefault(pk, set()).add(action)
+
+        existing = set(
+            Vacancies.objects.filter(pk__in=actions_by_pk).values_list("pk", flat=True)
+        )
+        rows: dict[str, list[UserVacancies]] = {"favourite": [], "blacklist": []}
+        for pk, actions in actions_by_pk.items():
+            if pk not in existing:
+                status = "not_found"
+            elif len(actions) > 1:
+                status = "conflict"
+            else:
+                status = "ok"
+                action = next(iter(actions))
+                rows[action].append(
+                    UserVacancies(
+                        user_id=user_id,
+                        vacancy_id=pk,
+                        is_favourite=action == "favourite",
+                        is_blacklist=action == "blacklist",
+                    )
+                )
+            for action in actions:
+                statuses[action][str(pk)] = status
+
+        companies = []
+        for item in operations.get("hide") or []:
+            if isinstance(item, str) and 0 < len(item.strip()) <= 255:
+                companies.append(item.strip())
+                statuses["hide"][item] = "ok"
+            else:
+                statuses["hide"][str(item)] = "invalid"
+
+        with transaction.atomic():
+            for action_rows in rows.values():
+                UserVacancies.objects.bulk_create(
+                    action_rows,
+                    batch_size=BATCH_SIZE,
+                    update_conflicts=True,
+                    unique_fields=["user", "vacancy"],
+                    update_fields=["is_favourite", "is_blacklist"],
+                )
+            UserVacancies.objects.bulk_create(
+                [
+                    UserVacancies(user_id=user_id, hidden_company=company)
+                    for company in dict.fromkeys(companies)
+                ],
+                batch_size=BATCH_SIZE,
+                ignore_conflicts=True,
+            )
+        preference_cache.invalidate(user_id)
+        return statuses
+
+
 class VacanciesMixin:
     """
     Класс-примесь для работы с вакансиями.
@@ -616,10 +855,10 @@ class VacanciesMixin:
         анонимным. Если пользователь анонимный, то метод возвращает список вакансий
         без изменений и пустой список избранных вакансий.
 
-        Если пользователь не анонимный, то метод получает список пользовательских
-        вакансий и вызывает методы `get_blacklist_urls`, `get_favourite_urls` и
-        `get_hidden_companies` для получения соответствующих списков URL-адресов и
-        компаний. Затем метод вызывает методы `get_filtered_vacancies` и
+        Если пользователь не анонимный, то метод получает снимок пользовательских
+        списков из `preference_cache` и вызывает методы `get_blacklist_urls`,
+        `get_favourite_urls` и `get_hidden_companies` для получения соответствующих
+        списков URL-адресов и компаний. Затем метод вызывает методы `get_filtered_vacancies` и
         `get_favourite_vacancies` для получения соответствующих списков вакансий.
         Возвращает кортеж из двух списков: отфильтрованных вакансий и избранных
         вакансий.
@@ -637,11 +876,11 @@ class VacanciesMixin:
             if user.is_anonymous:
                 return vacancies, []
 
-            user_vacancies = UserVacancies.objects.filter(user=user)
+            preferences = preference_cache.get(user.pk)
 
-            blacklist_urls = self.get_blacklist_urls(vacancies, user_vacancies)
-            favourite_urls = self.get_favourite_urls(vacancies, user_vacancies)
-            hidden_companies = self.get_hidden_companies(vacancies, user_vacancies)
+            blacklist_urls = self.get_blacklist_urls(vacancies, preferences)
+            favourite_urls = self.get_favourite_urls(vacancies, preferences)
+            hidden_companies = self.get_hidden_companies(vacancies, preferences)
 
             filtered_vacancies = self.get_filtered_vacancies(
                 vacancies, blacklist_urls, hidden_companies
@@ -657,79 +896,70 @@ class VacanciesMixin:
 
         return filtered_vacancies, favourite_vacancies
 
-    def get_blacklist_urls(self, vacancies: QuerySet, user_vacancies: QuerySet) -> set:
+    def get_blacklist_urls(
+        self, vacancies: QuerySet, preferences: PreferenceSnapshot
+    ) -> frozenset[int]:
         """
         Метод для получения списка URL-адресов вакансий из черного списка.
 
-        Метод принимает на вход объекты класса `QuerySet` с вакансиями и
-        пользовательскими вакансиями и возвращает множество URL-адресов вакансий,
+        Метод принимает на вход объект класса `QuerySet` с вакансиями и снимок
+        пользовательских списков и возвращает множество URL-адресов вакансий,
         которые находятся в черном списке пользователя.
 
         Args:
             vacancies (QuerySet): Объект класса `QuerySet` с вакансиями.
-            user_vacancies (QuerySet): Объект класса `QuerySet` с пользовательскими
-            вакансиями.
+            preferences (PreferenceSnapshot): Снимок пользовательских списков.
 
         Returns:
-            set: Множество URL-адресов вакансий из черного списка.
+            frozenset[int]: Множество URL-адресов вакансий из черного списка.
         """
-        blacklist_urls = set(
-            user_vacancy.vacancy_id
-            for user_vacancy in user_vacancies
-            if user_vacancy.is_blacklist
-        )
-        return blacklist_urls.intersection(vacancy.pk for vacancy in vacancies)
+        return preferences.blacklist.intersection(vacancy.pk for vacancy in vacancies)
 
-    def get_favourite_urls(self, vacancies: QuerySet, user_vacancies: QuerySet) -> set:
+    def get_favourite_urls(
+        self, vacancies: QuerySet, preferences: PreferenceSnapshot
+    ) -> frozenset[int]:
         """
         Метод для получения списка URL-адресов избранных вакансий.
 
-        Метод принимает на вход объекты класса `QuerySet` с вакансиями и
-        пользовательскими вакансиями и возвращает множество URL-адресов избранных
+        Метод принимает на вход объект класса `QuerySet` с вакансиями и снимок
+        пользовательских списков и возвращает множество URL-адресов избранных
         вакансий пользователя.
 
         Args:
             vacancies (QuerySet): Объект класса `QuerySet` с вакансиями.
-            user_vacancies (QuerySet): Объект класса `QuerySet` с пользовательскими
-            вакансиями.
+            preferences (PreferenceSnapshot): Снимок пользовательских списков.
 
         Returns:
-            set: Множество URL-адресов избранных вакансий.
+            frozenset[int]: Множество URL-адресов избранных вакансий.
         """
-        favourite_urls = set(
-            user_vacancy.vacancy_id
-            for user_vacancy in user_vacancies
-            if user_vacancy.is_favourite and not user_vacancy.is_blacklist
-        )
-        return favourite_urls.intersection(vacancy.pk for vacancy in vacancies)
+        return preferences.favourites.intersection(vacancy.pk for vacancy in vacancies)
 
     def get_hidden_companies(
-        self, vacancies: QuerySet, user_vacancies: QuerySet
-    ) -> set:
+        self, vacancies: QuerySet, preferences: PreferenceSnapshot
+    ) -> frozenset[str]:
         """
         Метод для получения списка скрытых компаний.
 
-        Метод принимает на вход объекты класса `QuerySet` с вакансиями и
-        пользовательскими вакансиями и возвращает множество названий компаний,
+        Метод принимает на вход объект класса `QuerySet` с вакансиями и снимок
+        пользовательских списков и возвращает множество названий компаний,
         которые пользователь скрыл.
 
         Args:
             vacancies (QuerySet): Объект класса `QuerySet` с вакансиями.
-            user_vacancies (QuerySet): Объект класса `QuerySet` с пользовательскими
-            вакансиями.
+            preferences (PreferenceSnapshot): Снимок пользовательских списков.
 
         Returns:
-            set: Множество названий скрытых компаний.
+            frozenset[str]: Множество названий скрытых компаний.
         """
-        hidden_companies = set()
-        for vacancy in vacancies:
-            for user_vacancy in user_vacancies:
-                if vacancy.company == user_vacancy.hidden_company:
-                    hidden_companies.add(user_vacancy.hidden_company)
-        return hidden_companies
+        return preferences.hidden_companies.intersection(
+            vacancy.company for vacancy in vacancies
+        )
 
     def get_filtered_vacancies(
-        self, vacancies: QuerySet, blacklist_urls: set, hidden_companies: set
+        self,
+        vacancies: QuerySet,
+        blacklist_urls: frozenset[int],
+        hidden_companies: frozenset[str],
     ) -> list:
         """
         Метод для получения множества отфильтрованных вакансий.
@@ -742,8 +972,8 @@ class VacanciesMixin:
 
         Args:
             vacancies (QuerySet): Объект класса `QuerySet` с вакансиями.
-            blacklist_urls (set): Множество URL-адресов из черного списка.
-            hidden_companies (set): Множество названий скрытых компаний.
+            blacklist_urls (frozenset[int]): Множество URL-адресов из черного списка.
+            hidden_companies (frozenset[str]): Множество названий скрытых компаний.
 
         Returns:
             list: Список отфильтрованных вакансий.
@@ -757,7 +987,10 @@ class VacanciesMixin:
         return filtered_vacancies
 
     def get_favourite_vacancies(
-        self, vacancies: QuerySet, favourite_urls: set, hidden_companies: set
+        self,
+        vacancies: QuerySet,
+        favourite_urls: frozenset[int],
+        hidden_companies: frozenset[str],
     ) -> list:
         """
         Метод для получения множества избранных вакансий.
@@ -770,8 +1003,8 @@ class VacanciesMixin:
 
         Args:
             vacancies (QuerySet): Объект класса `QuerySet` с вакансиями.
-            favourite_urls (set): Множество URL-адресов избранных вакансий.
-            hidden_companies (set): Множество названий скрытых компаний.
+            favourite_urls (frozenset[int]): Множество URL-адресов избранных вакансий.
+            hidden_companies (frozenset[str]): Множество названий скрытых компаний.
 
         Returns:
             list: Список избранных вакансий.
@@ -1,5 +1,44 @@
+import time
+from parser.bulk import copy_insert
+from parser.descriptions import CODEC, compress, decompress, plain_text
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.contrib.auth.models import User
-from django.db import models
+from django.db import connections, models, router
+
+# Размер пакета при сохранении описаний вакансий.
+DESCRIPTION_BATCH_SIZE = 500
+
+# Время в секундах, через которое проверяется, не обучен ли новый словарь.
+DICTIONARY_TTL = 300
+
+
+class VacanciesManager(models.Manager):
+    def ingest(self, rows: list["Vacancies"]) -> None:
+        """
+        Записывает новые вакансии, пропуская уже сохраненные URL-адреса.
+
+        В PostgreSQL пакет от `INGEST_COPY_MIN_ROWS` вакансий передается
+        командой COPY через промежуточную таблицу (см. `parser.bulk`), иначе
+        записывается `bulk_create(ignore_conflicts=True)`.
+
+        Args:
+            rows (list[Vacancies]): Вакансии.
+        """
+        connection = connections[router.db_for_write(self.model)]
+        if (
+            settings.INGEST_COPY
+            and connection.vendor == "postgresql"
+            and len(rows) >= settings.INGEST_COPY_MIN_ROWS
+        ):
+            copy_insert(rows, connection)
+        else:
+            self.bulk_create(rows, ignore_conflicts=True)
+
+    async def aingest(self, rows: list["Vacancies"]) -> None:
+        """Асинхронный вариант `ingest`."""
+        await sync_to_async(self.ingest)(rows)
 
 
 class Vacancies(models.Model):
@@ -16,9 +55,6 @@ class Vacancies(models.Model):
     salary_currency = models.CharField(
         max_length=30, null=True, blank=True, verbose_name="Валюта"
     )
-    description = models.TextField(
-        max_length=10000, null=True, blank=True, verbose_name="Описание вакансии"
-    )
     city = models.TextField(max_length=500, null=True, blank=True, verbose_name="Город")
     company = models.CharField(
         max_length=500, null=True, blank=True, verbose_name="Компания"
@@ -38,6 +74,22 @@ class Vacancies(models.Model):
     published_at = models.DateTimeField(
         db_index=True, null=True, blank=True, verbose_name="Дата публикации"
     )
+    fingerprint = models.CharField(
+        max_length=16, null=True, blank=True, db_index=True, verbose_name="Отпечаток"
+    )
+    simhash = models.BigIntegerField(
+        null=True, blank=True, verbose_name="SimHash описания"
+    )
+    duplicate_of = models.ForeignKey(
+        "self",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="duplicates",
+        verbose_name="Дубликат вакансии",
+    )
+
+    objects = VacanciesManager()
 
     class Meta:
         verbose_name = "Вакансия"
@@ -47,6 +99,195 @@ class Vacancies(models.Model):
     def __str__(self) -> str:
         return self.title
 
+    @property
+    def description(self) -> str | None:
+        """
+        Описание вакансии.
+
+        Описание хранится сжатым в отдельной таблице (см. `VacancyDescription`)
+        и распаковывается при первом обращении. Чтобы не выполнять запрос
+        на каждую вакансию, списки загружаются с
+        `select_related("description_data")`.
+        """
+        if "_description" not in self.__dict__:
+            try:
+                self._description = self.description_data.text
+            except VacancyDescription.DoesNotExist:
+                self._description = None
+        return self._description
+
+    @description.setter
+    def description(self, value: str | None) -> None:
+        self._description = value
+        self._description_changed = True
+
+    def save(self, *args, **kwargs) -> None:
+        super().save(*args, **kwargs)
+        if self.__dict__.pop("_description_changed", False):
+            if self._description:
+                VacancyDescription.objects.update_or_create(
+                    vacancy=self,
+                    defaults=VacancyDescription.pack(self._description, self.job_board),
+                )
+            else:
+                VacancyDescription.objects.filter(vacancy=self).delete()
+
+
+class DescriptionDictionary(models.Model):
+    job_board = models.CharField(max_length=100, db_index=True, verbose_name="Площадка")
+    codec = models.CharField(max_length=10, verbose_name="Кодек")
+    data = models.BinaryField(verbose_name="Словарь")
+    samples = models.IntegerField(default=0, verbose_name="Описаний в обучении")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Дата обучения")
+
+    class Meta:
+        verbose_name = "Словарь сжатия описаний"
+        verbose_name_plural = "Словари сжатия описаний"
+
+    # Словари не изменяются после обучения и кешируются в памяти процесса.
+    loaded: dict[int, bytes] = {}
+    active_by_board: dict[str, tuple[float, int | None]] = {}
+
+    def __str__(self) -> str:
+        return f"{self.job_board} {self.codec} {self.created_at:%Y-%m-%d}"
+
+    @classmethod
+    def load(cls, pk: int) -> bytes:
+        """Возвращает данные словаря по идентификатору."""
+        data = cls.loaded.get(pk)
+        if data is None:
+            data = bytes(cls.objects.values_list("data", flat=True).get(pk=pk))
+            cls.loaded[pk] = data
+        return data
+
+    @classmethod
+    def active(cls, job_board: str) -> int | None:
+        """
+        Возвращает идентификатор последнего словаря сайта для текущего кодека.
+
+        Args:
+            job_board (str): Название сайта.
+
+        Returns:
+            int | None: Идентификатор словаря или None, если словарь не обучен.
+        """
+        cached = cls.active_by_board.get(job_board)
+        if cached is None or time.monotonic() - cached[0] > DICTIONARY_TTL:
+            pk = (
+                cls.objects.filter(job_board=job_board, codec=CODEC)
+                .order_by("-created_at", "-pk")
+                .values_list("pk", flat=True)
+                .first()
+            )
+            cached = (time.monotonic(), pk)
+            cls.active_by_board[job_board] = cached
+        return cached[1]
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        cls.loaded.clear()
+        cls.active_by_board.clear()
+
+
+class VacancyDescriptionManager(models.Manager):
+    def store(self, descriptions: dict[str, str | None]) -> int:
+        """
+        Сохраняет описания записанных вакансий.
+
+        Описание сохраняется только для вакансии, у которой его еще нет:
+        повторно загруженная вакансия не перезаписывается, как и при
+        `bulk_create(ignore_conflicts=True)` самих вакансий.
+
+        Args:
+            descriptions (dict[str, str | None]): Описания по URL-адресам вакансий.
+
+        Returns:
+            int: Количество сохраненных описаний.
+        """
+        urls = [url for url, description in descriptions.items() if description]
+        rows: list["VacancyDescription"] = []
+        for start in range(0, len(urls), DESCRIPTION_BATCH_SIZE):
+            vacancies = Vacancies.objects.filter(
+                url__in=urls[start : start + DESCRIPTION_BATCH_SIZE],
+                description_data__isnull=True,
+            ).values_list("pk", "url", "job_board")
+            rows.extend(
+                self.model(
+                    vacancy_id=pk, **self.model.pack(descriptions[url], job_board)
+                )
+                for pk, url, job_board in vacancies
+            )
+        self.bulk_create(rows, batch_size=DESCRIPTION_BATCH_SIZE, ignore_conflicts=True)
+        return len(rows)
+
+    async def astore(self, descriptions: dict[str, str | None]) -> int:
+        """Асинхронный вариант `store`."""
+        return await sync_to_async(self.store)(descriptions)
+
+
+class VacancyDescription(models.Model):
+    vacancy = models.OneToOneField(
+        Vacancies,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="description_data",
+        verbose_name="Вакансия",
+    )
+    codec = models.CharField(max_length=10, verbose_name="Кодек")
+    dictionary = models.ForeignKey(
+        DescriptionDictionary,
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        verbose_name="Словарь",
+    )
+    data = models.BinaryField(verbose_name="Сжатое описание")
+    size = models.PositiveIntegerField(default=0, verbose_name="Размер описания")
+    search_text = models.TextField(blank=True, verbose_name="Текст для поиска")
+
+    objects = VacancyDescriptionManager()
+
+    class Meta:
+        verbose_name = "Описание вакансии"
+        verbose_name_plural = "Описания вакансий"
+
+    def __str__(self) -> str:
+        return f"{self.vacancy_id}: {self.size} -> {len(self.data)}"
+
+    @classmethod
+    def pack(cls, description: str, job_board: str) -> dict:
+        """
+        Сжимает описание последним словарем сайта, если он обучен.
+
+        Args:
+            description (str): Описание вакансии в HTML.
+            job_board (str): Название сайта.
+
+        Returns:
+            dict: Значения полей описания.
+        """
+        dictionary_id = DescriptionDictionary.active(job_board)
+        dictionary = (
+            DescriptionDictionary.load(dictionary_id) if dictionary_id else None
+        )
+        return {
+            "codec": CODEC,
+            "dictionary_id": dictionary_id,
+            "data": compress(description, CODEC, dictionary),
+            "size": len(description.encode()),
+            "search_text": plain_text(description),
+        }
+
+    @property
+    def text(self) -> str:
+        """Распакованное описание."""
+        dictionary = (
+            DescriptionDictionary.load(self.dictionary_id)
+            if self.dictionary_id
+            else None
+        )
+        return decompress(self.data, self.codec, dictionary)
+
 
 class UserVacancies(models.Model):
     user = models.ForeignKey(
@@ -68,6 +309,38 @@ class UserVacancies(models.Model):
     class Meta:
         verbose_name = "Вакансия пользователя"
         verbose_name_plural = "Вакансии пользователя"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "vacancy"], name="unique_user_vacancy"
+            ),
+            models.UniqueConstraint(
+                fields=["user", "hidden_company"], name="unique_user_hidden_company"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.vacancy.title if self.vacancy else self.hidden_company}"
+
+
+class SubscriptionMatch(models.Model):
+    profile = models.ForeignKey(
+        "profiles.Profile", on_delete=models.CASCADE, verbose_name="Профиль"
+    )
+    vacancy = models.ForeignKey(
+        Vacancies, on_delete=models.CASCADE, verbose_name="Вакансия"
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True, db_index=True, verbose_name="Дата сопоставления"
+    )
+
+    class Meta:
+        verbose_name = "Совпадение подписки"
+        verbose_name_plural = "Совпадения подписок"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["profile", "vacancy"], name="unique_profile_vacancy"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.profile} - {self.vacancy.title}"
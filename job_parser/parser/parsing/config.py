@@ -3,15 +3,16 @@ import os
 from dataclasses import dataclass, field
 from parser.parsing.connection import WebClient
 from parser.parsing.db import Database
+from parser.parsing.decoders import get_decoder
 from parser.parsing.fetcher import Fetcher
 from parser.parsing.parsers.headhunter import Headhunter
 from parser.parsing.parsers.superjob import SuperJob
 from parser.parsing.parsers.trudvsem import Trudvsem
 from parser.parsing.parsers.zarplata import Zarplata
+from parser.useragents import UserAgentPool
 from typing import TYPE_CHECKING
 
 from dotenv import load_dotenv
-from fake_useragent import UserAgent
 
 if TYPE_CHECKING:
     from parser.parsing.parsers.base import Parser
@@ -64,7 +65,7 @@ class ParserConfig:
     tv_items: str = "results"
 
     # OTHERS
-    ua: UserAgent = UserAgent()
+    ua: UserAgentPool = field(default_factory=UserAgentPool)
 
     def __post_init__(self) -> None:
         self.client = WebClient(self)
@@ -106,6 +107,7 @@ class ParserConfig:
             self.hh_pages,
             self.hh_items,
             self.client,
+            decoder=get_decoder(self.hh_job_board),
         )
 
         self.zp_fetcher = Fetcher(
@@ -115,6 +117,7 @@ class ParserConfig:
             self.zp_pages,
             self.zp_items,
             self.client,
+            decoder=get_decoder(self.zp_job_board),
         )
 
         self.sj_fetcher = Fetcher(
@@ -124,6 +127,7 @@ class ParserConfig:
             self.sj_pages,
             self.sj_items,
             self.client,
+            decoder=get_decoder(self.sj_job_board),
         )
 
         self.tv_fetcher = Fetcher(
@@ -133,6 +137,7 @@ class ParserConfig:
             self.tv_pages,
             self.tv_items,
             self.client,
+            decoder=get_decoder(self.tv_job_board),
         )
 
         self.hh_parser = Headhunter(self)
@@ -147,6 +152,23 @@ class ParserConfig:
             self.tv_parser,
         ]
 
+    @property
+    def fetchers(self) -> list[Fetcher]:
+        return [self.hh_fetcher, self.zp_fetcher, self.sj_fetcher, self.tv_fetcher]
+
+    def use_client(self, client: WebClient) -> None:
+        """
+        Метод для замены клиента, через который выполняются запросы к API.
+
+        Используется для записи и воспроизведения ответов API.
+
+        Args:
+            client (WebClient): Новый клиент.
+        """
+        self.client = client
+        for fetcher in self.fetchers:
+            fetcher.client = client
+
     def update_headers(self, url: str) -> dict:
         """
         Метод для обновления заголовков запроса.
@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Protocol
 
 import httpx
 
@@ -6,6 +6,13 @@ if TYPE_CHECKING:
     from parser.parsing.config import ParserConfig
 
 
+class ApiClient(Protocol):
+    """Клиент API, подключаемый к `Fetcher`."""
+
+    async def create_client(self, url: str, params: dict) -> httpx.Response:
+        ...
+
+
 class WebClient:
     """Класс для создания запросов к API.
 
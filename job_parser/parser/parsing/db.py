@@ -1,7 +1,11 @@
+from job_parser.metrics import registry
 from loguru import logger
 from parser.parsing.parsers.base import Vacancy
 
-from parser.models import Vacancies
+from parser.indexes import apublish
+from parser.models import Vacancies, VacancyDescription
+from parser.percolator import percolator
+from parser.tracing import span, stage
 
 
 class Database:
@@ -12,13 +16,47 @@ class Database:
     async def record(self, vacancy_data: list[Vacancy]) -> None:
         """Асинхронный метод добавления вакансий в базу данных.
 
+        Вакансии записываются `Vacancies.objects.ingest`: большие пакеты
+        в PostgreSQL - командой COPY. Описания новых вакансий сохраняются
+        сжатыми в отдельную таблицу (см. `VacancyDescription`), дубликаты
+        вакансий других сайтов (см. `parser.dedup`) сохраняются без описаний.
+        После записи вакансии сопоставляются с подписками на рассылку, а индексы
+        вакансий в памяти веб-процессов (см. `parser.indexes`) получают сигнал
+        обновиться.
+        Количество записанных и пропущенных (уже существующих) вакансий
+        и длительность записи регистрируются в метриках сайта.
+
         Args:
             vacancy_data (list[Vacancy]): Данные вакансии.
         """
+        source = vacancy_data[0].job_board if vacancy_data else ""
         try:
-            await Vacancies.objects.abulk_create(
-                [Vacancies(**data.__dict__) for data in vacancy_data],
-                ignore_conflicts=True,
+            with stage(source, "record"):
+                urls = {data.url for data in vacancy_data if data.url is not None}
+                existing = await Vacancies.objects.filter(url__in=urls).acount()
+                rows = [Vacancies(**data.__dict__) for data in vacancy_data]
+                with span("bulk_create"):
+                    await Vacancies.objects.aingest(rows)
+                with span("descriptions"):
+                    await VacancyDescription.objects.astore(
+                        {
+                            row.url: row.description
+                            for row in rows
+                            if row.duplicate_of_id is None
+                        }
+                    )
+                with span("percolate"):
+                    await percolator.apercolate(urls)
+                await apublish()
+            inserted = len(urls) - existing
+            registry.inc(
+                "ingest_rows_total", inserted, source=source, result="inserted"
+            )
+            registry.inc(
+                "ingest_rows_total",
+                len(vacancy_data) - inserted,
+                source=source,
+                result="skipped",
             )
         except Exception as exc:
             logger.exception(exc)
@@ -0,0 +1,195 @@
+import json
+from typing import Any, Protocol, TypedDict
+
+from django.conf import settings
+from logger import log_throttled, setup_logging
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - зависит от окружения
+    msgspec = None
+
+# Логирование
+setup_logging()
+
+# Схемы ответов API. Описаны только поля, которые читают парсеры, остальные
+# поля пропускаются при декодировании и не создаются в памяти. Значения
+# описаны как `Any`, чтобы изменение типа поля на стороне API не ломало
+# загрузку; вложенные объекты описаны схемами.
+
+
+class Named(TypedDict, total=False):
+    name: Any
+
+
+class Titled(TypedDict, total=False):
+    title: Any
+
+
+# HEADHUNTER, ZARPLATA
+
+
+HHSalary = TypedDict("HHSalary", {"from": Any, "to": Any, "currency": Any}, total=False)
+
+
+class HHVacancy(TypedDict, total=False):
+    id: Any
+    alternate_url: Any
+    name: Any
+    salary: HHSalary | None
+    area: Named | None
+    employer: Named | None
+    employment: Named | None
+    experience: Named | None
+    published_at: Any
+
+
+class HHPage(TypedDict, total=False):
+    items: list[HHVacancy]
+    found: Any
+
+
+class HHDetails(TypedDict, total=False):
+    description: Any
+    schedule: Named | None
+
+
+# SUPERJOB
+
+
+class SJExperience(TypedDict, total=False):
+    id: Any
+
+
+class SJVacancy(TypedDict, total=False):
+    id: Any
+    link: Any
+    profession: Any
+    payment_from: Any
+    payment_to: Any
+    currency: Any
+    vacancyRichText: Any
+    town: Titled | None
+    firm_name: Any
+    place_of_work: Titled | None
+    type_of_work: Titled | None
+    experience: SJExperience | None
+    date_published: Any
+
+
+class SJPage(TypedDict, total=False):
+    objects: list[SJVacancy]
+    total: Any
+
+
+# TRUDVSEM
+
+TVAddress = TypedDict("TVAddress", {"location": Any}, total=False)
+TVAddresses = TypedDict("TVAddresses", {"address": list[TVAddress]}, total=False)
+TVRequirement = TypedDict("TVRequirement", {"experience": Any}, total=False)
+TVVacancy = TypedDict(
+    "TVVacancy",
+    {
+        "id": Any,
+        "vac_url": Any,
+        "job-name": Any,
+        "salary_min": Any,
+        "salary_max": Any,
+        "duty": Any,
+        "addresses": TVAddresses | None,
+        "company": Named | None,
+        "employment": Any,
+        "schedule": Any,
+        "requirement": TVRequirement | None,
+    },
+    total=False,
+)
+TVItem = TypedDict("TVItem", {"vacancy": TVVacancy | None}, total=False)
+TVResults = TypedDict("TVResults", {"vacancies": list[TVItem]}, total=False)
+TVMeta = TypedDict("TVMeta", {"total": Any}, total=False)
+TVPage = TypedDict(
+    "TVPage", {"results": TVResults | None, "meta": TVMeta | None}, total=False
+)
+
+# Схемы страницы списка и деталей вакансии по названию сайта.
+SCHEMAS: dict[str, tuple[type, type | None]] = {
+    "HeadHunter": (HHPage, HHDetails),
+    "Zarplata": (HHPage, HHDetails),
+    "SuperJob": (SJPage, None),
+    "Trudvsem": (TVPage, None),
+}
+
+
+class Decoder(Protocol):
+    """Декодер ответа API, подключаемый к `Fetcher`."""
+
+    def decode(self, content: bytes, kind: str = "page") -> dict:
+        ...
+
+
+class JsonDecoder:
+    """
+    Декодер на стандартном модуле json.
+
+    Байты передаются в `json.loads` без предварительного `decode()`,
+    результат содержит все поля ответа.
+    """
+
+    def decode(self, content: bytes, kind: str = "page") -> dict:
+        return json.loads(content)
+
+
+class SchemaDecoder:
+    """
+    Декодер по схеме на msgspec.
+
+    Читает байты ответа напрямую и создает словари только с полями схемы,
+    поэтому парсеры работают с результатом так же, как с результатом
+    `json.loads`. Если ответ не соответствует схеме, он декодируется
+    `JsonDecoder`, чтобы изменение API не останавливало загрузку.
+
+    Attributes:
+        job_board (str): Название сайта поиска работы.
+    """
+
+    def __init__(self, job_board: str, page: type, details: type | None) -> None:
+        self.job_board = job_board
+        self.decoders = {"page": msgspec.json.Decoder(page)}
+        if details is not None:
+            self.decoders["detail"] = msgspec.json.Decoder(details)
+        self.fallback = JsonDecoder()
+
+    def decode(self, content: bytes, kind: str = "page") -> dict:
+        decoder = self.decoders.get(kind)
+        if decoder is None:
+            return self.fallback.decode(content, kind)
+        try:
+            return decoder.decode(content)
+        except msgspec.ValidationError as exc:
+            log_throttled(
+                f"decode:{self.job_board}",
+                "WARNING",
+                "Ответ {} не соответствует схеме: {}",
+                self.job_board,
+                exc,
+            )
+            return self.fallback.decode(content, kind)
+
+
+def get_decoder(job_board: str) -> Decoder:
+    """
+    Возвращает декодер ответов API для сайта.
+
+    Декодер по схеме используется, если установлен msgspec, для сайта
+    описана схема и настройка `API_DECODER` равна "schema".
+
+    Args:
+        job_board (str): Название сайта поиска работы.
+
+    Returns:
+        Decoder: Декодер ответов.
+    """
+    schemas = SCHEMAS.get(job_board)
+    if msgspec is None or schemas is None or settings.API_DECODER != "schema":
+        return JsonDecoder()
+    return SchemaDecoder(job_board, *schemas)
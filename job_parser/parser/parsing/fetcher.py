@@ -1,9 +1,33 @@
-import json
+import functools
+from urllib.parse import urlsplit
 
+import httpx
+from job_parser.metrics import registry
+from logger import log_throttled
 from loguru import logger
 
-from parser.parsing.connection import WebClient
-from parser.utils import Utils
+from parser.parsing.connection import ApiClient
+from parser.parsing.decoders import Decoder, JsonDecoder
+from parser.resilience import FetchError, RateLimiter, RetryPolicy
+from parser.tracing import span
+
+# Минимальный интервал между запросами к API сайтов в секундах.
+REQUEST_INTERVALS: dict[str, float] = {
+    "HeadHunter": 0.25,
+    "Zarplata": 0.20,
+    "SuperJob": 3,
+    "Trudvsem": 1,
+}
+
+
+def response_status(response: httpx.Response) -> int:
+    """Возвращает статус ответа API для `RetryPolicy`."""
+    return response.status_code
+
+
+def response_retry_after(response: httpx.Response) -> str | None:
+    """Возвращает заголовок Retry-After ответа API для `RetryPolicy`."""
+    return response.headers.get("Retry-After")
 
 
 class Fetcher:
@@ -18,7 +42,10 @@ class Fetcher:
         params: dict,
         pages: int,
         items: str,
-        client: WebClient,
+        client: ApiClient,
+        delay: bool = True,
+        decoder: Decoder | None = None,
+        retry: RetryPolicy | None = None,
     ) -> None:
         self.job_board = job_board
         self.url = url
@@ -26,8 +53,19 @@ class Fetcher:
         self.pages = pages
         self.items = items
         self.client = client
+        self.delay = delay
+        self.decoder = decoder or JsonDecoder()
+        self.retry = retry or RetryPolicy()
+        self.limiter = RateLimiter(REQUEST_INTERVALS.get(job_board, 0))
+
+    @property
+    def page_param(self) -> str:
+        """Параметр запроса с номером страницы."""
+        return "offset" if self.items == "results" else "page"
 
-    async def get_vacancies(self) -> list[dict]:
+    async def get_vacancies(
+        self, params: dict | None = None, first_page: dict | None = None
+    ) -> list[dict]:
         """
         Асинхронный метод для получения списка вакансий.
 
@@ -35,59 +73,130 @@ class Fetcher:
         страницам с вакансиями (количество страниц задается атрибутом `pages`), получает
         данные о вакансиях с помощью метода `get_data`, обрабатывает полученные данные
         с помощью метода `process_data` и добавляет их в список вакансий.
-        Если обработанные данные равны `None`, то цикл прерывается. В конце каждой
-        итерации цикла значение параметра `offset` или `page`
+        Если обработанные данные равны `None`, то цикл прерывается. Если страницу
+        не удалось загрузить после всех повторов (см. `parser.resilience`), цикл
+        прерывается с ошибкой в журнале, а уже собранные вакансии возвращаются.
+        В конце каждой итерации цикла значение параметра `offset` или `page`
         (в зависимости от значения атрибута `items`) увеличивается на 1.
         В конце работы метода возвращается список вакансий.
 
+        Args:
+            params (dict | None): Параметры запроса сегмента (см.
+            `parser.parsing.planner`), по умолчанию атрибут `params`.
+            first_page (dict | None): Уже загруженная первая страница.
+
         Returns:
             vacancy_list(list[dict]): Список словарей с данными о вакансиях.
         """
         vacancy_list: list[dict] = []
+        params = {**(self.params if params is None else params), self.page_param: 0}
 
         for page in range(self.pages):
-            json_data = await self.get_data(self.url)
+            if page == 0 and first_page is not None:
+                json_data = first_page
+            else:
+                try:
+                    json_data = await self.get_data(self.url, "page", params)
+                except FetchError as exc:
+                    registry.inc(
+                        "ingest_fetch_failures_total",
+                        source=self.job_board,
+                        kind="page",
+                    )
+                    logger.error(
+                        f"Загрузка {self.job_board} прервана на странице {page}: {exc}"
+                    )
+                    break
             vacancies = await self.process_data(json_data)
             if vacancies is None:
                 break
             else:
                 vacancy_list.extend(vacancies)
             page += 1
-            self.params["offset" if self.items == "results" else "page"] = page
+            params[self.page_param] = page
         return vacancy_list
 
-    async def get_data(self, url: str) -> dict:
+    async def request(self, url: str, kind: str, params: dict) -> httpx.Response:
+        """
+        Асинхронный метод для выполнения одного запроса к API.
+
+        Запрос регистрируется в метриках сайта (см. `job_parser.metrics`).
+
+        Args:
+            url (str): URL для получения данных.
+            kind (str): Вид запроса для метрик: "page" или "detail".
+            params (dict): Параметры запроса.
+
+        Returns:
+            httpx.Response: Ответ сервера.
+        """
+        try:
+            response = await self.client.create_client(url, params)
+        except Exception:
+            registry.observe_fetch(self.job_board, kind, "error")
+            raise
+        registry.observe_fetch(
+            self.job_board, kind, response.status_code, len(response.content)
+        )
+        return response
+
+    async def get_data(
+        self, url: str, kind: str = "detail", params: dict | None = None
+    ) -> dict:
         """
         Асинхронный метод для получения данных с указанного URL.
 
         Метод принимает на вход URL-адрес и возвращает словарь с данными.
-        Создает соединение с помощью метода `create_client` объекта `session`, передавая
-        ему URL-адрес и параметры запроса (атрибут `params`). Затем метод получает
-        содержимое ответа, декодирует его и преобразует в словарь с помощью модуля
-        `json`. Полученный словарь возвращается как результат работы метода. Если во
-        время работы метода возникает исключение, то оно логируется с помощью метода
-        `exception` объекта `logger`, а метод возвращает пустой словарь.
+        Запрос выполняется методом `request` с повторами временных ошибок
+        и предохранителем хоста (атрибут `retry`, см. `parser.resilience`).
+        Затем метод получает байты ответа и преобразует их в словарь декодером
+        сайта (атрибут `decoder`, см. `parser.parsing.decoders`) без промежуточной
+        строки. Если ответ не удалось декодировать, ошибка логируется с помощью
+        метода `exception` объекта `logger`, а метод возвращает пустой словарь.
 
         Args:
             url (str): URL для получения данных.
+            kind (str): Вид запроса для метрик: "page" или "detail".
+            params (dict | None): Параметры запроса, по умолчанию атрибут `params`.
+
+        Raises:
+            FetchError: Запрос не выполнен после всех повторов или предохранитель
+            хоста разомкнут.
 
         Returns:
             dict: Словарь с данными.
         """
-        await self.set_delay()
-        try:
-            response = await self.client.create_client(url, self.params)
+        params = self.params if params is None else params
+        with span("sleep"):
+            await self.set_delay()
+        with span(f"fetch_{kind}"):
+            try:
+                response = await self.retry.call(
+                    url,
+                    functools.partial(self.request, url, kind, params),
+                    status=response_status,
+                    retry_after=response_retry_after,
+                    source=self.job_board,
+                )
+            except FetchError:
+                raise
+            except Exception as exc:
+                raise FetchError(urlsplit(url).netloc, repr(exc)) from exc
             if not response.status_code == 200:
-                logger.debug(
-                    f"Error from {str(response.url)}, response status code: {response.status_code}\n {response.text}"
+                log_throttled(
+                    f"fetch-status:{self.job_board}",
+                    "DEBUG",
+                    "Error from {}, response status code: {}\n {}",
+                    response.url,
+                    response.status_code,
+                    response.text[:500],
                 )
-                pass
-            data = response.content.decode()
-            json_data = json.loads(data)
-            return json_data
-        except Exception as exc:
-            logger.exception(exc)
-            return {}
+            with span("decode"):
+                try:
+                    return self.decoder.decode(response.content, kind)
+                except Exception as exc:
+                    logger.exception(exc)
+                    return {}
 
     async def process_data(self, json_data: dict) -> list[dict] | None:
         """
@@ -119,8 +228,9 @@ class Fetcher:
 
         Метод принимает на вход словарь с данными о вакансии и возвращает словарь
         с деталями конкретной вакансии. Метод получает идентификатор вакансии из словаря
-        с данными с помощью метода `get_data`. Полученные данные возвращаются,
-        как результат работы метода.
+        с данными с помощью метода `get_data` без параметров списка вакансий.
+        Полученные данные возвращаются, как результат работы метода. Если детали не удалось загрузить после всех
+        повторов, возвращается пустой словарь, и вакансия сохраняется без них.
 
         Args:
             vacancy (dict): Словарь с данными о вакансии.
@@ -131,19 +241,30 @@ class Fetcher:
         details = None
         vacancy_id = vacancy.get("id", None)
         if vacancy_id:
-            details = await self.get_data(f"{self.url}/{vacancy_id}")
+            try:
+                details = await self.get_data(f"{self.url}/{vacancy_id}", params={})
+            except FetchError as exc:
+                registry.inc(
+                    "ingest_fetch_failures_total", source=self.job_board, kind="detail"
+                )
+                log_throttled(
+                    f"fetch-failure:{self.job_board}",
+                    "WARNING",
+                    "Не удалось загрузить детали вакансии {}: {}",
+                    vacancy_id,
+                    exc,
+                )
+                details = {}
         return details
 
     async def set_delay(self) -> None:
         """
         Асинхронный метод для установки задержки перед выполнением запроса.
-        Задержка устанавливается с помощью метода `set_delay` класса `Utils`.
+
+        Задержка выдерживает интервал `REQUEST_INTERVALS` между запросами к сайту,
+        в том числе при параллельной загрузке сегментов, и отключается атрибутом
+        `delay`, например при замерах на локальном сервере.
         """
-        if self.items == "items" and self.job_board == "HeadHunter":
-            await Utils.set_delay(0.25)
-        if self.items == "items" and self.job_board == "Zarplata":
-            await Utils.set_delay(0.20)
-        elif self.items == "objects":
-            await Utils.set_delay(3)
-        elif self.items == "results":
-            await Utils.set_delay(1)
+        if not self.delay:
+            return
+        await self.limiter.wait()
@@ -1,19 +1,36 @@
+from functools import cached_property
 from parser.parsing.config import ParserConfig
+from parser.tracing import traced
+from typing import Callable
 
 from logger import setup_logging
 
 # Логирование
 setup_logging()
 
-config = ParserConfig()
-
 
 class JobParser:
     """
     Класс содержит методы для парсинга вакансий с различных сайтов.
 
+    Конфигурация создается фабрикой `config_factory` при первом обращении,
+    а не при импорте модуля, поэтому каждый экземпляр (один на запуск задачи)
+    получает свежую конфигурацию, например параметры запросов с текущей датой.
+
+    Attributes:
+        config_factory (Callable[[], ParserConfig]): Фабрика конфигурации.
     """
-    @config.utils.timeit
+
+    def __init__(
+        self, config_factory: Callable[[], ParserConfig] = ParserConfig
+    ) -> None:
+        self.config_factory = config_factory
+
+    @cached_property
+    def config(self) -> ParserConfig:
+        return self.config_factory()
+
+    @traced("parse_headhunter")
     async def parse_headhunter(self) -> None:
         """
         Асинхронный метод для парсинга вакансий с сайта headhunter.
@@ -21,9 +38,9 @@ class JobParser:
         Returns:
             None
         """
-        await config.hh_parser.parse()
+        await self.config.hh_parser.parse()
 
-    @config.utils.timeit
+    @traced("parse_zarplata")
     async def parse_zarplata(self) -> None:
         """
         Асинхронный метод для парсинга вакансий с сайта zarplata.
@@ -31,9 +48,9 @@ class JobParser:
         Returns:
             None
         """
-        await config.zp_parser.parse()
+        await self.config.zp_parser.parse()
 
-    @config.utils.timeit
+    @traced("parse_superjob")
     async def parse_superjob(self) -> None:
         """
         Асинхронный метод для парсинга вакансий с сайта superjob.
@@ -41,9 +58,9 @@ class JobParser:
         Returns:
             None
         """
-        await config.sj_parser.parse()
+        await self.config.sj_parser.parse()
 
-    @config.utils.timeit
+    @traced("parse_trudvsem")
     async def parse_trudvsem(self) -> None:
         """
         Асинхронный метод для парсинга вакансий с сайта trudvsem.
@@ -51,4 +68,4 @@ class JobParser:
         Returns:
             None
         """
-        await config.tv_parser.parse()
+        await self.config.tv_parser.parse()
@@ -7,8 +7,13 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from parser.parsing.config import ParserConfig
 
+from django.conf import settings
 from logger import logger, setup_logging
 
+from parser.dedup import deduplicator
+from parser.parsing.planner import ShardPlanner
+from parser.tracing import span, stage
+
 # Логирование
 setup_logging()
 
@@ -29,6 +34,9 @@ class Vacancy:
     description: str = ""
     schedule: str | None = ""
     remote: bool = False
+    fingerprint: str | None = None
+    simhash: int | None = None
+    duplicate_of_id: int | None = None
 
 
 class Parser(abc.ABC):
@@ -54,44 +62,98 @@ class Parser(abc.ABC):
         self.job_board = getattr(config, f"{parser}_job_board")
         self.fetcher = getattr(config, f"{parser}_fetcher")
 
-    async def parse(self) -> None:
+    async def get_vacancies(
+        self,
+        start: datetime.datetime | None = None,
+        end: datetime.datetime | None = None,
+    ) -> list[dict]:
+        """
+        Асинхронный метод для получения списка вакансий в формате API.
+
+        Если включена настройка `INGEST_SHARDING` или задан период, запрос
+        разбивается на сегменты, каждый из которых помещается в ограничение API
+        на количество результатов (см. `parser.parsing.planner`). Иначе
+        вакансии загружаются одним запросом за период ежедневной загрузки.
+
+        Args:
+            start (datetime.datetime | None): Начало периода публикации.
+            end (datetime.datetime | None): Конец периода публикации.
+
+        Returns:
+            list[dict]: Вакансии в формате API.
+        """
+        if start is None and end is None and not settings.INGEST_SHARDING:
+            return await self.fetcher.get_vacancies()
+        return await ShardPlanner(self.fetcher).collect(start, end)
+
+    async def parse(
+        self,
+        start: datetime.datetime | None = None,
+        end: datetime.datetime | None = None,
+    ) -> None:
         """
         Асинхронный метод для парсинга вакансий.
 
         Получает список вакансий с помощью метода `get_vacancies`,
         затем для каждой вакансии из списка создает объект `Vacancy` с
-        деталями конкретной вакансии. Далее вызывается метод `update_vacancy_data`,
-        в котором реализуется получение дополнительных деталей вакансии.
+        деталями конкретной вакансии. Вакансии, уже сохраненные с этого
+        или другого сайта, отмечаются `deduplicator` (см. `parser.dedup`)
+        и не загружают детали. Для остальных вызывается метод `update_vacancy_data`,
+        в котором реализуется получение дополнительных деталей вакансии,
+        после чего они повторно проверяются на дубликаты по описанию.
         Сформированные объект добавляются в список `parsed_vacancy_list`,
         а затем при помощи метода `record` записываются в базу данных .
         В конце работы метода выводится сообщение о завершении сбора вакансий
         с указанием источника и количества собранных вакансий.
 
+        Args:
+            start (datetime.datetime | None): Начало периода публикации
+            для загрузки за прошлые дни.
+            end (datetime.datetime | None): Конец периода публикации.
+
         Returns: None
         """
-        vacancy_list: list[dict] = await self.fetcher.get_vacancies()
+        with stage(self.job_board, "fetch"):
+            vacancy_list: list[dict] = await self.get_vacancies(start, end)
         parsed_vacancy_list: list[Vacancy] = []
         vacancy_data: Vacancy | None = None
         vacancy_count: int = 0
 
-        for vacancy in vacancy_list:
-            vacancy_data = Vacancy(
-                job_board=self.job_board,
-                url=await self.get_url(vacancy),
-                title=await self.get_title(vacancy),
-                salary_from=await self.get_salary_from(vacancy),
-                salary_to=await self.get_salary_to(vacancy),
-                salary_currency=await self.get_salary_currency(vacancy),
-                city=await self.get_city(vacancy),
-                company=await self.get_company(vacancy),
-                employment=await self.get_employment(vacancy),
-                experience=await self.get_experience(vacancy),
-                published_at=await self.get_published_at(vacancy),
-            )
-
-            updated_vacancy_data = await self.update_vacancy_data(vacancy, vacancy_data)
-            parsed_vacancy_list.append(updated_vacancy_data)
-            vacancy_count += 1
+        with stage(self.job_board, "extract"):
+            for vacancy in vacancy_list:
+                vacancy_data = Vacancy(
+                    job_board=self.job_board,
+                    url=await self.get_url(vacancy),
+                    title=await self.get_title(vacancy),
+                    salary_from=await self.get_salary_from(vacancy),
+                    salary_to=await self.get_salary_to(vacancy),
+                    salary_currency=await self.get_salary_currency(vacancy),
+                    city=await self.get_city(vacancy),
+                    company=await self.get_company(vacancy),
+                    employment=await self.get_employment(vacancy),
+                    experience=await self.get_experience(vacancy),
+                    published_at=await self.get_published_at(vacancy),
+                )
+                parsed_vacancy_list.append(vacancy_data)
+                vacancy_count += 1
+
+            with span("dedup"):
+                known = await deduplicator.adetect(parsed_vacancy_list)
+
+            updated_vacancy_list: list[Vacancy] = []
+            for num, (vacancy, vacancy_data) in enumerate(
+                zip(vacancy_list, parsed_vacancy_list)
+            ):
+                if vacancy_data.duplicate_of_id or vacancy_data.url in known:
+                    continue
+                updated_vacancy_data = await self.update_vacancy_data(
+                    vacancy, vacancy_data
+                )
+                parsed_vacancy_list[num] = updated_vacancy_data
+                updated_vacancy_list.append(updated_vacancy_data)
+
+            with span("dedup"):
+                await deduplicator.adetect(updated_vacancy_list)
 
         await self.config.db.record(parsed_vacancy_list)
 
@@ -321,7 +383,7 @@ class Parser(abc.ABC):
             vacancy (dict): Словарь с информацией о вакансии.
 
         Returns:
-            datetime.datetime | None: Дата публикации вакансии или None, если 
+            datetime.datetime | None: Дата публикации вакансии или None, если
             дата отсутствует.
         """
         pass
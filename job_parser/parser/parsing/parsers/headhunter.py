@@ -27,16 +27,25 @@ class Headhunter(Parser):
     def __init__(self, config: "ParserConfig", parser: str = "hh") -> None:
         super().__init__(config, parser)
 
-    async def parse(self) -> None:
+    async def parse(
+        self,
+        start: datetime.datetime | None = None,
+        end: datetime.datetime | None = None,
+    ) -> None:
         """
         Асинхронный метод для парсинга вакансий с сайта HeadHunter.
 
         Метод вызывает метод parse родительского класса Parser
         с параметрами запроса.
 
+        Args:
+            start (datetime.datetime | None): Начало периода публикации
+            для загрузки за прошлые дни.
+            end (datetime.datetime | None): Конец периода публикации.
+
         Returns: None
         """
-        return await super().parse()
+        return await super().parse(start, end)
 
     async def get_url(self, vacancy: dict) -> str | None:
         """
@@ -28,15 +28,24 @@ class SuperJob(Parser):
     def __init__(self, config: "ParserConfig") -> None:
         super().__init__(config, "sj")
 
-    async def parse(self) -> None:
+    async def parse(
+        self,
+        start: datetime.datetime | None = None,
+        end: datetime.datetime | None = None,
+    ) -> None:
         """
         Асинхронный метод для парсинга вакансий с сайта SuperJob.
 
         Метод вызывает метод parse родительского класса Parser.
 
+        Args:
+            start (datetime.datetime | None): Начало периода публикации
+            для загрузки за прошлые дни.
+            end (datetime.datetime | None): Конец периода публикации.
+
         Returns: None
         """
-        return await super().parse()
+        return await super().parse(start, end)
 
     async def get_url(self, vacancy: dict) -> str | None:
         """
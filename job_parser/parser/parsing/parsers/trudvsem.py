@@ -32,15 +32,24 @@ class Trudvsem(Parser):
         """
         super().__init__(config, "tv")
 
-    async def parse(self) -> None:
+    async def parse(
+        self,
+        start: datetime.datetime | None = None,
+        end: datetime.datetime | None = None,
+    ) -> None:
         """
         Асинхронный метод для парсинга вакансий с сайта Trudvsem.
 
         метод parse родительского класса Parser.
 
+        Args:
+            start (datetime.datetime | None): Начало периода публикации
+            для загрузки за прошлые дни.
+            end (datetime.datetime | None): Конец периода публикации.
+
         Returns: None.
         """
-        return await super().parse()
+        return await super().parse(start, end)
 
     async def get_url(self, vacancy: dict) -> str | None:
         """
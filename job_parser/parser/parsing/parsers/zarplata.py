@@ -1,3 +1,4 @@
+import datetime
 from typing import TYPE_CHECKING
 
 from logger import setup_logging
@@ -25,13 +26,22 @@ class Zarplata(Headhunter):
     def __init__(self, config: "ParserConfig") -> None:
         super().__init__(config, "zp")
 
-    async def parse(self) -> None:
+    async def parse(
+        self,
+        start: datetime.datetime | None = None,
+        end: datetime.datetime | None = None,
+    ) -> None:
         """
         Асинхронный метод для парсинга вакансий с сайта Zarplata.
 
         Метод вызывает метод parse родительского класса Parser
         с параметрами запроса.
 
+        Args:
+            start (datetime.datetime | None): Начало периода публикации
+            для загрузки за прошлые дни.
+            end (datetime.datetime | None): Конец периода публикации.
+
         Returns: None.
         """
-        return await super().parse()
+        return await super().parse(start, end)
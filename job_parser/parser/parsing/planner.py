@@ -0,0 +1,351 @@
+import asyncio
+import datetime
+import math
+from dataclasses import dataclass, field, replace
+from parser.parsing.fetcher import Fetcher
+from parser.resilience import FetchError
+from typing import Any, Callable
+
+from django.conf import settings
+from job_parser.metrics import registry
+from logger import logger, setup_logging
+
+# Логирование
+setup_logging()
+
+
+def to_iso(moment: datetime.datetime) -> str:
+    return moment.isoformat(timespec="seconds")
+
+
+def to_timestamp(moment: datetime.datetime) -> int:
+    return int(moment.timestamp())
+
+
+def to_utc(moment: datetime.datetime) -> str:
+    return moment.astimezone(datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def get_count(data: dict, *path: str) -> int | None:
+    """Возвращает количество найденных вакансий из ответа API или None."""
+    value: Any = data
+    for key in path:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(frozen=True)
+class BoardQuery:
+    """
+    Параметры API сайта, используемые при разбиении запроса на сегменты.
+
+    Attributes:
+        start (str): Параметр начала периода публикации.
+        end (str): Параметр конца периода публикации.
+        page_size (str): Параметр количества вакансий на странице.
+        format (Callable): Преобразование даты в значение параметра периода.
+        found (Callable): Количество найденных вакансий из ответа API.
+        area (str | None): Параметр региона, если API его поддерживает.
+        lookback_days (int): Сколько полных дней до текущего входит
+        в период ежедневной загрузки.
+    """
+
+    start: str
+    end: str
+    page_size: str
+    format: Callable[[datetime.datetime], Any]
+    found: Callable[[dict], int | None]
+    area: str | None = None
+    lookback_days: int = 0
+
+
+HH_QUERY = BoardQuery(
+    "date_from",
+    "date_to",
+    "per_page",
+    to_iso,
+    lambda data: get_count(data, "found"),
+    area="area",
+)
+
+QUERIES: dict[str, BoardQuery] = {
+    "HeadHunter": HH_QUERY,
+    "Zarplata": HH_QUERY,
+    "SuperJob": BoardQuery(
+        "date_published_from",
+        "date_published_to",
+        "count",
+        to_timestamp,
+        lambda data: get_count(data, "total"),
+    ),
+    "Trudvsem": BoardQuery(
+        "modifiedFrom",
+        "modifiedTo",
+        "limit",
+        to_utc,
+        lambda data: get_count(data, "meta", "total"),
+        lookback_days=1,
+    ),
+}
+
+
+@dataclass
+class Shard:
+    """
+    Сегмент запроса к API: период публикации и, при необходимости, регион.
+
+    Attributes:
+        start (datetime.datetime): Начало периода.
+        end (datetime.datetime): Конец периода.
+        area (str | None): Регион.
+        found (int | None): Количество найденных вакансий или None, если API
+        его не сообщает.
+        first_page (dict | None): Первая страница, полученная при оценке.
+        remainder (bool): Сегмент по всем регионам, оставшийся после деления
+        по регионам `INGEST_SHARD_AREAS`: не делится дальше и загружается
+        в пределах ограничения API.
+    """
+
+    start: datetime.datetime
+    end: datetime.datetime
+    area: str | None = None
+    found: int | None = None
+    first_page: dict | None = field(default=None, repr=False)
+    remainder: bool = False
+
+    def params(self, query: BoardQuery) -> dict:
+        params = {
+            query.start: query.format(self.start),
+            query.end: query.format(self.end),
+        }
+        if self.area is not None and query.area:
+            params[query.area] = self.area
+        return params
+
+    def split(self, parts: int) -> list["Shard"]:
+        """Делит период сегмента на `parts` равных частей."""
+        step = (self.end - self.start) / parts
+        bounds = [self.start + step * num for num in range(parts)] + [self.end]
+        return [
+            Shard(start, end, self.area) for start, end in zip(bounds[:-1], bounds[1:])
+        ]
+
+
+def default_window(query: BoardQuery) -> tuple[datetime.datetime, datetime.datetime]:
+    """
+    Возвращает период ежедневной загрузки: с начала дня `lookback_days` дней
+    назад до текущего момента в локальном часовом поясе.
+    """
+    now = datetime.datetime.now().astimezone()
+    day = now.date() - datetime.timedelta(days=query.lookback_days)
+    start = datetime.datetime.combine(day, datetime.time.min, tzinfo=now.tzinfo)
+    return start, now
+
+
+def vacancy_key(vacancy: dict) -> Any:
+    """Идентификатор вакансии из списка вакансий API для удаления повторов."""
+    inner = vacancy.get("vacancy")
+    if isinstance(inner, dict):
+        return inner.get("id") or inner.get("vac_url")
+    return vacancy.get("id") or vacancy.get("alternate_url") or vacancy.get("link")
+
+
+class ShardPlanner:
+    """
+    Разбиение запроса к API на сегменты, каждый из которых помещается
+    в ограничение API на количество результатов.
+
+    API отдают не больше `pages * размер страницы` вакансий на запрос
+    (2000 у HeadHunter и Zarplata, 500 у SuperJob), остальные найденные
+    вакансии недоступны. Планировщик запрашивает первую страницу сегмента,
+    берет из нее количество найденных вакансий и, если оно превышает
+    ограничение, делит период на части с запасом, после чего оценивает
+    каждую часть. Период, который нельзя делить дальше (`min_window`),
+    делится по регионам `areas`, если API их поддерживает. API не умеет
+    исключать регионы, поэтому вакансии остальных регионов загружаются
+    сегментом по всем регионам в пределах ограничения, а повторы удаляются
+    при загрузке. Первая страница оценки используется при загрузке сегмента,
+    поэтому сегмент, который помещается в ограничение, не требует лишних
+    запросов.
+
+    Сегменты загружаются параллельно, не больше `concurrency` одновременно;
+    частота запросов ограничивается сборщиком (см. `Fetcher.set_delay`).
+
+    Attributes:
+        fetcher (Fetcher): Сборщик вакансий сайта.
+        query (BoardQuery): Параметры API сайта.
+        cap (int): Максимальное количество вакансий на запрос.
+        min_window (datetime.timedelta): Минимальная длина периода сегмента.
+        areas (list[str]): Регионы для разбиения самых коротких периодов.
+        concurrency (int): Количество одновременно загружаемых сегментов.
+    """
+
+    # Доля ограничения, до которой заполняются части при делении периода:
+    # вакансии распределены по времени неравномерно.
+    FILL = 0.8
+
+    def __init__(
+        self,
+        fetcher: Fetcher,
+        min_window: datetime.timedelta | None = None,
+        areas: list[str] | None = None,
+        concurrency: int | None = None,
+    ) -> None:
+        self.fetcher = fetcher
+        self.query = QUERIES[fetcher.job_board]
+        page_size = int(fetcher.params.get(self.query.page_size, 100))
+        self.cap = fetcher.pages * page_size
+        self.min_window = min_window or datetime.timedelta(
+            seconds=settings.INGEST_SHARD_MIN_WINDOW
+        )
+        self.areas = areas if areas is not None else settings.INGEST_SHARD_AREAS
+        self.concurrency = concurrency or settings.INGEST_SHARD_CONCURRENCY
+
+    def shard_params(self, shard: Shard) -> dict:
+        return {**self.fetcher.params, **shard.params(self.query)}
+
+    async def estimate(self, shard: Shard) -> Shard | None:
+        """
+        Запрашивает первую страницу сегмента и количество найденных вакансий.
+
+        Сегмент, первая страница которого уже загружена, не запрашивается.
+
+        Args:
+            shard (Shard): Сегмент.
+
+        Returns:
+            Shard | None: Сегмент с результатом оценки или None, если страницу
+            не удалось загрузить.
+        """
+        if shard.first_page is not None:
+            return shard
+        params = {**self.shard_params(shard), self.fetcher.page_param: 0}
+        try:
+            data = await self.fetcher.get_data(self.fetcher.url, "page", params)
+        except FetchError as exc:
+            registry.inc(
+                "ingest_fetch_failures_total",
+                source=self.fetcher.job_board,
+                kind="probe",
+            )
+            logger.error(f"Не удалось оценить сегмент {shard}: {exc}")
+            return None
+        return replace(shard, found=self.query.found(data), first_page=data)
+
+    def refine(self, shard: Shard) -> list[Shard] | None:
+        """
+        Делит сегмент, который не помещается в ограничение.
+
+        Args:
+            shard (Shard): Оцененный сегмент.
+
+        Returns:
+            list[Shard] | None: Части сегмента или None, если делить не нужно
+            или нельзя.
+        """
+        if shard.found is None or shard.found <= self.cap:
+            return None
+        if shard.end - shard.start > self.min_window:
+            parts = max(2, math.ceil(shard.found / (self.cap * self.FILL)))
+            longest = (shard.end - shard.start) / self.min_window
+            return shard.split(max(2, min(parts, math.floor(longest))))
+        if (
+            shard.area is None
+            and not shard.remainder
+            and self.areas
+            and self.query.area
+        ):
+            return [replace(shard, remainder=True)] + [
+                replace(shard, area=area, found=None, first_page=None)
+                for area in self.areas
+            ]
+        logger.warning(
+            f"Сегмент {self.fetcher.job_board} {shard.start}-{shard.end} "
+            f"не помещается в ограничение API: {shard.found} > {self.cap}"
+        )
+        return None
+
+    async def plan(
+        self, start: datetime.datetime, end: datetime.datetime
+    ) -> list[Shard]:
+        """
+        Разбивает период на сегменты.
+
+        Сегменты одного уровня деления оцениваются параллельно.
+
+        Args:
+            start (datetime.datetime): Начало периода.
+            end (datetime.datetime): Конец периода.
+
+        Returns:
+            list[Shard]: Оцененные сегменты в порядке периодов.
+        """
+        pending = [Shard(start, end)]
+        planned: list[Shard] = []
+        while pending:
+            estimated = await asyncio.gather(*map(self.estimate, pending))
+            pending = []
+            for shard in estimated:
+                if shard is None:
+                    continue
+                parts = self.refine(shard)
+                if parts is None:
+                    if shard.found != 0:
+                        planned.append(shard)
+                else:
+                    pending.extend(parts)
+        planned.sort(key=lambda shard: (shard.start, shard.area or ""))
+        registry.inc("ingest_shards_total", len(planned), source=self.fetcher.job_board)
+        return planned
+
+    async def fetch(self, shards: list[Shard]) -> list[dict]:
+        """
+        Загружает вакансии сегментов параллельно и удаляет повторы
+        на границах периодов и пересекающихся регионах.
+
+        Args:
+            shards (list[Shard]): Сегменты.
+
+        Returns:
+            list[dict]: Вакансии в формате API.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def load(shard: Shard) -> list[dict]:
+            async with semaphore:
+                return await self.fetcher.get_vacancies(
+                    self.shard_params(shard), shard.first_page
+                )
+
+        vacancies: dict[Any, dict] = {}
+        for chunk in await asyncio.gather(*map(load, shards)):
+            for vacancy in chunk:
+                vacancies.setdefault(vacancy_key(vacancy) or id(vacancy), vacancy)
+        return list(vacancies.values())
+
+    async def collect(
+        self,
+        start: datetime.datetime | None = None,
+        end: datetime.datetime | None = None,
+    ) -> list[dict]:
+        """
+        Загружает все вакансии периода, по умолчанию периода ежедневной загрузки.
+
+        Args:
+            start (datetime.datetime | None): Начало периода.
+            end (datetime.datetime | None): Конец периода.
+
+        Returns:
+            list[dict]: Вакансии в формате API.
+        """
+        default_start, default_end = default_window(self.query)
+        shards = await self.plan(start or default_start, end or default_end)
+        logger.debug(
+            f"Загрузка {self.fetcher.job_board} разбита на сегменты: {len(shards)}"
+        )
+        return await self.fetch(shards)
@@ -0,0 +1,165 @@
+import hashlib
+import json
+import re
+from pathlib import Path
+from parser.parsing.connection import WebClient
+from typing import TYPE_CHECKING, Iterator
+from urllib.parse import urlsplit
+
+import httpx
+
+if TYPE_CHECKING:
+    from parser.parsing.config import ParserConfig
+
+# Параметры с датами меняются при каждом запуске парсера, поэтому не участвуют
+# в ключе фикстуры: иначе записанные ответы нельзя было бы воспроизвести на
+# следующий день.
+VOLATILE_PARAMS: frozenset[str] = frozenset(
+    {
+        "date_from",
+        "date_to",
+        "date_published_from",
+        "date_published_to",
+        "modifiedFrom",
+        "modifiedTo",
+    }
+)
+
+
+def fixture_key(host: str, path: str, query: list[tuple[str, str]]) -> str:
+    """
+    Формирует ключ фикстуры по адресу и параметрам запроса.
+
+    Args:
+        host (str): Хост API.
+        path (str): Путь запроса.
+        query (list[tuple[str, str]]): Параметры запроса.
+
+    Returns:
+        str: Ключ фикстуры вида `хост/хеш`.
+    """
+    path = re.sub("/+", "/", path).rstrip("/")
+    stable = sorted((key, value) for key, value in query if key not in VOLATILE_PARAMS)
+    digest = hashlib.sha1(f"{path}?{stable}".encode()).hexdigest()
+    return f"{host}/{digest[:20]}"
+
+
+class FixtureStore:
+    """
+    Хранилище записанных ответов API.
+
+    Каждый ответ хранится в отдельном JSON-файле `<каталог>/<хост>/<хеш>.json`
+    вместе с адресом, параметрами запроса, статусом и телом ответа.
+
+    Attributes:
+        directory (Path): Каталог с фикстурами.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = Path(directory)
+
+    def path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def save(self, response: httpx.Response) -> Path:
+        """
+        Сохраняет ответ API.
+
+        Args:
+            response (httpx.Response): Ответ сервера.
+
+        Returns:
+            Path: Путь к файлу фикстуры.
+        """
+        url = response.request.url
+        query = list(url.params.multi_items())
+        path = self.path(fixture_key(url.host, url.path, query))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fixture = {
+            "host": url.host,
+            "path": url.path,
+            "query": query,
+            "status": response.status_code,
+            "content_type": response.headers.get("content-type", "application/json"),
+            "body": response.text,
+        }
+        path.write_text(json.dumps(fixture, ensure_ascii=False), encoding="utf-8")
+        return path
+
+    def load(self, host: str, path: str, query: list[tuple[str, str]]) -> dict | None:
+        """
+        Загружает записанный ответ API.
+
+        Args:
+            host (str): Хост API.
+            path (str): Путь запроса.
+            query (list[tuple[str, str]]): Параметры запроса.
+
+        Returns:
+            dict | None: Данные фикстуры или None, если ответ не записан.
+        """
+        fixture_path = self.path(fixture_key(host, path, query))
+        if not fixture_path.exists():
+            return None
+        return json.loads(fixture_path.read_text(encoding="utf-8"))
+
+    def __iter__(self) -> Iterator[dict]:
+        for fixture_path in sorted(self.directory.glob("*/*.json")):
+            yield json.loads(fixture_path.read_text(encoding="utf-8"))
+
+
+class RecordingWebClient(WebClient):
+    """
+    Клиент, сохраняющий ответы реального API в хранилище фикстур.
+
+    Attributes:
+        store (FixtureStore): Хранилище фикстур.
+    """
+
+    def __init__(self, config: "ParserConfig", store: FixtureStore) -> None:
+        super().__init__(config)
+        self.store = store
+
+    async def create_client(
+        self, url: str, params: dict | None = None
+    ) -> httpx.Response:
+        response = await super().create_client(url, params)
+        self.store.save(response)
+        return response
+
+
+class ReplayWebClient(WebClient):
+    """
+    Клиент, направляющий запросы к API на локальный сервер с фикстурами.
+
+    Хост API сохраняется первым сегментом пути, поэтому сервер может отличить
+    одинаковые пути разных площадок, например `/vacancies` у HeadHunter и Zarplata.
+
+    Attributes:
+        base_url (str): Адрес локального сервера.
+        requests (int): Количество отправленных запросов.
+    """
+
+    def __init__(self, config: "ParserConfig", base_url: str) -> None:
+        super().__init__(config)
+        self.base_url = base_url.rstrip("/")
+        self.requests = 0
+
+    def rewrite(self, url: str) -> str:
+        """
+        Заменяет адрес API на адрес локального сервера.
+
+        Args:
+            url (str): Адрес API.
+
+        Returns:
+            str: Адрес на локальном сервере.
+        """
+        parts = urlsplit(url)
+        return f"{self.base_url}/{parts.netloc}{parts.path}"
+
+    async def create_client(
+        self, url: str, params: dict | None = None
+    ) -> httpx.Response:
+        self.requests += 1
+        return await super().create_client(self.rewrite(url), params)
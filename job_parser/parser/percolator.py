@@ -0,0 +1,277 @@
+import datetime
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from parser.models import SubscriptionMatch, Vacancies
+from typing import Iterable, Iterator
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from logger import logger, setup_logging
+from profiles.models import Profile
+
+# Логирование
+setup_logging()
+
+# Количество совпадений в одном запросе пакетной вставки.
+BATCH_SIZE = 1000
+
+
+def normalize(value: str | None) -> str:
+    """Приводит текст к виду для сравнения без учета регистра и лишних пробелов."""
+    return " ".join((value or "").split()).casefold()
+
+
+class AhoCorasick:
+    """
+    Автомат Ахо-Корасик для поиска нескольких подстрок за один проход по тексту.
+
+    Attributes:
+        patterns (list[str]): Искомые подстроки.
+    """
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        self.patterns = list(dict.fromkeys(pattern for pattern in patterns if pattern))
+        self.goto: list[dict[str, int]] = [{}]
+        self.fail: list[int] = [0]
+        self.output: list[list[int]] = [[]]
+        for index, pattern in enumerate(self.patterns):
+            state = 0
+            for char in pattern:
+                if char not in self.goto[state]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                    self.goto[state][char] = len(self.goto) - 1
+                state = self.goto[state][char]
+            self.output[state].append(index)
+        self._build_links()
+
+    def _build_links(self) -> None:
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self.goto[state].items():
+                queue.append(child)
+                fail = self.fail[state]
+                while fail and char not in self.goto[fail]:
+                    fail = self.fail[fail]
+                self.fail[child] = self.goto[fail].get(char, 0)
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def search(self, text: str) -> set[str]:
+        """
+        Возвращает подстроки, найденные в тексте.
+
+        Args:
+            text (str): Текст для поиска.
+
+        Returns:
+            set[str]: Найденные подстроки.
+        """
+        found: set[int] = set()
+        state = 0
+        for char in text:
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+            found.update(self.output[state])
+        return {self.patterns[index] for index in found}
+
+
+@dataclass
+class SubscriptionIndex:
+    """
+    Индекс подписок для сопоставления вакансий с профилями при записи.
+
+    Профессии подписчиков объединены в автомат Ахо-Корасик, поэтому название
+    и описание вакансии просматриваются один раз независимо от количества
+    подписок. Для каждой профессии подписчики сгруппированы по городу.
+    Вакансия подходит профилю, если название или описание содержит профессию,
+    а город вакансии - город профиля, как и в прежних запросах `icontains`.
+    Пустая профессия или город не ограничивают выборку.
+
+    Attributes:
+        version (int): Версия подписок, для которой построен индекс.
+        subscriptions (dict[str, dict[str, list[int]]]): Идентификаторы профилей
+        по профессии и городу.
+    """
+
+    version: int = 0
+    subscriptions: dict[str, dict[str, list[int]]] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self.automaton = AhoCorasick(self.subscriptions)
+
+    @classmethod
+    def build(cls, version: int = 0) -> "SubscriptionIndex":
+        """
+        Строит индекс по профилям с подпиской на рассылку.
+
+        Args:
+            version (int): Версия подписок.
+
+        Returns:
+            SubscriptionIndex: Индекс подписок.
+        """
+        subscriptions: dict[str, dict[str, list[int]]] = {}
+        profiles = Profile.objects.filter(subscribe=True).values_list(
+            "pk", "job", "city"
+        )
+        for pk, job, city in profiles:
+            cities = subscriptions.setdefault(normalize(job), {})
+            cities.setdefault(normalize(city), []).append(pk)
+        return cls(version, subscriptions)
+
+    def match(
+        self, title: str | None, description: str | None, city: str | None
+    ) -> set[int]:
+        """
+        Возвращает профили, которым подходит вакансия.
+
+        Args:
+            title (str | None): Название вакансии.
+            description (str | None): Описание вакансии.
+            city (str | None): Город вакансии.
+
+        Returns:
+            set[int]: Идентификаторы профилей.
+        """
+        jobs = self.automaton.search(f"{normalize(title)}\n{normalize(description)}")
+        if "" in self.subscriptions:
+            jobs.add("")
+        city = normalize(city)
+        profiles: set[int] = set()
+        for job in jobs:
+            for profile_city, pks in self.subscriptions[job].items():
+                if profile_city in city:
+                    profiles.update(pks)
+        return profiles
+
+    def matches(self, vacancies: Iterable[tuple]) -> Iterator[SubscriptionMatch]:
+        """
+        Сопоставляет вакансии с подписками.
+
+        Args:
+            vacancies (Iterable[tuple]): Идентификаторы, названия, тексты
+            описаний для поиска и города сохраненных вакансий.
+
+        Yields:
+            SubscriptionMatch: Совпадения вакансий с профилями.
+        """
+        for pk, title, description, city in vacancies:
+            for profile_id in self.match(title, description, city):
+                yield SubscriptionMatch(profile_id=profile_id, vacancy_id=pk)
+
+
+class Percolator:
+    """
+    Сопоставление новых вакансий с подписками при записи в базу данных.
+
+    Индекс подписок хранится в памяти процесса и перестраивается, когда
+    меняется версия подписок в кеше Django. Версия увеличивается сигналами
+    при изменении профилей. Без общего кеша воркер не видит увеличения версии
+    веб-процессом, поэтому версия истекает через `CACHE_VERSION_TIMEOUT`
+    секунд и индекс перестраивается не реже этого интервала.
+    """
+
+    version_key = "subscriptions:version"
+
+    def __init__(self) -> None:
+        self.index: SubscriptionIndex | None = None
+        self.lock = threading.Lock()
+
+    def get_version(self) -> int:
+        version = cache.get(self.version_key)
+        if version is None:
+            cache.add(self.version_key, time.time_ns(), settings.CACHE_VERSION_TIMEOUT)
+            version = cache.get(self.version_key)
+        return version
+
+    def get_index(self) -> SubscriptionIndex:
+        """Возвращает актуальный индекс подписок."""
+        version = self.get_version()
+        with self.lock:
+            if self.index is None or self.index.version != version:
+                self.index = SubscriptionIndex.build(version)
+                logger.debug(
+                    f"Индекс подписок построен: {len(self.index.subscriptions)} профессий"
+                )
+            return self.index
+
+    def invalidate(self) -> None:
+        """Увеличивает версию подписок."""
+        try:
+            cache.incr(self.version_key)
+        except ValueError:
+            cache.add(self.version_key, time.time_ns(), settings.CACHE_VERSION_TIMEOUT)
+
+    def percolate(self, urls: Iterable[str]) -> int:
+        """
+        Сопоставляет вакансии с подписками и сохраняет совпадения.
+
+        Вакансии загружаются по URL-адресам одним запросом вместе с текстом
+        описаний без распаковки (см. `VacancyDescription.search_text`), совпадения
+        записываются пакетами, повторные совпадения пропускаются. Дубликаты
+        вакансий других сайтов не сопоставляются.
+
+        Args:
+            urls (Iterable[str]): URL-адреса записанных вакансий.
+
+        Returns:
+            int: Количество найденных совпадений.
+        """
+        index = self.get_index()
+        if not index.subscriptions:
+            return 0
+        vacancies = Vacancies.objects.filter(
+            url__in=list(urls), duplicate_of__isnull=True
+        ).values_list("pk", "title", "description_data__search_text", "city")
+        matches = list(index.matches(vacancies))
+        SubscriptionMatch.objects.bulk_create(
+            matches, batch_size=BATCH_SIZE, ignore_conflicts=True
+        )
+        return len(matches)
+
+    def rematch(self, profile: Profile) -> int:
+        """
+        Сопоставляет подписку профиля с сегодняшними вакансиями заново.
+
+        Вызывается после изменения профессии, города или подписки профиля:
+        совпадения прежней подписки удаляются, а вакансии, записанные сегодня
+        до изменения, сопоставляются с новой подпиской, поэтому рассылка
+        отправляет вакансии по текущим предпочтениям профиля.
+
+        Args:
+            profile (Profile): Профиль подписчика.
+
+        Returns:
+            int: Количество найденных совпадений.
+        """
+        with transaction.atomic():
+            SubscriptionMatch.objects.filter(profile_id=profile.pk).delete()
+            if not profile.subscribe:
+                return 0
+            index = SubscriptionIndex(
+                subscriptions={
+                    normalize(profile.job): {normalize(profile.city): [profile.pk]}
+                }
+            )
+            vacancies = Vacancies.objects.filter(
+                published_at__date=datetime.date.today(), duplicate_of__isnull=True
+            ).values_list("pk", "title", "description_data__search_text", "city")
+            matches = list(index.matches(vacancies.iterator(chunk_size=BATCH_SIZE)))
+            SubscriptionMatch.objects.bulk_create(
+                matches, batch_size=BATCH_SIZE, ignore_conflicts=True
+            )
+        return len(matches)
+
+    async def apercolate(self, urls: Iterable[str]) -> int:
+        """Асинхронный вариант `percolate`."""
+        return await sync_to_async(self.percolate)(list(urls))
+
+
+percolator = Percolator()
@@ -0,0 +1,198 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from parser.models import UserVacancies
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+
+
+@dataclass(frozen=True)
+class PreferenceSnapshot:
+    """
+    Снимок пользовательских списков.
+
+    Attributes:
+        version (int): Версия списков пользователя, для которой построен снимок.
+        blacklist (frozenset[int]): Идентификаторы вакансий из черного списка.
+        favourites (frozenset[int]): Идентификаторы избранных вакансий.
+        hidden_companies (frozenset[str]): Названия скрытых компаний.
+    """
+
+    version: int
+    blacklist: frozenset[int] = frozenset()
+    favourites: frozenset[int] = frozenset()
+    hidden_companies: frozenset[str] = frozenset()
+
+    def to_cache(self) -> tuple:
+        return (
+            self.version,
+            sorted(self.blacklist),
+            sorted(self.favourites),
+            sorted(self.hidden_companies),
+        )
+
+    @classmethod
+    def from_cache(cls, value: tuple) -> "PreferenceSnapshot":
+        version, blacklist, favourites, hidden_companies = value
+        return cls(
+            version,
+            frozenset(blacklist),
+            frozenset(favourites),
+            frozenset(hidden_companies),
+        )
+
+
+class PreferenceCache:
+    """
+    Двухуровневый кеш снимков пользовательских списков.
+
+    Первый уровень - LRU-словарь в памяти процесса, второй - кеш Django
+    (Redis в рабочем окружении). Актуальность снимка определяется версией
+    списков пользователя, которая хранится в кеше Django и увеличивается
+    при каждом изменении списков. Поэтому для получения снимка в общем
+    случае достаточно одного обращения к кешу и ни одного к базе данных.
+    Без общего кеша версия истекает через `CACHE_VERSION_TIMEOUT` секунд:
+    другие процессы не видят ее увеличения и иначе использовали бы
+    устаревший снимок до истечения `timeout`.
+
+    Attributes:
+        maxsize (int): Количество снимков в памяти процесса.
+        timeout (int): Время жизни снимков и версий в кеше Django в секундах.
+    """
+
+    def __init__(self, maxsize: int | None = None, timeout: int | None = None) -> None:
+        self.maxsize = maxsize or settings.PREFERENCE_CACHE_SIZE
+        self.timeout = timeout or settings.PREFERENCE_CACHE_TIMEOUT
+        self.local: OrderedDict[int, PreferenceSnapshot] = OrderedDict()
+        self.lock = threading.Lock()
+
+    @property
+    def version_timeout(self) -> int:
+        """Время жизни версий списков в кеше Django в секундах."""
+        if settings.CACHE_VERSION_TIMEOUT is None:
+            return self.timeout
+        return min(self.timeout, settings.CACHE_VERSION_TIMEOUT)
+
+    @staticmethod
+    def version_key(user_id: int) -> str:
+        return f"preferences:version:{user_id}"
+
+    @staticmethod
+    def snapshot_key(user_id: int, version: int) -> str:
+        return f"preferences:{user_id}:{version}"
+
+    def get_version(self, user_id: int) -> int:
+        """
+        Возвращает текущую версию списков пользователя.
+
+        Если версия отсутствует в кеше, она инициализируется текущим временем,
+        а не единицей: так вытесненный из кеша счетчик не вернется к версии,
+        для которой в памяти процесса может оставаться устаревший снимок.
+
+        Args:
+            user_id (int): Идентификатор пользователя.
+
+        Returns:
+            int: Версия списков пользователя.
+        """
+        key = self.version_key(user_id)
+        version = cache.get(key)
+        if version is None:
+            cache.add(key, time.time_ns(), self.version_timeout)
+            version = cache.get(key)
+        return version
+
+    def get(self, user_id: int) -> PreferenceSnapshot:
+        """
+        Возвращает снимок списков пользователя.
+
+        Args:
+            user_id (int): Идентификатор пользователя.
+
+        Returns:
+            PreferenceSnapshot: Снимок списков пользователя.
+        """
+        version = self.get_version(user_id)
+        with self.lock:
+            snapshot = self.local.get(user_id)
+            if snapshot is not None and snapshot.version == version:
+                self.local.move_to_end(user_id)
+                return snapshot
+
+        key = self.snapshot_key(user_id, version)
+        cached = cache.get(key)
+        if cached is not None:
+            snapshot = PreferenceSnapshot.from_cache(cached)
+        else:
+            snapshot = self.build(user_id, version)
+            cache.set(key, snapshot.to_cache(), self.timeout)
+        self.remember(user_id, snapshot)
+        return snapshot
+
+    def build(self, user_id: int, version: int) -> PreferenceSnapshot:
+        """
+        Строит снимок списков пользователя одним запросом к базе данных.
+
+        Args:
+            user_id (int): Идентификатор пользователя.
+            version (int): Версия списков пользователя.
+
+        Returns:
+            PreferenceSnapshot: Снимок списков пользователя.
+        """
+        blacklist, favourites, hidden_companies = set(), set(), set()
+        rows = UserVacancies.objects.filter(
+            Q(is_blacklist=True)
+            | Q(is_favourite=True)
+            | Q(hidden_company__isnull=False),
+            user_id=user_id,
+        ).values_list("vacancy_id", "is_blacklist", "is_favourite", "hidden_company")
+        for vacancy_id, is_blacklist, is_favourite, hidden_company in rows:
+            if is_blacklist and vacancy_id is not None:
+                blacklist.add(vacancy_id)
+            elif is_favourite and vacancy_id is not None:
+                favourites.add(vacancy_id)
+            if hidden_company:
+                hidden_companies.add(hidden_company)
+        return PreferenceSnapshot(
+            version,
+            frozenset(blacklist),
+            frozenset(favourites),
+            frozenset(hidden_companies),
+        )
+
+    def remember(self, user_id: int, snapshot: PreferenceSnapshot) -> None:
+        with self.lock:
+            self.local[user_id] = snapshot
+            self.local.move_to_end(user_id)
+            while len(self.local) > self.maxsize:
+                self.local.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        """
+        Увеличивает версию списков пользователя.
+
+        Снимки предыдущей версии перестают использоваться во всех процессах
+        и удаляются из кеша Django по истечении времени жизни.
+
+        Args:
+            user_id (int): Идентификатор пользователя.
+        """
+        key = self.version_key(user_id)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, time.time_ns(), self.version_timeout)
+        with self.lock:
+            self.local.pop(user_id, None)
+
+    async def ainvalidate(self, user_id: int) -> None:
+        """Асинхронный вариант `invalidate`."""
+        await sync_to_async(self.invalidate)(user_id)
+
+
+preference_cache = PreferenceCache()
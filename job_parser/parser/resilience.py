@@ -0,0 +1,362 @@
+import asyncio
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, TypeVar
+from urllib.parse import urlsplit
+
+import aiohttp
+import httpx
+from django.conf import settings
+from job_parser.metrics import registry
+from logger import log_throttled, setup_logging
+
+# Логирование
+setup_logging()
+
+T = TypeVar("T")
+
+# Статусы ответа, после которых запрос повторяется.
+RETRY_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+# Исключения соединения, после которых запрос повторяется.
+TRANSIENT_ERRORS: tuple[type[BaseException], ...] = (
+    httpx.TransportError,
+    aiohttp.ClientConnectionError,
+    asyncio.TimeoutError,
+    ConnectionError,
+)
+
+
+class FetchError(Exception):
+    """
+    Запрос к сайту поиска работы не выполнен после всех повторов.
+
+    Attributes:
+        host (str): Хост сайта.
+        status (int | None): Статус последнего ответа, если ответ был получен.
+    """
+
+    def __init__(self, host: str, message: str, status: int | None = None) -> None:
+        super().__init__(f"{host}: {message}")
+        self.host = host
+        self.status = status
+
+
+class CircuitOpenError(FetchError):
+    """Запрос не отправлен: предохранитель хоста разомкнут."""
+
+
+def classify(status: int | None = None, exc: BaseException | None = None) -> str:
+    """
+    Определяет, как обработать результат запроса.
+
+    Args:
+        status (int | None): Статус ответа.
+        exc (BaseException | None): Исключение, возникшее при запросе.
+
+    Returns:
+        str: "ok" - ответ получен, "retry" - временная ошибка, запрос можно
+        повторить, "fatal" - ошибка, которую повтор не исправит.
+    """
+    if exc is not None:
+        return "retry" if isinstance(exc, TRANSIENT_ERRORS) else "fatal"
+    if status in RETRY_STATUSES:
+        return "retry"
+    return "ok"
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Разбирает заголовок Retry-After.
+
+    Args:
+        value (str | None): Значение заголовка: секунды или дата.
+
+    Returns:
+        float | None: Задержка в секундах или None, если заголовка нет.
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitBreaker:
+    """
+    Предохранитель запросов к одному хосту.
+
+    После `threshold` временных ошибок подряд предохранитель размыкается,
+    и запросы к хосту завершаются ошибкой без отправки. Через `reset_timeout`
+    секунд пропускается один пробный запрос: если он успешен, предохранитель
+    замыкается, иначе снова размыкается.
+
+    Attributes:
+        host (str): Хост сайта.
+        threshold (int): Количество ошибок подряд до размыкания.
+        reset_timeout (float): Время до пробного запроса в секундах.
+        state (str): "closed", "open" или "half_open".
+    """
+
+    def __init__(self, host: str, threshold: int, reset_timeout: float) -> None:
+        self.host = host
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Проверяет, можно ли отправить запрос."""
+        with self.lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open":
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    return False
+                self.state = "half_open"
+                return True
+            # Пробный запрос уже отправлен.
+            return False
+
+    def record_success(self) -> None:
+        with self.lock:
+            self.state = "closed"
+            self.failures = 0
+
+    def release(self) -> None:
+        """Возвращает разрешение на пробный запрос, не учитывая его результат."""
+        with self.lock:
+            if self.state == "half_open":
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+    def record_failure(self) -> None:
+        with self.lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.threshold:
+                if self.state != "open":
+                    registry.inc("ingest_circuit_open_total", host=self.host)
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+
+# Предохранители по хостам, общие для всех сборщиков процесса.
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(host: str) -> CircuitBreaker:
+    """
+    Возвращает предохранитель хоста, создавая его при первом обращении.
+
+    Args:
+        host (str): Хост сайта.
+
+    Returns:
+        CircuitBreaker: Предохранитель.
+    """
+    with _breakers_lock:
+        breaker = _breakers.get(host)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                host,
+                settings.INGEST_BREAKER_THRESHOLD,
+                settings.INGEST_BREAKER_RESET,
+            )
+            _breakers[host] = breaker
+        return breaker
+
+
+def reset_breakers() -> None:
+    """Сбрасывает предохранители всех хостов."""
+    with _breakers_lock:
+        _breakers.clear()
+
+
+class RateLimiter:
+    """
+    Ограничение частоты запросов к сайту.
+
+    Запросы начинаются не чаще одного раза в `interval` секунд, в том числе
+    при параллельной загрузке нескольких сегментов одним сборщиком: каждый
+    вызов `wait` занимает следующий свободный интервал.
+
+    Attributes:
+        interval (float): Минимальный интервал между запросами в секундах.
+    """
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self.next_at = 0.0
+
+    async def wait(self) -> None:
+        now = time.monotonic()
+        start_at = max(now, self.next_at)
+        self.next_at = start_at + self.interval
+        if start_at > now:
+            await asyncio.sleep(start_at - now)
+
+
+class RetryPolicy:
+    """
+    Повтор запросов к сайтам поиска работы.
+
+    Временные ошибки (обрыв соединения, таймаут, статусы 429 и 5xx)
+    повторяются до `retries` раз с экспоненциальной задержкой со случайным
+    разбросом (full jitter): перед повтором `n` ожидание выбирается
+    равномерно от 0 до `min(cap, base * 2 ** n)`, а если сайт прислал
+    Retry-After, то не меньше указанного времени. Все запросы к хосту
+    проходят через его предохранитель (см. `CircuitBreaker`).
+
+    Если задан `hedge_after`, то при отсутствии ответа за это время
+    отправляется копия запроса и используется первый полученный ответ.
+    Копии отправляются только для идемпотентных GET-запросов сборщиков.
+
+    Attributes:
+        retries (int): Количество повторов.
+        base (float): Начальная задержка в секундах.
+        cap (float): Максимальная задержка в секундах.
+        hedge_after (float): Время до отправки копии запроса в секундах,
+        0 - не отправлять.
+    """
+
+    def __init__(
+        self,
+        retries: int | None = None,
+        base: float | None = None,
+        cap: float | None = None,
+        hedge_after: float | None = None,
+    ) -> None:
+        self.retries = retries if retries is not None else settings.INGEST_RETRIES
+        self.base = base if base is not None else settings.INGEST_BACKOFF_BASE
+        self.cap = cap if cap is not None else settings.INGEST_BACKOFF_CAP
+        self.hedge_after = (
+            hedge_after if hedge_after is not None else settings.INGEST_HEDGE_AFTER
+        )
+
+    def backoff(self, attempt: int, retry_after: float | None = None) -> float:
+        """
+        Вычисляет задержку перед повтором.
+
+        Args:
+            attempt (int): Номер неудачной попытки, начиная с 0.
+            retry_after (float | None): Задержка, запрошенная сайтом.
+
+        Returns:
+            float: Задержка в секундах.
+        """
+        delay = random.uniform(0, min(self.cap, self.base * 2**attempt))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.cap))
+        return delay
+
+    async def hedged(self, request: Callable[[], Awaitable[T]], source: str) -> T:
+        """
+        Выполняет запрос, отправляя копию, если ответ задерживается.
+
+        Args:
+            request (Callable[[], Awaitable[T]]): Функция, выполняющая запрос.
+            source (str): Название сайта для метрик.
+
+        Returns:
+            T: Первый успешный результат.
+        """
+        if not self.hedge_after:
+            return await request()
+        primary = asyncio.ensure_future(request())
+        done, _ = await asyncio.wait({primary}, timeout=self.hedge_after)
+        if done:
+            return primary.result()
+        registry.inc("ingest_hedged_requests_total", source=source)
+        pending = {primary, asyncio.ensure_future(request())}
+        error: BaseException | None = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error  # type: ignore[misc]
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def call(
+        self,
+        url: str,
+        request: Callable[[], Awaitable[T]],
+        status: Callable[[T], int],
+        retry_after: Callable[[T], str | None] | None = None,
+        source: str = "",
+    ) -> T:
+        """
+        Выполняет запрос с повторами и предохранителем хоста.
+
+        Ответ с постоянной ошибкой (например, 404) возвращается без повторов,
+        его обрабатывает вызывающий код.
+
+        Args:
+            url (str): URL запроса, по хосту выбирается предохранитель.
+            request (Callable[[], Awaitable[T]]): Функция, выполняющая запрос.
+            status (Callable[[T], int]): Функция, возвращающая статус ответа.
+            retry_after (Callable[[T], str | None] | None): Функция,
+            возвращающая заголовок Retry-After ответа.
+            source (str): Название сайта для метрик и журнала.
+
+        Raises:
+            CircuitOpenError: Предохранитель хоста разомкнут.
+            FetchError: Временная ошибка не исчезла после всех повторов.
+
+        Returns:
+            T: Ответ сайта.
+        """
+        host = urlsplit(url).netloc
+        breaker = get_breaker(host)
+        attempt = 0
+        while True:
+            if not breaker.allow():
+                raise CircuitOpenError(host, "предохранитель разомкнут")
+            try:
+                result = await self.hedged(request, source)
+            except Exception as exc:
+                if classify(exc=exc) == "fatal":
+                    breaker.release()
+                    raise
+                breaker.record_failure()
+                reason, code, wait_for = repr(exc), None, None
+            else:
+                code = status(result)
+                if classify(status=code) == "ok":
+                    breaker.record_success()
+                    return result
+                breaker.record_failure()
+                reason = f"статус {code}"
+                wait_for = (
+                    parse_retry_after(retry_after(result)) if retry_after else None
+                )
+            if attempt == self.retries:
+                raise FetchError(host, f"{reason} после {attempt + 1} попыток", code)
+            delay = self.backoff(attempt, wait_for)
+            registry.inc("ingest_retries_total", source=source)
+            log_throttled(
+                f"retry:{host}",
+                "WARNING",
+                "Повтор запроса к {} через {:.2f} с: {}",
+                host,
+                delay,
+                reason,
+            )
+            await asyncio.sleep(delay)
+            attempt += 1
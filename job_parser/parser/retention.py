@@ -0,0 +1,231 @@
+import datetime
+import gzip
+import json
+import time
+from dataclasses import dataclass
+from parser.indexes import publish
+from parser.models import Vacancies, VacancyDescription
+from pathlib import Path
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Case, Value, When
+from django.utils import timezone
+from logger import logger, setup_logging
+
+# Логирование
+setup_logging()
+
+
+@dataclass
+class RetentionResult:
+    """
+    Результат очистки устаревших вакансий.
+
+    Attributes:
+        deleted (int): Количество удаленных вакансий.
+        batches (int): Количество выполненных пакетов.
+        archived (int): Количество вакансий, сохраненных в архив.
+        elapsed (float): Время очистки в секундах.
+        exhausted (bool): Все устаревшие вакансии удалены.
+    """
+
+    deleted: int = 0
+    batches: int = 0
+    archived: int = 0
+    elapsed: float = 0.0
+    exhausted: bool = False
+
+
+class RetentionPolicy:
+    """
+    Удаление устаревших вакансий небольшими пакетами.
+
+    Каждый пакет удаляется в отдельной короткой транзакции: выбираются
+    идентификаторы самых старых вакансий, затем по ним удаляются связанные
+    строки и сами вакансии. В память загружаются только идентификаторы,
+    а объем работы за один запуск ограничен `max_batches`, поэтому стоимость
+    запуска не зависит от количества устаревших строк. Остаток удаляется
+    следующими запусками.
+
+    Attributes:
+        days (int): Срок хранения вакансий в днях.
+        batch_size (int): Количество вакансий в одном пакете.
+        max_batches (int): Максимальное количество пакетов за запуск.
+        archive_dir (Path | None): Каталог архива удаленных вакансий.
+    """
+
+    def __init__(
+        self,
+        days: int | None = None,
+        batch_size: int | None = None,
+        max_batches: int | None = None,
+        archive_dir: Path | str | None = None,
+    ) -> None:
+        self.days = days if days is not None else settings.RETENTION_DAYS
+        self.batch_size = batch_size or settings.RETENTION_BATCH_SIZE
+        self.max_batches = max_batches or settings.RETENTION_MAX_BATCHES
+        archive_dir = archive_dir or settings.RETENTION_ARCHIVE_DIR
+        self.archive_dir = Path(archive_dir) if archive_dir else None
+
+    def cutoff(self) -> datetime.datetime:
+        """Возвращает дату, начиная с которой вакансии считаются устаревшими."""
+        return timezone.now() - datetime.timedelta(days=self.days)
+
+    def expired_ids(self, cutoff: datetime.datetime) -> list[int]:
+        """
+        Возвращает идентификаторы очередного пакета устаревших вакансий.
+
+        Args:
+            cutoff (datetime.datetime): Граница срока хранения.
+
+        Returns:
+            list[int]: Идентификаторы вакансий.
+        """
+        return list(
+            Vacancies.objects.filter(published_at__lte=cutoff)
+            .order_by("published_at")
+            .values_list("pk", flat=True)[: self.batch_size]
+        )
+
+    def archive(self, ids: list[int], directory: Path) -> int:
+        """
+        Дописывает вакансии пакета в архив `vacancies-<дата>.jsonl.gz`.
+
+        Описания сохраняются в архиве распакованными.
+
+        Args:
+            ids (list[int]): Идентификаторы вакансий.
+            directory (Path): Каталог архива.
+
+        Returns:
+            int: Количество сохраненных вакансий.
+        """
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"vacancies-{datetime.date.today()}.jsonl.gz"
+        rows = Vacancies.objects.filter(pk__in=ids).values()
+        descriptions = {
+            description.vacancy_id: description.text
+            for description in VacancyDescription.objects.filter(vacancy_id__in=ids)
+        }
+        count = 0
+        with gzip.open(path, "at", encoding="utf-8") as file:
+            for row in rows:
+                row["description"] = descriptions.get(row["id"])
+                file.write(json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False))
+                file.write("\n")
+                count += 1
+        return count
+
+    def promote_duplicates(self, ids: list[int]) -> int:
+        """
+        Переназначает дубликаты удаляемых вакансий.
+
+        Первый оставшийся дубликат каждой удаляемой вакансии становится
+        основной вакансией (ссылка обнуляется при удалении, см.
+        `Vacancies.duplicate_of`) и получает ее описание, остальные дубликаты
+        ссылаются на него. Иначе все дубликаты стали бы основными вакансиями
+        и снова появились бы в поиске и рассылке.
+
+        Args:
+            ids (list[int]): Идентификаторы удаляемых вакансий.
+
+        Returns:
+            int: Количество вакансий, ставших основными.
+        """
+        heads: dict[int, int] = {}
+        others: dict[int, int] = {}
+        survivors = (
+            Vacancies.objects.filter(duplicate_of_id__in=ids)
+            .exclude(pk__in=ids)
+            .order_by("pk")
+            .values_list("pk", "duplicate_of_id")
+        )
+        for pk, original in survivors:
+            if original in heads:
+                others[pk] = heads[original]
+            else:
+                heads[original] = pk
+        if not heads:
+            return 0
+        if others:
+            Vacancies.objects.filter(pk__in=others).update(
+                duplicate_of_id=Case(
+                    *(When(pk=pk, then=Value(head)) for pk, head in others.items())
+                )
+            )
+        described = set(
+            VacancyDescription.objects.filter(
+                vacancy_id__in=heads.values()
+            ).values_list("vacancy_id", flat=True)
+        )
+        moved = {
+            original: head for original, head in heads.items() if head not in described
+        }
+        if moved:
+            VacancyDescription.objects.filter(vacancy_id__in=moved).update(
+                vacancy_id=Case(
+                    *(
+                        When(vacancy_id=original, then=Value(head))
+                        for original, head in moved.items()
+                    )
+                )
+            )
+        return len(heads)
+
+    def delete_batch(self, ids: list[int]) -> int:
+        """
+        Удаляет пакет вакансий вместе со связанными строками.
+
+        Связанные строки удаляются запросами по идентификаторам вакансий
+        без загрузки в память, у самих вакансий загружаются только ключи.
+        Оставшиеся дубликаты удаляемых вакансий переназначаются
+        (см. `promote_duplicates`).
+
+        Args:
+            ids (list[int]): Идентификаторы вакансий.
+
+        Returns:
+            int: Количество удаленных вакансий.
+        """
+        with transaction.atomic():
+            self.promote_duplicates(ids)
+            _, deleted = Vacancies.objects.filter(pk__in=ids).only("pk").delete()
+        return deleted.get(Vacancies._meta.label, 0)
+
+    def run(self, dry_run: bool = False) -> RetentionResult:
+        """
+        Удаляет устаревшие вакансии.
+
+        Args:
+            dry_run (bool): Только подсчитать устаревшие вакансии.
+
+        Returns:
+            RetentionResult: Результат очистки.
+        """
+        result = RetentionResult()
+        start = time.perf_counter()
+        cutoff = self.cutoff()
+        if dry_run:
+            result.deleted = Vacancies.objects.filter(published_at__lte=cutoff).count()
+            result.elapsed = time.perf_counter() - start
+            return result
+
+        while result.batches < self.max_batches:
+            ids = self.expired_ids(cutoff)
+            if not ids:
+                result.exhausted = True
+                break
+            if self.archive_dir is not None:
+                result.archived += self.archive(ids, self.archive_dir)
+            result.deleted += self.delete_batch(ids)
+            result.batches += 1
+        if result.deleted:
+            publish(deleted=True)
+        result.elapsed = time.perf_counter() - start
+        logger.debug(
+            f"Удалено устаревших вакансий: {result.deleted}, "
+            f"пакетов: {result.batches}, за {result.elapsed:.2f} с"
+        )
+        return result
@@ -5,10 +5,9 @@ from parser.scraping.fetching import Fetcher
 from parser.scraping.scrapers.geekjob import GeekjobScraper
 from parser.scraping.scrapers.habr import HabrScraper
 from parser.scraping.scrapers.careerist import CareeristScraper
+from parser.useragents import UserAgentPool
 from parser.utils import Utils
 
-from fake_useragent import UserAgent
-
 
 @dataclass
 class Config:
@@ -37,7 +36,7 @@ class Config:
 
     # ПРОЧИЕ ПАРАМЕТРЫ
     download_delay: int = int(os.getenv("DOWNLOAD_DELAY", 5))
-    ua: UserAgent = UserAgent()
+    ua: UserAgentPool = field(default_factory=UserAgentPool)
     headers: dict | None = None
     utils: Utils = field(default_factory=Utils)
 
@@ -50,17 +49,20 @@ class Config:
             self,
             self.geekjob_url,
             self.geekjob_pages_count,
+            self.geekjob_job_board,
         )
         self.habr_fetcher = Fetcher(
             self,
             self.habr_url,
             self.habr_pages_count,
+            self.habr_job_board,
         )
 
         self.careerist_fetcher = Fetcher(
             self,
             self.careerist_url,
             self.careerist_pages_count,
+            self.careerist_job_board,
         )
 
         self.geekjob_scraper = GeekjobScraper(self)
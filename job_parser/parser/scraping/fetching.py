@@ -1,9 +1,15 @@
 import asyncio
+import functools
+from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
 import aiohttp
 from bs4 import BeautifulSoup
-from logger import logger, setup_logging
+from job_parser.metrics import registry
+from logger import log_throttled, setup_logging
+
+from parser.resilience import RetryPolicy
+from parser.tracing import span
 
 if TYPE_CHECKING:
     from parser.scraping.configuration import Config
@@ -11,6 +17,34 @@ if TYPE_CHECKING:
 setup_logging()
 
 
+@dataclass
+class Page:
+    """
+    Ответ на запрос страницы.
+
+    Attributes:
+        status (int): Статус ответа.
+        text (str): Текст ответа.
+        url (str): URL-адрес ответа после перенаправлений.
+        retry_after (str | None): Заголовок Retry-After.
+    """
+
+    status: int
+    text: str
+    url: str
+    retry_after: str | None = None
+
+
+def page_status(page: Page) -> int:
+    """Возвращает статус ответа для `RetryPolicy`."""
+    return page.status
+
+
+def page_retry_after(page: Page) -> str | None:
+    """Возвращает заголовок Retry-After ответа для `RetryPolicy`."""
+    return page.retry_after
+
+
 class Fetcher:
     """
     Класс Fetcher используется для получения данных с указанного URL.
@@ -19,33 +53,80 @@ class Fetcher:
         config (Config): Экземпляр класса конфигурации.
         url (str): URL-адрес для получения данных
         pages (int): Количество страниц для получения
+        job_board (str): Название сайта поиска работы для метрик.
+        retry (RetryPolicy): Повторы запросов (см. `parser.resilience`).
     """
 
-    def __init__(self, config: "Config", url: str, pages: int) -> None:
+    def __init__(
+        self,
+        config: "Config",
+        url: str,
+        pages: int,
+        job_board: str = "",
+        retry: RetryPolicy | None = None,
+    ) -> None:
         self.config = config
         self.url = url
         self.pages = pages
+        self.job_board = job_board
+        self.retry = retry or RetryPolicy()
+
+    async def request(
+        self, url: str, params: dict[str, str], headers: dict[str, str], kind: str
+    ) -> Page:
+        """
+        Асинхронный метод для выполнения одного GET-запроса.
+
+        Запрос регистрируется в метриках сайта (см. `job_parser.metrics`).
+
+        Args:
+            url (str): URL-адрес для получения данных.
+            params (dict[str, str]): Параметры запроса.
+            headers (dict[str, str]): Заголовки запроса.
+            kind (str): Вид запроса для метрик: "page" или "detail".
+
+        Returns:
+            Page: Ответ на запрос.
+        """
+        observed = False
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.get(url, params=params, headers=headers) as response:
+                    body = await response.read()
+                    registry.observe_fetch(
+                        self.job_board, kind, response.status, len(body)
+                    )
+                    observed = True
+                    return Page(
+                        response.status,
+                        await response.text(),
+                        str(response.url),
+                        response.headers.get("Retry-After"),
+                    )
+        except Exception:
+            if not observed:
+                registry.observe_fetch(self.job_board, kind, "error")
+            raise
 
     async def fetch(
         self,
         url: str,
         params: dict[str, str] = {},
         headers: dict[str, str] = {},
+        kind: str = "detail",
     ) -> tuple[str, str] | None:
         """
         Асинхронный метод для получения данных с указанного URL.
 
         В этом методе выполняется GET-запрос к указанному URL с переданными
         параметрами и заголовками.
-        Перед отправкой запроса заголовки обновляются рандомным фейковым user-agent
+        Перед отправкой запроса заголовки дополняются случайным user-agent
         с помощью вызова функции `config.update_headers()`.
-        Далее создается сессия и выполняется GET-запрос с использованием асинхронного
-        контекстного менеджера.
-        После получения ответа в лог записывается информация о заголовках
-        и коде состояния ответа.
+        Запрос выполняется методом `request` с повторами временных ошибок
+        и предохранителем хоста (атрибут `retry`, см. `parser.resilience`).
         В конце метода возвращается кортеж с текстом ответа и URL-адресом.
 
-        В случае возникновения исключения информация об исключении
+        Если запрос не удался после всех повторов, информация об ошибке
         записывается в лог и возвращается None.
 
         Args:
@@ -54,26 +135,44 @@ class Fetcher:
             По умолчанию пустой словарь.
             headers (dict[str, str], optional): Заголовки запроса.
             По умолчанию пустой словарь.
+            kind (str): Вид запроса для метрик: "page" или "detail".
 
         Returns:
             tuple[str, str] | None: Кортеж с текстом ответа и URL-адресом
             или None в случае ошибки.
         """
-        try:
-            headers.update(self.config.update_headers())  # fake-user-agent
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
+        with span(f"fetch_{kind}"):
+            try:
+                # случайный user-agent
+                headers = {**headers, **self.config.update_headers()}
+                page = await self.retry.call(
                     url,
-                    params=params,
-                    headers=headers,
-                ) as response:
-                    if not response.status == 200:
-                        logger.debug(
-                            f"Error {str(response.url)}, response status code {response.status}"
-                        )
-                    return await response.text(), str(response.url)
-        except Exception as exc:
-            return logger.exception(exc)
+                    functools.partial(self.request, url, params, headers, kind),
+                    status=page_status,
+                    retry_after=page_retry_after,
+                    source=self.job_board,
+                )
+            except Exception as exc:
+                registry.inc(
+                    "ingest_fetch_failures_total", source=self.job_board, kind=kind
+                )
+                log_throttled(
+                    f"fetch-failure:{self.job_board}",
+                    "ERROR",
+                    "Не удалось загрузить {}: {!r}",
+                    url,
+                    exc,
+                )
+                return None
+            if not page.status == 200:
+                log_throttled(
+                    f"fetch-status:{self.job_board}",
+                    "DEBUG",
+                    "Error {}, response status code {}",
+                    page.url,
+                    page.status,
+                )
+            return page.text, page.url
 
     async def fetch_pagination_pages(self) -> asyncio.Future[list]:
         """
@@ -99,7 +198,7 @@ class Fetcher:
 
         for page_num in range(1, self.pages + 1):
             page_url = f"{self.url}{page_num}"
-            task = asyncio.create_task(self.fetch(page_url))
+            task = asyncio.create_task(self.fetch(page_url, kind="page"))
             tasks.append(task)
 
         return await asyncio.gather(*tasks)
@@ -112,8 +211,7 @@ class Fetcher:
         вакансий по указанным ссылкам. Затем выполняется ожидание завершения всех
         задач и сбор результатов.
 
-        В случае возникновения исключения при выполнении задачи, оно логируется,
-        а результат игнорируется.
+        Страницы, которые не удалось загрузить (`fetch` вернул None), пропускаются.
 
         Args:
             links (list[str]): Список ссылок на страницы вакансий.
@@ -124,17 +222,15 @@ class Fetcher:
         results: list[tuple[str, str]] = []
 
         for link in links:
-            await asyncio.sleep(self.config.download_delay)
+            with span("sleep"):
+                await asyncio.sleep(self.config.download_delay)
             task = asyncio.create_task(self.fetch(link))
             tasks.append(task)
         for task_ in asyncio.as_completed(tasks):
-            try:
-                text, url = await task_
-            except Exception as exc:
-                logger.exception(exc)
-            if text is None or url is None:
+            page = await task_
+            if page is None:
                 continue
-            results.append((text, url))
+            results.append(page)
         return results
 
     async def get_vacancy_links(
@@ -154,16 +250,41 @@ class Fetcher:
         html_pages = await self.fetch_pagination_pages()
         links: list[str] = []
 
-        for html in html_pages:
-            soup = BeautifulSoup(html[0], "lxml")
-            if tag:
-                page_links = soup.find_all(name=tag)
-            if selector:
-                page_links = soup.find_all("a", class_=selector)
-            for link in page_links:
-                href = link.get("href")
-                if href.startswith("http") or href.startswith("https"):
-                    links.append(href)
-                else:
-                    links.append(domain + href)
+        for page in html_pages:
+            if page is None:
+                continue
+            links.extend(self.extract_links(page[0], domain, selector, tag))
+        return links
+
+    def extract_links(
+        self,
+        html: str,
+        domain: str,
+        selector: str | None = None,
+        tag: str | None = None,
+    ) -> list[str]:
+        """
+        Метод для извлечения ссылок на вакансии из страницы пагинации.
+
+        Args:
+            html (str): HTML-код страницы пагинации.
+            domain (str): Домен сайта.
+            selector (str | None ): Название html-класса, по которому будет
+            осуществлен поиск.
+            tag: (str | None ): HTML-тег.
+        Returns:
+            list[str]: Список ссылок на вакансии.
+        """
+        links: list[str] = []
+        soup = BeautifulSoup(html, "lxml")
+        if tag:
+            page_links = soup.find_all(name=tag)
+        if selector:
+            page_links = soup.find_all("a", class_=selector)
+        for link in page_links:
+            href = link.get("href")
+            if href.startswith("http") or href.startswith("https"):
+                links.append(href)
+            else:
+                links.append(domain + href)
         return links
@@ -1,16 +1,34 @@
+from functools import cached_property
+from typing import Callable
+
 from logger import setup_logging
 
 from parser.scraping.configuration import Config
+from parser.tracing import traced
 
 setup_logging()
 
-config = Config()
-
 
 class StartScrapers:
-    """Класс предназначен для запуска скраперов сайтов поиска работы."""
+    """
+    Класс предназначен для запуска скраперов сайтов поиска работы.
+
+    Конфигурация создается фабрикой `config_factory` при первом обращении,
+    а не при импорте модуля, поэтому каждый экземпляр (один на запуск задачи)
+    получает свежую конфигурацию, например параметры запросов с текущей датой.
+
+    Attributes:
+        config_factory (Callable[[], Config]): Фабрика конфигурации.
+    """
+
+    def __init__(self, config_factory: Callable[[], Config] = Config) -> None:
+        self.config_factory = config_factory
+
+    @cached_property
+    def config(self) -> Config:
+        return self.config_factory()
 
-    @config.utils.timeit
+    @traced("scrape_habr")
     async def scrape_habr(self) -> None:
         """
         Асинхронный метод для скрапинга вакансий с сайта Habr.
@@ -18,9 +36,9 @@ class StartScrapers:
         Returns:
             None
         """
-        await config.habr_scraper.scrape()
+        await self.config.habr_scraper.scrape()
 
-    @config.utils.timeit
+    @traced("scrape_geekjob")
     async def scrape_geekjob(self) -> None:
         """
         Асинхронный метод для скрапинга вакансий с сайта Geekjob.
@@ -28,9 +46,9 @@ class StartScrapers:
         Returns:
             None
         """
-        await config.geekjob_scraper.scrape()
+        await self.config.geekjob_scraper.scrape()
 
-    @config.utils.timeit
+    @traced("scrape_careerist")
     async def scrape_careerist(self) -> None:
         """
         Асинхронный метод для скрапинга вакансий с сайта Careerist.
@@ -38,4 +56,4 @@ class StartScrapers:
         Returns:
             None
         """
-        await config.careerist_scraper.scrape()
+        await self.config.careerist_scraper.scrape()
@@ -10,6 +10,9 @@ if TYPE_CHECKING:
 
 from logger import logger, setup_logging
 
+from parser.dedup import deduplicator
+from parser.tracing import span, stage
+
 setup_logging()
 
 
@@ -28,6 +31,9 @@ class Vacancy:
     schedule: str | None
     remote: bool
     published_at: datetime.date | None
+    fingerprint: str | None = None
+    simhash: int | None = None
+    duplicate_of_id: int | None = None
 
 
 class Scraper(abc.ABC):
@@ -53,10 +59,12 @@ class Scraper(abc.ABC):
         списка ссылок на вакансии с указанного домена. Затем вызывается метод
         `fetch_vacancy_pages` для получения страниц вакансий.
 
-        Далее создается объект `BeautifulSoup` для парсинга HTML-кода страницы.
-        Затем вызываются различные методы для извлечения информации с использованием
-        объекта `BeautifulSoup`. Эта информация используется для создания объекта
-        `Vacancy`, который затем добавляется в список обработанных вакансий.
+        Далее методом `parse_page` создается объект `BeautifulSoup` для парсинга
+        HTML-кода страницы. Затем метод `extract` вызывает различные методы для
+        извлечения информации с использованием объекта `BeautifulSoup` и создает
+        объект `Vacancy`, который затем добавляется в список обработанных вакансий.
+        Вакансии, уже сохраненные с другого сайта, отмечаются как дубликаты
+        (см. `parser.dedup`) и записываются ссылкой на найденную вакансию.
 
         В конце метода список обработанных вакансий записывается в базу данных
         с помощью метода `record`.
@@ -68,36 +76,66 @@ class Scraper(abc.ABC):
             None
         """
         parsed_vacancy_list: list[dict] = []
-        links: list[str] = await self.fetcher.get_vacancy_links(selector, domain)
-        vacancy_list: list[dict] = await self.fetcher.fetch_vacancy_pages(links)
+        with stage(self.job_board, "fetch"):
+            links: list[str] = await self.fetcher.get_vacancy_links(selector, domain)
+            vacancy_list: list[dict] = await self.fetcher.fetch_vacancy_pages(links)
         vacancy_count: int = 0
 
-        for page in vacancy_list:
-            html, url = page
-            soup = BeautifulSoup(html, "lxml")
-            vacancy = Vacancy(
-                job_board=self.job_board,
-                url=url,
-                title=await self.get_title(soup),
-                city=await self.get_city(soup),
-                description=await self.get_description(soup),
-                salary_from=await self.get_salary_from(soup),
-                salary_to=await self.get_salary_to(soup),
-                salary_currency=await self.get_salary_currency(soup),
-                company=await self.get_company(soup),
-                experience=await self.get_experience(soup),
-                schedule=await self.get_schedule(soup),
-                remote=await self.get_remote(),
-                published_at=await self.get_published_at(soup),
-            )
-            parsed_vacancy_list.append(asdict(vacancy))
-            vacancy_count += 1
+        with stage(self.job_board, "extract"):
+            vacancies: list[Vacancy] = []
+            for page in vacancy_list:
+                html, url = page
+                soup = self.parse_page(html)
+                vacancies.append(await self.extract(soup, url))
+                vacancy_count += 1
+            with span("dedup"):
+                await deduplicator.adetect(vacancies)
+            parsed_vacancy_list = [asdict(vacancy) for vacancy in vacancies]
 
         logger.debug(
             f"Сбор вакансий с площадки {self.job_board} завершен. Собрано вакансий: {vacancy_count}"
         )
         await self.config.db.record(parsed_vacancy_list)
 
+    def parse_page(self, html: str) -> BeautifulSoup:
+        """
+        Метод для построения дерева HTML-страницы вакансии.
+
+        Args:
+            html (str): HTML-код страницы вакансии.
+
+        Returns:
+            BeautifulSoup: Объект BeautifulSoup со страницей вакансии.
+        """
+        return BeautifulSoup(html, "lxml")
+
+    async def extract(self, soup: BeautifulSoup, url: str) -> Vacancy:
+        """
+        Асинхронный метод для извлечения данных вакансии со страницы.
+
+        Args:
+            soup (BeautifulSoup): Объект BeautifulSoup со страницей вакансии.
+            url (str): URL-адрес вакансии.
+
+        Returns:
+            Vacancy: Данные вакансии.
+        """
+        return Vacancy(
+            job_board=self.job_board,
+            url=url,
+            title=await self.get_title(soup),
+            city=await self.get_city(soup),
+            description=await self.get_description(soup),
+            salary_from=await self.get_salary_from(soup),
+            salary_to=await self.get_salary_to(soup),
+            salary_currency=await self.get_salary_currency(soup),
+            company=await self.get_company(soup),
+            experience=await self.get_experience(soup),
+            schedule=await self.get_schedule(soup),
+            remote=await self.get_remote(),
+            published_at=await self.get_published_at(soup),
+        )
+
     @abc.abstractmethod
     async def get_title(self, soup: BeautifulSoup) -> str | None:
         """Извлекает название вакансии со страницы вакансии.
@@ -1,32 +1,60 @@
 import asyncio
 import datetime
+from parser.percolator import normalize, percolator
+from parser.retention import RetentionPolicy
 from parser.scraping.main import StartScrapers
+from typing import Any, Callable, Iterator
 
 from django.conf import settings
-from django.core.mail import EmailMultiAlternatives
-from django.db.models import Q
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db.models import QuerySet
+from django.template.loader import render_to_string
 from huey import crontab
-from huey.contrib.djhuey import periodic_task
+from huey.contrib.djhuey import db_periodic_task, db_task, lock_task, signal
+from huey.signals import SIGNAL_COMPLETE, SIGNAL_ERROR
+from job_parser.metrics import registry
 from logger import logger, setup_logging
 from profiles.models import Profile
 
-from .models import Vacancies
+from .models import SubscriptionMatch, Vacancies
 from .parsing.main import JobParser
 
 setup_logging()
 
+# Приоритеты задач: задачи с большим приоритетом выполняются раньше, поэтому
+# письма пользователям не ждут, пока воркеры заняты загрузкой вакансий.
+PRIORITY_USER = 100
+PRIORITY_MAINTENANCE = 50
+PRIORITY_INGEST = 10
+
+# Периодические задачи выполняются под блокировкой `lock_task` с именем
+# источника: если предыдущий запуск еще не завершен, новый пропускается.
+
 
 class EmailSender:
-    """Класс для отправки электронных писем с вакансиями."""
+    """
+    Класс для отправки электронных писем с вакансиями.
+
+    Вакансии сопоставляются с подписками при записи в базу данных
+    (см. `parser.percolator`), поэтому рассылка только читает сохраненные
+    совпадения за сегодня одним запросом. Профили подписчиков группируются
+    по нормализованной паре (профессия, город), и письмо рендерится один раз
+    для каждой группы. Письма отправляются пачками по `EMAIL_BATCH_SIZE`
+    через одно SMTP-соединение на пачку.
+    """
+
+    template_name = "parser/email/digest.html"
+    text_template_name = "parser/email/digest.txt"
 
-    def __init__(self) -> None:
+    def __init__(self, batch_size: int | None = None) -> None:
         """
         Инициализация класса.
 
-        Создает пустые списки для хранения профилей и вакансий.
+        Args:
+            batch_size (int | None): Количество писем в одной пачке.
         """
-        self.profiles: list[Profile] = []
-        self.vacancy_list: list = []
+        self.batch_size = batch_size or settings.EMAIL_BATCH_SIZE
+        self.profiles: QuerySet[Profile] | list[Profile] = []
 
     def get_profiles(self) -> None:
         """
@@ -35,109 +63,235 @@ class EmailSender:
         Этот метод получает список профилей из модели `Profile`,
         у которых значение поля `subscribe` равно `True`.
         """
-        self.profiles = Profile.objects.filter(subscribe=True)
+        self.profiles = (
+            Profile.objects.filter(subscribe=True, user__isnull=False)
+            .exclude(user__email="")
+            .select_related("user")
+            .only("job", "city", "user__email")
+        )
         logger.debug("Профили получены")
 
-    def get_vacancies(self, profile: Profile) -> None:
+    def group_profiles(self) -> dict[tuple[str, str], list[Profile]]:
         """
-        Получение списка вакансий со скрапера.
+        Группировка подписчиков по профессии и городу.
 
-        Этот метод принимает аргумент `profile` и получает список вакансий
-        из модели `VacancyScraper`, у которых значения полей `title`, `city`
-        и `published_at` соответствуют значениям этих полей в переданном профиле.
+        Значения сравниваются так же, как в индексе подписок: без учета
+        регистра и лишних пробелов.
 
-        Args:
-            profile: Профиль пользователя.
+        Returns:
+            dict[tuple[str, str], list[Profile]]: Профили подписчиков
+            по паре (профессия, город).
+        """
+        groups: dict[tuple[str, str], list[Profile]] = {}
+        for profile in self.profiles:
+            key = (normalize(profile.job), normalize(profile.city))
+            groups.setdefault(key, []).append(profile)
+        logger.debug(f"Подписчики сгруппированы: {len(groups)} групп")
+        return groups
+
+    def get_matches(self) -> dict[int, dict[int, Vacancies]]:
+        """
+        Получение сохраненных совпадений подписок за сегодня.
+
+        Returns:
+            dict[int, dict[int, Vacancies]]: Вакансии по идентификаторам
+            профилей и вакансий.
         """
-        self.vacancy_list = Vacancies.objects.filter(
-            Q(title__icontains=profile.job) | Q(description__icontains=profile.job),
-            city__icontains=profile.city,
-            published_at=datetime.date.today(),
+        matches: dict[int, dict[int, Vacancies]] = {}
+        rows = (
+            SubscriptionMatch.objects.filter(
+                profile__subscribe=True,
+                vacancy__published_at__date=datetime.date.today(),
+            )
+            .select_related("vacancy")
+            .only(
+                "profile_id",
+                "vacancy__url",
+                "vacancy__title",
+                "vacancy__company",
+                "vacancy__city",
+                "vacancy__published_at",
+            )
+            .order_by("-vacancy__published_at")
         )
-        logger.debug("Вакансии со скрапера получены")
+        for match in rows:
+            matches.setdefault(match.profile_id, {})[match.vacancy_id] = match.vacancy
+        logger.debug("Совпадения подписок получены")
+        return matches
+
+    def get_vacancies(
+        self, profiles: list[Profile], matches: dict[int, dict[int, Vacancies]]
+    ) -> list[Vacancies]:
+        """
+        Получение списка вакансий для группы подписчиков.
+
+        Профили группы подписаны на одно и то же, но могли быть сопоставлены
+        с разным набором вакансий, если подписка появилась в течение дня,
+        поэтому совпадения профилей объединяются.
+
+        Args:
+            profiles (list[Profile]): Профили группы.
+            matches (dict[int, dict[int, Vacancies]]): Совпадения подписок.
 
-    def send_email(self, profile: Profile) -> None:
+        Returns:
+            list[Vacancies]: Список вакансий.
         """
-        Отправка электронного письма с вакансиями.
+        vacancies: dict[int, Vacancies] = {}
+        for profile in profiles:
+            vacancies.update(matches.get(profile.pk, {}))
+        return list(vacancies.values())
 
-        Этот метод принимает аргумент `profile` и отправляет электронное письмо
-        на адрес электронной почты пользователя, указанный в профиле.
-        Тема письма и текстовое содержимое формируются из текущей даты и
-        настроек. HTML-содержимое формируется из списка `shared_job_list`.
-        Если список пуст, вместо него используется сообщение о том,
-        что вакансий нет. Для отправки письма используется класс
-        `EmailMultiAlternatives` Django.
+    def render_digest(self, vacancies: list[Vacancies]) -> tuple[str, str]:
+        """
+        Рендеринг письма с вакансиями.
 
         Args:
-            profile: Профиль пользователя.
+            vacancies (list[Vacancies]): Список вакансий.
+
+        Returns:
+            tuple[str, str]: Текстовое и HTML-содержимое письма.
         """
-        subject = f"Вакансии по вашим предпочтениям за {datetime.date.today()}"
-        text_content = "Рассылка вакансий"
-        from_email = settings.EMAIL_HOST_USER
-        html = ""
-        empty = "<h2>К сожалению на сегодня вакансий нет.</h2>"
+        context = {"vacancies": vacancies}
+        return (
+            render_to_string(self.text_template_name, context),
+            render_to_string(self.template_name, context),
+        )
 
-        for vacancy in self.vacancy_list:
-            html += f'<h5><a href="{vacancy.url}">{vacancy.title}</a></h5>'
-            html += f"<p>{vacancy.company}</p>"
-            html += f"<p>Город: {vacancy.city} | Дата публикации: {vacancy.published_at}</p>"
+    def chunks(self, recipients: list[str]) -> Iterator[list[str]]:
+        """Разбивает список адресов на пачки по `batch_size`."""
+        for start in range(0, len(recipients), self.batch_size):
+            yield recipients[start : start + self.batch_size]
 
-        _html = html if html else empty
+    @staticmethod
+    def send_chunk(subject: str, text: str, html: str, recipients: list[str]) -> int:
+        """
+        Отправка пачки писем через одно SMTP-соединение.
 
-        to = profile.user.email
+        Каждому получателю отправляется отдельное письмо, чтобы адреса
+        подписчиков не раскрывались друг другу.
+
+        Args:
+            subject (str): Тема письма.
+            text (str): Текстовое содержимое письма.
+            html (str): HTML-содержимое письма.
+            recipients (list[str]): Адреса получателей.
+
+        Returns:
+            int: Количество отправленных писем.
+        """
+        connection = get_connection()
+        messages = []
+        for to in recipients:
+            message = EmailMultiAlternatives(
+                subject, text, settings.DEFAULT_FROM_EMAIL, [to], connection=connection
+            )
+            message.attach_alternative(html, "text/html")
+            messages.append(message)
         try:
-            msg = EmailMultiAlternatives(subject, text_content, from_email, [to])
-            msg.attach_alternative(_html, "text/html")
-            msg.send()
-            logger.debug(f"Письмо на адрес {to} отправлено")
+            sent = connection.send_messages(messages) or 0
+            logger.debug(f"Отправлено писем: {sent} из {len(messages)}")
         except Exception as exc:
             logger.exception(exc)
+            sent = 0
+        return sent
 
-    def sending_emails(self) -> None:
+    def sending_emails(
+        self, dispatch: Callable[[str, str, str, list[str]], Any] | None = None
+    ) -> None:
         """
         Отправка электронных писем с вакансиями.
+
+        Args:
+            dispatch (Callable | None): Функция отправки пачки писем. По умолчанию
+            пачки отправляются в текущем процессе методом `send_chunk`.
         """
+        dispatch = dispatch or self.send_chunk
+        subject = f"Вакансии по вашим предпочтениям за {datetime.date.today()}"
         try:
             self.get_profiles()
-            for profile in self.profiles:
-                self.get_vacancies(profile)
-                self.send_email(profile)
+            groups = self.group_profiles()
+            matches = self.get_matches()
+            for profiles in groups.values():
+                text, html = self.render_digest(self.get_vacancies(profiles, matches))
+                recipients = [profile.user.email for profile in profiles]
+                for chunk in self.chunks(recipients):
+                    dispatch(subject, text, html, chunk)
         except Exception as exc:
             logger.exception(exc)
 
 
-@periodic_task(crontab(minute=f"*/{settings.SENDING_EMAILS_HOURS}"))
+@signal(SIGNAL_COMPLETE, SIGNAL_ERROR)
+def publish_metrics(signal_name: str, task: Any, *args: Any) -> None:
+    """Сохраняет снимок метрик воркера после каждой задачи для `/metrics`."""
+    registry.publish()
+
+
+@db_task(priority=PRIORITY_USER)
+def send_digest_chunk(subject: str, text: str, html: str, recipients: list[str]) -> int:
+    """
+    Отправка пачки писем с вакансиями.
+
+    Задача выполняется воркером huey, поэтому пачки одной рассылки
+    распределяются между воркерами.
+    """
+    return EmailSender.send_chunk(subject, text, html, recipients)
+
+
+@db_task(priority=PRIORITY_USER)
+def rematch_subscription(profile_id: int) -> int:
+    """
+    Сопоставление подписки профиля с сегодняшними вакансиями заново.
+
+    Задача ставится в очередь после изменения предпочтений рассылки профиля
+    (см. `profiles.signals`), поэтому сохранение профиля не ждет
+    сопоставления. Профиль загружается при выполнении задачи: если он уже
+    удален, задача ничего не делает.
+    """
+    profile = Profile.objects.filter(pk=profile_id).first()
+    if profile is None:
+        return 0
+    return percolator.rematch(profile)
+
+
+@db_periodic_task(
+    crontab(minute=f"*/{settings.SENDING_EMAILS_HOURS}"), priority=PRIORITY_USER
+)
+@lock_task("send-emails")
 def start_sending_emails() -> None:
     """
     Отправка электронных писем с вакансиями.
 
     Эта функция создает экземпляр класса `EmailSender` и вызывает его метод
-    `sending_emails` для отправки электронных писем с вакансиями.
+    `sending_emails`, который ставит отправку каждой пачки писем в очередь.
     Функция выполняется периодически с интервалом, указанным в настройках.
     """
     sender = EmailSender()
-    sender.sending_emails()
+    sender.sending_emails(dispatch=send_digest_chunk)
 
 
-@periodic_task(crontab(minute=f"*/{settings.DELETE_OLD_VACANCIES}"))
+@db_periodic_task(
+    crontab(minute=f"*/{settings.DELETE_OLD_VACANCIES}"), priority=PRIORITY_MAINTENANCE
+)
+@lock_task("delete-old-vacancies")
 def delete_old_vacancies() -> None:
     """
     Удаление устаревших вакансий.
 
-    Эта функция удаляет объекты модели `VacancyScraper`, у которых значение поля
-    `published_at` меньше или равно текущей дате минус 10 дней.
-    Если во время выполнения возникает исключение, оно записывается в журнал.
+    Эта функция удаляет вакансии, опубликованные раньше срока хранения
+    `RETENTION_DAYS`, пакетами с помощью `RetentionPolicy`. За один запуск
+    удаляется не больше `RETENTION_MAX_BATCHES` пакетов, остаток удаляется
+    следующими запусками. Если во время выполнения возникает исключение,
+    оно записывается в журнал.
     Функция выполняется периодически с интервалом, указанным в настройках.
     """
-    min_date = datetime.datetime.today() - datetime.timedelta(days=10)
     try:
-        Vacancies.objects.filter(published_at__lte=min_date).delete()
+        RetentionPolicy().run()
     except Exception as exc:
         logger.exception(exc)
-    logger.debug("Устаревшие вакансии удалены")
 
 
-@periodic_task(crontab(minute=f"*/{settings.SCRAPE_HABR}"))
+@db_periodic_task(crontab(minute=f"*/{settings.SCRAPE_HABR}"), priority=PRIORITY_INGEST)
+@lock_task("scrape-habr")
 def scrape_habr_task() -> None:
     """
     Запуск скрапера habr.
@@ -146,7 +300,10 @@ def scrape_habr_task() -> None:
     asyncio.run(scraper.scrape_habr())
 
 
-@periodic_task(crontab(minute=f"*/{settings.SCRAPE_GEEKJOB}"))
+@db_periodic_task(
+    crontab(minute=f"*/{settings.SCRAPE_GEEKJOB}"), priority=PRIORITY_INGEST
+)
+@lock_task("scrape-geekjob")
 def scrape_geekjob_task() -> None:
     """
     Запуск скрапера geekjob.
@@ -155,7 +312,10 @@ def scrape_geekjob_task() -> None:
     asyncio.run(scraper.scrape_geekjob())
 
 
-@periodic_task(crontab(minute=f"*/{settings.SCRAPE_CAREERIST}"))
+@db_periodic_task(
+    crontab(minute=f"*/{settings.SCRAPE_CAREERIST}"), priority=PRIORITY_INGEST
+)
+@lock_task("scrape-careerist")
 def scrape_careerist_task() -> None:
     """
     Запуск парсера careerist.
@@ -164,7 +324,10 @@ def scrape_careerist_task() -> None:
     asyncio.run(scraper.scrape_careerist())
 
 
-@periodic_task(crontab(minute=f"*/{settings.PARSE_HEADHUNTER}"))
+@db_periodic_task(
+    crontab(minute=f"*/{settings.PARSE_HEADHUNTER}"), priority=PRIORITY_INGEST
+)
+@lock_task("parse-headhunter")
 def parse_headhunter_task() -> None:
     """
     Запуск парсера headhunter.
@@ -173,7 +336,10 @@ def parse_headhunter_task() -> None:
     asyncio.run(parser.parse_headhunter())
 
 
-@periodic_task(crontab(minute=f"*/{settings.PARSE_ZARPLATA}"))
+@db_periodic_task(
+    crontab(minute=f"*/{settings.PARSE_ZARPLATA}"), priority=PRIORITY_INGEST
+)
+@lock_task("parse-zarplata")
 def parse_zarplata_task() -> None:
     """
     Запуск парсера zarplata.
@@ -182,7 +348,10 @@ def parse_zarplata_task() -> None:
     asyncio.run(parser.parse_zarplata())
 
 
-@periodic_task(crontab(minute=f"*/{settings.PARSE_SUPERJOB}"))
+@db_periodic_task(
+    crontab(minute=f"*/{settings.PARSE_SUPERJOB}"), priority=PRIORITY_INGEST
+)
+@lock_task("parse-superjob")
 def pars_superjob_task() -> None:
     """
     Запуск парсера superjob.
@@ -191,7 +360,10 @@ def pars_superjob_task() -> None:
     asyncio.run(parser.parse_superjob())
 
 
-@periodic_task(crontab(minute=f"*/{settings.PARSE_TRUDVSEM}"))
+@db_periodic_task(
+    crontab(minute=f"*/{settings.PARSE_TRUDVSEM}"), priority=PRIORITY_INGEST
+)
+@lock_task("parse-trudvsem")
 def parse_trudvsem_task() -> None:
     """
     Запуск парсера trudvsem.
@@ -0,0 +1,153 @@
+from pathlib import Path
+from parser.autocomplete import autocomplete_index
+from parser.facets import facet_index
+from parser.models import DescriptionDictionary, Vacancies
+from parser.parsing.replay import FixtureStore
+from parser.preferences import preference_cache
+from parser.resilience import reset_breakers
+from typing import Any
+
+import httpx
+import pytest
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import Client
+
+HH_URL = "https://api.hh.ru/vacancies"
+
+
+def hh_vacancy(num: int) -> dict:
+    """Формирует вакансию в формате списка вакансий API HeadHunter."""
+    return {
+        "id": str(num),
+        "name": f"Python разработчик {num}",
+        "alternate_url": f"https://hh.ru/vacancy/{num}",
+        "salary": {"from": 100000, "to": 150000, "currency": "RUR"},
+        "area": {"name": "Москва"},
+        "employer": {"name": "Тестовая компания"},
+        "employment": {"name": "Полная занятость"},
+        "experience": {"name": "От 1 года до 3 лет"},
+        "published_at": "2023-05-01T10:00:00+0300",
+    }
+
+
+def save_response(store: FixtureStore, url: str, params: dict, data: dict) -> None:
+    """Сохраняет ответ API в хранилище фикстур."""
+    request = httpx.Request("GET", url, params=params)
+    store.save(httpx.Response(200, json=data, request=request))
+
+
+@pytest.fixture
+def fix_store(tmp_path: Path) -> FixtureStore:
+    """Фикстура создающая хранилище с ответами API HeadHunter.
+
+    Хранилище содержит две страницы списка: первую с двумя вакансиями и пустую
+    вторую, а также детали каждой вакансии. Детали запрашиваются без параметров
+    списка. Параметры с датами отличаются от тех, что передаст парсер, так как
+    они не участвуют в ключе фикстуры.
+
+    Args:
+        tmp_path (Path): Временный каталог.
+
+    Returns:
+        FixtureStore: Хранилище фикстур.
+    """
+    store = FixtureStore(tmp_path)
+    params = {"per_page": 100, "date_from": "2023-05-01", "date_to": "2023-05-01"}
+    vacancies = [hh_vacancy(1), hh_vacancy(2)]
+    save_response(store, HH_URL, {**params, "page": 0}, {"items": vacancies})
+    save_response(store, HH_URL, {**params, "page": 1}, {"items": []})
+    for vacancy in vacancies:
+        save_response(
+            store,
+            f"{HH_URL}/{vacancy['id']}",
+            {},
+            {
+                "description": "<p>Описание</p>",
+                "schedule": {"name": "Удаленная работа"},
+            },
+        )
+    return store
+
+
+@pytest.fixture(autouse=True)
+def clear_preference_cache() -> None:
+    """Фикстура очищающая кеш пользовательских списков перед каждым тестом."""
+    cache.clear()
+    preference_cache.local.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_circuit_breakers() -> None:
+    """Фикстура сбрасывающая предохранители хостов перед каждым тестом."""
+    reset_breakers()
+
+
+@pytest.fixture(autouse=True)
+def clear_description_dictionaries() -> None:
+    """Фикстура очищающая кеш словарей сжатия описаний перед каждым тестом."""
+    DescriptionDictionary.clear_cache()
+
+
+@pytest.fixture(autouse=True)
+def clear_vacancy_indexes() -> None:
+    """Фикстура сбрасывающая индексы вакансий в памяти перед каждым тестом."""
+    autocomplete_index.reset()
+    facet_index.reset()
+
+
+@pytest.fixture(autouse=True)
+def isolate_ingest_traces(settings: Any, tmp_path: Path) -> None:
+    """Фикстура направляющая трассировки и профили загрузки во временный
+    каталог, чтобы тесты не дописывали их в журналы проекта."""
+    settings.INGEST_TRACE_FILE = str(tmp_path / "ingest_traces.jsonl")
+    settings.INGEST_PROFILE_DIR = str(tmp_path / "ingest_profiles")
+
+
+@pytest.fixture
+def fix_user(db: Any) -> User:
+    """Фикстура создающая тестового пользователя.
+
+    Args:
+        db (Any): Фикстура pytest-django, отвечает за подключение
+        к тестовой базе данных.
+
+    Returns:
+        User: Тестовый пользователь.
+    """
+    return User.objects.create(username="testuser", password="testpass")
+
+
+@pytest.fixture
+def logged_in_client(client: Client, fix_user: User) -> Client:
+    """Фикстура создающая клиент с авторизованным пользователем.
+
+    Args:
+        client (Client): Экземпляр клиента для тестирования.
+        fix_user (User): Тестовый пользователь.
+
+    Returns:
+        Client: Клиент с авторизованным пользователем.
+    """
+    client.force_login(fix_user)
+    return client
+
+
+@pytest.fixture
+def fix_vacancy(db: Any) -> Vacancies:
+    """Фикстура создающая тестовую вакансию.
+
+    Args:
+        db (Any): Фикстура pytest-django, отвечает за подключение
+        к тестовой базе данных.
+
+    Returns:
+        Vacancies: Тестовая вакансия.
+    """
+    return Vacancies.objects.create(
+        job_board="HeadHunter",
+        url="https://hh.ru/vacancy/1",
+        title="Python разработчик",
+        company="Тестовая компания",
+        city="Москва",
+    )
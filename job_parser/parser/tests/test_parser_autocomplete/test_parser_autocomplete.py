@@ -0,0 +1,160 @@
+import asyncio
+from parser.autocomplete import PrefixIndex, autocomplete_index, normalize
+from parser.indexes import publish
+from parser.models import Vacancies
+
+import pytest
+from django.db import connection
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+
+def create_vacancy(num: int, **fields) -> Vacancies:
+    """Создает вакансию с уникальным URL-адресом."""
+    fields.setdefault("title", f"Разработчик {num}")
+    return Vacancies.objects.create(
+        job_board="HeadHunter", url=f"https://hh.ru/vacancy/{num}", **fields
+    )
+
+
+class TestPrefixIndex:
+    """Класс описывает тестовые случаи для префиксного индекса терминов."""
+
+    def make_index(self, counts: dict[str, int]) -> PrefixIndex:
+        return PrefixIndex(
+            {normalize(term): count for term, count in counts.items()},
+            {normalize(term): term for term in counts},
+        )
+
+    def test_normalize(self) -> None:
+        """Тест проверяет приведение терминов к виду для сравнения."""
+        assert normalize("  Ёлочный   Базар ") == "елочный базар"
+        assert normalize(None) == ""
+
+    def test_search_orders_by_popularity(self) -> None:
+        """Тест проверяет, что подсказки упорядочены по количеству вакансий."""
+        index = self.make_index(
+            {"Python разработчик": 5, "Python аналитик": 2, "PHP разработчик": 7}
+        )
+        assert index.search("python", 10) == [
+            ("Python разработчик", 5),
+            ("Python аналитик", 2),
+        ]
+        assert index.search("python", 1) == [("Python разработчик", 5)]
+
+    def test_search_matches_word_suffixes(self) -> None:
+        """Тест проверяет поиск термина по началу любого слова."""
+        index = self.make_index(
+            {"Python разработчик": 5, "PHP разработчик": 7, "Тестировщик": 3}
+        )
+        assert index.search("разр", 10) == [
+            ("PHP разработчик", 7),
+            ("Python разработчик", 5),
+        ]
+        assert index.search("разработчик python", 10) == []
+
+    def test_short_prefix_uses_precomputed_top(self) -> None:
+        """Тест проверяет подсказки для коротких префиксов."""
+        index = self.make_index({"Москва": 10, "Мурманск": 4, "Минск": 6})
+        assert "м" in index.top
+        assert index.search("м", 2) == [("Москва", 10), ("Минск", 6)]
+        assert index.search("мо", 10) == [("Москва", 10)]
+        assert index.search("я", 10) == []
+
+
+@pytest.mark.django_db(transaction=True)
+class TestAutocompleteIndex:
+    """Класс описывает тестовые случаи для обновления индекса подсказок."""
+
+    def test_build_skips_duplicates(self) -> None:
+        """Тест проверяет построение индекса без дубликатов вакансий."""
+        original = create_vacancy(1, title="Python разработчик", city="Москва")
+        create_vacancy(2, title="Python разработчик", city="Москва")
+        create_vacancy(3, title="Python разработчик", duplicate_of=original)
+        autocomplete_index.refresh()
+
+        assert autocomplete_index.suggest("title", "pyth", 10) == [
+            ("Python разработчик", 2)
+        ]
+        assert autocomplete_index.suggest("city", "мос", 10) == [("Москва", 2)]
+        assert autocomplete_index.suggest("company", "тест", 10) == []
+
+    def test_refresh_loads_only_new_vacancies(self) -> None:
+        """Тест проверяет дозагрузку новых вакансий после записи."""
+        create_vacancy(1, title="Python разработчик")
+        autocomplete_index.refresh()
+        built_at = autocomplete_index.built_at
+
+        create_vacancy(2, title="Python разработчик")
+        autocomplete_index.refresh()
+        assert autocomplete_index.suggest("title", "python", 10) == [
+            ("Python разработчик", 1)
+        ]
+
+        publish()
+        with CaptureQueriesContext(connection) as queries:
+            autocomplete_index.refresh()
+        assert len(queries) == 1
+        assert '"id" > ' in queries[0]["sql"]
+        assert autocomplete_index.built_at == built_at
+        assert autocomplete_index.suggest("title", "python", 10) == [
+            ("Python разработчик", 2)
+        ]
+
+    def test_refresh_rebuilds_after_delete(self) -> None:
+        """Тест проверяет построение индекса заново после удаления вакансий."""
+        create_vacancy(1, title="Python разработчик")
+        vacancy = create_vacancy(2, title="Тестировщик")
+        autocomplete_index.refresh()
+
+        vacancy.delete()
+        publish(deleted=True)
+        autocomplete_index.refresh()
+        assert autocomplete_index.suggest("title", "тест", 10) == []
+        assert autocomplete_index.suggest("title", "python", 10) == [
+            ("Python разработчик", 1)
+        ]
+
+
+@pytest.mark.django_db(transaction=True)
+class TestAutocompleteView:
+    """Класс описывает тестовые случаи для представления подсказок."""
+
+    def get(self, **params):
+        return asyncio.run(AsyncClient().get(reverse("autocomplete"), params))
+
+    def test_suggestions(self) -> None:
+        """Тест проверяет ответ с подсказками и количеством вакансий."""
+        create_vacancy(1, company="Тестовая компания")
+        create_vacancy(2, company="Тестовая компания")
+        create_vacancy(3, company="Другая компания")
+
+        response = self.get(field="company", q="комп")
+        assert response.status_code == 200
+        assert response.json() == {
+            "field": "company",
+            "suggestions": [
+                {"value": "Тестовая компания", "count": 2},
+                {"value": "Другая компания", "count": 1},
+            ],
+        }
+        response = self.get(field="company", q="комп", limit=1)
+        assert len(response.json()["suggestions"]) == 1
+
+    def test_suggestions_without_queries(self) -> None:
+        """Тест проверяет, что построенный индекс не обращается к базе данных."""
+        create_vacancy(1, title="Python разработчик")
+        autocomplete_index.refresh()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get(field="title", q="py")
+        assert response.json()["suggestions"] == [
+            {"value": "Python разработчик", "count": 1}
+        ]
+        assert len(queries) == 0
+
+    def test_invalid_params(self) -> None:
+        """Тест проверяет ошибки при неизвестном поле и невалидном limit."""
+        assert self.get(field="description", q="py").status_code == 400
+        assert self.get(field="title", q="py", limit="x").status_code == 400
@@ -0,0 +1,69 @@
+import json
+from io import StringIO
+from parser.management.commands.generate_vacancies import (
+    SYNTHETIC_URL_PREFIX,
+    SYNTHETIC_USER_PREFIX,
+)
+from parser.models import UserVacancies, Vacancies
+from pathlib import Path
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command
+
+
+def generate(vacancies: int, users: int) -> None:
+    """Вызывает команду генерации синтетических данных."""
+    call_command(
+        "generate_vacancies",
+        vacancies=vacancies,
+        users=users,
+        max_blacklist=10,
+        batch_size=20,
+        stdout=StringIO(),
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class TestSearchBenchmark:
+    """Класс описывает тестовые случаи для замеров производительности поиска."""
+
+    def test_generate_tops_up_to_count(self) -> None:
+        """Тест проверяет, что повторный запуск досоздает данные до заданного
+        количества."""
+        generate(vacancies=30, users=2)
+        assert (
+            Vacancies.objects.filter(url__startswith=SYNTHETIC_URL_PREFIX).count() == 30
+        )
+        assert (
+            User.objects.filter(username__startswith=SYNTHETIC_USER_PREFIX).count() == 2
+        )
+        assert UserVacancies.objects.exists()
+
+        generate(vacancies=50, users=3)
+        generate(vacancies=50, users=3)
+        assert (
+            Vacancies.objects.filter(url__startswith=SYNTHETIC_URL_PREFIX).count() == 50
+        )
+        assert (
+            User.objects.filter(username__startswith=SYNTHETIC_USER_PREFIX).count() == 3
+        )
+
+    def test_bench_search_saves_baseline(self, tmp_path: Path) -> None:
+        """Тест проверяет замеры всех форм запроса и сохранение эталона."""
+        generate(vacancies=30, users=2)
+        baseline = tmp_path / "search.json"
+        stdout = StringIO()
+        call_command(
+            "bench_search",
+            repeat=1,
+            warmup=0,
+            baseline=baseline,
+            save_baseline=True,
+            stdout=stdout,
+        )
+
+        saved = json.loads(baseline.read_text())
+        assert saved["meta"]["vacancies"] == 30
+        assert saved["results"]
+        assert "Эталон сохранен" in stdout.getvalue()
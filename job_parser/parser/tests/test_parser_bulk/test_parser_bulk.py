@@ -0,0 +1,85 @@
+import datetime
+from parser.bulk import copy_buffer, copy_insert, copy_value
+from parser.models import Vacancies
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+
+
+def vacancy(num: int, **fields) -> Vacancies:
+    """Создает несохраненную вакансию с уникальным URL-адресом."""
+    fields.setdefault("title", f"Разработчик {num}")
+    return Vacancies(
+        job_board="Trudvsem", url=f"https://trudvsem.ru/vacancy/{num}", **fields
+    )
+
+
+class TestCopyFormat:
+    """Класс описывает тестовые случаи для формата данных команды COPY."""
+
+    def test_copy_value(self) -> None:
+        """Тест проверяет экранирование значений и NULL."""
+        assert copy_value(None) == "\\N"
+        assert copy_value(True) == "t"
+        assert copy_value(0) == "0"
+        assert copy_value("a\tb\nc\\d\r") == "a\\tb\\nc\\\\d\\r"
+
+    def test_copy_buffer(self) -> None:
+        """Тест проверяет строку вакансии в данных команды COPY."""
+        fields = [
+            Vacancies._meta.get_field(name)
+            for name in ("url", "title", "salary_from", "remote", "published_at")
+        ]
+        published_at = timezone.make_aware(datetime.datetime(2023, 5, 1, 12))
+        row = vacancy(1, title="Python\tDjango", remote=True, published_at=published_at)
+        buffer = copy_buffer([row], fields, connection)
+        line = buffer.getvalue()
+        assert line.endswith("\n")
+        url, title, salary_from, remote, published = line[:-1].split("\t")
+        assert (url, title, salary_from, remote) == (
+            "https://trudvsem.ru/vacancy/1",
+            "Python\\tDjango",
+            "\\N",
+            "t",
+        )
+        assert published.startswith("2023-05-01")
+
+
+@pytest.mark.django_db
+class TestIngest:
+    """Класс описывает тестовые случаи для записи пакета вакансий."""
+
+    def test_ingest_skips_existing_urls(self, settings) -> None:
+        """Тест проверяет запись новых вакансий и пропуск сохраненных."""
+        settings.INGEST_COPY_MIN_ROWS = 1
+        Vacancies.objects.ingest([vacancy(1), vacancy(2)])
+        Vacancies.objects.ingest([vacancy(2, title="Изменено"), vacancy(3)])
+        assert Vacancies.objects.count() == 3
+        assert Vacancies.objects.get(url__endswith="/2").title == "Разработчик 2"
+
+    @pytest.mark.skipif(
+        connection.vendor != "postgresql", reason="COPY поддерживает только PostgreSQL"
+    )
+    def test_copy_insert(self) -> None:
+        """Тест проверяет запись вакансий командой COPY."""
+        assert copy_insert([vacancy(1), vacancy(2)], connection) == 2
+        assert copy_insert([vacancy(2), vacancy(3)], connection) == 1
+        assert Vacancies.objects.count() == 3
+
+    def test_bench_ingest(self, tmp_path, capsys) -> None:
+        """Тест проверяет замер скорости записи и удаление вакансий бенчмарка."""
+        call_command(
+            "bench_ingest",
+            "--rows",
+            "50",
+            "--repeat",
+            "1",
+            "--baseline",
+            str(tmp_path / "ingest.json"),
+        )
+        output = capsys.readouterr().out
+        assert "orm/new" in output
+        assert "orm/existing" in output
+        assert not Vacancies.objects.exists()
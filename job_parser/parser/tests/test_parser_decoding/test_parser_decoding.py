@@ -0,0 +1,118 @@
+import asyncio
+from parser.benchmarks.decoding import page_payload
+from parser.parsing.decoders import SCHEMAS, JsonDecoder, get_decoder
+from parser.parsing.fetcher import Fetcher
+
+import httpx
+import pytest
+
+# Ключ списка вакансий в ответе API по сайтам.
+ITEMS = {
+    "HeadHunter": "items",
+    "Zarplata": "items",
+    "SuperJob": "objects",
+    "Trudvsem": "results",
+}
+
+
+def vacancy_url(job_board: str, vacancy: dict) -> str:
+    """Возвращает ссылку на вакансию из элемента списка вакансий API."""
+    if job_board == "SuperJob":
+        return vacancy["link"]
+    if job_board == "Trudvsem":
+        return vacancy["vacancy"]["vac_url"]
+    return vacancy["alternate_url"]
+
+
+class RecordingDecoder(JsonDecoder):
+    """Декодер, запоминающий переданные ему ответы."""
+
+    def __init__(self) -> None:
+        self.calls: list[tuple[bytes, str]] = []
+
+    def decode(self, content: bytes, kind: str = "page") -> dict:
+        self.calls.append((content, kind))
+        return super().decode(content, kind)
+
+
+class StubClient:
+    """Клиент, возвращающий заранее заданное тело ответа."""
+
+    def __init__(self, content: bytes) -> None:
+        self.content = content
+
+    async def create_client(self, url: str, params: dict) -> httpx.Response:
+        request = httpx.Request("GET", url)
+        return httpx.Response(200, content=self.content, request=request)
+
+
+def make_fetcher(job_board: str, content: bytes, decoder=None) -> Fetcher:
+    return Fetcher(
+        job_board,
+        "https://api.example.ru/vacancies",
+        {},
+        1,
+        ITEMS[job_board],
+        StubClient(content),
+        delay=False,
+        decoder=decoder,
+    )
+
+
+class TestDecoders:
+    """Класс описывает тестовые случаи для декодеров ответов API."""
+
+    def test_get_decoder_uses_json_when_disabled(self, settings) -> None:
+        """Тест проверяет выбор декодера json настройкой `API_DECODER`."""
+        settings.API_DECODER = "json"
+        assert isinstance(get_decoder("HeadHunter"), JsonDecoder)
+
+    def test_get_decoder_without_schema(self) -> None:
+        """Тест проверяет, что для сайта без схемы используется декодер json."""
+        assert isinstance(get_decoder("Habr"), JsonDecoder)
+
+    def test_fetcher_passes_bytes_to_decoder(self) -> None:
+        """Тест проверяет, что сборщик передает декодеру байты ответа."""
+        content = page_payload("HeadHunter", 2)
+        decoder = RecordingDecoder()
+        fetcher = make_fetcher("HeadHunter", content, decoder)
+        data = asyncio.run(fetcher.get_data(fetcher.url, kind="page"))
+        assert decoder.calls == [(content, "page")]
+        assert len(data["items"]) == 2
+
+    @pytest.mark.parametrize("job_board", list(SCHEMAS))
+    def test_board_decoder_returns_vacancies(self, job_board: str) -> None:
+        """Тест проверяет, что декодер сайта отдает вакансии с полями парсеров."""
+        content = page_payload(job_board, 3)
+        fetcher = make_fetcher(job_board, content, get_decoder(job_board))
+        vacancies = asyncio.run(fetcher.get_vacancies())
+        assert len(vacancies) == 3
+        assert vacancy_url(job_board, vacancies[0]).startswith("http")
+
+
+class TestSchemaDecoder:
+    """Класс описывает тестовые случаи для декодера по схеме на msgspec."""
+
+    @pytest.fixture(autouse=True)
+    def require_msgspec(self) -> None:
+        pytest.importorskip("msgspec")
+
+    def test_skips_unused_fields(self) -> None:
+        """Тест проверяет, что декодер оставляет только поля схемы."""
+        data = get_decoder("HeadHunter").decode(page_payload("HeadHunter", 1))
+        vacancy = data["items"][0]
+        assert "snippet" not in vacancy and "found" not in data
+        assert vacancy["salary"]["currency"] == "RUR"
+        assert set(vacancy["salary"]) == {"from", "to", "currency"}
+
+    def test_keeps_hyphenated_fields(self) -> None:
+        """Тест проверяет поля с дефисом в схеме Trudvsem."""
+        data = get_decoder("Trudvsem").decode(page_payload("Trudvsem", 1))
+        vacancy = data["results"]["vacancies"][0]["vacancy"]
+        assert vacancy["job-name"] == "Python разработчик 0"
+
+    def test_falls_back_on_schema_mismatch(self) -> None:
+        """Тест проверяет декодирование модулем json при несовпадении схемы."""
+        content = b'{"items": {"unexpected": true}}'
+        data = get_decoder("HeadHunter").decode(content)
+        assert data == {"items": {"unexpected": True}}
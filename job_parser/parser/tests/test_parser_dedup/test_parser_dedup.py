@@ -0,0 +1,199 @@
+import asyncio
+import datetime
+from parser.benchmarks.ingest import ParserBenchmark
+from parser.benchmarks.server import ApiFixtureServer
+from parser.dedup import deduplicator, distance, fingerprint, simhash
+from parser.models import Vacancies
+from parser.parsing.parsers.base import Vacancy
+from parser.parsing.replay import FixtureStore
+from parser.tests.conftest import HH_URL, hh_vacancy, save_response
+
+import pytest
+from django.utils import timezone
+
+ZP_URL = "https://api.zarplata.ru/vacancies"
+
+DESCRIPTION = (
+    "<p>Ищем Python разработчика в команду платежного сервиса. Вы будете "
+    "проектировать API, писать тесты и участвовать в код-ревью.</p>"
+    "<ul><li>Опыт коммерческой разработки от трех лет</li>"
+    "<li>Знание Django, PostgreSQL и Redis</li></ul>"
+)
+
+
+def make_vacancy(job_board: str, url: str, description: str = "") -> Vacancy:
+    """Формирует вакансию парсера с общими названием, компанией и городом."""
+    return Vacancy(
+        job_board=job_board,
+        url=url,
+        title="Python-разработчик",
+        salary_from=None,
+        salary_to=None,
+        salary_currency=None,
+        city="Москва",
+        company="ООО «Ромашка»",
+        employment=None,
+        experience=None,
+        published_at=None,
+        description=description,
+    )
+
+
+class TestFingerprints:
+    """Класс описывает тестовые случаи для отпечатков вакансий."""
+
+    def test_fingerprint_ignores_case_and_punctuation(self) -> None:
+        """Тест проверяет нормализацию полей отпечатка."""
+        assert fingerprint("Python-разработчик", "ООО «Ромашка»", "Москва") == (
+            fingerprint("python  разработчик", "ооо ромашка", "МОСКВА")
+        )
+        assert fingerprint("Python", "Ромашка", "Москва") != fingerprint(
+            "Python", "Ромашка", "Казань"
+        )
+        assert fingerprint("Python", None, "Москва") is None
+
+    def test_simhash_distance(self) -> None:
+        """Тест проверяет, что переформатированное описание близко к исходному."""
+        reformatted = DESCRIPTION.replace("<li>", "<li><b>").replace("Redis", "Redis.")
+        other = (
+            "<p>Требуется бухгалтер на первичную документацию, знание 1С, "
+            "работа с банком и контрагентами, сдача отчетности в срок.</p>"
+        )
+        hashes = [simhash(text) for text in (DESCRIPTION, reformatted, other)]
+        original, close, far = hashes
+        assert original is not None and close is not None and far is not None
+        assert distance(original, close) <= 3
+        assert distance(original, far) > 10
+        assert simhash("Нет описания") is None
+
+
+@pytest.mark.django_db
+class TestDeduplicator:
+    """Класс описывает тестовые случаи для поиска дубликатов."""
+
+    @pytest.fixture
+    def fix_stored(self) -> Vacancies:
+        """Фикстура создающая вакансию HeadHunter с отпечатком."""
+        vacancy = make_vacancy("HeadHunter", "https://hh.ru/vacancy/1", DESCRIPTION)
+        deduplicator.sign(vacancy)
+        return Vacancies.objects.create(
+            **{**vacancy.__dict__, "published_at": timezone.now()}
+        )
+
+    def test_detect_links_other_board(self, fix_stored: Vacancies) -> None:
+        """Тест проверяет поиск дубликата с другого сайта и известного URL."""
+        clone = make_vacancy("Zarplata", "https://zarplata.ru/vacancy/1", DESCRIPTION)
+        same = make_vacancy("HeadHunter", "https://hh.ru/vacancy/1")
+        fresh = make_vacancy("HeadHunter", "https://hh.ru/vacancy/2")
+        assert deduplicator.detect([clone]) == set()
+        assert clone.duplicate_of_id == fix_stored.pk
+        assert deduplicator.detect([same, fresh]) == {"https://hh.ru/vacancy/1"}
+        assert same.duplicate_of_id is None
+        assert fresh.duplicate_of_id is None
+
+    def test_detect_compares_descriptions(self, fix_stored: Vacancies) -> None:
+        """Тест проверяет, что разные описания с одним отпечатком не дубликаты."""
+        other = make_vacancy(
+            "Habr",
+            "https://career.habr.com/vacancies/1",
+            "<p>Поддержка legacy-проекта на Python 2, миграция данных между "
+            "хранилищами, дежурства по выходным и ночные релизы.</p>",
+        )
+        deduplicator.detect([other])
+        assert other.duplicate_of_id is None
+
+    def test_detect_requires_description(self, fix_stored: Vacancies) -> None:
+        """Тест проверяет, что совпадения отпечатков без описания недостаточно
+        для дубликата."""
+        clone = make_vacancy("Zarplata", "https://zarplata.ru/vacancy/1")
+        assert deduplicator.detect([clone]) == set()
+        assert clone.fingerprint == fix_stored.fingerprint
+        assert clone.duplicate_of_id is None
+
+    def test_detect_respects_window(self, fix_stored: Vacancies, settings) -> None:
+        """Тест проверяет, что старые вакансии не участвуют в сравнении."""
+        Vacancies.objects.update(
+            published_at=timezone.now() - datetime.timedelta(days=30)
+        )
+        clone = make_vacancy("Zarplata", "https://zarplata.ru/vacancy/1", DESCRIPTION)
+        deduplicator.detect([clone])
+        assert clone.duplicate_of_id is None
+        settings.DEDUP_ENABLED = False
+        assert deduplicator.detect([clone]) == set()
+
+
+@pytest.mark.django_db(transaction=True)
+class TestDuplicateIngest:
+    """Класс описывает тестовые случаи для загрузки вакансий сайта-клона."""
+
+    def save_details(self, store: FixtureStore, url: str, description: str) -> None:
+        """Сохраняет детали вакансии с описанием в хранилище фикстур."""
+        details = {"description": description, "schedule": {"name": "Полный день"}}
+        save_response(store, url, {}, details)
+
+    def test_clone_is_linked_after_details(
+        self, fix_store: FixtureStore, settings, client
+    ) -> None:
+        """Тест проверяет, что вакансии Zarplata без описания в списке
+        загружают детали, после чего дубликаты сохраняются ссылками
+        и скрываются в результатах поиска."""
+        settings.DEDUP_WINDOW_DAYS = 365 * 100
+        clones = [
+            {**hh_vacancy(num), "alternate_url": f"https://zarplata.ru/vacancy/{num}"}
+            for num in (1, 2)
+        ]
+        save_response(
+            fix_store, ZP_URL, {"per_page": 100, "page": 0}, {"items": clones}
+        )
+        save_response(fix_store, ZP_URL, {"per_page": 100, "page": 1}, {"items": []})
+        for num, text in enumerate((DESCRIPTION, DESCRIPTION.upper()), start=1):
+            self.save_details(fix_store, f"{HH_URL}/{num}", text)
+            self.save_details(fix_store, f"{ZP_URL}/{num}", text)
+        with ApiFixtureServer(store=fix_store) as server:
+            config = ParserBenchmark(server, repeat=1).make_config()
+            asyncio.run(config.hh_parser.parse())
+            requests = server.stats.requests
+            asyncio.run(config.zp_parser.parse())
+            assert server.stats.requests - requests == 4
+            assert server.stats.misses == 0
+
+        originals = Vacancies.objects.filter(job_board="HeadHunter")
+        duplicates = Vacancies.objects.filter(job_board="Zarplata").order_by("url")
+        assert [vacancy.duplicate_of for vacancy in duplicates] == list(
+            originals.order_by("url")
+        )
+        assert all(vacancy.description is None for vacancy in duplicates)
+
+        query = {"title": "Python", "date_from": "2023-04-01", "date_to": "2023-06-01"}
+        response = client.get("/vacancies/", query)
+        assert response.context["total_vacancies"] == 2
+        settings.DEDUP_COLLAPSE_RESULTS = False
+        response = client.get("/vacancies/", query)
+        assert response.context["total_vacancies"] == 4
+
+    def test_same_fingerprint_different_descriptions(
+        self, fix_store: FixtureStore, settings
+    ) -> None:
+        """Тест проверяет, что вакансии с одним отпечатком и разными
+        описаниями не считаются дубликатами и сохраняют описание."""
+        settings.DEDUP_WINDOW_DAYS = 365 * 100
+        other = {**hh_vacancy(1), "alternate_url": "https://zarplata.ru/vacancy/1"}
+        save_response(
+            fix_store, ZP_URL, {"per_page": 100, "page": 0}, {"items": [other]}
+        )
+        save_response(fix_store, ZP_URL, {"per_page": 100, "page": 1}, {"items": []})
+        self.save_details(fix_store, f"{HH_URL}/1", DESCRIPTION)
+        self.save_details(
+            fix_store,
+            f"{ZP_URL}/1",
+            "<p>Поддержка legacy-проекта на Python 2, миграция данных между "
+            "хранилищами, дежурства по выходным и ночные релизы.</p>",
+        )
+        with ApiFixtureServer(store=fix_store) as server:
+            config = ParserBenchmark(server, repeat=1).make_config()
+            asyncio.run(config.hh_parser.parse())
+            asyncio.run(config.zp_parser.parse())
+
+        vacancy = Vacancies.objects.get(job_board="Zarplata")
+        assert vacancy.duplicate_of is None
+        assert "legacy" in vacancy.description
@@ -0,0 +1,155 @@
+import asyncio
+import gzip
+import json
+from parser.descriptions import compress, decompress, plain_text, train_dictionary
+from parser.models import DescriptionDictionary, Vacancies, VacancyDescription
+from parser.retention import RetentionPolicy
+from parser.scraping.db import Database
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+DESCRIPTION = (
+    "<p><strong>Обязанности:</strong></p><ul><li>Разработка backend на Python</li>"
+    "<li>Код-ревью</li></ul><p><strong>Требования:</strong></p>"
+    "<ul><li>Опыт работы с Django от 2 лет</li><li>PostgreSQL &amp; Redis</li></ul>"
+)
+
+
+def sample(num: int) -> str:
+    """Формирует описание вакансии с общей разметкой и уникальной строкой."""
+    return DESCRIPTION + f"<p>Проект номер {num}</p>"
+
+
+class TestCodec:
+    """Класс описывает тестовые случаи для сжатия описаний."""
+
+    @pytest.mark.parametrize("codec", ["zlib", "zstd"])
+    def test_round_trip(self, codec: str) -> None:
+        """Тест проверяет сжатие и распаковку описания со словарем и без него."""
+        if codec == "zstd":
+            pytest.importorskip("zstandard")
+        data = compress(DESCRIPTION, codec)
+        assert len(data) < len(DESCRIPTION.encode())
+        assert decompress(data, codec) == DESCRIPTION
+
+        dictionary = train_dictionary([sample(num) for num in range(200)], codec)
+        data = compress(sample(1), codec, dictionary)
+        assert decompress(data, codec, dictionary) == sample(1)
+
+    def test_dictionary_shrinks_descriptions(self) -> None:
+        """Тест проверяет, что словарь сайта уменьшает сжатые описания."""
+        dictionary = train_dictionary([sample(num) for num in range(50)], "zlib")
+        assert len(dictionary) <= 32 * 1024
+        plain = len(compress(sample(100), "zlib"))
+        assert len(compress(sample(100), "zlib", dictionary)) < plain / 2
+
+    def test_plain_text(self) -> None:
+        """Тест проверяет текст описания для поиска."""
+        assert plain_text("<p>Знание  <b>Python</b> &amp; SQL</p>") == (
+            "знание python & sql"
+        )
+        assert plain_text(None) == ""
+
+
+@pytest.mark.django_db
+class TestDescriptionStorage:
+    """Класс описывает тестовые случаи для хранения описаний вакансий."""
+
+    def test_description_is_stored_compressed(self) -> None:
+        """Тест проверяет хранение описания в отдельной таблице."""
+        vacancy = Vacancies.objects.create(
+            job_board="HeadHunter", url="https://hh.ru/vacancy/1", description=sample(1)
+        )
+        stored = VacancyDescription.objects.get(vacancy=vacancy)
+        assert stored.size == len(sample(1).encode())
+        assert len(stored.data) < stored.size
+        assert "python" in stored.search_text
+
+        vacancy = Vacancies.objects.get(pk=vacancy.pk)
+        assert vacancy.description == sample(1)
+        vacancy.description = None
+        vacancy.save()
+        assert not VacancyDescription.objects.exists()
+        assert Vacancies.objects.get(pk=vacancy.pk).description is None
+
+    def test_list_loads_descriptions_in_one_query(self) -> None:
+        """Тест проверяет загрузку описаний списка вместе с вакансиями."""
+        for num in range(3):
+            Vacancies.objects.create(
+                job_board="HeadHunter",
+                url=f"https://hh.ru/vacancy/{num}",
+                description=sample(num),
+            )
+        with CaptureQueriesContext(connection) as queries:
+            vacancies = list(Vacancies.objects.select_related("description_data"))
+            descriptions = {vacancy.description for vacancy in vacancies}
+        assert descriptions == {sample(num) for num in range(3)}
+        assert len(queries) == 1
+
+    def test_archive_contains_description(self, tmp_path) -> None:
+        """Тест проверяет распакованное описание в архиве и удаление описаний."""
+        vacancy = Vacancies.objects.create(
+            job_board="HeadHunter", url="https://hh.ru/vacancy/1", description=sample(1)
+        )
+        policy = RetentionPolicy(days=0)
+        assert policy.archive([vacancy.pk], tmp_path) == 1
+        (archive,) = tmp_path.glob("*.jsonl.gz")
+        with gzip.open(archive, "rt", encoding="utf-8") as file:
+            assert json.loads(file.readline())["description"] == sample(1)
+        policy.delete_batch([vacancy.pk])
+        assert not VacancyDescription.objects.exists()
+
+
+@pytest.mark.django_db(transaction=True)
+class TestDescriptionRecord:
+    """Класс описывает тестовые случаи для записи описаний при сборе вакансий."""
+
+    def test_record_keeps_first_description(self) -> None:
+        """Тест проверяет, что повторная запись не перезаписывает описание."""
+        data = {
+            "job_board": "Habr",
+            "url": "https://career.habr.com/vacancies/1",
+            "title": "Backend разработчик",
+            "description": sample(1),
+        }
+        asyncio.run(Database().record([data]))
+        asyncio.run(Database().record([{**data, "description": sample(2)}]))
+        vacancy = Vacancies.objects.get()
+        assert vacancy.description == sample(1)
+        assert Vacancies.objects.filter(
+            description_data__search_text__contains="django"
+        ).exists()
+
+
+@pytest.mark.django_db
+class TestTrainDictionaries:
+    """Класс описывает тестовые случаи для обучения словарей сжатия."""
+
+    def test_train_and_recompress(self) -> None:
+        """Тест проверяет обучение словаря и пересжатие сохраненных описаний."""
+        for num in range(120):
+            Vacancies.objects.create(
+                job_board="HeadHunter",
+                url=f"https://hh.ru/vacancy/{num}",
+                description=sample(num),
+            )
+        before = sum(len(row.data) for row in VacancyDescription.objects.all())
+
+        call_command("train_description_dictionaries", "--recompress", "--size", "4096")
+
+        dictionary = DescriptionDictionary.objects.get()
+        assert dictionary.job_board == "HeadHunter"
+        rows = list(VacancyDescription.objects.all())
+        assert {row.dictionary_id for row in rows} == {dictionary.pk}
+        assert sum(len(row.data) for row in rows) < before
+        assert Vacancies.objects.get(url="https://hh.ru/vacancy/7").description == (
+            sample(7)
+        )
+
+        vacancy = Vacancies.objects.create(
+            job_board="HeadHunter", url="https://hh.ru/vacancy/new", description="<p>"
+        )
+        assert VacancyDescription.objects.get(vacancy=vacancy).dictionary == dictionary
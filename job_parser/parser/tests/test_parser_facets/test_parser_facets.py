@@ -0,0 +1,209 @@
+import datetime
+from parser.facets import (
+    FacetCounts,
+    bit_ids,
+    date_bucket,
+    facet_index,
+    make_bitmap,
+    search_date,
+)
+from parser.forms import FACET_COUNTS_HELP
+from parser.indexes import publish
+from parser.mixins import FormDataParser
+from parser.models import Vacancies
+
+import pytest
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+TODAY = timezone.localdate()
+
+
+def create_vacancy(num: int, days_ago: int = 0, **fields) -> Vacancies:
+    """Создает вакансию с уникальным URL-адресом, опубликованную days_ago дней
+    назад."""
+    fields.setdefault("title", f"Разработчик {num}")
+    fields.setdefault("job_board", "HeadHunter")
+    published_at = datetime.datetime.combine(
+        TODAY - datetime.timedelta(days=days_ago), datetime.time(12)
+    )
+    return Vacancies.objects.create(
+        url=f"https://hh.ru/vacancy/{num}",
+        published_at=timezone.make_aware(published_at),
+        **fields,
+    )
+
+
+def search_params(**form_data):
+    """Возвращает параметры поиска для данных формы."""
+    return FormDataParser().get_request_params(form_data)
+
+
+def found(**form_data) -> int:
+    """Возвращает количество вакансий индекса, подходящих под фасеты поиска."""
+    state = facet_index.state
+    return state.match(
+        facet_index.selections(state, search_params(**form_data))
+    ).bit_count()
+
+
+def facet_counts(**form_data) -> FacetCounts:
+    """Возвращает количество вакансий по значениям фасетов построенного индекса."""
+    counts = facet_index.counts(search_params(**form_data))
+    assert counts is not None
+    return counts
+
+
+class TestBitmaps:
+    """Класс описывает тестовые случаи для битовых карт."""
+
+    def test_make_bitmap(self) -> None:
+        """Тест проверяет построение битовой карты из идентификаторов."""
+        assert make_bitmap([]) == 0
+        assert make_bitmap([70, 1, 5]) == (1 << 1) | (1 << 5) | (1 << 70)
+        assert make_bitmap(range(0, 1000, 7)).bit_count() == 143
+
+    def test_make_bitmap_from_base(self) -> None:
+        """Тест проверяет, что размер карты не зависит от величины
+        идентификаторов."""
+        bits = make_bitmap([10**9 + 3, 10**9], base=10**9)
+        assert bits == 0b1001
+        assert bit_ids(bits, base=10**9) == [10**9, 10**9 + 3]
+        assert bit_ids(0) == []
+
+    def test_date_bucket(self) -> None:
+        """Тест проверяет день публикации в часовом поясе проекта."""
+        value = timezone.make_aware(datetime.datetime(2023, 5, 1, 23, 30))
+        assert date_bucket(value) == datetime.date(2023, 5, 1)
+        assert date_bucket(value.astimezone(datetime.timezone.utc)) == (
+            datetime.date(2023, 5, 1)
+        )
+        assert date_bucket(None) is None
+
+    def test_search_date(self) -> None:
+        """Тест проверяет день из даты параметров поиска."""
+        day = datetime.date(2023, 5, 1)
+        assert search_date(datetime.datetime(2023, 5, 1, 23, 59)) == day
+        assert search_date(day) == day
+        assert search_date("2023-05-01") == day
+        assert search_date(None) is None
+
+
+@pytest.mark.django_db(transaction=True)
+class TestFacetIndex:
+    """Класс описывает тестовые случаи для индекса фасетов."""
+
+    def test_match_fetcher_filters(self) -> None:
+        """Тест проверяет отбор вакансий по фасетам как в запросе к базе."""
+        create_vacancy(1, experience="Нет опыта", remote=True)
+        create_vacancy(2, experience="От 3 до 6 лет")
+        create_vacancy(3, job_board="Habr", experience="Нет опыта")
+        create_vacancy(4, days_ago=10, experience="Нет опыта")
+        facet_index.refresh()
+
+        assert found(experience=["Нет опыта"]) == 2
+        assert found(experience=["Нет опыта"], remote=True) == 1
+        assert found(job_board=["Не имеет значения"], experience=[]) == 3
+        assert found(date_from=TODAY - datetime.timedelta(days=30)) == 4
+
+    def test_ids(self) -> None:
+        """Тест проверяет идентификаторы вакансий, подходящих под фасеты."""
+        assert facet_index.ids(search_params()) is None
+        first = create_vacancy(1, pk=10**6, experience="Нет опыта")
+        create_vacancy(2, pk=10**6 + 1, experience="От 3 до 6 лет")
+        third = create_vacancy(3, pk=10**6 + 5, experience="Нет опыта")
+        facet_index.refresh()
+
+        ids = facet_index.ids(search_params(experience=["Нет опыта"]))
+        assert ids == [first.pk, third.pk]
+        assert Vacancies.objects.filter(pk__in=ids).count() == 2
+
+    def test_bitmaps_start_at_oldest_vacancy(self) -> None:
+        """Тест проверяет, что карты начинаются со старейшей вакансии индекса
+        и не растут с величиной идентификаторов."""
+        first = create_vacancy(1, pk=10**6)
+        facet_index.refresh()
+        create_vacancy(2, pk=10**6 + 9)
+        publish()
+        facet_index.refresh()
+        state = facet_index.state
+        assert state.base == first.pk
+        assert state.everything == 1 | 1 << 9
+
+        first.delete()
+        publish(deleted=True)
+        facet_index.refresh()
+        assert facet_index.state.base == 10**6 + 9
+        assert facet_index.state.everything == 1
+
+    def test_counts_exclude_own_facet(self) -> None:
+        """Тест проверяет, что количество по значениям фасета учитывает выбор
+        в остальных фасетах, но не в нем самом."""
+        create_vacancy(1, experience="Нет опыта", remote=True)
+        create_vacancy(2, experience="От 3 до 6 лет")
+        create_vacancy(3, job_board="Habr", experience="Нет опыта")
+        create_vacancy(4, days_ago=10, experience="Нет опыта")
+        facet_index.refresh()
+
+        counts = facet_counts(job_board=["HeadHunter"], experience=["Нет опыта"])
+        assert counts.values["job_board"] == {"HeadHunter": 1, "Habr": 1}
+        assert counts.totals["job_board"] == 2
+        assert counts.values["experience"]["Нет опыта"] == 1
+        assert counts.values["experience"]["От 3 до 6 лет"] == 1
+        assert counts.totals["experience"] == 2
+        assert counts.values["remote"] == {True: 1, False: 0}
+        assert counts.values["published"][TODAY] == 1
+
+    def test_refresh_adds_new_vacancies(self) -> None:
+        """Тест проверяет дозагрузку новых вакансий после записи и построение
+        заново после удаления."""
+        create_vacancy(1)
+        facet_index.refresh()
+        vacancy = create_vacancy(2, job_board="Habr")
+        publish()
+        facet_index.refresh()
+        assert facet_counts().values["job_board"] == {
+            "HeadHunter": 1,
+            "Habr": 1,
+        }
+
+        vacancy.delete()
+        publish(deleted=True)
+        facet_index.refresh()
+        assert facet_counts().values["job_board"] == {"HeadHunter": 1}
+
+
+@pytest.mark.django_db(transaction=True)
+class TestFacetCountsInForm:
+    """Класс описывает тестовые случаи для количества вакансий у флажков формы."""
+
+    def test_home_page(self, client: Client) -> None:
+        """Тест проверяет количество вакансий у флажков на главной странице."""
+        create_vacancy(1, remote=True)
+        create_vacancy(2, job_board="Habr")
+        response = client.get(reverse("home"))
+        form = response.context["form"]
+        choices = dict(form.fields["job_board"].choices)
+        assert choices["Не имеет значения"] == "Не имеет значения (2)"
+        assert choices["HeadHunter"] == "HeadHunter (1)"
+        assert choices["Geekjob"] == "Geekjob (0)"
+        assert form.fields["remote"].label == "Удаленная работа (1)"
+        assert form.fields["job_board"].help_text == FACET_COUNTS_HELP
+        assert "HeadHunter (1)" in response.content.decode()
+
+    def test_search_page(self, client: Client) -> None:
+        """Тест проверяет количество вакансий у флажков с учетом отмеченных."""
+        create_vacancy(1, remote=True, experience="Нет опыта")
+        create_vacancy(2, job_board="Habr", experience="Нет опыта")
+        create_vacancy(3, job_board="Habr", experience="От 6 лет")
+        response = client.get(
+            reverse("vacancies"),
+            {"title": "Разработчик", "job_board": ["Habr"], "remote": "on"},
+        )
+        form = response.context["form"]
+        choices = dict(form.fields["job_board"].choices)
+        assert choices["Habr"] == "Habr (0)"
+        assert choices["HeadHunter"] == "HeadHunter (1)"
+        assert dict(form.fields["experience"].choices)["Нет опыта"] == "Нет опыта (0)"
+        assert form.fields["remote"].label == "Удаленная работа (0)"
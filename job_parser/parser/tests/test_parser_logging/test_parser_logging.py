@@ -0,0 +1,39 @@
+from typing import Iterator
+
+import logger as logging_config
+import pytest
+from logger import log_throttled, setup_logging
+from loguru import logger
+
+
+@pytest.fixture
+def messages() -> Iterator[list[str]]:
+    """Фикстура добавляющая обработчик, собирающий сообщения в список."""
+    records: list[str] = []
+    handler_id = logger.add(records.append, format="{message}", level="DEBUG")
+    yield records
+    logger.remove(handler_id)
+
+
+class TestLogging:
+    """Класс описывает тестовые случаи для настройки логирования."""
+
+    def test_setup_logging_is_idempotent(self, mocker) -> None:
+        """Тест проверяет, что повторный вызов не пересоздает обработчики."""
+        setup_logging()
+        configured = mocker.patch.object(logging_config, "logger")
+        setup_logging()
+        assert not configured.method_calls
+
+    def test_log_throttled(self, messages: list[str], monkeypatch) -> None:
+        """Тест проверяет пропуск частых сообщений и подсчет пропущенных."""
+        monkeypatch.setattr(logging_config, "_throttle", {})
+        for status in (429, 429, 503):
+            log_throttled("test", "DEBUG", "Статус ответа {}", status)
+        assert [message.strip() for message in messages] == ["Статус ответа 429"]
+
+        monkeypatch.setattr(logging_config, "THROTTLE_SECONDS", 0)
+        log_throttled("test", "DEBUG", "Статус ответа {}", 500)
+        assert messages[-1].strip() == (
+            "Статус ответа 500 (пропущено похожих сообщений: 2)"
+        )
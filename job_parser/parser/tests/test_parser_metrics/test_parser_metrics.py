@@ -0,0 +1,116 @@
+import asyncio
+from parser.models import Vacancies
+from parser.scraping.db import Database
+
+import pytest
+from django.core.cache import cache
+from django.test import Client
+from job_parser.metrics import MetricsRegistry, registry, render
+
+
+@pytest.fixture(autouse=True)
+def clear_metrics() -> None:
+    """Фикстура очищающая реестр и снимки метрик перед каждым тестом."""
+    registry.reset()
+    registry.slot = None
+    registry.published_at = 0.0
+    cache.clear()
+
+
+class TestRender:
+    """Класс описывает тестовые случаи для формата Prometheus."""
+
+    def test_render_counters_and_histograms(self) -> None:
+        """Тест проверяет вывод счетчиков и гистограмм с метками."""
+        metrics = MetricsRegistry()
+        metrics.observe("GET", "/vacancies/", 200, 30, 100, queries=3)
+        metrics.inc("ingest_rows_total", 2, source='Habr "new"', result="inserted")
+        metrics.observe_duration(
+            "ingest_stage_duration_seconds", 2, source="Habr", stage="fetch"
+        )
+        text = render(metrics, {("huey_queue_depth", (("queue", "pending"),)): 4})
+
+        assert "# TYPE http_request_duration_seconds histogram" in text
+        assert (
+            'http_request_duration_seconds_bucket{method="GET",route="/vacancies/",'
+            'le="0.05"} 1'
+        ) in text
+        assert 'http_db_queries_total{method="GET",route="/vacancies/"} 3' in text
+        assert 'ingest_rows_total{result="inserted",source="Habr \\"new\\""} 2' in text
+        assert (
+            'ingest_stage_duration_seconds_bucket{source="Habr",stage="fetch",'
+            'le="5"} 1'
+        ) in text
+        assert 'huey_queue_depth{queue="pending"} 4' in text
+
+
+@pytest.mark.django_db(transaction=True)
+class TestMetrics:
+    """Класс описывает тестовые случаи для сбора метрик."""
+
+    def test_collect_merges_processes(self) -> None:
+        """Тест проверяет суммирование снимков нескольких процессов."""
+        other = MetricsRegistry()
+        other.inc("ingest_pages_fetched_total", 5, source="Habr")
+        other.observe("GET", "/vacancies/", 200, 10, 10)
+        other.publish()
+
+        registry.inc("ingest_pages_fetched_total", 2, source="Habr")
+        registry.observe("GET", "/vacancies/", 500, 10, 10)
+        total = registry.collect()
+
+        assert (
+            total.counters[("ingest_pages_fetched_total", (("source", "Habr"),))] == 7
+        )
+        assert total.routes[("GET", "/vacancies/")].statuses == {2: 1, 5: 1}
+        assert other.slot != registry.slot
+
+    def test_record_counts_rows(self) -> None:
+        """Тест проверяет подсчет записанных и пропущенных вакансий."""
+        vacancy = {
+            "job_board": "Habr",
+            "url": "https://career.habr.com/vacancies/1",
+            "title": "Python",
+        }
+        asyncio.run(Database().record([vacancy]))
+        asyncio.run(Database().record([vacancy]))
+
+        assert Vacancies.objects.count() == 1
+        source = ("source", "Habr")
+        assert (
+            registry.counters[("ingest_rows_total", (("result", "inserted"), source))]
+            == 1
+        )
+        assert (
+            registry.counters[("ingest_rows_total", (("result", "skipped"), source))]
+            == 1
+        )
+        assert (
+            registry.histograms[
+                ("ingest_stage_duration_seconds", (source, ("stage", "record")))
+            ].count
+            == 2
+        )
+
+    def test_view_counts_queries(self, logged_in_client: Client, fix_vacancy) -> None:
+        """Тест проверяет подсчет SQL-запросов и вывод метрик эндпоинтом."""
+        logged_in_client.post(
+            "/favourite/",
+            data={"vacancy_id": fix_vacancy.pk},
+            content_type="application/json",
+        )
+        assert registry.routes[("POST", "/favourite/")].queries > 0
+
+        response = logged_in_client.get("/metrics")
+        assert response.status_code == 200
+        assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+        content = response.content.decode()
+        assert 'http_db_queries_total{method="POST",route="/favourite/"}' in content
+        assert 'huey_queue_depth{queue="pending"}' in content
+
+    def test_view_requires_token(self, client: Client, settings) -> None:
+        """Тест проверяет доступ к метрикам по токену."""
+        settings.METRICS_TOKEN = "secret"
+        assert client.get("/metrics").status_code == 401
+        response = client.get("/metrics", HTTP_AUTHORIZATION="Bearer secret")
+        assert response.status_code == 200
@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+from asgiref.sync import SyncToAsync
+from django.core.handlers.asgi import ASGIHandler
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import Client, RequestFactory
+from job_parser.logging_middleware import logging_middleware
+from job_parser.metrics import Histogram, registry
+from job_parser.static_middleware import StaticFilesMiddleware
+
+
+@pytest.fixture(autouse=True)
+def clear_metrics() -> None:
+    """Фикстура очищающая реестр метрик перед каждым тестом."""
+    registry.reset()
+
+
+class TestHistogram:
+    """Класс описывает тестовые случаи для гистограммы задержек."""
+
+    def test_observe_and_quantile(self) -> None:
+        """Тест проверяет распределение значений по интервалам."""
+        histogram = Histogram(buckets=(10, 100, 1000))
+        for value in (1, 5, 50, 500, 5000):
+            histogram.observe(value)
+        assert histogram.counts == [2, 1, 1, 1]
+        assert histogram.count == 5
+        assert histogram.quantile(0.5) == 100
+        assert histogram.quantile(0.99) == 1000
+
+
+@pytest.mark.django_db(transaction=True)
+class TestLoggingMiddleware:
+    """Класс описывает тестовые случаи для промежуточного ПО метрик."""
+
+    def test_request_is_recorded_by_route(self, client: Client) -> None:
+        """Тест проверяет запись запроса в метрики шаблона маршрута."""
+        response = client.post(
+            "/delete-favourite/", data="{}", content_type="application/json"
+        )
+        assert response.has_header("X-Request-ID")
+
+        stats = registry.routes[("POST", "/delete-favourite/")]
+        assert stats.latency.count == 1
+        assert stats.statuses == {3: 1}
+
+    def test_streaming_response_is_not_materialized(self) -> None:
+        """Тест проверяет подсчет размера потокового ответа при отправке."""
+        request = RequestFactory().get("/stream/")
+        middleware = logging_middleware(
+            lambda request: StreamingHttpResponse(iter([b"ab", b"cde"]))
+        )
+        response = middleware(request)
+
+        stats = registry.routes[("GET", "unmatched")]
+        assert stats.unknown_size == 1
+        assert b"".join(response.streaming_content) == b"abcde"
+        assert stats.response_bytes == 5
+        assert stats.unknown_size == 0
+
+    def test_async_chain_stays_async(self) -> None:
+        """Тест проверяет, что для асинхронной цепочки middleware асинхронное."""
+
+        async def get_response(request):
+            response = HttpResponse(b"ok")
+            response["Content-Length"] = "2"
+            return response
+
+        middleware = logging_middleware(get_response)
+        assert asyncio.iscoroutinefunction(middleware)
+        asyncio.run(middleware(RequestFactory().get("/")))
+        assert registry.routes[("GET", "unmatched")].response_bytes == 2
+
+
+class TestAsgiMiddlewareChain:
+    """Класс описывает тестовые случаи для цепочки middleware под ASGI."""
+
+    async def get_response(self, request):
+        return HttpResponse(b"ok")
+
+    def test_asgi_handler_loads_async_chain(self) -> None:
+        """Тест проверяет, что под ASGI цепочка middleware из настроек
+        асинхронная и не переводится в поток."""
+        chain = ASGIHandler()._middleware_chain
+        assert asyncio.iscoroutinefunction(chain)
+        assert not isinstance(chain, SyncToAsync)
+
+    def test_static_files_middleware_is_async(self, settings) -> None:
+        """Тест проверяет раздачу статических файлов и передачу остальных
+        запросов в асинхронной цепочке."""
+        settings.WHITENOISE_USE_FINDERS = True
+        middleware = StaticFilesMiddleware(self.get_response)
+        assert asyncio.iscoroutinefunction(middleware)
+
+        request = RequestFactory().get("/static/css/styles.css")
+        response = asyncio.run(middleware(request))
+        assert response.status_code == 200
+        assert response["Content-Type"].startswith("text/css")
+        response.file_to_stream.close()
+
+        response = asyncio.run(middleware(RequestFactory().get("/")))
+        assert response.content == b"ok"
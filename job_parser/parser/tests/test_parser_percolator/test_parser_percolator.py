@@ -0,0 +1,152 @@
+import asyncio
+import time
+from parser.models import SubscriptionMatch, Vacancies
+from parser.parsing.db import Database
+from parser.parsing.parsers.base import Vacancy
+from parser.percolator import AhoCorasick, SubscriptionIndex, percolator
+from parser.tasks import EmailSender
+from typing import Iterator
+
+import pytest
+from django.contrib.auth.models import User
+from django.utils import timezone
+from huey.contrib.djhuey import HUEY
+from profiles.models import Profile
+
+
+@pytest.fixture
+def immediate_huey() -> Iterator[None]:
+    """Фикстура выполняющая задачи huey сразу при постановке в очередь."""
+    HUEY.immediate = True
+    yield
+    HUEY.immediate = False
+
+
+class TestAhoCorasick:
+    """Класс описывает тестовые случаи для автомата Ахо-Корасик."""
+
+    def test_search_finds_overlapping_patterns(self) -> None:
+        """Тест проверяет поиск пересекающихся подстрок за один проход."""
+        automaton = AhoCorasick(["java", "javascript", "script", "go", ""])
+        assert automaton.search("senior javascript developer") == {
+            "java",
+            "javascript",
+            "script",
+        }
+        assert automaton.search("python") == set()
+
+
+class TestSubscriptionIndex:
+    """Класс описывает тестовые случаи для индекса подписок."""
+
+    def test_match_by_job_and_city(self) -> None:
+        """Тест проверяет сопоставление по профессии и городу."""
+        index = SubscriptionIndex(
+            subscriptions={
+                "python": {"москва": [1], "": [2]},
+                "go": {"казань": [3]},
+                "": {"москва": [4]},
+            }
+        )
+        assert index.match("Python  Разработчик", None, "г. Москва") == {1, 2, 4}
+        assert index.match("Разработчик", "Знание Python", "Казань") == {2}
+        assert index.match("Go developer", None, "Казань") == {3}
+
+
+@pytest.mark.django_db(transaction=True)
+class TestPercolator:
+    """Класс описывает тестовые случаи для сопоставления при записи вакансий."""
+
+    def test_record_stores_matches(self) -> None:
+        """Тест проверяет сохранение совпадений при записи вакансий."""
+        user = User.objects.create(username="subscriber")
+        profile = Profile.objects.create(
+            user=user, job="Python", city="Москва", subscribe=True
+        )
+        Profile.objects.create(job="Go", subscribe=True)
+        Profile.objects.create(job="Python", city="Москва", subscribe=False)
+
+        vacancies = [
+            Vacancy(
+                job_board="HeadHunter",
+                url=f"https://hh.ru/vacancy/{num}",
+                title=title,
+                salary_from=None,
+                salary_to=None,
+                salary_currency=None,
+                city="Москва",
+                company=None,
+                employment=None,
+                experience=None,
+                published_at=None,
+            )
+            for num, title in enumerate(["Python разработчик", "Java разработчик"])
+        ]
+        asyncio.run(Database().record(vacancies))
+        asyncio.run(Database().record(vacancies))
+
+        match = SubscriptionMatch.objects.get()
+        assert match.profile == profile
+        assert match.vacancy == Vacancies.objects.get(url="https://hh.ru/vacancy/0")
+
+    def test_profile_change_rebuilds_index(self) -> None:
+        """Тест проверяет перестроение индекса после изменения профиля."""
+        profile = Profile.objects.create(job="Python", subscribe=True)
+        assert "python" in percolator.get_index().subscriptions
+
+        profile.job = "Go"
+        profile.save()
+        assert set(percolator.get_index().subscriptions) == {"go"}
+
+    def test_local_cache_version_expires(self, mocker) -> None:
+        """Тест проверяет, что без общего кеша индекс подписок перестраивается
+        после истечения версии, даже если профиль изменен в другом процессе."""
+        Profile.objects.create(job="Python", subscribe=True)
+        index = percolator.get_index()
+        # Другой процесс изменяет профиль и увеличивает версию в своем кеше.
+        Profile.objects.update(job="Go")
+        assert percolator.get_index() is index
+
+        clock = mocker.patch("django.core.cache.backends.locmem.time")
+        clock.time.return_value = time.time() + 31
+        assert set(percolator.get_index().subscriptions) == {"go"}
+
+    def test_profile_save_enqueues_rematch(self, mocker) -> None:
+        """Тест проверяет, что сохранение профиля ставит сопоставление
+        в очередь, а не выполняет его."""
+        enqueue = mocker.patch("profiles.signals.rematch_subscription")
+        rematch = mocker.spy(percolator, "rematch")
+        profile = Profile.objects.create(job="Python", subscribe=True)
+        profile.save()
+        enqueue.assert_called_once_with(profile.pk)
+        rematch.assert_not_called()
+
+    def test_profile_change_rematches_today(self, immediate_huey: None) -> None:
+        """Тест проверяет, что совпадения профиля сопоставляются заново
+        после изменения предпочтений рассылки."""
+        profile = Profile.objects.create(job="Python", subscribe=True)
+        python, go = (
+            Vacancies.objects.create(
+                job_board="HeadHunter",
+                url=f"https://hh.ru/vacancy/{num}",
+                title=title,
+                published_at=timezone.now(),
+            )
+            for num, title in enumerate(["Python разработчик", "Go разработчик"])
+        )
+        percolator.percolate([python.url, go.url])
+        assert list(
+            profile.subscriptionmatch_set.values_list("vacancy", flat=True)
+        ) == [python.pk]
+
+        profile = Profile.objects.get(pk=profile.pk)
+        profile.job = "Go"
+        profile.save()
+        assert list(
+            profile.subscriptionmatch_set.values_list("vacancy", flat=True)
+        ) == [go.pk]
+        assert EmailSender().get_matches() == {profile.pk: {go.pk: go}}
+
+        profile.subscribe = False
+        profile.save()
+        assert not SubscriptionMatch.objects.exists()
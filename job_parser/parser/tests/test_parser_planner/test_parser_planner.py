@@ -0,0 +1,188 @@
+import asyncio
+import datetime
+from parser.benchmarks.ingest import ParserBenchmark
+from parser.benchmarks.server import ApiFixtureServer
+from parser.management.commands import backfill
+from parser.management.commands.backfill import day_windows
+from parser.models import Vacancies
+from parser.parsing.fetcher import Fetcher
+from parser.parsing.planner import Shard, ShardPlanner
+from parser.parsing.replay import FixtureStore
+
+import httpx
+import pytest
+from django.core.management import call_command
+
+URL = "https://api.hh.ru/vacancies"
+START = datetime.datetime(2023, 5, 1, tzinfo=datetime.timezone.utc)
+END = START + datetime.timedelta(days=1)
+
+
+class SearchClient:
+    """
+    Клиент, имитирующий поиск вакансий API HeadHunter по периоду публикации
+    и региону с ограничением на количество доступных результатов.
+    """
+
+    def __init__(self, vacancies: list[dict], cap: int) -> None:
+        self.vacancies = vacancies
+        self.cap = cap
+        self.requests: list[dict] = []
+
+    async def create_client(self, url: str, params: dict) -> httpx.Response:
+        self.requests.append(dict(params))
+        found = self.vacancies
+        if "date_from" in params:
+            start = datetime.datetime.fromisoformat(params["date_from"])
+            end = datetime.datetime.fromisoformat(params["date_to"])
+            found = [
+                vacancy
+                for vacancy in found
+                if start
+                <= datetime.datetime.fromisoformat(vacancy["published_at"])
+                <= end
+            ]
+        if "area" in params:
+            found = [vacancy for vacancy in found if vacancy["area"] == params["area"]]
+        size = params["per_page"]
+        offset = params["page"] * size
+        items = found[: self.cap][offset : offset + size]
+        request = httpx.Request("GET", url)
+        return httpx.Response(
+            200, json={"items": items, "found": len(found)}, request=request
+        )
+
+
+def make_vacancies(count: int, areas: tuple[str, ...] = ("1",)) -> list[dict]:
+    step = (END - START) / count
+    return [
+        {
+            "id": str(num),
+            "published_at": (START + step * num).isoformat(),
+            "area": areas[num % len(areas)],
+        }
+        for num in range(count)
+    ]
+
+
+def make_fetcher(client: SearchClient, pages: int = 2, per_page: int = 2) -> Fetcher:
+    return Fetcher(
+        "HeadHunter", URL, {"per_page": per_page}, pages, "items", client, delay=False
+    )
+
+
+class TestShardPlanner:
+    """Класс описывает тестовые случаи для разбиения запросов на сегменты."""
+
+    def test_split_covers_window(self) -> None:
+        """Тест проверяет, что части сегмента покрывают его период без разрывов."""
+        parts = Shard(START, END, area="1").split(3)
+        assert parts[0].start == START and parts[-1].end == END
+        assert all(a.end == b.start for a, b in zip(parts, parts[1:]))
+        assert {part.area for part in parts} == {"1"}
+
+    def test_collects_beyond_cap(self) -> None:
+        """Тест проверяет загрузку всех вакансий, когда их больше ограничения."""
+        client = SearchClient(make_vacancies(20), cap=4)
+        planner = ShardPlanner(
+            make_fetcher(client), min_window=datetime.timedelta(minutes=1)
+        )
+        shards = asyncio.run(planner.plan(START, END))
+        assert all(
+            shard.found is not None and shard.found <= planner.cap for shard in shards
+        )
+        vacancies = asyncio.run(planner.fetch(shards))
+        assert sorted(int(vacancy["id"]) for vacancy in vacancies) == list(range(20))
+
+    def test_splits_by_area_at_min_window(self) -> None:
+        """Тест проверяет разбиение по регионам самого короткого периода."""
+        vacancies = [
+            {"id": str(num), "published_at": START.isoformat(), "area": str(num % 2)}
+            for num in range(6)
+        ]
+        client = SearchClient(vacancies, cap=4)
+        planner = ShardPlanner(
+            make_fetcher(client),
+            min_window=datetime.timedelta(days=1),
+            areas=["0", "1"],
+        )
+        shards = asyncio.run(planner.plan(START, END))
+        assert sorted(str(shard.area) for shard in shards) == ["0", "1", "None"]
+        assert len(asyncio.run(planner.fetch(shards))) == 6
+
+    def test_area_split_keeps_other_areas(self) -> None:
+        """Тест проверяет, что при разбиении по регионам вакансии остальных
+        регионов загружаются сегментом по всем регионам."""
+        vacancies = [
+            {"id": str(num), "published_at": START.isoformat(), "area": area}
+            for num, area in enumerate(["9", "9", "0", "0", "0"])
+        ]
+        client = SearchClient(vacancies, cap=4)
+        planner = ShardPlanner(
+            make_fetcher(client), min_window=datetime.timedelta(days=1), areas=["0"]
+        )
+        shards = asyncio.run(planner.plan(START, END))
+        remainder = [shard for shard in shards if shard.remainder]
+        assert len(remainder) == 1 and remainder[0].area is None
+        vacancies = asyncio.run(planner.fetch(shards))
+        assert sorted(int(vacancy["id"]) for vacancy in vacancies) == list(range(5))
+        assert sum("area" not in request for request in client.requests) == 2
+
+    def test_fits_under_cap_without_extra_requests(self) -> None:
+        """Тест проверяет, что первая страница оценки не запрашивается повторно."""
+        client = SearchClient(make_vacancies(3), cap=4)
+        planner = ShardPlanner(make_fetcher(client))
+        vacancies = asyncio.run(planner.collect(START, END))
+        assert len(vacancies) == 3
+        assert [request["page"] for request in client.requests] == [0, 1]
+
+    def test_get_vacancies_keeps_params(self) -> None:
+        """Тест проверяет, что загрузка не изменяет переданные параметры."""
+        client = SearchClient(make_vacancies(3), cap=4)
+        fetcher = make_fetcher(client)
+        params = {"per_page": 2}
+        assert len(asyncio.run(fetcher.get_vacancies(params))) == 3
+        assert params == {"per_page": 2}
+        assert fetcher.params == {"per_page": 2}
+
+    @pytest.mark.parametrize("found", [None, 0])
+    def test_shards_without_count(self, found: int | None) -> None:
+        """Тест проверяет сегменты без количества и без найденных вакансий."""
+        planner = ShardPlanner(make_fetcher(SearchClient([], cap=4)))
+        shard = Shard(START, END, found=found)
+        assert planner.refine(shard) is None
+
+
+class TestBackfill:
+    """Класс описывает тестовые случаи для загрузки вакансий за прошлые дни."""
+
+    def test_day_windows(self) -> None:
+        """Тест проверяет деление периода на интервалы по дням."""
+        windows = day_windows(
+            datetime.date(2023, 5, 1), datetime.date(2023, 5, 3), step=2
+        )
+        assert [(start.day, end.day) for start, end in windows] == [(1, 3), (3, 4)]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_backfill_command(
+        self, fix_store: FixtureStore, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Тест проверяет загрузку вакансий за период парсером HeadHunter
+        на записанных ответах API."""
+        with ApiFixtureServer(store=fix_store) as server:
+            benchmark = ParserBenchmark(server, repeat=1)
+            monkeypatch.setattr(backfill, "ParserConfig", benchmark.make_config)
+            call_command(
+                "backfill",
+                "headhunter",
+                "--since",
+                "2023-05-01",
+                "--until",
+                "2023-05-01",
+            )
+
+        assert sorted(Vacancies.objects.values_list("url", flat=True)) == [
+            "https://hh.ru/vacancy/1",
+            "https://hh.ru/vacancy/2",
+        ]
+        assert server.stats.misses == 0
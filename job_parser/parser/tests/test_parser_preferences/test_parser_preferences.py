@@ -0,0 +1,118 @@
+import json
+import time
+from parser.mixins import VacanciesMixin
+from parser.models import UserVacancies, Vacancies
+from parser.preferences import PreferenceCache, preference_cache
+
+import pytest
+from django.contrib.auth.models import User
+from django.test import Client, RequestFactory
+from django.urls import reverse
+
+
+@pytest.mark.django_db(transaction=True)
+class TestPreferenceCache:
+    """Класс описывает тестовые случаи для кеша пользовательских списков."""
+
+    def test_snapshot_is_cached(
+        self,
+        fix_user: User,
+        fix_vacancy: Vacancies,
+        django_assert_num_queries,
+    ) -> None:
+        """Тест проверяет, что повторное получение снимка не обращается к базе."""
+        UserVacancies.objects.create(
+            user=fix_user, vacancy=fix_vacancy, is_blacklist=True
+        )
+        UserVacancies.objects.create(user=fix_user, hidden_company="Компания")
+
+        with django_assert_num_queries(1):
+            snapshot = preference_cache.get(fix_user.pk)
+        assert snapshot.blacklist == {fix_vacancy.pk}
+        assert snapshot.favourites == frozenset()
+        assert snapshot.hidden_companies == {"Компания"}
+
+        with django_assert_num_queries(0):
+            assert preference_cache.get(fix_user.pk) is snapshot
+
+        preference_cache.local.clear()
+        with django_assert_num_queries(0):
+            assert preference_cache.get(fix_user.pk) == snapshot
+
+    def test_views_invalidate_snapshot(
+        self,
+        logged_in_client: Client,
+        fix_user: User,
+        fix_vacancy: Vacancies,
+    ) -> None:
+        """Тест проверяет, что изменение списков увеличивает версию снимка."""
+        before = preference_cache.get(fix_user.pk)
+        logged_in_client.post(
+            reverse("favourite"),
+            data=json.dumps({"pk": fix_vacancy.pk}),
+            content_type="application/json",
+        )
+        after = preference_cache.get(fix_user.pk)
+        assert after.version > before.version
+        assert after.favourites == {fix_vacancy.pk}
+
+        logged_in_client.post(
+            reverse("hide_company"),
+            data=json.dumps({"company": "Компания"}),
+            content_type="application/json",
+        )
+        assert preference_cache.get(fix_user.pk).hidden_companies == {"Компания"}
+
+    def test_local_cache_version_expires(
+        self, fix_user: User, fix_vacancy: Vacancies, mocker
+    ) -> None:
+        """Тест проверяет, что без общего кеша снимок перестраивается после
+        истечения версии, даже если изменение сделано в другом процессе."""
+        assert preference_cache.version_timeout == 30
+        before = preference_cache.get(fix_user.pk)
+        # Другой процесс изменяет списки и увеличивает версию в своем кеше.
+        UserVacancies.objects.create(
+            user=fix_user, vacancy=fix_vacancy, is_favourite=True
+        )
+        assert preference_cache.get(fix_user.pk) is before
+
+        clock = mocker.patch("django.core.cache.backends.locmem.time")
+        clock.time.return_value = time.time() + 31
+        after = preference_cache.get(fix_user.pk)
+        assert after.version != before.version
+        assert after.favourites == {fix_vacancy.pk}
+
+    def test_local_cache_evicts_least_recently_used(self, db) -> None:
+        """Тест проверяет вытеснение давно использованных снимков."""
+        cache = PreferenceCache(maxsize=2)
+        cache.get(1)
+        cache.get(2)
+        cache.get(1)
+        cache.get(3)
+        assert list(cache.local) == [1, 3]
+
+    def test_check_vacancies_uses_snapshot(
+        self,
+        fix_user: User,
+        fix_vacancy: Vacancies,
+        django_assert_num_queries,
+    ) -> None:
+        """Тест проверяет фильтрацию результатов по снимку без запросов к базе."""
+        other = Vacancies.objects.create(
+            job_board="HeadHunter", url="https://hh.ru/vacancy/2", company="Скрытая"
+        )
+        UserVacancies.objects.create(
+            user=fix_user, vacancy=fix_vacancy, is_favourite=True
+        )
+        UserVacancies.objects.create(user=fix_user, hidden_company="Скрытая")
+        vacancies = list(Vacancies.objects.all())
+        request = RequestFactory().get("/")
+        request.user = fix_user
+        preference_cache.get(fix_user.pk)
+
+        with django_assert_num_queries(0):
+            filtered, favourite = VacanciesMixin().check_vacancies(vacancies, request)
+
+        assert filtered == [fix_vacancy]
+        assert favourite == [fix_vacancy]
+        assert other not in filtered
@@ -0,0 +1,113 @@
+import asyncio
+from parser.benchmarks.ingest import ParserBenchmark
+from parser.benchmarks.server import ApiFixtureServer
+from parser.models import Vacancies
+from parser.parsing.config import ParserConfig
+from parser.parsing.replay import FixtureStore, ReplayWebClient, fixture_key
+
+import pytest
+
+
+class TestFixtureKey:
+    """Класс описывает тестовые случаи для ключа фикстуры."""
+
+    def test_fixture_key_ignores_dates_and_order(self) -> None:
+        """Тест проверяет, что ключ не зависит от дат и порядка параметров."""
+        first = fixture_key(
+            "api.hh.ru",
+            "/vacancies",
+            [("page", "0"), ("date_from", "2023-05-01"), ("per_page", "100")],
+        )
+        second = fixture_key(
+            "api.hh.ru",
+            "/vacancies/",
+            [("per_page", "100"), ("page", "0"), ("date_from", "2023-06-01")],
+        )
+        assert first == second
+
+    def test_fixture_key_depends_on_host_and_page(self) -> None:
+        """Тест проверяет, что ключ различает площадки и страницы."""
+        query = [("page", "0")]
+        assert fixture_key("api.hh.ru", "/vacancies", query) != fixture_key(
+            "api.zarplata.ru", "/vacancies", query
+        )
+        assert fixture_key("api.hh.ru", "/vacancies", query) != fixture_key(
+            "api.hh.ru", "/vacancies", [("page", "1")]
+        )
+
+
+@pytest.mark.django_db(transaction=True)
+class TestReplay:
+    """Класс описывает тестовые случаи для воспроизведения ответов API.
+
+    Декоратор `@pytest.mark.django_db` указывает pytest на необходимость использования
+    базы данных.
+    Параметр `transaction=True` указывает на использование транзакций для ускорения
+    и изоляции тестов.
+    """
+
+    def test_replay_client_returns_recorded_response(
+        self, fix_store: FixtureStore
+    ) -> None:
+        """Тест проверяет, что клиент получает записанный ответ с сервера."""
+        with ApiFixtureServer(store=fix_store) as server:
+            config = ParserConfig()
+            client = ReplayWebClient(config, server.base_url)
+            response = asyncio.run(
+                client.create_client(
+                    "https://api.hh.ru/vacancies",
+                    {"per_page": 100, "page": 0, "date_from": "2030-01-01"},
+                )
+            )
+        assert response.status_code == 200
+        assert len(response.json()["items"]) == 2
+        assert client.requests == 1
+
+    def test_server_injects_errors(self, fix_store: FixtureStore) -> None:
+        """Тест проверяет, что сервер отдает ошибки с заданной долей."""
+        with ApiFixtureServer(store=fix_store, error_rate=1.0) as server:
+            client = ReplayWebClient(ParserConfig(), server.base_url)
+            response = asyncio.run(
+                client.create_client("https://api.hh.ru/vacancies", {"page": 0})
+            )
+        assert response.status_code == 503
+        assert server.stats.errors == 1
+
+    def test_parse_end_to_end(self, fix_store: FixtureStore) -> None:
+        """Тест проверяет полный прогон парсера на записанных ответах."""
+        with ApiFixtureServer(store=fix_store) as server:
+            benchmark = ParserBenchmark(server, repeat=1)
+            config = benchmark.make_config()
+            asyncio.run(config.hh_parser.parse())
+
+        vacancies = Vacancies.objects.order_by("url")
+        assert vacancies.count() == 2
+        assert vacancies[0].description == "<p>Описание</p>"
+        assert vacancies[0].remote is True
+        assert server.stats.requests == 4
+        assert server.stats.misses == 0
+
+    def test_parser_benchmark_reports_results(self, fix_store: FixtureStore) -> None:
+        """Тест проверяет отчет бенчмарка и удаление записанных вакансий."""
+        with ApiFixtureServer(store=fix_store) as server:
+            results = ParserBenchmark(server, repeat=2).run(["hh"])
+
+        row = results[0].to_dict()
+        assert row["items"] == 2
+        assert row["requests"] == 4
+        assert row["peak_mb"] > 0
+        assert len(results[0].runs) == 2
+        assert not Vacancies.objects.exists()
+
+    def test_parser_benchmark_keeps_existing_vacancies(
+        self, fix_store: FixtureStore
+    ) -> None:
+        """Тест проверяет, что бенчмарк удаляет только созданные им вакансии."""
+        existing = Vacancies.objects.create(
+            job_board="HeadHunter", url="https://hh.ru/vacancy/1", title="Старая"
+        )
+        with ApiFixtureServer(store=fix_store) as server:
+            results = ParserBenchmark(server, repeat=1).run(["hh"])
+
+        assert results[0].to_dict()["items"] == 2
+        assert list(Vacancies.objects.all()) == [existing]
@@ -0,0 +1,232 @@
+import asyncio
+import time
+from parser.parsing.fetcher import Fetcher
+from parser.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    FetchError,
+    RetryPolicy,
+    classify,
+    get_breaker,
+    parse_retry_after,
+)
+from parser.scraping.configuration import Config
+from parser.scraping.fetching import Fetcher as ScrapingFetcher
+from parser.scraping.fetching import Page
+from typing import Awaitable, Callable
+
+import aiohttp
+import httpx
+import pytest
+
+URL = "https://api.example.ru/vacancies"
+
+
+def scripted(outcomes: list) -> tuple[Callable[[], Awaitable], list]:
+    """
+    Создает запрос, который по очереди возвращает статусы или вызывает исключения.
+
+    Returns:
+        tuple: Функция запроса и список выполненных вызовов.
+    """
+    calls: list = []
+
+    async def request():
+        outcome = outcomes[len(calls)]
+        calls.append(outcome)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+    return request, calls
+
+
+def call(policy: RetryPolicy, request: Callable[[], Awaitable]):
+    return asyncio.run(policy.call(URL, request, status=lambda status: status))
+
+
+class TestClassification:
+    """Класс описывает тестовые случаи для классификации ошибок запросов."""
+
+    @pytest.mark.parametrize(
+        "status, expected",
+        [(200, "ok"), (404, "ok"), (429, "retry"), (503, "retry")],
+    )
+    def test_classify_status(self, status: int, expected: str) -> None:
+        """Тест проверяет классификацию статусов ответа."""
+        assert classify(status=status) == expected
+
+    def test_classify_exceptions(self) -> None:
+        """Тест проверяет, что повторяются только ошибки соединения."""
+        assert classify(exc=httpx.ConnectTimeout("timeout")) == "retry"
+        assert classify(exc=asyncio.TimeoutError()) == "retry"
+        assert classify(exc=ValueError("bad url")) == "fatal"
+
+    def test_parse_retry_after(self) -> None:
+        """Тест проверяет разбор заголовка Retry-After."""
+        assert parse_retry_after("3") == 3.0
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+        assert parse_retry_after("soon") is None
+
+
+class TestRetryPolicy:
+    """Класс описывает тестовые случаи для повторов запросов."""
+
+    def test_backoff_is_bounded(self) -> None:
+        """Тест проверяет границы задержки и учет Retry-After."""
+        policy = RetryPolicy(base=0.5, cap=4)
+        for attempt in range(6):
+            assert 0 <= policy.backoff(attempt) <= min(4, 0.5 * 2**attempt)
+        assert policy.backoff(0, retry_after=2) >= 2
+        assert policy.backoff(0, retry_after=60) <= 4
+
+    def test_retries_transient_errors(self) -> None:
+        """Тест проверяет повтор временных ошибок до успешного ответа."""
+        request, calls = scripted([httpx.ConnectError("reset"), 503, 200])
+        assert call(RetryPolicy(retries=3, base=0), request) == 200
+        assert len(calls) == 3
+
+    def test_raises_after_retries(self) -> None:
+        """Тест проверяет ошибку после исчерпания повторов."""
+        request, calls = scripted([503, 503, 503])
+        with pytest.raises(FetchError) as exc_info:
+            call(RetryPolicy(retries=2, base=0), request)
+        assert exc_info.value.status == 503
+        assert len(calls) == 3
+
+    def test_does_not_retry_fatal_errors(self) -> None:
+        """Тест проверяет, что постоянные ошибки не повторяются."""
+        request, calls = scripted([ValueError("bad url"), 200])
+        with pytest.raises(ValueError):
+            call(RetryPolicy(retries=3, base=0), request)
+        request, calls = scripted([404, 200])
+        assert call(RetryPolicy(retries=3, base=0), request) == 404
+        assert len(calls) == 1
+
+    def test_hedged_request_returns_first_response(self) -> None:
+        """Тест проверяет, что копия запроса отвечает вместо медленного запроса."""
+        calls: list[int] = []
+
+        async def request() -> int:
+            calls.append(len(calls))
+            if len(calls) == 1:
+                await asyncio.sleep(5)
+            return 200
+
+        start = time.perf_counter()
+        assert call(RetryPolicy(retries=0, hedge_after=0.05), request) == 200
+        assert time.perf_counter() - start < 1
+        assert len(calls) == 2
+
+
+class TestCircuitBreaker:
+    """Класс описывает тестовые случаи для предохранителя хоста."""
+
+    def test_opens_after_threshold_and_fails_fast(self, settings) -> None:
+        """Тест проверяет размыкание и отказ без отправки запроса."""
+        settings.INGEST_BREAKER_THRESHOLD = 2
+        settings.INGEST_BREAKER_RESET = 60
+        request, calls = scripted([503, 503, 200])
+        with pytest.raises(FetchError):
+            call(RetryPolicy(retries=5, base=0), request)
+        assert len(calls) == 2
+        assert get_breaker("api.example.ru").state == "open"
+        with pytest.raises(CircuitOpenError):
+            call(RetryPolicy(retries=5, base=0), request)
+        assert len(calls) == 2
+
+    def test_half_open_probe_closes_breaker(self) -> None:
+        """Тест проверяет замыкание после успешного пробного запроса."""
+        breaker = CircuitBreaker("api.example.ru", threshold=1, reset_timeout=0)
+        breaker.record_failure()
+        assert breaker.state == "open"
+        assert breaker.allow() is True
+        assert breaker.state == "half_open"
+        assert breaker.allow() is False
+        breaker.record_success()
+        assert breaker.state == "closed"
+
+
+class FlakyClient:
+    """Клиент API, первый запрос которого завершается таймаутом."""
+
+    def __init__(self, pages: list[dict]) -> None:
+        self.pages = pages
+        self.calls = 0
+
+    async def create_client(self, url: str, params: dict) -> httpx.Response:
+        self.calls += 1
+        if self.calls == 1:
+            raise httpx.ConnectTimeout("timeout")
+        request = httpx.Request("GET", url)
+        return httpx.Response(200, json=self.pages[params["page"]], request=request)
+
+
+class TestFetchers:
+    """Класс описывает тестовые случаи для повторов в сборщиках."""
+
+    def test_transient_error_does_not_truncate_run(self) -> None:
+        """Тест проверяет, что таймаут страницы не обрывает сбор вакансий."""
+        pages: list[dict] = [
+            {"items": [{"id": "1"}]},
+            {"items": [{"id": "2"}]},
+            {"items": []},
+        ]
+        client = FlakyClient(pages)
+        fetcher = Fetcher(
+            "HeadHunter",
+            URL,
+            {},
+            5,
+            "items",
+            client,
+            delay=False,
+            retry=RetryPolicy(retries=2, base=0),
+        )
+        vacancies = asyncio.run(fetcher.get_vacancies())
+        assert [vacancy["id"] for vacancy in vacancies] == ["1", "2"]
+        assert client.calls == 4
+
+    def test_failed_page_keeps_collected_vacancies(self) -> None:
+        """Тест проверяет, что после исчерпания повторов собранное сохраняется."""
+
+        class DownClient(FlakyClient):
+            async def create_client(self, url: str, params: dict) -> httpx.Response:
+                if params["page"] == 1:
+                    raise httpx.ConnectError("down")
+                request = httpx.Request("GET", url)
+                return httpx.Response(200, json=self.pages[0], request=request)
+
+        fetcher = Fetcher(
+            "HeadHunter",
+            URL,
+            {},
+            5,
+            "items",
+            DownClient([{"items": [{"id": "1"}]}]),
+            delay=False,
+            retry=RetryPolicy(retries=1, base=0),
+        )
+        assert asyncio.run(fetcher.get_vacancies()) == [{"id": "1"}]
+
+    def test_scraping_fetch_skips_failed_pages(self, monkeypatch) -> None:
+        """Тест проверяет, что неудачный запрос скрапера возвращает None
+        и не прерывает сбор страниц вакансий."""
+        config = Config()
+        config.download_delay = 0
+        fetcher = ScrapingFetcher(
+            config, "https://career.habr.com/vacancies?page=", 1, "Habr"
+        )
+        fetcher.retry = RetryPolicy(retries=0, base=0)
+
+        async def request(url: str, params: dict, headers: dict, kind: str):
+            if url.endswith("/2"):
+                raise aiohttp.ClientConnectionError("down")
+            return Page(200, "<html></html>", url)
+
+        monkeypatch.setattr(fetcher, "request", request)
+        links = ["https://career.habr.com/1", "https://career.habr.com/2"]
+        assert asyncio.run(fetcher.fetch(links[1])) is None
+        pages = asyncio.run(fetcher.fetch_vacancy_pages(links))
+        assert pages == [("<html></html>", links[0])]
@@ -0,0 +1,109 @@
+import datetime
+import gzip
+import json
+from parser.models import UserVacancies, Vacancies, VacancyDescription
+from parser.retention import RetentionPolicy
+from pathlib import Path
+
+import pytest
+from django.contrib.auth.models import User
+from django.utils import timezone
+
+
+@pytest.fixture
+def fix_old_vacancies(fix_user: User) -> list[Vacancies]:
+    """Фикстура создающая устаревшие и актуальные вакансии.
+
+    Args:
+        fix_user (User): Тестовый пользователь.
+
+    Returns:
+        list[Vacancies]: Устаревшие вакансии.
+    """
+    now = timezone.now()
+    old = Vacancies.objects.bulk_create(
+        Vacancies(
+            job_board="HeadHunter",
+            url=f"https://hh.ru/vacancy/old-{num}",
+            published_at=now - datetime.timedelta(days=20 + num),
+        )
+        for num in range(7)
+    )
+    Vacancies.objects.create(
+        job_board="HeadHunter", url="https://hh.ru/vacancy/new", published_at=now
+    )
+    UserVacancies.objects.create(user=fix_user, vacancy=old[0], is_favourite=True)
+    return old
+
+
+@pytest.mark.django_db(transaction=True)
+class TestRetentionPolicy:
+    """Класс описывает тестовые случаи для удаления устаревших вакансий."""
+
+    def test_run_deletes_in_batches(self, fix_old_vacancies: list[Vacancies]) -> None:
+        """Тест проверяет пакетное удаление с ограничением на запуск."""
+        policy = RetentionPolicy(days=10, batch_size=3, max_batches=2)
+        first = policy.run()
+        assert first.deleted == 6
+        assert first.batches == 2
+        assert not first.exhausted
+
+        second = policy.run()
+        assert second.deleted == 1
+        assert second.exhausted
+        assert list(Vacancies.objects.values_list("url", flat=True)) == [
+            "https://hh.ru/vacancy/new"
+        ]
+        assert not UserVacancies.objects.exists()
+
+    def test_batch_query_count_is_fixed(
+        self, fix_old_vacancies: list[Vacancies], django_assert_max_num_queries
+    ) -> None:
+        """Тест проверяет, что пакет удаляется постоянным числом запросов."""
+        policy = RetentionPolicy(days=10, batch_size=100, max_batches=1)
+        with django_assert_max_num_queries(9):
+            assert policy.run().deleted == 7
+
+    def test_duplicates_survive_original(self) -> None:
+        """Тест проверяет, что дубликаты удаленной вакансии не удаляются вместе
+        с ней, а первый из них становится основной вакансией."""
+        now = timezone.now()
+        original = Vacancies.objects.create(
+            job_board="HeadHunter",
+            url="https://hh.ru/vacancy/original",
+            published_at=now - datetime.timedelta(days=20),
+        )
+        VacancyDescription.objects.store({original.url: "Описание вакансии"})
+        first, second = (
+            Vacancies.objects.create(
+                job_board=job_board,
+                url=url,
+                published_at=now,
+                duplicate_of=original,
+            )
+            for job_board, url in [
+                ("SuperJob", "https://superjob.ru/vacancy/1"),
+                ("Zarplata", "https://zarplata.ru/vacancy/1"),
+            ]
+        )
+
+        assert RetentionPolicy(days=10).run().deleted == 1
+        first.refresh_from_db()
+        second.refresh_from_db()
+        assert first.duplicate_of is None
+        assert second.duplicate_of == first
+        assert first.description_data.text == "Описание вакансии"
+
+    def test_dry_run_and_archive(
+        self, fix_old_vacancies: list[Vacancies], tmp_path: Path
+    ) -> None:
+        """Тест проверяет подсчет без удаления и архивирование вакансий."""
+        assert RetentionPolicy(days=10).run(dry_run=True).deleted == 7
+        assert Vacancies.objects.count() == 8
+
+        result = RetentionPolicy(days=10, archive_dir=tmp_path).run()
+        assert result.archived == 7
+        (archive,) = tmp_path.glob("*.jsonl.gz")
+        with gzip.open(archive, "rt", encoding="utf-8") as file:
+            urls = {json.loads(line)["url"] for line in file}
+        assert urls == {vacancy.url for vacancy in fix_old_vacancies}
@@ -0,0 +1,106 @@
+import asyncio
+from pathlib import Path
+from parser.benchmarks.scraping import Corpus, CorpusServer, ScraperBenchmark
+from parser.scraping.configuration import Config
+from parser.scraping.main import StartScrapers
+from parser.useragents import USER_AGENTS
+
+import pytest
+
+HABR_LISTING_URL = "https://career.habr.com/vacancies?sort=date&type=all&page=1"
+
+HABR_LISTING = """
+<html><body>
+<a class="vacancy-card__title-link" href="/vacancies/1000001">Python</a>
+<a class="vacancy-card__title-link" href="/vacancies/1000002">Go</a>
+</body></html>
+"""
+
+HABR_VACANCY = """
+<html><body>
+<h1 class="page-title__title">Python разработчик</h1>
+<div class="basic-salary basic-salary--appearance-vacancy-header">от 100 000 до 200 000 ₽</div>
+<div class="company_name"><a href="/companies/test">Тестовая компания</a></div>
+<a href="/vacancies?city_id=678">Москва</a>
+<a href="/vacancies?qid=3">Средний (Middle)</a>
+<span>Полный рабочий день</span>
+<div class="vacancy-description__text"><p>Описание</p></div>
+<time datetime="2023-05-01T10:00:00+03:00">1 мая</time>
+</body></html>
+"""
+
+
+@pytest.fixture
+def fix_corpus(tmp_path: Path) -> Corpus:
+    """Фикстура создающая корпус со страницами Habr.
+
+    Args:
+        tmp_path (Path): Временный каталог.
+
+    Returns:
+        Corpus: Корпус страниц.
+    """
+    corpus = Corpus(tmp_path / "v1")
+    corpus.add("habr", "listing", HABR_LISTING_URL, HABR_LISTING)
+    corpus.add(
+        "habr", "vacancy", "https://career.habr.com/vacancies/1000001", HABR_VACANCY
+    )
+    corpus.save()
+    return Corpus(tmp_path / "v1")
+
+
+class TestScraperBenchmark:
+    """Класс описывает тестовые случаи для бенчмарка скраперов."""
+
+    def test_corpus_versions(self, tmp_path: Path, fix_corpus: Corpus) -> None:
+        """Тест проверяет выбор последней и следующей версии корпуса."""
+        assert Corpus.latest(tmp_path).version == "v1"
+        assert Corpus.next_version(tmp_path).version == "v2"
+        assert len(list(fix_corpus.pages("habr", "vacancy"))) == 1
+
+    def test_scraper_extracts_saved_page(self, fix_corpus: Corpus) -> None:
+        """Тест проверяет извлечение полей из сохраненной страницы."""
+        scraper = Config().habr_scraper
+        html, url = next(fix_corpus.pages("habr", "vacancy"))
+        vacancy = asyncio.run(scraper.extract(scraper.parse_page(html), url))
+
+        assert vacancy.title == "Python разработчик"
+        assert vacancy.salary_from == 100000
+        assert vacancy.salary_to == 200000
+        assert vacancy.city == "Москва"
+        assert vacancy.experience == "От 3 до 6 лет"
+
+    def test_benchmark_reports_results(self, fix_corpus: Corpus) -> None:
+        """Тест проверяет замеры ссылок и извлечения через локальный сервер."""
+        with CorpusServer(corpus=fix_corpus) as server:
+            results = ScraperBenchmark(fix_corpus, server, repeat=2).run(["habr"])
+
+        row = results[0].to_dict()
+        assert row["listing_pages"] == 1
+        assert row["links"] == 2
+        assert row["vacancy_pages"] == 2
+        assert row["pages_per_s"] > 0
+        assert row["parse_peak_kb"] > 0
+        assert server.stats.misses == 0
+
+
+class TestScrapingConfig:
+    """Класс описывает тестовые случаи для создания конфигурации скраперов."""
+
+    def test_config_is_built_lazily_once(self) -> None:
+        """Тест проверяет создание конфигурации при первом обращении."""
+        calls: list[Config] = []
+
+        def factory() -> Config:
+            calls.append(Config())
+            return calls[-1]
+
+        scrapers = StartScrapers(factory)
+        assert calls == []
+        assert scrapers.config is scrapers.config
+        assert len(calls) == 1
+
+    def test_user_agent_from_bundled_pool(self) -> None:
+        """Тест проверяет выбор User-Agent из встроенного набора."""
+        config = Config()
+        assert config.update_headers()["User-Agent"] in USER_AGENTS
@@ -0,0 +1,118 @@
+from parser.benchmarks.smtp import SmtpStubServer
+from parser.models import Vacancies
+from parser.percolator import percolator
+from parser.tasks import EmailSender, parse_headhunter_task, send_digest_chunk
+from typing import Any
+
+import pytest
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core import mail
+from django.utils import timezone
+from huey.contrib.djhuey import HUEY
+from huey.exceptions import TaskLockedException
+from profiles.models import Profile
+
+
+@pytest.fixture
+def fix_subscribers(db: Any) -> list[Profile]:
+    """Фикстура создающая подписчиков с одинаковыми предпочтениями.
+
+    Предпочтения отличаются только регистром и пробелами и должны попасть
+    в одну группу, кроме последнего подписчика.
+
+    Args:
+        db (Any): Фикстура pytest-django, отвечает за подключение
+        к тестовой базе данных.
+
+    Returns:
+        list[Profile]: Профили подписчиков.
+    """
+    preferences = [
+        ("Python", "Москва"),
+        ("python ", "Москва"),
+        ("PYTHON", " Москва"),
+        ("Python", "Москва"),
+        ("Python", "Москва"),
+        ("Go", "Казань"),
+    ]
+    profiles = []
+    for num, (job, city) in enumerate(preferences):
+        user = User.objects.create(username=f"user{num}", email=f"user{num}@test.ru")
+        profiles.append(
+            Profile.objects.create(user=user, job=job, city=city, subscribe=True)
+        )
+    Vacancies.objects.create(
+        job_board="HeadHunter",
+        url="https://hh.ru/vacancy/1",
+        title="Python разработчик",
+        company="Тестовая компания",
+        city="Москва",
+        published_at=timezone.now(),
+    )
+    percolator.percolate(["https://hh.ru/vacancy/1"])
+    return profiles
+
+
+@pytest.mark.django_db(transaction=True)
+class TestEmailSender:
+    """Класс описывает тестовые случаи для рассылки писем с вакансиями."""
+
+    def test_profiles_are_grouped(
+        self, fix_subscribers: list[Profile], django_assert_num_queries
+    ) -> None:
+        """Тест проверяет, что рассылка читает совпадения одним запросом."""
+        sender = EmailSender()
+        with django_assert_num_queries(2):
+            sender.sending_emails()
+
+        assert len(mail.outbox) == 6
+        python = next(m for m in mail.outbox if m.to == ["user0@test.ru"])
+        go = next(m for m in mail.outbox if m.to == ["user5@test.ru"])
+        assert "Python разработчик" in python.alternatives[0][0]
+        assert "вакансий нет" in go.alternatives[0][0]
+
+    def test_chunks_reuse_smtp_connection(
+        self, fix_subscribers: list[Profile], settings: Any
+    ) -> None:
+        """Тест проверяет отправку пачек через одно SMTP-соединение."""
+        with SmtpStubServer() as server:
+            settings.EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+            settings.EMAIL_HOST = server.host
+            settings.EMAIL_PORT = server.port
+            settings.EMAIL_HOST_USER = ""
+            settings.EMAIL_USE_TLS = False
+            EmailSender(batch_size=2).sending_emails()
+
+        assert server.stats.messages == 6
+        assert server.stats.connections == 4
+        assert {message["To"] for message in server.messages} == {
+            f"user{num}@test.ru" for num in range(6)
+        }
+
+
+class TestTaskLocks:
+    """Класс описывает тестовые случаи для блокировок периодических задач."""
+
+    def test_locked_source_is_skipped(self) -> None:
+        """Тест проверяет, что задача не запускается во время предыдущего запуска."""
+        with HUEY.lock_task("parse-headhunter"):
+            with pytest.raises(TaskLockedException):
+                parse_headhunter_task.call_local()
+
+    def test_consumer_keeps_locks_by_default(self) -> None:
+        """Тест проверяет, что новый потребитель не сбрасывает блокировки
+        работающих, а с `flush_locks` сбрасывает."""
+        lock = HUEY.lock_task("parse-headhunter")
+        with lock:
+            HUEY.create_consumer(**settings.HUEY_CONSUMER)
+            assert lock.is_locked()
+            HUEY.create_consumer(**{**settings.HUEY_CONSUMER, "flush_locks": True})
+            assert not lock.is_locked()
+
+    def test_user_tasks_run_ahead_of_ingest(self) -> None:
+        """Тест проверяет приоритет рассылки над загрузкой вакансий."""
+        assert (
+            send_digest_chunk.settings["default_priority"]
+            > parse_headhunter_task.settings["default_priority"]
+        )
@@ -0,0 +1,109 @@
+import asyncio
+import json
+import pstats
+import time
+from parser.scraping.db import Database
+from parser.tracing import span, trace
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture
+def trace_file(tmp_path: Path, settings) -> Path:
+    """Фикстура направляющая трассировку и профили во временный каталог."""
+    settings.INGEST_TRACE_FILE = str(tmp_path / "traces.jsonl")
+    settings.INGEST_PROFILE = ""
+    settings.INGEST_PROFILE_DIR = str(tmp_path / "profiles")
+    return tmp_path / "traces.jsonl"
+
+
+def read_trace(path: Path) -> dict:
+    return json.loads(path.read_text(encoding="utf-8").splitlines()[-1])
+
+
+class TestTracing:
+    """Класс описывает тестовые случаи для трассировки загрузки."""
+
+    def test_span_without_trace_is_noop(self) -> None:
+        """Тест проверяет, что вне запуска интервалы не создаются."""
+        with span("fetch_page") as current:
+            assert current is None
+
+    def test_spans_from_tasks_are_aggregated(self, trace_file: Path) -> None:
+        """Тест проверяет объединение интервалов параллельных задач."""
+
+        async def fetch() -> None:
+            with span("fetch_detail"):
+                with span("decode"):
+                    await asyncio.sleep(0)
+
+        async def run() -> None:
+            with span("extract"):
+                await asyncio.gather(*(fetch() for _ in range(3)))
+
+        with trace("parse_headhunter"):
+            asyncio.run(run())
+
+        summary = read_trace(trace_file)
+        assert summary["trace"] == "parse_headhunter"
+        extract = summary["children"][0]
+        assert extract["name"] == "extract"
+        detail = extract["children"][0]
+        assert (detail["name"], detail["count"]) == ("fetch_detail", 3)
+        assert detail["children"][0]["name"] == "decode"
+
+    def test_nested_trace_becomes_span(self, trace_file: Path) -> None:
+        """Тест проверяет, что вложенный запуск записывается как интервал."""
+        with trace("ingest_habr"):
+            with trace("scrape_habr"):
+                pass
+
+        lines = trace_file.read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 1
+        assert json.loads(lines[0])["children"][0]["name"] == "scrape_habr"
+
+    @pytest.mark.django_db(transaction=True)
+    def test_record_spans(self, trace_file: Path) -> None:
+        """Тест проверяет интервалы записи вакансий в базу данных."""
+        vacancy = {"job_board": "Habr", "url": "https://career.habr.com/vacancies/1"}
+        with trace("scrape_habr"):
+            asyncio.run(Database().record([vacancy]))
+
+        record = read_trace(trace_file)["children"][0]
+        assert record["name"] == "record"
+        assert [child["name"] for child in record["children"]] == [
+            "bulk_create",
+            "descriptions",
+            "percolate",
+        ]
+
+
+class TestProfiling:
+    """Класс описывает тестовые случаи для профилирования запуска."""
+
+    def busy(self, seconds: float) -> None:
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            pass
+
+    def test_sampling_profiler_writes_folded_stacks(self, trace_file: Path) -> None:
+        """Тест проверяет сохранение свернутых стеков для flamegraph."""
+        with trace("scrape_habr", profile="sample"):
+            self.busy(0.1)
+
+        path = Path(read_trace(trace_file)["profile"])
+        assert path.suffix == ".folded"
+        stack, count = path.read_text(encoding="utf-8").splitlines()[0].rsplit(" ", 1)
+        assert "busy (test_parser_tracing.py" in stack
+        assert int(count) > 0
+
+    def test_cprofile_writes_stats(self, trace_file: Path) -> None:
+        """Тест проверяет сохранение статистики cProfile."""
+        with trace("scrape_habr", profile="cprofile"):
+            self.busy(0.01)
+
+        path = Path(read_trace(trace_file)["profile"])
+        assert path.suffix == ".prof"
+        functions = set(pstats.Stats(str(path)).get_stats_profile().func_profiles)
+        assert "busy" in functions
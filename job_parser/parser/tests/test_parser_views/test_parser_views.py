@@ -0,0 +1,277 @@
+import asyncio
+import datetime
+import json
+import os
+from parser.models import UserVacancies, Vacancies
+
+import pytest
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import AsyncClient, Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+
+def post_json(client: Client, name: str, data: dict):
+    """Отправляет POST-запрос с JSON-данными на указанный маршрут."""
+    return client.post(
+        reverse(name), data=json.dumps(data), content_type="application/json"
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class TestUserVacanciesViews:
+    """Класс описывает тестовые случаи для представлений избранного и черного
+    списка."""
+
+    def test_add_to_favourite_is_idempotent(
+        self, logged_in_client: Client, fix_user: User, fix_vacancy: Vacancies
+    ) -> None:
+        """Тест проверяет, что повторное добавление не создает дубликатов."""
+        for _ in range(3):
+            response = post_json(logged_in_client, "favourite", {"pk": fix_vacancy.pk})
+            assert response.status_code == 200
+
+        rows = UserVacancies.objects.filter(user=fix_user, vacancy=fix_vacancy)
+        assert rows.count() == 1
+        assert rows.get().is_favourite is True
+
+    def test_blacklist_and_favourite_are_exclusive(
+        self, logged_in_client: Client, fix_user: User, fix_vacancy: Vacancies
+    ) -> None:
+        """Тест проверяет, что вакансия переносится между списками одной строкой."""
+        post_json(logged_in_client, "favourite", {"pk": fix_vacancy.pk})
+        post_json(logged_in_client, "add_to_black_list", {"pk": fix_vacancy.pk})
+
+        row = UserVacancies.objects.get(user=fix_user, vacancy=fix_vacancy)
+        assert row.is_blacklist is True
+        assert row.is_favourite is False
+
+        post_json(logged_in_client, "favourite", {"pk": fix_vacancy.pk})
+        row.refresh_from_db()
+        assert row.is_blacklist is False
+        assert row.is_favourite is True
+
+    def test_add_unknown_vacancy_returns_404(self, logged_in_client: Client) -> None:
+        """Тест проверяет ответ при добавлении несуществующей вакансии."""
+        response = post_json(logged_in_client, "favourite", {"pk": 999})
+        assert response.status_code == 404
+        assert not UserVacancies.objects.exists()
+
+    def test_add_invalid_pk_returns_400(self, logged_in_client: Client) -> None:
+        """Тест проверяет ответ при невалидном идентификаторе вакансии."""
+        response = post_json(logged_in_client, "add_to_black_list", {"pk": "abc"})
+        assert response.status_code == 400
+
+    def test_delete_from_lists(
+        self, logged_in_client: Client, fix_user: User, fix_vacancy: Vacancies
+    ) -> None:
+        """Тест проверяет удаление вакансии из избранного и черного списка."""
+        post_json(logged_in_client, "favourite", {"pk": fix_vacancy.pk})
+        response = post_json(
+            logged_in_client, "delete_favourite", {"pk": fix_vacancy.pk}
+        )
+        assert response.status_code == 200
+        assert not UserVacancies.objects.filter(user=fix_user).exists()
+
+        post_json(logged_in_client, "add_to_black_list", {"pk": fix_vacancy.pk})
+        response = post_json(
+            logged_in_client, "delete_from_blacklist", {"pk": fix_vacancy.pk}
+        )
+        assert response.status_code == 200
+        assert not UserVacancies.objects.filter(user=fix_user).exists()
+
+    def test_clear_lists_use_constant_queries(
+        self,
+        logged_in_client: Client,
+        fix_user: User,
+        django_assert_max_num_queries,
+    ) -> None:
+        """Тест проверяет, что очистка списка не зависит от его размера."""
+        vacancies = Vacancies.objects.bulk_create(
+            Vacancies(job_board="HeadHunter", url=f"https://hh.ru/vacancy/{num}")
+            for num in range(50)
+        )
+        UserVacancies.objects.bulk_create(
+            UserVacancies(user=fix_user, vacancy=vacancy, is_blacklist=True)
+            for vacancy in vacancies[:40]
+        )
+        UserVacancies.objects.bulk_create(
+            UserVacancies(user=fix_user, vacancy=vacancy, is_favourite=True)
+            for vacancy in vacancies[40:]
+        )
+        for num, vacancy in enumerate(vacancies[:5]):
+            UserVacancies.objects.filter(vacancy=vacancy).update(
+                hidden_company=f"Компания {num}"
+            )
+
+        with django_assert_max_num_queries(10):
+            response = post_json(logged_in_client, "clear_blacklist_list", {})
+        assert response.status_code == 200
+        assert response.json()["deleted"] == 35
+        assert response.json()["updated"] == 5
+        assert not UserVacancies.objects.filter(is_blacklist=True).exists()
+        assert UserVacancies.objects.filter(is_favourite=True).count() == 10
+
+        response = post_json(logged_in_client, "clear_hidden_companies_list", {})
+        assert response.json()["deleted"] == 5
+        response = post_json(logged_in_client, "clear_favourite_list", {})
+        assert response.json()["deleted"] == 10
+        assert not UserVacancies.objects.exists()
+
+
+@pytest.mark.django_db(transaction=True)
+class TestBatchActionView:
+    """Класс описывает тестовые случаи для пакетного изменения списков."""
+
+    def test_batch_applies_operations(
+        self,
+        logged_in_client: Client,
+        fix_user: User,
+        django_assert_max_num_queries,
+    ) -> None:
+        """Тест проверяет применение пакета действий и статусы элементов."""
+        vacancies = Vacancies.objects.bulk_create(
+            Vacancies(job_board="HeadHunter", url=f"https://hh.ru/vacancy/{num}")
+            for num in range(1200)
+        )
+        favourite = [vacancy.pk for vacancy in vacancies[:1000]]
+        blacklist = [vacancy.pk for vacancy in vacancies[1000:]]
+
+        with django_assert_max_num_queries(20):
+            response = post_json(
+                logged_in_client,
+                "batch_action",
+                {
+                    "favourite": favourite + ["abc", 999999],
+                    "blacklist": blacklist + [favourite[0]],
+                    "hide": ["Компания", "Компания", ""],
+                },
+            )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["favourite"]["abc"] == "invalid"
+        assert data["favourite"]["999999"] == "not_found"
+        assert data["favourite"][str(favourite[0])] == "conflict"
+        assert data["blacklist"][str(blacklist[0])] == "ok"
+        assert data["hide"] == {"Компания": "ok", "": "invalid"}
+
+        rows = UserVacancies.objects.filter(user=fix_user)
+        assert rows.filter(is_favourite=True).count() == 999
+        assert rows.filter(is_blacklist=True).count() == 200
+        assert rows.filter(hidden_company="Компания").count() == 1
+
+    def test_batch_is_idempotent(
+        self, logged_in_client: Client, fix_user: User, fix_vacancy: Vacancies
+    ) -> None:
+        """Тест проверяет, что повторный пакет переносит вакансию без дубликатов."""
+        post_json(logged_in_client, "batch_action", {"favourite": [fix_vacancy.pk]})
+        post_json(
+            logged_in_client,
+            "batch_action",
+            {"blacklist": [fix_vacancy.pk], "hide": ["Компания"]},
+        )
+        post_json(logged_in_client, "batch_action", {"hide": ["Компания"]})
+
+        row = UserVacancies.objects.get(user=fix_user, vacancy=fix_vacancy)
+        assert row.is_blacklist is True
+        assert row.is_favourite is False
+        assert UserVacancies.objects.filter(hidden_company="Компания").count() == 1
+
+    def test_batch_rejects_invalid_payload(self, logged_in_client: Client) -> None:
+        """Тест проверяет ответ на невалидный пакет."""
+        response = post_json(logged_in_client, "batch_action", {"favourite": 1})
+        assert response.status_code == 400
+        response = post_json(
+            logged_in_client, "batch_action", {"hide": ["Компания"] * 5001}
+        )
+        assert response.status_code == 400
+
+    def test_hide_company_is_single_upsert(
+        self, logged_in_client: Client, fix_user: User
+    ) -> None:
+        """Тест проверяет, что скрытие компании - один запрос к таблице
+        списков, а повторное скрытие не создает дубликат."""
+        with CaptureQueriesContext(connection) as queries:
+            response = post_json(
+                logged_in_client, "hide_company", {"company": "Компания"}
+            )
+        assert response.status_code == 200
+        table = UserVacancies._meta.db_table
+        writes = [query["sql"] for query in queries if table in query["sql"]]
+        assert len(writes) == 1
+        assert writes[0].startswith("INSERT")
+
+        post_json(logged_in_client, "hide_company", {"company": "Компания"})
+        assert (
+            UserVacancies.objects.filter(
+                user=fix_user, hidden_company="Компания"
+            ).count()
+            == 1
+        )
+        response = post_json(logged_in_client, "hide_company", {"company": "К" * 256})
+        assert response.status_code == 400
+
+
+@pytest.mark.django_db(transaction=True)
+class TestAsgiViews:
+    """Класс описывает тестовые случаи для асинхронных представлений
+    в режиме ASGI."""
+
+    def test_views_are_async_safe(self, fix_user: User) -> None:
+        """Тест проверяет поиск и изменение списков через обработчик ASGI
+        без разрешения синхронных запросов в асинхронном коде."""
+        assert "DJANGO_ALLOW_ASYNC_UNSAFE" not in os.environ
+        vacancy = Vacancies.objects.create(
+            job_board="HeadHunter",
+            url="https://hh.ru/vacancy/1",
+            title="Python разработчик",
+            company="Тестовая компания",
+            published_at=timezone.make_aware(datetime.datetime(2023, 5, 1)),
+            description="<p>Django</p>",
+        )
+        client = AsyncClient()
+        client.force_login(fix_user)
+
+        response = asyncio.run(
+            client.post(
+                reverse("favourite"),
+                data=json.dumps({"pk": vacancy.pk}),
+                content_type="application/json",
+            )
+        )
+        assert response.status_code == 200
+        response = asyncio.run(
+            client.post(
+                reverse("hide_company"),
+                data=json.dumps({"company": "Другая компания"}),
+                content_type="application/json",
+            )
+        )
+        assert response.status_code == 200
+
+        response = asyncio.run(
+            client.get(
+                reverse("vacancies"),
+                {"title": "Python", "date_from": "2023-04-01", "date_to": "2023-06-01"},
+            )
+        )
+        assert response.status_code == 200
+        assert response.context["total_vacancies"] == 1
+        assert vacancy in response.context["favourite"]
+        assert UserVacancies.objects.filter(
+            user=fix_user, hidden_company="Другая компания"
+        ).exists()
+
+    def test_anonymous_user_is_redirected(self) -> None:
+        """Тест проверяет перенаправление анонимного пользователя на вход."""
+        response = asyncio.run(
+            AsyncClient().post(
+                reverse("favourite"),
+                data=json.dumps({"pk": 1}),
+                content_type="application/json",
+            )
+        )
+        assert response.status_code == 302
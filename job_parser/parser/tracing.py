@@ -0,0 +1,289 @@
+import contextlib
+import cProfile
+import datetime
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from django.conf import settings
+from job_parser.metrics import registry
+from logger import logger, setup_logging
+
+# Логирование
+setup_logging()
+
+# Виды профилировщика для `INGEST_PROFILE`.
+PROFILERS = ("sample", "cprofile")
+
+# Текущий интервал трассировки. Контекст копируется в задачи asyncio
+# и в `sync_to_async`, поэтому вложенные интервалы попадают к родителю.
+current_span: ContextVar["Span | None"] = ContextVar("current_span", default=None)
+
+
+@dataclass
+class Span:
+    """
+    Интервал трассировки.
+
+    Attributes:
+        name (str): Название этапа.
+        start (float): Время начала по `time.perf_counter`.
+        duration (float): Длительность в секундах.
+        children (list[Span]): Вложенные интервалы.
+    """
+
+    name: str
+    start: float = field(default_factory=time.perf_counter)
+    duration: float = 0.0
+    children: list["Span"] = field(default_factory=list)
+
+
+def summarize(spans: list[Span]) -> dict[str, Any]:
+    """
+    Объединяет одноименные интервалы одного уровня.
+
+    Загрузка вакансий состоит из сотен однотипных запросов, поэтому
+    вместо каждого интервала выводится количество, суммарная
+    и максимальная длительность. Интервалы, выполнявшиеся параллельно,
+    могут в сумме превышать длительность родителя.
+
+    Args:
+        spans (list[Span]): Одноименные интервалы.
+
+    Returns:
+        dict[str, Any]: Сводка интервалов с вложенными сводками.
+    """
+    groups: dict[str, list[Span]] = {}
+    for span in spans:
+        for child in span.children:
+            groups.setdefault(child.name, []).append(child)
+    durations = [span.duration for span in spans]
+    return {
+        "name": spans[0].name,
+        "count": len(spans),
+        "total": round(sum(durations), 6),
+        "max": round(max(durations), 6),
+        "children": [summarize(group) for group in groups.values()],
+    }
+
+
+@contextlib.contextmanager
+def span(name: str) -> Iterator[Span | None]:
+    """
+    Регистрирует вложенный интервал трассировки.
+
+    Вне запуска `trace` ничего не делает.
+
+    Args:
+        name (str): Название этапа.
+
+    Yields:
+        Span | None: Интервал или None, если трассировка не запущена.
+    """
+    parent = current_span.get()
+    if parent is None:
+        yield None
+        return
+    child = Span(name)
+    parent.children.append(child)
+    token = current_span.set(child)
+    try:
+        yield child
+    finally:
+        child.duration = time.perf_counter() - child.start
+        current_span.reset(token)
+
+
+@contextlib.contextmanager
+def stage(source: str, name: str) -> Iterator[None]:
+    """
+    Регистрирует этап загрузки в трассировке и в метриках сайта.
+
+    Args:
+        source (str): Название сайта поиска работы.
+        name (str): Название этапа.
+    """
+    with span(name), registry.timer(
+        "ingest_stage_duration_seconds", source=source, stage=name
+    ):
+        yield
+
+
+class SamplingProfiler:
+    """
+    Выборочный профилировщик потока.
+
+    Отдельный поток с интервалом `interval` снимает стек профилируемого
+    потока через `sys._current_frames` и считает одинаковые стеки.
+    Результат сохраняется в свернутом формате (`folded`), который
+    принимают flamegraph.pl, speedscope и inferno.
+
+    Профилируется только поток, запустивший профилировщик, то есть цикл
+    событий: запросы к базе данных в потоках `sync_to_async` видны как
+    ожидание в цикле событий.
+
+    Attributes:
+        interval (float): Интервал между выборками в секундах.
+        stacks (Counter[str]): Количество выборок по стекам.
+    """
+
+    def __init__(self, interval: float = 0.005) -> None:
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._target = 0
+
+    @staticmethod
+    def frame_name(frame: Any) -> str:
+        code = frame.f_code
+        return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+    def sample(self) -> None:
+        frame = sys._current_frames().get(self._target)
+        names: list[str] = []
+        while frame is not None:
+            names.append(self.frame_name(frame))
+            frame = frame.f_back
+        if names:
+            self.stacks[";".join(reversed(names))] += 1
+
+    def run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def start(self) -> None:
+        self._target = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def save(self, path: Path) -> None:
+        with open(path, "w", encoding="utf-8") as file:
+            for stack, count in self.stacks.most_common():
+                file.write(f"{stack} {count}\n")
+
+
+class Profiler:
+    """
+    Профилировщик запуска загрузки.
+
+    Attributes:
+        kind (str): "sample" - выборочный профилировщик со свернутыми стеками
+        для flamegraph, "cprofile" - cProfile с файлом статистики `.prof`
+        (snakeviz, flameprof).
+        path (Path): Файл с результатом профилирования.
+    """
+
+    def __init__(self, kind: str, name: str, directory: Path | str) -> None:
+        if kind not in PROFILERS:
+            raise ValueError(f"Неизвестный профилировщик: {kind}")
+        self.kind = kind
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        timestamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+        suffix = "folded" if kind == "sample" else "prof"
+        self.path = directory / f"{name}-{timestamp}-{os.getpid()}.{suffix}"
+        self.profiler: SamplingProfiler | cProfile.Profile = (
+            SamplingProfiler() if kind == "sample" else cProfile.Profile()
+        )
+
+    def start(self) -> None:
+        if isinstance(self.profiler, SamplingProfiler):
+            self.profiler.start()
+        else:
+            self.profiler.enable()
+
+    def stop(self) -> Path:
+        if isinstance(self.profiler, SamplingProfiler):
+            self.profiler.stop()
+            self.profiler.save(self.path)
+        else:
+            self.profiler.disable()
+            self.profiler.dump_stats(self.path)
+        return self.path
+
+
+def write_trace(summary: dict[str, Any]) -> None:
+    path = settings.INGEST_TRACE_FILE
+    if not path:
+        return
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as file:
+        file.write(json.dumps(summary, ensure_ascii=False) + "\n")
+
+
+@contextlib.contextmanager
+def trace(name: str, profile: str | None = None) -> Iterator[Span]:
+    """
+    Трассирует запуск загрузки вакансий.
+
+    Внутри другого запуска работает как вложенный интервал.
+    По завершении сводка интервалов (см. `summarize`) дописывается строкой
+    JSON в `INGEST_TRACE_FILE` и выводится в журнал. Если задан профилировщик
+    (аргументом или настройкой `INGEST_PROFILE`), результат профилирования
+    сохраняется в `INGEST_PROFILE_DIR`.
+
+    Args:
+        name (str): Название запуска.
+        profile (str | None): Профилировщик: "sample" или "cprofile".
+
+    Yields:
+        Span: Корневой интервал.
+    """
+    if current_span.get() is not None:
+        with span(name) as nested:
+            assert nested is not None
+            yield nested
+        return
+    profile = profile if profile is not None else settings.INGEST_PROFILE
+    profiler = Profiler(profile, name, settings.INGEST_PROFILE_DIR) if profile else None
+    started_at = datetime.datetime.now(datetime.timezone.utc).isoformat()
+    root = Span(name)
+    token = current_span.set(root)
+    if profiler is not None:
+        profiler.start()
+    try:
+        yield root
+    finally:
+        root.duration = time.perf_counter() - root.start
+        current_span.reset(token)
+        summary = {"trace": name, "started_at": started_at, **summarize([root])}
+        if profiler is not None:
+            summary["profile"] = str(profiler.stop())
+        write_trace(summary)
+        logger.bind(trace=summary).debug(
+            f"Затрачено времени на {name}: {root.duration:.2f} с"
+        )
+
+
+def traced(name: str) -> Callable:
+    """
+    Декоратор асинхронной функции, трассирующий ее запуск (см. `trace`).
+
+    Args:
+        name (str): Название запуска.
+    """
+
+    def decorator(f: Callable) -> Callable:
+        @wraps(f)
+        async def wrapper(*args, **kwargs):
+            with trace(name):
+                return await f(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
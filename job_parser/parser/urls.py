@@ -1,5 +1,7 @@
 from django.urls import path
 
+from .views.autocomplete import AutocompleteView
+from .views.batch import BatchActionView
 from .views.blacklist import (
     AddToBlackListView,
     ClearBlackList,
@@ -16,6 +18,7 @@ from .views.hiddenCompanies import (
     HideCompanyView,
 )
 from .views.home import HomePageView
+from .views.metrics import MetricsView
 from .views.vacancies import VacancyListView
 
 urlpatterns = [
@@ -58,4 +61,7 @@ urlpatterns = [
         ClearHiddenCompaniesList.as_view(),
         name="clear_hidden_companies_list",
     ),
+    path("batch/", BatchActionView.as_view(), name="batch_action"),
+    path("autocomplete/", AutocompleteView.as_view(), name="autocomplete"),
+    path("metrics", MetricsView.as_view(), name="metrics"),
 ]
@@ -1,8 +1,6 @@
 import asyncio
 import datetime
 import json
-import time
-from functools import wraps
 
 from django.http import HttpRequest
 from logger import logger, setup_logging
@@ -257,15 +255,3 @@ class Utils:
         except json.JSONDecodeError as exc:
             logger.exception(exc)
         return data
-
-    @staticmethod
-    def timeit(f):
-        @wraps(f)
-        async def wrapper(*args, **kwargs):
-            start = time.time()
-            result = await f(*args, **kwargs)
-            finish = time.time()
-            logger.debug(f"Затрачено времени: {finish - start}")
-            return result
-
-        return wrapper
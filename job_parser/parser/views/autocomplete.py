@@ -0,0 +1,48 @@
+from parser.autocomplete import FIELDS, autocomplete_index
+
+from django.conf import settings
+from django.http import HttpRequest, JsonResponse
+from django.views import View
+from logger import setup_logging
+
+# Логирование
+setup_logging()
+
+
+class AutocompleteView(View):
+    """
+    Класс представления подсказок для полей формы поиска.
+
+    Принимает параметры `field` (title, city или company), `q` - введенный
+    текст и необязательный `limit`. Подсказки берутся из индекса в памяти
+    процесса (см. `parser.autocomplete`) без обращения к базе данных.
+    """
+
+    async def get(self, request: HttpRequest) -> JsonResponse:
+        """Метод обработки GET-запроса.
+
+        Args:
+            request (HttpRequest): Объект запроса.
+
+        Returns:
+            JsonResponse: JSON-ответ с подсказками и количеством вакансий.
+        """
+        field = request.GET.get("field")
+        if field not in FIELDS:
+            return JsonResponse({"Ошибка": "Неизвестное поле"}, status=400)
+        try:
+            limit = int(request.GET.get("limit", settings.AUTOCOMPLETE_LIMIT))
+        except ValueError:
+            return JsonResponse({"Ошибка": "Невалидный limit"}, status=400)
+        await autocomplete_index.aprepare()
+        suggestions = autocomplete_index.suggest(
+            field, request.GET.get("q", ""), max(limit, 1)
+        )
+        return JsonResponse(
+            {
+                "field": field,
+                "suggestions": [
+                    {"value": value, "count": count} for value, count in suggestions
+                ],
+            }
+        )
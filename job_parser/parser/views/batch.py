@@ -0,0 +1,63 @@
+from parser.mixins import BATCH_ACTIONS, AsyncLoginRequiredMixin, UserVacanciesMixin
+from parser.utils import Utils
+
+from django.db import DatabaseError
+from django.http import HttpRequest, JsonResponse
+from django.views import View
+from logger import logger, setup_logging
+
+# Логирование
+setup_logging()
+
+# Максимальное количество элементов в одном пакетном запросе.
+BATCH_MAX_ITEMS = 5000
+
+
+class BatchActionView(AsyncLoginRequiredMixin, UserVacanciesMixin, View):
+    """
+    Класс представления для пакетного изменения списков пользователя.
+
+    Принимает JSON вида `{"favourite": [...], "blacklist": [...], "hide": [...]}`
+    с идентификаторами вакансий и названиями компаний и применяет все действия
+    в одной транзакции.
+
+    Этот класс наследуется от AsyncLoginRequiredMixin, UserVacanciesMixin и View.
+    Требует аутентификации пользователя перед использованием.
+    """
+
+    async def post(self, request: HttpRequest) -> JsonResponse:
+        """Метод обработки POST-запроса на пакетное изменение списков.
+
+        Args:
+            request (HttpRequest): Объект запроса.
+
+        Returns:
+            JsonResponse: JSON-ответ со статусом каждого элемента.
+        """
+        data = Utils.get_data(request)
+        if not isinstance(data, dict) or not any(
+            isinstance(data.get(action), list) for action in BATCH_ACTIONS
+        ):
+            return JsonResponse({"Ошибка": "Невалидный JSON"}, status=400)
+        operations = {
+            action: data[action]
+            for action in BATCH_ACTIONS
+            if isinstance(data.get(action), list)
+        }
+        if sum(len(items) for items in operations.values()) > BATCH_MAX_ITEMS:
+            return JsonResponse(
+                {"Ошибка": f"Превышено количество элементов: {BATCH_MAX_ITEMS}"},
+                status=400,
+            )
+
+        try:
+            statuses = await self.apply_batch(request, operations)
+        except DatabaseError as exc:
+            logger.exception(exc)
+            return JsonResponse({"Ошибка": "Произошла ошибка базы данных"}, status=500)
+
+        logger.info(
+            f"Пакетное изменение списков выполнено: "
+            f"{ {action: len(items) for action, items in statuses.items()} }"
+        )
+        return JsonResponse({"status": "Пакетное изменение выполнено", **statuses})
@@ -1,21 +1,20 @@
-from django.db import DatabaseError
+from django.db import DatabaseError, IntegrityError
 from django.http import HttpRequest, JsonResponse
 from django.views import View
 from logger import logger, setup_logging
 
-from parser.mixins import AsyncLoginRequiredMixin
-from parser.models import UserVacancies, Vacancies
+from parser.mixins import AsyncLoginRequiredMixin, UserVacanciesMixin
 from parser.utils import Utils
 
 # Логирование
 setup_logging()
 
 
-class AddToBlackListView(AsyncLoginRequiredMixin, View):
+class AddToBlackListView(AsyncLoginRequiredMixin, UserVacanciesMixin, View):
     """
     Класс представления для добавления вакансии в черный список.
 
-    Этот класс наследуется от AsyncLoginRequiredMixin и View.
+    Этот класс наследуется от AsyncLoginRequiredMixin, UserVacanciesMixin и View.
     Требует аутентификации пользователя перед использованием.
     """
 
@@ -33,41 +32,40 @@ class AddToBlackListView(AsyncLoginRequiredMixin, View):
         pk = data.get("pk", None)
         if not pk:
             return JsonResponse({"Ошибка": "Невалидный JSON"}, status=400)
-        await self.add_to_blacklist(request, pk)
+        try:
+            await self.add_to_blacklist(request, pk)
+        except ValueError:
+            return JsonResponse({"Ошибка": "Невалидный JSON"}, status=400)
+        except IntegrityError:
+            return JsonResponse({"Ошибка": f"Вакансия {pk} не найдена"}, status=404)
+        except DatabaseError as exc:
+            logger.exception(exc)
+            return JsonResponse({"Ошибка": "Произошла ошибка базы данных"}, status=500)
         return JsonResponse({"status": f"Вакансия {pk} добавлена в черный список"})
 
     async def add_to_blacklist(self, request: HttpRequest, pk: str) -> None:
         """Асинхронный метод добавления вакансии в черный список.
 
+        Вакансия добавляется одним запросом, при этом она удаляется из избранного.
+
         Args:
             request (HttpRequest): Объект запроса.
-            url (str): URL вакансии.
-            title (str): Название вакансии.
+            pk (str): Идентификатор вакансии.
 
         Returns:
             None
         """
-        try:
-            vacancy = await Vacancies.objects.aget(pk=pk)
-            user_vacancy, created = await UserVacancies.objects.aget_or_create(
-                user=request.user, vacancy=vacancy
-            )
-            user_vacancy.is_blacklist = True
-            user_vacancy.save()
-
-            user_vacancy.is_favourite = False
-            user_vacancy.save()
-
-            logger.info(f"Вакансия {pk} добавлена в черный список")
-        except Exception as exc:
-            logger.exception(exc)
+        await self.upsert_user_vacancy(
+            request, pk, is_blacklist=True, is_favourite=False
+        )
+        logger.info(f"Вакансия {pk} добавлена в черный список")
 
 
-class DeleteFromBlacklistView(AsyncLoginRequiredMixin, View):
+class DeleteFromBlacklistView(AsyncLoginRequiredMixin, UserVacanciesMixin, View):
     """
     Класс представления для удаления вакансии из черного списка.
 
-    Этот класс наследуется от AsyncLoginRequiredMixin и View.
+    Этот класс наследуется от AsyncLoginRequiredMixin, UserVacanciesMixin и View.
     Требует аутентификации пользователя перед использованием.
     """
 
@@ -85,7 +83,13 @@ class DeleteFromBlacklistView(AsyncLoginRequiredMixin, View):
         pk = data.get("pk", None)
         if not pk:
             return JsonResponse({"Ошибка": "Невалидный JSON"}, status=400)
-        await self.delete_from_blacklist(request, pk)
+        try:
+            await self.delete_from_blacklist(request, pk)
+        except ValueError:
+            return JsonResponse({"Ошибка": "Невалидный JSON"}, status=400)
+        except DatabaseError as exc:
+            logger.exception(exc)
+            return JsonResponse({"Ошибка": "Произошла ошибка базы данных"}, status=500)
         return JsonResponse({"status": f"Вакансия {pk} удалена из черного списка"})
 
     async def delete_from_blacklist(self, request: HttpRequest, pk: str) -> None:
@@ -93,39 +97,20 @@ class DeleteFromBlacklistView(AsyncLoginRequiredMixin, View):
 
         Args:
             request (HttpRequest): Объект запроса.
-            url (str): URL вакансии.
+            pk (str): Идентификатор вакансии.
 
         Returns:
             None
         """
-        try:
-            vacancy = await Vacancies.objects.aget(pk=pk)
-            user_vacancy = await UserVacancies.objects.filter(
-                user=request.user, vacancy=vacancy
-            ).afirst()
-            if not user_vacancy:
-                pass
-            elif (
-                user_vacancy.is_blacklist
-                and not user_vacancy.is_favourite
-                and not user_vacancy.hidden_company
-            ):
-                user_vacancy.delete()
-            else:
-                user_vacancy.is_blacklist = True
-                user_vacancy.save()
-
-            logger.info(f"Вакансия {pk} удалена из черного списка")
-
-        except Exception as exc:
-            logger.exception(exc)
+        await self.delete_user_vacancy(request, pk, is_blacklist=True)
+        logger.info(f"Вакансия {pk} удалена из черного списка")
 
 
-class ClearBlackList(AsyncLoginRequiredMixin, View):
+class ClearBlackList(AsyncLoginRequiredMixin, UserVacanciesMixin, View):
     """
     Класс представления для очистки черного списка вакансий.
 
-    Этот класс наследуется от AsyncLoginRequiredMixin и View.
+    Этот класс наследуется от AsyncLoginRequiredMixin, UserVacanciesMixin и View.
     Требует аутентификации пользователя перед использованием.
     """
 
@@ -140,20 +125,12 @@ class ClearBlackList(AsyncLoginRequiredMixin, View):
             успешной очистке черного списка.
         """
         try:
-            vacancies = UserVacancies.objects.filter(user=request.user)
-            for vacancy in vacancies:
-                if (
-                    vacancy.is_blacklist
-                    and not vacancy.is_favourite
-                    and not vacancy.hidden_company
-                ):
-                    vacancy.delete()
-                else:
-                    vacancy.is_blacklist = True
-                    vacancy.save()
-            logger.info("Черный список вакансий успешно очищен")
+            counts = await self.clear_user_list(request, "is_blacklist")
+            logger.info(f"Черный список вакансий успешно очищен: {counts}")
         except DatabaseError as exc:
             logger.exception(exc)
             return JsonResponse({"Ошибка": "Произошла ошибка базы данных"}, status=500)
 
-        return JsonResponse({"status": "Черный список вакансий успешно очищен"})
+        return JsonResponse(
+            {"status": "Черный список вакансий успешно очищен", **counts}
+        )
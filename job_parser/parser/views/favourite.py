@@ -1,8 +1,7 @@
-from parser.mixins import AsyncLoginRequiredMixin
-from parser.models import UserVacancies, Vacancies
+from parser.mixins import AsyncLoginRequiredMixin, UserVacanciesMixin
 from parser.utils import Utils
 
-from django.db import DatabaseError
+from django.db import DatabaseError, IntegrityError
 from django.http import HttpRequest, JsonResponse
 from django.views import View
 from logger import logger, setup_logging
@@ -11,11 +10,11 @@ from logger import logger, setup_logging
 setup_logging()
 
 
-class AddToFavouritesView(AsyncLoginRequiredMixin, View):
+class AddToFavouritesView(AsyncLoginRequiredMixin, UserVacanciesMixin, View):
     """
     Класс представления для добавления вакансии в избранное.
 
-    Этот класс наследуется от AsyncLoginRequiredMixin и View.
+    Этот класс наследуется от AsyncLoginRequiredMixin, UserVacanciesMixin и View.
     Требует аутентификации пользователя перед использованием.
     """
 
@@ -33,40 +32,40 @@ class AddToFavouritesView(AsyncLoginRequiredMixin, View):
         pk = data.get("pk", None)
         if not pk:
             return JsonResponse({"Ошибка": "Невалидный JSON"}, status=400)
-
-        await self.add_to_favourite(request, pk)
+        try:
+            await self.add_to_favourite(request, pk)
+        except ValueError:
+            return JsonResponse({"Ошибка": "Невалидный JSON"}, status=400)
+        except IntegrityError:
+            return JsonResponse({"Ошибка": f"Вакансия {pk} не найдена"}, status=404)
+        except DatabaseError as exc:
+            logger.exception(exc)
+            return JsonResponse({"Ошибка": "Произошла ошибка базы данных"}, status=500)
         return JsonResponse({"status": f"Вакансия {pk} добавлена в избранное"})
 
     async def add_to_favourite(self, request: HttpRequest, pk: str) -> None:
-        """Асинхронный метод добавления вакансии в базу данных.
+        """Асинхронный метод добавления вакансии в избранное.
+
+        Вакансия добавляется одним запросом, при этом она удаляется из черного
+        списка.
 
         Args:
             request (HttpRequest): Объект запроса.
-            url (str): URL вакансии.
-            title (str): Название вакансии.
+            pk (str): Идентификатор вакансии.
 
         Returns: None
         """
-        try:
-            vacancy = await Vacancies.objects.aget(pk=pk)
-            user_vacancy, created = await UserVacancies.objects.aget_or_create(
-                user=request.user, vacancy=vacancy
-            )
-            if not user_vacancy.is_blacklist or not user_vacancy.hidden_company:
-                user_vacancy.is_favourite = True
-                user_vacancy.save()
+        await self.upsert_user_vacancy(
+            request, pk, is_favourite=True, is_blacklist=False
+        )
+        logger.info(f"Вакансия {pk} добавлена в избранное")
 
-            logger.info(f"Вакансия {pk} добавлена в избранное")
-
-        except Exception as exc:
-            logger.exception(exc)
 
-
-class DeleteFromFavouritesView(AsyncLoginRequiredMixin, View):
+class DeleteFromFavouritesView(AsyncLoginRequiredMixin, UserVacanciesMixin, View):
     """
     Класс представления для удаления вакансии из списка избранных.
 
-    Этот класс наследуется от AsyncLoginRequiredMixin и View.
+    Этот класс наследуется от AsyncLoginRequiredMixin, UserVacanciesMixin и View.
     Требует аутентификации пользователя перед использованием.
     """
 
@@ -84,40 +83,33 @@ class DeleteFromFavouritesView(AsyncLoginRequiredMixin, View):
         pk = data.get("pk", None)
         if not pk:
             return JsonResponse({"Ошибка": "Невалидный JSON"}, status=400)
-
-        await self.delete_from_favourite(request, pk)
+        try:
+            await self.delete_from_favourite(request, pk)
+        except ValueError:
+            return JsonResponse({"Ошибка": "Невалидный JSON"}, status=400)
+        except DatabaseError as exc:
+            logger.exception(exc)
+            return JsonResponse({"Ошибка": "Произошла ошибка базы данных"}, status=500)
         return JsonResponse({"status": f"Вакансия {pk} удалена из избранного"})
 
     async def delete_from_favourite(self, request: HttpRequest, pk: str) -> None:
-        """Асинхронный метод удаления вакансии из базы данных.
+        """Асинхронный метод удаления вакансии из избранного.
 
         Args:
             request (HttpRequest): Объект запроса.
-            url (str): URL вакансии.
+            pk (str): Идентификатор вакансии.
 
         Returns: None
         """
-        try:
-            vacancy = await Vacancies.objects.aget(pk=pk)
-            user_vacancy = await UserVacancies.objects.filter(
-                user=request.user, vacancy=vacancy
-            ).afirst()
-            if not user_vacancy:
-                pass
-            elif user_vacancy.is_blacklist or user_vacancy.hidden_company:
-                user_vacancy.is_favourite = False
-            else:
-                user_vacancy.delete()
-                logger.info(f"Вакансия {pk} удалена из избранного")
-        except Exception as exc:
-            logger.exception(exc)
+        await self.delete_user_vacancy(request, pk, is_favourite=True)
+        logger.info(f"Вакансия {pk} удалена из избранного")
 
 
-class ClearFavouriteList(AsyncLoginRequiredMixin, View):
+class ClearFavouriteList(AsyncLoginRequiredMixin, UserVacanciesMixin, View):
     """
     Класс представления для очистки списка избранных вакансий.
 
-    Этот класс наследуется от AsyncLoginRequiredMixin и View.
+    Этот класс наследуется от AsyncLoginRequiredMixin, UserVacanciesMixin и View.
     Требует аутентификации пользователя перед использованием.
     """
 
@@ -132,16 +124,12 @@ class ClearFavouriteList(AsyncLoginRequiredMixin, View):
             успешной очистке списка избранного.
         """
         try:
-            vacancies = UserVacancies.objects.filter(user=request.user)
-            for vacancy in vacancies:
-                if vacancy.is_blacklist or vacancy.hidden_company:
-                    vacancy.is_favourite = False
-                    vacancy.save()
-                else:
-                    vacancy.delete()
-            logger.info("Список избранных вакансий успешно очищен")
+            counts = await self.clear_user_list(request, "is_favourite")
+            logger.info(f"Список избранных вакансий успешно очищен: {counts}")
         except DatabaseError as exc:
             logger.exception(exc)
             return JsonResponse({"Ошибка": "Произошла ошибка базы данных"}, status=500)
 
-        return JsonResponse({"status": "Список избранных вакансий успешно очищен"})
+        return JsonResponse(
+            {"status": "Список избранных вакансий успешно очищен", **counts}
+        )
@@ -1,10 +1,12 @@
+from asgiref.sync import sync_to_async
 from django.db import DatabaseError
 from django.http import HttpRequest, JsonResponse
 from django.views import View
 from logger import logger, setup_logging
 
-from parser.mixins import AsyncLoginRequiredMixin
+from parser.mixins import AsyncLoginRequiredMixin, UserVacanciesMixin
 from parser.models import UserVacancies
+from parser.preferences import preference_cache
 from parser.utils import Utils
 
 # Логирование
@@ -13,11 +15,11 @@ setup_logging()
 utils = Utils()
 
 
-class HideCompanyView(AsyncLoginRequiredMixin, View):
+class HideCompanyView(AsyncLoginRequiredMixin, UserVacanciesMixin, View):
     """
     Класс представления для сокрытия вакансий выбранных компаний.
 
-    Этот класс наследуется от AsyncLoginRequiredMixin и View.
+    Этот класс наследуется от AsyncLoginRequiredMixin, UserVacanciesMixin и View.
     Требует аутентификации пользователя перед использованием.
     """
 
@@ -35,20 +37,33 @@ class HideCompanyView(AsyncLoginRequiredMixin, View):
         company = data.get("company", None)
         if not company:
             return JsonResponse({"Ошибка": "Невалидный JSON"}, status=400)
-        await self.hide_company(request, company)
+        try:
+            hidden = await self.hide_company(request, company)
+        except DatabaseError as exc:
+            logger.exception(exc)
+            return JsonResponse({"Ошибка": "Произошла ошибка базы данных"}, status=500)
+        if not hidden:
+            return JsonResponse({"Ошибка": "Невалидное название компании"}, status=400)
         return JsonResponse({"status": f"Компания {company} скрыта"})
 
-    async def hide_company(self, request: HttpRequest, company: str) -> None:
-        try:
-            vacancy, created = await UserVacancies.objects.aget_or_create(
-                user=request.user, hidden_company=company
-            )
-            vacancy.is_favourite = False
-            vacancy.is_blacklist = False
-            vacancy.save()
+    async def hide_company(self, request: HttpRequest, company: str) -> bool:
+        """
+        Скрывает компанию одним запросом вставки с пропуском существующей
+        строки по паре пользователь - компания (см. `apply_batch`).
+
+        Args:
+            request (HttpRequest): Объект запроса.
+            company (str): Название компании.
+
+        Returns:
+            bool: Скрыта ли компания: название должно быть непустым
+            и не длиннее 255 символов.
+        """
+        statuses = await self.apply_batch(request, {"hide": [company]})
+        hidden = statuses["hide"].get(company) == "ok"
+        if hidden:
             logger.info(f"Компания {company} скрыта")
-        except Exception as exc:
-            logger.exception(exc)
+        return hidden
 
 
 class DeleteFromHiddenCompaniesView(AsyncLoginRequiredMixin, View):
@@ -85,20 +100,21 @@ class DeleteFromHiddenCompaniesView(AsyncLoginRequiredMixin, View):
             if not vacancy:
                 pass
             elif not vacancy.is_blacklist and not vacancy.is_favourite:
-                vacancy.delete()
+                await sync_to_async(vacancy.delete)()
             else:
                 vacancy.hidden_company = None
-                vacancy.save()
+                await sync_to_async(vacancy.save)()
+            await preference_cache.ainvalidate(request.user.pk)
             logger.info(f"Компания {company} удалена из списка скрытых")
         except Exception as exc:
             logger.exception(exc)
 
 
-class ClearHiddenCompaniesList(AsyncLoginRequiredMixin, View):
+class ClearHiddenCompaniesList(AsyncLoginRequiredMixin, UserVacanciesMixin, View):
     """
     Класс представления для очистки списка скрытых компаний.
 
-    Этот класс наследуется от AsyncLoginRequiredMixin и View.
+    Этот класс наследуется от AsyncLoginRequiredMixin, UserVacanciesMixin и View.
     Требует аутентификации пользователя перед использованием.
     """
 
@@ -113,17 +129,12 @@ class ClearHiddenCompaniesList(AsyncLoginRequiredMixin, View):
             успешной очистке списка скрытых компаний.
         """
         try:
-            vacancies = UserVacancies.objects.filter(user=request.user)
-            for vacancy in vacancies:
-                if not vacancy.is_blacklist and not vacancy.is_favourite:
-                    vacancy.delete()
-                else:
-                    vacancy.hidden_company = None
-                    vacancy.save()
-
-            logger.info("Список скрытых компаний успешно очищен")
+            counts = await self.clear_user_list(request, "hidden_company")
+            logger.info(f"Список скрытых компаний успешно очищен: {counts}")
         except DatabaseError as exc:
             logger.exception(exc)
             return JsonResponse({"Ошибка": "Произошла ошибка базы данных"}, status=500)
 
-        return JsonResponse({"status": "Список скрытых компаний успешно очищен"})
+        return JsonResponse(
+            {"status": "Список скрытых компаний успешно очищен", **counts}
+        )
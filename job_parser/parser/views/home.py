@@ -1,4 +1,6 @@
+from parser.facets import FORM_FACETS, facet_index
 from parser.forms import SearchingForm
+from parser.mixins import FormDataParser
 
 from django.http import HttpRequest, HttpResponse, HttpResponseRedirect
 from django.views.generic.edit import FormView
@@ -41,6 +43,27 @@ class HomePageView(FormView):
         context = self.get_context_data()
         return self.render_to_response(context)
 
+    def get_form(self, form_class=None) -> SearchingForm:
+        """Метод получения формы.
+
+        К подписям флажков формы добавляется количество вакансий по значениям
+        из индекса фасетов (см. `parser.facets`) для поиска с параметрами
+        по умолчанию.
+
+        Args:
+            form_class (type, optional): Класс формы.
+
+        Returns:
+            SearchingForm: Форма поиска.
+        """
+        form = super().get_form(form_class)
+        facet_index.prepare()
+        params = FormDataParser().get_request_params({})
+        counts = facet_index.counts(params, FORM_FACETS)
+        if counts:
+            form.set_facet_counts(counts)
+        return form
+
     def form_valid(self, form) -> HttpResponseRedirect:
         """Метод обработки валидной формы.
 
@@ -0,0 +1,65 @@
+import hmac
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+from django.views import View
+from huey.contrib.djhuey import HUEY
+from job_parser.metrics import registry, render
+from logger import logger, setup_logging
+
+# Логирование
+setup_logging()
+
+# Тип содержимого текстового формата Prometheus.
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricsView(View):
+    """
+    Класс представления метрик в формате Prometheus.
+
+    Возвращает суммарные метрики всех процессов (см. `job_parser.metrics`)
+    и текущую длину очереди задач huey. Если задан `METRICS_TOKEN`,
+    требует заголовок `Authorization: Bearer <токен>`.
+    """
+
+    def authorized(self, request: HttpRequest) -> bool:
+        if not settings.METRICS_TOKEN:
+            return True
+        expected = f"Bearer {settings.METRICS_TOKEN}"
+        return hmac.compare_digest(request.headers.get("Authorization", ""), expected)
+
+    def get_gauges(self) -> dict[tuple[str, tuple], float]:
+        """
+        Возвращает длину очереди задач huey.
+
+        Returns:
+            dict[tuple[str, tuple], float]: Мгновенные значения метрик.
+        """
+        gauges: dict[tuple[str, tuple], float] = {}
+        try:
+            gauges[("huey_queue_depth", (("queue", "pending"),))] = HUEY.pending_count()
+            gauges[
+                ("huey_queue_depth", (("queue", "scheduled"),))
+            ] = HUEY.scheduled_count()
+        except Exception as exc:
+            logger.exception(exc)
+        return gauges
+
+    def collect(self) -> str:
+        return render(registry.collect(), self.get_gauges())
+
+    async def get(self, request: HttpRequest) -> HttpResponse:
+        """Метод обработки GET-запроса.
+
+        Args:
+            request (HttpRequest): Объект запроса.
+
+        Returns:
+            HttpResponse: Метрики в текстовом формате Prometheus.
+        """
+        if not self.authorized(request):
+            return HttpResponse(status=401)
+        content = await sync_to_async(self.collect)()
+        return HttpResponse(content, content_type=CONTENT_TYPE)
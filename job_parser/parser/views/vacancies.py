@@ -1,12 +1,14 @@
 from typing import Any
 
+from asgiref.sync import sync_to_async
 from django.db.models import QuerySet
 from django.http import HttpRequest
 from django.views.generic import ListView
 from logger import setup_logging
 
+from parser.facets import FORM_FACETS, facet_index
 from parser.forms import SearchingForm
-from parser.mixins import VacanciesMixin
+from parser.mixins import VacanciesMixin, aget_user
 from parser.models import Vacancies
 
 # Логирование
@@ -22,12 +24,18 @@ class VacancyListView(ListView, VacanciesMixin):
         """
         Метод обработки GET-запросов.
 
+        Фильтры поиска собираются в асинхронном коде, а запросы к базе данных
+        (списки пользователя, количество вакансий и страница) выполняются
+        в отдельном потоке, поэтому представление работает в цикле событий
+        ASGI-сервера.
+
         Args:
             request (HttpRequest): Запрос.
 
         Returns:
             Any: Шаблон с контекстом.
         """
+        await aget_user(request)
         self.object_list = await self.get_queryset()
         context = await self.get_context_data()
         return self.render_to_response(context)
@@ -42,9 +50,9 @@ class VacancyListView(ListView, VacanciesMixin):
         form = SearchingForm(self.request.GET)
         vacancies = await self.get_vacancies(form)
         if self.request.user.is_authenticated:
-            self.filtered_list, self.favourite = self.check_vacancies(
-                vacancies, self.request
-            )
+            self.filtered_list, self.favourite = await sync_to_async(
+                self.check_vacancies
+            )(vacancies, self.request)
             vacancies = self.filtered_list
         return vacancies
 
@@ -58,9 +66,42 @@ class VacancyListView(ListView, VacanciesMixin):
         Returns:
             dict: Словарь с контекстом шаблона.
         """
-        context = super().get_context_data(**kwargs)
-        context["form"] = SearchingForm(self.request.GET)
-        context["total_vacancies"] = context["paginator"].count
+        context = await sync_to_async(self.get_page_context)(**kwargs)
+        context["form"] = await self.get_form()
         if self.request.user.is_authenticated:
             context["favourite"] = self.favourite
         return context
+
+    async def get_form(self) -> SearchingForm:
+        """
+        Метод для получения формы поиска с количеством вакансий у флажков.
+
+        Количество вакансий по значениям фасетов берется из индекса в памяти
+        процесса (см. `parser.facets`) с учетом отмеченных флажков и периода
+        поиска.
+
+        Returns:
+            SearchingForm: Форма поиска.
+        """
+        form = SearchingForm(self.request.GET)
+        await facet_index.aprepare()
+        params = self.parser.get_request_params(self.parser.get_form_data(form))
+        counts = facet_index.counts(params, FORM_FACETS)
+        if counts:
+            form.set_facet_counts(counts)
+        return form
+
+    def get_page_context(self, **kwargs) -> dict:
+        """
+        Метод для получения контекста страницы: разбиение вакансий на страницы
+        и их количество.
+
+        Args:
+            **kwargs: Произвольное количество именованных аргументов.
+
+        Returns:
+            dict: Словарь с контекстом страницы.
+        """
+        context = super().get_context_data(**kwargs)
+        context["total_vacancies"] = context["paginator"].count
+        return context
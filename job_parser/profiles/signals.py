@@ -1,7 +1,13 @@
+from functools import partial
+
 from allauth.account.signals import user_signed_up
 from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
 from django.dispatch import receiver
 from logger import logger, setup_logging
+from parser.percolator import percolator
+from parser.tasks import rematch_subscription
 
 from .models import Profile
 
@@ -14,10 +20,10 @@ def create_profile(sender: User, **kwargs) -> Profile:
     """
     Функция-обработчик сигнала `user_signed_up`.
 
-    Эта функция вызывается после регистрации пользователя и используется для создания 
+    Эта функция вызывается после регистрации пользователя и используется для создания
     профиля пользователя.
     Она принимает отправителя сигнала `sender` и дополнительные аргументы `kwargs`.
-    Внутри функции извлекается пользователь из аргументов и пытается создать профиль 
+    Внутри функции извлекается пользователь из аргументов и пытается создать профиль
     пользователя с помощью метода `get_or_create` модели `Profile`.
     Если профиль был успешно создан, в лог записывается информация об этом.
     В случае возникновения исключения оно записывается в лог.
@@ -37,3 +43,75 @@ def create_profile(sender: User, **kwargs) -> Profile:
     except Exception as exc:
         logger.exception(exc)
     return profile
+
+
+def subscription(profile: Profile) -> tuple:
+    """Возвращает предпочтения рассылки профиля: профессию, город и подписку."""
+    return (profile.job, profile.city, profile.subscribe)
+
+
+# Поля профиля с предпочтениями рассылки.
+SUBSCRIPTION_FIELDS = {"job", "city", "subscribe"}
+
+
+@receiver(post_init, sender=Profile)
+def remember_subscription(sender: Profile, instance: Profile, **kwargs) -> None:
+    """
+    Функция-обработчик сигнала `post_init` профиля.
+
+    Запоминает предпочтения рассылки загруженного профиля, чтобы после
+    сохранения определить, изменились ли они. Если профиль загружен
+    без этих полей, предпочтения не запоминаются, а совпадения
+    сопоставляются заново при сохранении.
+
+    Args:
+        sender (Profile): Отправитель сигнала.
+        instance (Profile): Профиль.
+        kwargs (dict): Дополнительные аргументы.
+    """
+    if instance.get_deferred_fields() & SUBSCRIPTION_FIELDS:
+        instance._subscription = None
+    else:
+        instance._subscription = subscription(instance)
+
+
+@receiver(post_save, sender=Profile)
+def update_subscriptions(
+    sender: Profile, instance: Profile, created: bool, **kwargs
+) -> None:
+    """
+    Функция-обработчик сигнала `post_save` профиля.
+
+    Увеличивает версию подписок, чтобы индекс подписок был перестроен
+    при следующей записи вакансий. Если профиль создан или его предпочтения
+    рассылки изменились, после фиксации транзакции в очередь ставится задача
+    `rematch_subscription`, которая сопоставляет совпадения профиля заново
+    с сегодняшними вакансиями (см. `Percolator.rematch`).
+
+    Args:
+        sender (Profile): Отправитель сигнала.
+        instance (Profile): Профиль.
+        created (bool): Создан ли профиль.
+        kwargs (dict): Дополнительные аргументы.
+    """
+    percolator.invalidate()
+    current = subscription(instance)
+    if created or instance._subscription != current:
+        transaction.on_commit(partial(rematch_subscription, instance.pk))
+        instance._subscription = current
+
+
+@receiver(post_delete, sender=Profile)
+def invalidate_subscriptions(sender: Profile, **kwargs) -> None:
+    """
+    Функция-обработчик сигнала `post_delete` профиля.
+
+    Увеличивает версию подписок, чтобы индекс подписок был перестроен
+    при следующей записи вакансий. Совпадения профиля удаляются вместе
+    с ним.
+
+    Args:
+        sender (Profile): Отправитель сигнала.
+        kwargs (dict): Дополнительные аргументы.
+    """
+    percolator.invalidate()
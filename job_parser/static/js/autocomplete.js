@@ -0,0 +1,42 @@
+// Задержка в миллисекундах между вводом и запросом подсказок
+const AUTOCOMPLETE_DELAY = 150;
+
+/**
+ * Подключает подсказки к полю формы поиска.
+ * Подсказки запрашиваются у /autocomplete/ и выводятся списком datalist.
+ * @param {HTMLInputElement} input - Поле с атрибутом data-autocomplete.
+ */
+function attachAutocomplete(input) {
+    let field = input.dataset.autocomplete;
+    let datalist = document.createElement("datalist");
+    datalist.id = `${field}-suggestions`;
+    input.after(datalist);
+    input.setAttribute("list", datalist.id);
+
+    let timer = null;
+    input.addEventListener("input", function () {
+        clearTimeout(timer);
+        let query = input.value.trim();
+        if (!query) {
+            datalist.replaceChildren();
+            return;
+        }
+        timer = setTimeout(function () {
+            let params = new URLSearchParams({ field: field, q: query });
+            fetch(`/autocomplete/?${params}`, { credentials: "same-origin" })
+                .then((response) => response.json())
+                .then((data) => {
+                    datalist.replaceChildren(
+                        ...data.suggestions.map(function (suggestion) {
+                            let option = document.createElement("option");
+                            option.value = suggestion.value;
+                            option.label = `${suggestion.value} (${suggestion.count})`;
+                            return option;
+                        })
+                    );
+                });
+        }, AUTOCOMPLETE_DELAY);
+    });
+}
+
+document.querySelectorAll("input[data-autocomplete]").forEach(attachAutocomplete);